@@ -34,6 +34,8 @@ class Settings(BaseSettings):
     # Rate limiting
     rate_limit_requests: int = 100
     rate_limit_window_seconds: int = 60
+    # Contracted requests per minute by API key id (enterprise agreements)
+    rate_limit_api_keys: dict[str, int] = {}
 
     # File storage
     upload_dir: str = "uploads"
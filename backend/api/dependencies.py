@@ -1,15 +1,26 @@
 """FastAPI dependencies for authentication, authorization, and more."""
 
+import asyncio
 import hashlib
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable
 from datetime import datetime
 from typing import Annotated
 
-from fastapi import Depends, Header, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import Depends, Header, HTTPException, Request, status
+from sqlalchemy import Select, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 
-from backend.db.base import get_db
+from backend.api.middleware.rate_limit import RateLimitIdentity
+from backend.db.base import SessionLocal, get_async_db, get_db
 from backend.db.models import User, Session as UserSession, APIKey, PlanType
 
+logger = logging.getLogger("infographix.api")
+
 
 def hash_token(token: str) -> str:
     """Hash a token for lookup."""
@@ -32,16 +43,11 @@ async def get_token_from_header(
     return None, ""
 
 
-async def get_current_user(
-    db: Session = Depends(get_db),
-    token_info: tuple[str | None, str] = Depends(get_token_from_header),
-) -> User:
-    """Get the current authenticated user.
-
-    Supports both Bearer tokens (sessions) and API keys.
+def _principal_query(token_info: tuple[str | None, str]) -> Select:
+    """Build the query for the session or API key behind a token.
 
     Raises:
-        HTTPException: If not authenticated or token is invalid.
+        HTTPException: If there is no token or the method is unsupported.
     """
     token, token_type = token_info
 
@@ -56,74 +62,124 @@ async def get_current_user(
 
     if token_type == "bearer":
         # Session-based authentication
-        session = db.query(UserSession).filter(
+        return select(UserSession).options(joinedload(UserSession.user)).where(
             UserSession.token_hash == token_hash,
-        ).first()
+        )
+
+    if token_type == "api_key":
+        # API key authentication
+        return select(APIKey).options(joinedload(APIKey.user)).where(
+            APIKey.key_hash == token_hash,
+            APIKey.is_active == True,
+        )
+
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid authentication method",
+    )
+
 
-        if not session:
+def _authenticate(principal: UserSession | APIKey | None, token_type: str) -> User:
+    """Validate a session or API key and record its use.
+
+    Returns:
+        The principal's user. The caller commits the usage update.
+
+    Raises:
+        HTTPException: If the principal is missing or expired.
+    """
+    now = datetime.utcnow()
+
+    if token_type == "bearer":
+        if not principal:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid or expired token",
             )
 
         # Check expiration
-        if session.expires_at < datetime.utcnow():
+        if principal.expires_at < now:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token expired",
             )
 
         # Update last used
-        session.last_used_at = datetime.utcnow()
-        db.commit()
-
-        user = session.user
+        principal.last_used_at = now
 
-    elif token_type == "api_key":
-        # API key authentication
-        api_key = db.query(APIKey).filter(
-            APIKey.key_hash == token_hash,
-            APIKey.is_active == True,
-        ).first()
-
-        if not api_key:
+    else:
+        if not principal:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid API key",
             )
 
         # Check expiration
-        if api_key.expires_at and api_key.expires_at < datetime.utcnow():
+        if principal.expires_at and principal.expires_at < now:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="API key expired",
             )
 
         # Update usage
-        api_key.last_used_at = datetime.utcnow()
-        api_key.request_count += 1
-        db.commit()
+        principal.last_used_at = now
+        principal.request_count += 1
 
-        user = api_key.user
+    return principal.user
 
-    else:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication method",
-        )
 
+def _check_active(user: User) -> User:
+    """Reject disabled accounts."""
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Account is disabled",
         )
-
     return user
 
 
-async def get_optional_user(
+async def get_current_user(
+    db: AsyncSession = Depends(get_async_db),
+    token_info: tuple[str | None, str] = Depends(get_token_from_header),
+) -> User:
+    """Get the current authenticated user.
+
+    Supports both Bearer tokens (sessions) and API keys. The user is
+    loaded on an async session, so routes depending on it should query
+    through ``get_async_db`` too.
+
+    Raises:
+        HTTPException: If not authenticated or token is invalid.
+    """
+    token_type = token_info[1]
+    principal = (await db.scalars(_principal_query(token_info))).first()
+    user = _authenticate(principal, token_type)
+    await db.commit()
+    return _check_active(user)
+
+
+async def get_current_user_sync(
     db: Session = Depends(get_db),
     token_info: tuple[str | None, str] = Depends(get_token_from_header),
+) -> User:
+    """Get the current authenticated user on a synchronous session.
+
+    For routes still on ``get_db`` that modify the user: the user must be
+    loaded in the session that commits the change.
+
+    Raises:
+        HTTPException: If not authenticated or token is invalid.
+    """
+    token_type = token_info[1]
+    principal = db.scalars(_principal_query(token_info)).first()
+    user = _authenticate(principal, token_type)
+    db.commit()
+    return _check_active(user)
+
+
+async def get_optional_user(
+    db: AsyncSession = Depends(get_async_db),
+    token_info: tuple[str | None, str] = Depends(get_token_from_header),
 ) -> User | None:
     """Get the current user if authenticated, None otherwise."""
     try:
@@ -187,7 +243,7 @@ def require_scope(scope: str):
         Dependency function.
     """
     async def check_scope(
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         token_info: tuple[str | None, str] = Depends(get_token_from_header),
     ) -> None:
         token, token_type = token_info
@@ -202,9 +258,9 @@ def require_scope(scope: str):
                 detail="Not authenticated",
             )
 
-        api_key = db.query(APIKey).filter(
+        api_key = (await db.scalars(select(APIKey).where(
             APIKey.key_hash == hash_token(token),
-        ).first()
+        ))).first()
 
         if not api_key:
             raise HTTPException(
@@ -221,8 +277,84 @@ def require_scope(scope: str):
     return check_scope
 
 
+class RateLimitIdentityResolver:
+    """Resolve request credentials to a user and plan for rate limiting.
+
+    Runs in the rate limit middleware, before route dependencies, so it
+    only reads: a valid session or API key maps to its user's plan, and
+    anything else is treated as anonymous. Results, including misses, are
+    cached per token for ``ttl`` seconds so most requests skip the database.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        ttl: float = 60.0,
+        max_entries: int = 10_000,
+    ):
+        self.session_factory = session_factory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._cache: OrderedDict[str, tuple[float, RateLimitIdentity | None]] = OrderedDict()
+
+    async def __call__(self, request: Request) -> RateLimitIdentity | None:
+        """Get the identity for a request, or None if not authenticated."""
+        token, token_type = await get_token_from_header(
+            request.headers.get("Authorization"),
+            request.headers.get("X-API-Key"),
+        )
+        if not token:
+            return None
+
+        cache_key = f"{token_type}:{hash_token(token)}"
+        cached = self._cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            self._cache.move_to_end(cache_key)
+            return cached[1]
+
+        try:
+            identity = await asyncio.to_thread(self._lookup, token, token_type)
+        except SQLAlchemyError as e:
+            # Limit as anonymous rather than failing the request
+            logger.warning("Rate limit identity lookup failed: %s", e)
+            return None
+        self._cache[cache_key] = (time.monotonic() + self.ttl, identity)
+        self._cache.move_to_end(cache_key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return identity
+
+    def _lookup(self, token: str, token_type: str) -> RateLimitIdentity | None:
+        """Look up the user behind a token."""
+        token_hash = hash_token(token)
+        now = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            if token_type == "bearer":
+                session = db.query(UserSession).filter(
+                    UserSession.token_hash == token_hash,
+                    UserSession.expires_at > now,
+                ).first()
+                if not session or not session.user.is_active:
+                    return None
+                return RateLimitIdentity(session.user_id, session.user.plan.value)
+
+            api_key = db.query(APIKey).filter(
+                APIKey.key_hash == token_hash,
+                APIKey.is_active == True,
+            ).first()
+            if not api_key or (api_key.expires_at and api_key.expires_at < now):
+                return None
+            if not api_key.user.is_active:
+                return None
+            return RateLimitIdentity(api_key.user_id, api_key.user.plan.value, api_key.id)
+        finally:
+            db.close()
+
+
 # Type aliases for cleaner dependency injection
 CurrentUser = Annotated[User, Depends(get_current_user)]
+SyncCurrentUser = Annotated[User, Depends(get_current_user_sync)]
 OptionalUser = Annotated[User | None, Depends(get_optional_user)]
 CreditCheck = Annotated[None, Depends(check_credits)]
 ProRequired = Annotated[None, Depends(require_pro)]
@@ -1,5 +1,6 @@
 """FastAPI application entry point."""
 
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
@@ -13,11 +14,73 @@ from backend.api.middleware import (
     LoggingMiddleware,
     SecurityHeadersMiddleware,
 )
-from backend.api.middleware.rate_limit import RateLimitConfig
+from backend.api.dependencies import RateLimitIdentityResolver
+from backend.api.middleware.rate_limit import RateLimitConfig, RateLimitPolicy, RouteRule
 
 settings = get_settings()
 
 
+def rate_limit_config() -> RateLimitConfig:
+    """Build the per-route and per-plan rate limit policy table.
+
+    Generation has its own bucket so that polling and browsing cannot use
+    up a client's generation capacity, and each generation request costs
+    tokens in proportion to the work it starts.
+    """
+    prefix = settings.api_prefix
+    routes = {
+        f"POST {prefix}/generate": RouteRule(bucket="generate", cost=1),
+        f"POST {prefix}/generate/variations": RouteRule(bucket="generate", cost=3),
+        f"POST {prefix}/downloads": RouteRule(bucket="generate", cost=1),
+        f"GET {prefix}/generate/{{generation_id}}": RouteRule(bucket="poll"),
+        f"GET {prefix}/downloads/{{download_id}}": RouteRule(bucket="poll"),
+        f"GET {prefix}/generate/{{generation_id}}/events": RouteRule(bucket="poll"),
+        f"GET {prefix}/downloads/{{download_id}}/events": RouteRule(bucket="poll"),
+        f"POST {prefix}/auth/login": RouteRule(bucket="auth"),
+        f"POST {prefix}/auth/register": RouteRule(bucket="auth"),
+        f"POST {prefix}/auth/forgot-password": RouteRule(bucket="auth"),
+        f"POST {prefix}/billing/webhooks/stripe": RouteRule(exempt=True),
+    }
+    auth = RateLimitPolicy(requests_per_minute=10, requests_per_hour=100, burst_size=0)
+    policies = {
+        "anonymous": {
+            "default": RateLimitPolicy(requests_per_minute=60, requests_per_hour=1000),
+            "auth": auth,
+        },
+        "free": {
+            "default": RateLimitPolicy(requests_per_minute=60, requests_per_hour=1000),
+            "generate": RateLimitPolicy(requests_per_minute=10, requests_per_hour=100, burst_size=2),
+            "poll": RateLimitPolicy(requests_per_minute=120, requests_per_hour=0, burst_size=30),
+            "auth": auth,
+        },
+        "pro": {
+            "default": RateLimitPolicy(requests_per_minute=300, requests_per_hour=10000, burst_size=50),
+            "generate": RateLimitPolicy(requests_per_minute=60, requests_per_hour=1000, burst_size=10),
+            "poll": RateLimitPolicy(requests_per_minute=600, requests_per_hour=0, burst_size=100),
+            "auth": auth,
+        },
+        "enterprise": {
+            "default": RateLimitPolicy(requests_per_minute=1200, requests_per_hour=0, burst_size=200),
+            "generate": RateLimitPolicy(requests_per_minute=300, requests_per_hour=0, burst_size=50),
+            "poll": RateLimitPolicy(requests_per_minute=2400, requests_per_hour=0, burst_size=400),
+            "auth": auth,
+        },
+    }
+    for key_id, per_minute in settings.rate_limit_api_keys.items():
+        policies[f"api_key:{key_id}"] = {
+            "default": RateLimitPolicy(
+                requests_per_minute=per_minute, requests_per_hour=0, burst_size=per_minute // 5
+            ),
+        }
+
+    return RateLimitConfig(
+        requests_per_minute=60,
+        exempt_paths=["/health", "/ready", "/docs", "/redoc", "/openapi.json"],
+        routes=routes,
+        policies=policies,
+    )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan handler for startup/shutdown events."""
@@ -30,10 +93,30 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     from backend.db.base import init_db
     init_db()
 
+    # Without Redis, tasks are queued in this process and no separate worker
+    # can see them, so run one here
+    from backend.tasks.queue import InMemoryTaskQueue, get_task_queue
+    from backend.tasks.worker import Worker, WorkerSettings
+
+    queue = get_task_queue(redis_url=settings.redis_url)
+    worker_task = None
+    if isinstance(queue, InMemoryTaskQueue):
+        print("Task queue: in-process (no Redis); running an embedded worker")
+        worker = Worker(
+            WorkerSettings(warm_up_models=False, shutdown_timeout=5.0),
+            queue=queue,
+        )
+        worker_task = asyncio.create_task(worker.run())
+
     yield
 
     # Shutdown
     print("Shutting down...")
+    if worker_task is not None:
+        worker_task.cancel()
+        await asyncio.gather(worker_task, return_exceptions=True)
+    from backend.renderer import shutdown_render_pool
+    shutdown_render_pool()
 
 
 def create_app() -> FastAPI:
@@ -59,10 +142,8 @@ def create_app() -> FastAPI:
     # Rate limiting middleware
     app.add_middleware(
         RateLimitMiddleware,
-        config=RateLimitConfig(
-            requests_per_minute=60,
-            exempt_paths=["/health", "/ready", "/docs", "/redoc", "/openapi.json"],
-        ),
+        config=rate_limit_config(),
+        get_identity=RateLimitIdentityResolver(),
     )
 
     # CORS middleware
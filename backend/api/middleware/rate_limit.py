@@ -1,18 +1,151 @@
-"""Rate limiting middleware."""
-
+"""Rate limiting middleware.
+
+Each client gets a token bucket for short-term rate and bursts, plus a
+sliding-window counter for the hourly quota. With Redis configured, both
+are updated by one Lua script per request, so limits hold across all
+workers. Without Redis, or while it is unreachable, each process applies
+the same algorithm locally.
+
+Limits are looked up per request from a policy table: the route (matched
+against precompiled templates) selects a bucket and a cost, and the
+client's tier (plan, or a contracted API key) selects the limits for that
+bucket. Each (client, bucket) pair has its own state, so cheap polling
+cannot use up the budget for generation.
+"""
+
+import logging
+import math
+import os
 import time
-from collections import defaultdict
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
-from typing import Callable
+from typing import NamedTuple
 
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
 
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger("infographix.api")
+
+HOUR = 3600
+
+# Keys: the client's state hash.
+# Args: refill rate (tokens/s), bucket capacity, hourly limit (0 = none),
+# hour window (s), cost.
+# Mirrors _take() below; uses server time so all workers share one clock.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local hour_limit = tonumber(ARGV[3])
+local hour_window = tonumber(ARGV[4])
+local cost = tonumber(ARGV[5])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts', 'window', 'count', 'prev')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+local window = tonumber(state[3]) or 0
+local count = tonumber(state[4]) or 0
+local prev = tonumber(state[5]) or 0
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local current = math.floor(now / hour_window)
+if current ~= window then
+    if current == window + 1 then prev = count else prev = 0 end
+    count = 0
+    window = current
+end
+local elapsed = (now - current * hour_window) / hour_window
+local hour_used = prev * (1 - elapsed) + count
+
+local allowed = 0
+local retry_after = 0
+if tokens < cost then
+    retry_after = (cost - tokens) / rate
+elseif hour_limit > 0 and hour_used + cost > hour_limit then
+    if prev > 0 and count + cost <= hour_limit then
+        retry_after = (1 - (hour_limit - count - cost) / prev - elapsed) * hour_window
+    else
+        retry_after = (current + 1) * hour_window - now
+    end
+else
+    allowed = 1
+    tokens = tokens - cost
+    count = count + cost
+    hour_used = hour_used + cost
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now, 'window', window,
+    'count', count, 'prev', prev)
+redis.call('EXPIRE', KEYS[1], math.ceil(math.max(capacity / rate, 2 * hour_window)))
+return {allowed, tostring(tokens), tostring(hour_used), tostring(retry_after), tostring(now)}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """Limits for one tier and bucket.
+
+    A client may send ``requests_per_minute + burst_size`` requests back to
+    back after being idle; after that tokens refill at
+    ``requests_per_minute`` per ``window_size`` seconds. ``requests_per_hour``
+    caps the total over a sliding hour (0 disables it).
+    """
+    requests_per_minute: int = 60
+    requests_per_hour: int = 1000
+    burst_size: int = 10
+    window_size: int = 60  # seconds
+
+    @property
+    def refill_rate(self) -> float:
+        """Tokens added per second."""
+        return self.requests_per_minute / self.window_size
+
+    @property
+    def capacity(self) -> int:
+        """Token bucket size."""
+        return self.requests_per_minute + self.burst_size
+
+
+@dataclass(frozen=True)
+class RouteRule:
+    """How requests to a route are counted."""
+    # Requests in the same bucket share limits
+    bucket: str = "default"
+    # Tokens each request takes
+    cost: int = 1
+    # Skip rate limiting entirely
+    exempt: bool = False
+
+
+DEFAULT_RULE = RouteRule()
+EXEMPT_RULE = RouteRule(exempt=True)
+
+
+class RateLimitIdentity(NamedTuple):
+    """Authenticated client resolved from a request's credentials."""
+    user_id: str
+    plan: str
+    api_key_id: str | None = None
+
 
 @dataclass
 class RateLimitConfig:
-    """Rate limit configuration."""
+    """Rate limit configuration.
+
+    The top-level limits are the default policy, used for any tier and
+    bucket without an entry in ``policies``.
+    """
     # Requests per window
     requests_per_minute: int = 60
     requests_per_hour: int = 1000
@@ -23,84 +156,378 @@ class RateLimitConfig:
     # Sliding window size
     window_size: int = 60  # seconds
 
-    # Exempted paths (no rate limiting)
+    # Exempted path prefixes (no rate limiting)
     exempt_paths: list[str] = field(default_factory=lambda: ["/health", "/ready"])
 
+    # Route templates to rules, e.g. "POST /api/v1/generate" or
+    # "/api/v1/generate/{id}" (any method). A trailing "/*" matches a prefix.
+    routes: dict[str, RouteRule] = field(default_factory=dict)
+
+    # Tier -> bucket -> limits. Tiers are plan names, "api_key:<id>" for
+    # contracted API keys, and ``anonymous_tier`` for unauthenticated
+    # clients. A tier's "default" bucket covers buckets it doesn't list.
+    policies: dict[str, dict[str, RateLimitPolicy]] = field(default_factory=dict)
+    anonymous_tier: str = "anonymous"
+
+    # Shared limits in Redis; defaults to REDIS_URL, in-memory if unset
+    redis_url: str | None = None
+    key_prefix: str = "infographix:ratelimit:"
+    redis_timeout: float = 0.1  # seconds
+    # How long to use local limits after a Redis error before retrying
+    redis_retry_interval: float = 30.0
+    # Processes sharing the limits; local fallback limits are divided by it
+    local_workers: int = field(
+        default_factory=lambda: int(os.getenv("WEB_CONCURRENCY", "1"))
+    )
+    # Clients tracked in memory; least recently seen are dropped first
+    max_local_keys: int = 100_000
+
+    @property
+    def default_policy(self) -> RateLimitPolicy:
+        """Limits used where ``policies`` has no entry."""
+        return RateLimitPolicy(
+            requests_per_minute=self.requests_per_minute,
+            requests_per_hour=self.requests_per_hour,
+            burst_size=self.burst_size,
+            window_size=self.window_size,
+        )
+
+    @property
+    def refill_rate(self) -> float:
+        """Tokens added per second."""
+        return self.requests_per_minute / self.window_size
+
+    @property
+    def capacity(self) -> int:
+        """Token bucket size."""
+        return self.requests_per_minute + self.burst_size
+
+
+class _RouteNode:
+    """Path segment node of a ``RouteTable``."""
+
+    __slots__ = ("children", "param", "rules", "prefix_rules")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _RouteNode] = {}
+        self.param: _RouteNode | None = None
+        # Method ("*" for any) -> rule, for paths ending here
+        self.rules: dict[str, RouteRule] = {}
+        # Method -> rule, for paths continuing below this node
+        self.prefix_rules: dict[str, RouteRule] = {}
+
+
+class RouteTable:
+    """Route templates compiled into a segment trie.
+
+    Lookup cost depends on the path depth, not on the number of rules.
+    Literal segments win over ``{param}`` segments, and exact routes over
+    prefix ("/*") routes, so the most specific rule applies.
+    """
+
+    def __init__(self, routes: dict[str, RouteRule] | None = None):
+        self._root = _RouteNode()
+        for pattern, rule in (routes or {}).items():
+            self.add(pattern, rule)
+
+    @staticmethod
+    def _segments(path: str) -> list[str]:
+        return [segment for segment in path.split("/") if segment]
+
+    def add(self, pattern: str, rule: RouteRule) -> None:
+        """Add a route template.
+
+        Args:
+            pattern: Optional method and a path template, e.g.
+                "GET /api/v1/generate/{id}", "/docs/*".
+            rule: Rule for matching requests.
+        """
+        method, _, path = pattern.strip().rpartition(" ")
+        method = method.strip().upper() or "*"
+        segments = self._segments(path)
+        prefix = bool(segments) and segments[-1] == "*"
+        if prefix:
+            segments.pop()
+
+        node = self._root
+        for segment in segments:
+            if segment.startswith("{") and segment.endswith("}"):
+                node.param = node.param or _RouteNode()
+                node = node.param
+            else:
+                node = node.children.setdefault(segment, _RouteNode())
+
+        if prefix:
+            node.prefix_rules[method] = rule
+        else:
+            node.rules[method] = rule
+
+    def match(self, method: str, path: str) -> RouteRule | None:
+        """Find the rule for a request, or None if no route matches."""
+        return self._match(self._root, self._segments(path), 0, method.upper())
+
+    def _match(
+        self, node: _RouteNode, segments: list[str], i: int, method: str
+    ) -> RouteRule | None:
+        if i == len(segments):
+            rule = node.rules.get(method) or node.rules.get("*")
+            if rule:
+                return rule
+        else:
+            child = node.children.get(segments[i])
+            if child:
+                rule = self._match(child, segments, i + 1, method)
+                if rule:
+                    return rule
+            if node.param:
+                rule = self._match(node.param, segments, i + 1, method)
+                if rule:
+                    return rule
+        return node.prefix_rules.get(method) or node.prefix_rules.get("*")
+
+
+def _take(
+    state: list[float] | None,
+    now: float,
+    rate: float,
+    capacity: float,
+    hour_limit: float,
+    cost: float,
+) -> tuple[bool, list[float], float, float, float]:
+    """Apply one request to a client's limiter state.
+
+    Same algorithm as ``TOKEN_BUCKET_SCRIPT``.
+
+    Args:
+        state: [tokens, ts, window, count, prev], or None for a new client.
+        now: Current time in seconds.
+        rate: Refill rate in tokens per second.
+        capacity: Token bucket size.
+        hour_limit: Requests per sliding hour, or 0 for no limit.
+        cost: Tokens this request takes.
+
+    Returns:
+        Tuple of (allowed, new state, tokens left, hourly usage, retry after).
+    """
+    tokens, ts, window, count, prev = state or (capacity, now, 0, 0, 0)
+    tokens = min(capacity, tokens + max(0.0, now - ts) * rate)
+
+    current = math.floor(now / HOUR)
+    if current != window:
+        prev = count if current == window + 1 else 0
+        count = 0
+        window = current
+    elapsed = (now - current * HOUR) / HOUR
+    hour_used = prev * (1 - elapsed) + count
+
+    allowed = False
+    retry_after = 0.0
+    if tokens < cost:
+        retry_after = (cost - tokens) / rate
+    elif hour_limit > 0 and hour_used + cost > hour_limit:
+        if prev > 0 and count + cost <= hour_limit:
+            retry_after = (1 - (hour_limit - count - cost) / prev - elapsed) * HOUR
+        else:
+            retry_after = (current + 1) * HOUR - now
+    else:
+        allowed = True
+        tokens -= cost
+        count += cost
+        hour_used += cost
+
+    return allowed, [tokens, now, window, count, prev], tokens, hour_used, retry_after
+
+
+def _limit_info(
+    limit: int,
+    allowed: bool,
+    tokens: float,
+    hour_used: float,
+    retry_after: float,
+    now: float,
+    rate: float,
+    capacity: float,
+    hour_limit: float,
+) -> dict:
+    """Build the info dict returned by the limiters."""
+    remaining = tokens
+    if hour_limit > 0:
+        remaining = min(remaining, hour_limit - hour_used)
+    info = {
+        "limit": limit,
+        "remaining": max(0, int(remaining)),
+        # When the bucket is full again
+        "reset": int(now + (capacity - tokens) / rate),
+    }
+    if not allowed:
+        info["retry_after"] = max(1, math.ceil(retry_after))
+    return info
+
 
 class InMemoryRateLimiter:
-    """Simple in-memory rate limiter using sliding window.
+    """In-process token bucket and hourly sliding-window limiter.
 
-    For production, use Redis-based rate limiting.
+    Keeps a fixed-size state per client in an LRU map bounded by
+    ``config.max_local_keys``. Limits are per process; use
+    ``RedisRateLimiter`` to share them across workers.
     """
 
-    def __init__(self, config: RateLimitConfig):
+    def __init__(self, config: RateLimitConfig, share: float = 1.0):
+        """Initialize the limiter.
+
+        Args:
+            config: Rate limit configuration.
+            share: Fraction of the configured limits this process enforces.
+        """
         self.config = config
-        self._requests: dict[str, list[float]] = defaultdict(list)
-        self._last_cleanup = time.time()
+        self.share = share
+        self._default = config.default_policy
+        self._state: OrderedDict[str, list[float]] = OrderedDict()
 
-    def is_allowed(self, key: str) -> tuple[bool, dict]:
+    def is_allowed(
+        self, key: str, cost: int = 1, policy: RateLimitPolicy | None = None
+    ) -> tuple[bool, dict]:
         """Check if request is allowed.
 
         Args:
             key: Rate limit key (e.g., IP address or user ID).
+            cost: Tokens the request takes.
+            policy: Limits to apply. Defaults to the config's limits.
 
         Returns:
             Tuple of (allowed, info dict with limits).
         """
+        policy = policy or self._default
+        rate = policy.refill_rate * self.share
+        capacity = max(1.0, policy.capacity * self.share)
+        hour_limit = policy.requests_per_hour * self.share
+
         now = time.time()
+        allowed, state, tokens, hour_used, retry_after = _take(
+            self._state.get(key), now, rate, capacity, hour_limit, cost
+        )
+        self._state[key] = state
+        self._state.move_to_end(key)
+        while len(self._state) > self.config.max_local_keys:
+            self._state.popitem(last=False)
+
+        return allowed, _limit_info(
+            policy.requests_per_minute,
+            allowed,
+            tokens,
+            hour_used,
+            retry_after,
+            now,
+            rate,
+            capacity,
+            hour_limit,
+        )
+
+    async def check(
+        self, key: str, cost: int = 1, policy: RateLimitPolicy | None = None
+    ) -> tuple[bool, dict]:
+        """Async interface shared with ``RedisRateLimiter``."""
+        return self.is_allowed(key, cost, policy)
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+
+class RedisRateLimiter:
+    """Rate limiter shared across workers through Redis.
+
+    Each check runs ``TOKEN_BUCKET_SCRIPT`` once (EVALSHA). If Redis fails,
+    checks go to a local ``InMemoryRateLimiter`` enforcing this worker's
+    share of the limits for ``config.redis_retry_interval`` seconds.
+    """
 
-        # Cleanup old entries periodically
-        if now - self._last_cleanup > 60:
-            self._cleanup()
-            self._last_cleanup = now
+    def __init__(self, config: RateLimitConfig, client: "aioredis.Redis | None" = None):
+        """Initialize the limiter.
 
-        # Get request timestamps for this key
-        timestamps = self._requests[key]
+        Args:
+            config: Rate limit configuration.
+            client: Redis client. Defaults to one for ``config.redis_url``.
+        """
+        if not REDIS_AVAILABLE:
+            raise ImportError("redis package not installed")
 
-        # Remove old timestamps outside window
-        window_start = now - self.config.window_size
-        timestamps = [t for t in timestamps if t > window_start]
-        self._requests[key] = timestamps
+        self.config = config
+        self._client = client or aioredis.from_url(
+            config.redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+            socket_timeout=config.redis_timeout,
+            socket_connect_timeout=config.redis_timeout,
+        )
+        self._script = self._client.register_script(TOKEN_BUCKET_SCRIPT)
+        self.fallback = InMemoryRateLimiter(config, share=1 / max(1, config.local_workers))
+        self._default = config.default_policy
+        self._down_until = 0.0
+
+    async def check(
+        self, key: str, cost: int = 1, policy: RateLimitPolicy | None = None
+    ) -> tuple[bool, dict]:
+        """Check if request is allowed.
 
-        # Check rate limit
-        request_count = len(timestamps)
-        limit = self.config.requests_per_minute
-
-        if request_count >= limit:
-            retry_after = int(timestamps[0] + self.config.window_size - now) + 1
-            return False, {
-                "limit": limit,
-                "remaining": 0,
-                "reset": int(timestamps[0] + self.config.window_size),
-                "retry_after": retry_after,
-            }
-
-        # Add current request
-        timestamps.append(now)
-        self._requests[key] = timestamps
-
-        return True, {
-            "limit": limit,
-            "remaining": limit - request_count - 1,
-            "reset": int(now + self.config.window_size),
-        }
-
-    def _cleanup(self):
-        """Remove expired entries."""
-        now = time.time()
-        window_start = now - self.config.window_size
-
-        keys_to_remove = []
-        for key, timestamps in self._requests.items():
-            # Remove old timestamps
-            timestamps = [t for t in timestamps if t > window_start]
-            if not timestamps:
-                keys_to_remove.append(key)
-            else:
-                self._requests[key] = timestamps
+        Args:
+            key: Rate limit key (e.g., IP address or user ID).
+            cost: Tokens the request takes.
+            policy: Limits to apply. Defaults to the config's limits.
 
-        for key in keys_to_remove:
-            del self._requests[key]
+        Returns:
+            Tuple of (allowed, info dict with limits).
+        """
+        if time.monotonic() < self._down_until:
+            return self.fallback.is_allowed(key, cost, policy)
+
+        config = self.config
+        policy = policy or self._default
+        try:
+            allowed, tokens, hour_used, retry_after, now = await self._script(
+                keys=[f"{config.key_prefix}{key}"],
+                args=[
+                    policy.refill_rate,
+                    policy.capacity,
+                    policy.requests_per_hour,
+                    HOUR,
+                    cost,
+                ],
+            )
+        except (RedisError, OSError) as e:
+            logger.warning(
+                "Redis rate limiter unavailable, using local limits for %ss: %s",
+                config.redis_retry_interval,
+                e,
+            )
+            self._down_until = time.monotonic() + config.redis_retry_interval
+            return self.fallback.is_allowed(key, cost, policy)
+
+        allowed = bool(allowed)
+        return allowed, _limit_info(
+            policy.requests_per_minute,
+            allowed,
+            float(tokens),
+            float(hour_used),
+            float(retry_after),
+            float(now),
+            policy.refill_rate,
+            policy.capacity,
+            policy.requests_per_hour,
+        )
+
+
+def get_rate_limiter(config: RateLimitConfig) -> InMemoryRateLimiter | RedisRateLimiter:
+    """Get a rate limiter for the configuration.
+
+    Returns a Redis limiter when a Redis URL is configured (``redis_url`` or
+    the REDIS_URL environment variable) and the redis package is installed,
+    otherwise an in-memory limiter.
+    """
+    if REDIS_AVAILABLE and (config.redis_url or os.getenv("REDIS_URL")):
+        try:
+            return RedisRateLimiter(config)
+        except Exception:
+            pass
+
+    return InMemoryRateLimiter(config)
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
@@ -114,11 +541,54 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         app,
         config: RateLimitConfig | None = None,
         get_key: Callable[[Request], str] | None = None,
+        get_identity: Callable[[Request], Awaitable[RateLimitIdentity | None]] | None = None,
     ):
+        """Initialize the middleware.
+
+        Args:
+            app: ASGI application.
+            config: Rate limit configuration.
+            get_key: Key for unauthenticated clients. Defaults to client IP.
+            get_identity: Resolves a request's credentials to a user and plan.
+                Without it every client is limited as anonymous.
+        """
         super().__init__(app)
         self.config = config or RateLimitConfig()
-        self.limiter = InMemoryRateLimiter(self.config)
+        self.limiter = get_rate_limiter(self.config)
         self.get_key = get_key or self._default_get_key
+        self.get_identity = get_identity
+
+        self.routes = RouteTable(self.config.routes)
+        for path in self.config.exempt_paths:
+            self.routes.add(f"{path.rstrip('/')}/*", EXEMPT_RULE)
+
+        # (tier, bucket) -> policy, so each request needs one dict lookup
+        self._policies: dict[tuple[str, str], RateLimitPolicy] = {}
+        for tier, buckets in self.config.policies.items():
+            for bucket, policy in buckets.items():
+                self._policies[(tier, bucket)] = policy
+        self._default_policy = self.config.default_policy
+
+    def get_policy(self, tier: str, bucket: str) -> RateLimitPolicy:
+        """Get the limits for a tier and bucket."""
+        return (
+            self._policies.get((tier, bucket))
+            or self._policies.get((tier, "default"))
+            or self._default_policy
+        )
+
+    async def _resolve(self, request: Request) -> tuple[str, str]:
+        """Get the rate limit subject and tier for a request."""
+        identity = await self.get_identity(request) if self.get_identity else None
+        if identity is None:
+            return f"ip:{self.get_key(request)}", self.config.anonymous_tier
+
+        if identity.api_key_id:
+            # Contracted keys get their own limits, separate from the user's
+            tier = f"api_key:{identity.api_key_id}"
+            if tier in self.config.policies:
+                return tier, tier
+        return f"user:{identity.user_id}", identity.plan
 
     def _default_get_key(self, request: Request) -> str:
         """Get rate limit key from request.
@@ -135,16 +605,19 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
     async def dispatch(self, request: Request, call_next) -> Response:
         """Process request with rate limiting."""
+        rule = self.routes.match(request.method, request.url.path) or DEFAULT_RULE
+
         # Skip rate limiting for exempt paths
-        path = request.url.path
-        if any(path.startswith(exempt) for exempt in self.config.exempt_paths):
+        if rule.exempt:
             return await call_next(request)
 
-        # Get rate limit key
-        key = self.get_key(request)
+        subject, tier = await self._resolve(request)
+        policy = self.get_policy(tier, rule.bucket)
 
         # Check rate limit
-        allowed, info = self.limiter.is_allowed(key)
+        allowed, info = await self.limiter.check(
+            f"{subject}:{rule.bucket}", rule.cost, policy
+        )
 
         if not allowed:
             return JSONResponse(
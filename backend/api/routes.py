@@ -1,6 +1,5 @@
 """API routes for Infographix."""
 
-import io
 import tempfile
 import uuid
 from pathlib import Path
@@ -11,13 +10,17 @@ from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 
 from backend.dsl.schema import GenerateRequest, GenerateResponse, SlideScene
-from backend.renderer import PPTXWriter
+from backend.renderer import FastPPTXWriter
 from backend.constraints import ConstraintEngine, ArchetypeRules
 
 router = APIRouter(tags=["generation"])
 
-# Temporary storage for generated files (in production, use cloud storage)
-_file_storage: dict[str, bytes] = {}
+# Temporary storage for generated files (in production, use cloud storage).
+# Only paths are kept in memory; the decks themselves live on disk.
+_storage_dir = Path(tempfile.gettempdir()) / "infographix"
+_file_storage: dict[str, Path] = {}
+
+PPTX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
 
 
 class RenderRequest(BaseModel):
@@ -129,7 +132,7 @@ async def list_templates() -> dict[str, list[dict[str, str]]]:
 
 
 @router.get("/downloads/{file_id}")
-async def download_file(file_id: str) -> StreamingResponse:
+async def download_file(file_id: str) -> FileResponse:
     """Download a generated PPTX file.
 
     Args:
@@ -138,14 +141,14 @@ async def download_file(file_id: str) -> StreamingResponse:
     Returns:
         The PPTX file as a download.
     """
-    if file_id not in _file_storage:
+    file_path = _file_storage.get(file_id)
+    if file_path is None or not file_path.exists():
         raise HTTPException(status_code=404, detail="File not found")
 
-    pptx_bytes = _file_storage[file_id]
-    return StreamingResponse(
-        io.BytesIO(pptx_bytes),
-        media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
-        headers={"Content-Disposition": f'attachment; filename="infographic_{file_id}.pptx"'},
+    return FileResponse(
+        path=str(file_path),
+        media_type=PPTX_MEDIA_TYPE,
+        filename=f"infographic_{file_id}.pptx",
     )
 
 
@@ -186,16 +189,12 @@ async def render_scenes(request: RenderRequest) -> RenderResponse:
     # Calculate average score
     avg_score = total_score / len(request.scenes)
 
-    # Render to PPTX
-    writer = PPTXWriter()
-    pptx_bytes = writer.write(processed_scenes, None)
-
-    if pptx_bytes is None:
-        raise HTTPException(status_code=500, detail="Failed to generate PPTX")
-
-    # Store the file
+    # Render straight to disk
     file_id = str(uuid.uuid4())[:8]
-    _file_storage[file_id] = pptx_bytes
+    _storage_dir.mkdir(parents=True, exist_ok=True)
+    file_path = _storage_dir / f"{file_id}.pptx"
+    FastPPTXWriter().write(processed_scenes, file_path)
+    _file_storage[file_id] = file_path
 
     return RenderResponse(
         file_id=file_id,
@@ -228,15 +227,10 @@ async def render_scenes_stream(request: RenderRequest) -> StreamingResponse:
             scene = engine.fix(scene)
         processed_scenes.append(scene)
 
-    writer = PPTXWriter()
-    pptx_bytes = writer.write(processed_scenes, None)
-
-    if pptx_bytes is None:
-        raise HTTPException(status_code=500, detail="Failed to generate PPTX")
-
+    # Slides are rendered while the response is sent, never buffered whole
     return StreamingResponse(
-        io.BytesIO(pptx_bytes),
-        media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
+        FastPPTXWriter().stream(processed_scenes),
+        media_type=PPTX_MEDIA_TYPE,
         headers={"Content-Disposition": 'attachment; filename="infographic.pptx"'},
     )
 
@@ -5,9 +5,10 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.base import get_db
+from backend.db.base import get_async_db
 from backend.db.models import User, MemberRole, AuditLog
 from backend.api.dependencies import CurrentUser
 from backend.api.routes.organizations import require_org_role
@@ -59,7 +60,7 @@ def audit_log_to_response(log: AuditLog) -> AuditLogResponse:
 async def list_audit_logs(
     org_id: str,
     current_user: CurrentUser,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
     action: str | None = None,
@@ -74,29 +75,33 @@ async def list_audit_logs(
 
     Only owners and admins can view audit logs.
     """
-    require_org_role(db, current_user, org_id, [MemberRole.OWNER, MemberRole.ADMIN])
+    await db.run_sync(
+        require_org_role, current_user, org_id, [MemberRole.OWNER, MemberRole.ADMIN]
+    )
 
-    query = db.query(AuditLog).filter(AuditLog.organization_id == org_id)
+    query = select(AuditLog).where(AuditLog.organization_id == org_id)
 
     if action:
-        query = query.filter(AuditLog.action == action)
+        query = query.where(AuditLog.action == action)
     if actor_id:
-        query = query.filter(AuditLog.actor_id == actor_id)
+        query = query.where(AuditLog.actor_id == actor_id)
     if target_type:
-        query = query.filter(AuditLog.target_type == target_type)
+        query = query.where(AuditLog.target_type == target_type)
     if target_id:
-        query = query.filter(AuditLog.target_id == target_id)
+        query = query.where(AuditLog.target_id == target_id)
     if start_date:
-        query = query.filter(AuditLog.created_at >= start_date)
+        query = query.where(AuditLog.created_at >= start_date)
     if end_date:
-        query = query.filter(AuditLog.created_at <= end_date)
+        query = query.where(AuditLog.created_at <= end_date)
 
     # Get total count
-    total = query.count()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
 
     # Get paginated results
     offset = (page - 1) * page_size
-    logs = query.order_by(AuditLog.created_at.desc()).offset(offset).limit(page_size).all()
+    logs = (await db.scalars(
+        query.order_by(AuditLog.created_at.desc()).offset(offset).limit(page_size)
+    )).all()
 
     return AuditLogListResponse(
         items=[audit_log_to_response(log) for log in logs],
@@ -111,7 +116,7 @@ async def list_audit_logs(
 async def get_audit_summary(
     org_id: str,
     current_user: CurrentUser,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     days: int = Query(7, ge=1, le=90),
 ):
     """
@@ -119,19 +124,19 @@ async def get_audit_summary(
 
     Returns action counts and recent security events.
     """
-    require_org_role(db, current_user, org_id, [MemberRole.OWNER, MemberRole.ADMIN])
+    await db.run_sync(
+        require_org_role, current_user, org_id, [MemberRole.OWNER, MemberRole.ADMIN]
+    )
 
     start_date = datetime.utcnow() - timedelta(days=days)
 
     # Get action counts
-    from sqlalchemy import func
-    action_counts = (
-        db.query(AuditLog.action, func.count(AuditLog.id))
-        .filter(AuditLog.organization_id == org_id)
-        .filter(AuditLog.created_at >= start_date)
+    action_counts = (await db.execute(
+        select(AuditLog.action, func.count(AuditLog.id))
+        .where(AuditLog.organization_id == org_id)
+        .where(AuditLog.created_at >= start_date)
         .group_by(AuditLog.action)
-        .all()
-    )
+    )).all()
 
     # Get security events
     security_actions = [
@@ -145,22 +150,20 @@ async def get_audit_summary(
         "org.ownership_transferred",
     ]
 
-    security_events = (
-        db.query(AuditLog)
-        .filter(AuditLog.organization_id == org_id)
-        .filter(AuditLog.action.in_(security_actions))
-        .filter(AuditLog.created_at >= start_date)
+    security_events = (await db.scalars(
+        select(AuditLog)
+        .where(AuditLog.organization_id == org_id)
+        .where(AuditLog.action.in_(security_actions))
+        .where(AuditLog.created_at >= start_date)
         .order_by(AuditLog.created_at.desc())
         .limit(20)
-        .all()
-    )
+    )).all()
 
     # Get unique actors
-    unique_actors = (
-        db.query(func.count(func.distinct(AuditLog.actor_id)))
-        .filter(AuditLog.organization_id == org_id)
-        .filter(AuditLog.created_at >= start_date)
-        .scalar()
+    unique_actors = await db.scalar(
+        select(func.count(func.distinct(AuditLog.actor_id)))
+        .where(AuditLog.organization_id == org_id)
+        .where(AuditLog.created_at >= start_date)
     )
 
     return {
@@ -176,7 +179,7 @@ async def get_audit_summary(
 async def export_audit_logs(
     org_id: str,
     current_user: CurrentUser,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     start_date: datetime | None = None,
     end_date: datetime | None = None,
     format: str = Query("json", pattern="^(json|csv)$"),
@@ -186,16 +189,16 @@ async def export_audit_logs(
 
     Returns logs in JSON or CSV format.
     """
-    require_org_role(db, current_user, org_id, [MemberRole.OWNER])
+    await db.run_sync(require_org_role, current_user, org_id, [MemberRole.OWNER])
 
-    query = db.query(AuditLog).filter(AuditLog.organization_id == org_id)
+    query = select(AuditLog).where(AuditLog.organization_id == org_id)
 
     if start_date:
-        query = query.filter(AuditLog.created_at >= start_date)
+        query = query.where(AuditLog.created_at >= start_date)
     if end_date:
-        query = query.filter(AuditLog.created_at <= end_date)
+        query = query.where(AuditLog.created_at <= end_date)
 
-    logs = query.order_by(AuditLog.created_at.desc()).limit(10000).all()
+    logs = (await db.scalars(query.order_by(AuditLog.created_at.desc()).limit(10000))).all()
 
     if format == "csv":
         import csv
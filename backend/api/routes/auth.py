@@ -27,7 +27,7 @@ from backend.auth import (
 )
 from backend.auth.totp import generate_backup_codes, hash_backup_code
 from backend.auth.tokens import generate_session_tokens, generate_api_key
-from backend.api.dependencies import get_current_user, CurrentUser
+from backend.api.dependencies import SyncCurrentUser
 
 router = APIRouter()
 
@@ -342,7 +342,7 @@ async def refresh_token(
 
 @router.post("/logout")
 async def logout(
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
     authorization: str | None = None,
 ):
@@ -362,7 +362,7 @@ async def logout(
 
 @router.post("/logout-all")
 async def logout_all_sessions(
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Logout from all sessions (except current)."""
@@ -376,7 +376,7 @@ async def logout_all_sessions(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
 ):
     """Get current user information."""
     return UserResponse(
@@ -429,7 +429,7 @@ async def verify_email(
 
 @router.post("/resend-verification")
 async def resend_verification_email(
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Resend verification email."""
@@ -521,7 +521,7 @@ async def reset_password(
 @router.post("/change-password")
 async def change_password(
     request: ChangePasswordRequest,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Change password for authenticated user."""
@@ -575,7 +575,7 @@ async def change_password(
 # 2FA (TOTP)
 @router.post("/2fa/setup", response_model=Enable2FAResponse)
 async def setup_2fa(
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Begin 2FA setup process."""
@@ -608,7 +608,7 @@ async def setup_2fa(
 @router.post("/2fa/enable")
 async def enable_2fa(
     request: Verify2FARequest,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Enable 2FA after verifying setup code."""
@@ -639,7 +639,7 @@ async def enable_2fa(
 @router.post("/2fa/disable")
 async def disable_2fa(
     request: Verify2FARequest,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Disable 2FA."""
@@ -666,7 +666,7 @@ async def disable_2fa(
 @router.post("/2fa/backup-codes")
 async def regenerate_backup_codes(
     request: Verify2FARequest,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Regenerate backup codes (requires 2FA verification)."""
@@ -692,7 +692,7 @@ async def regenerate_backup_codes(
 # API Keys
 @router.get("/api-keys", response_model=list[APIKeyResponse])
 async def list_api_keys(
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """List user's API keys."""
@@ -716,7 +716,7 @@ async def list_api_keys(
 @router.post("/api-keys", response_model=APIKeyResponse)
 async def create_api_key(
     request: APIKeyCreate,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Create a new API key."""
@@ -745,7 +745,7 @@ async def create_api_key(
 @router.delete("/api-keys/{key_id}")
 async def delete_api_key(
     key_id: str,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Delete an API key."""
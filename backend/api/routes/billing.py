@@ -9,7 +9,7 @@ from sqlalchemy.orm import Session
 
 from backend.db.base import get_db
 from backend.db.models import User, PlanType
-from backend.api.dependencies import CurrentUser
+from backend.api.dependencies import SyncCurrentUser
 from backend.billing import (
     PLANS,
     get_plan,
@@ -155,7 +155,7 @@ async def get_plan_details(plan_id: str):
 @router.post("/checkout", response_model=CheckoutResponse)
 async def create_checkout(
     request: CreateCheckoutRequest,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Create a Stripe Checkout session for subscription."""
@@ -195,7 +195,7 @@ async def create_checkout(
 
 @router.post("/portal", response_model=PortalResponse)
 async def create_customer_portal(
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     return_url: str | None = None,
 ):
     """Create a Stripe Customer Portal session."""
@@ -216,7 +216,7 @@ async def create_customer_portal(
 # Subscription Management
 @router.get("/subscription", response_model=SubscriptionResponse)
 async def get_current_subscription(
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Get current subscription details."""
@@ -245,7 +245,7 @@ async def get_current_subscription(
 
 @router.post("/subscription/cancel")
 async def cancel_current_subscription(
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     at_period_end: bool = True,
 ):
     """Cancel current subscription."""
@@ -268,7 +268,7 @@ async def cancel_current_subscription(
 
 @router.post("/subscription/reactivate")
 async def reactivate_current_subscription(
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
 ):
     """Reactivate a cancelled subscription."""
     if not current_user.stripe_subscription_id:
@@ -288,7 +288,7 @@ async def reactivate_current_subscription(
 # Usage & Invoices
 @router.get("/usage", response_model=UsageStatsResponse)
 async def get_usage(
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
     days: int = 30,
 ):
@@ -307,7 +307,7 @@ async def get_usage(
 
 @router.get("/usage/history")
 async def get_usage_history_endpoint(
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
     limit: int = 50,
     offset: int = 0,
@@ -319,7 +319,7 @@ async def get_usage_history_endpoint(
 
 @router.get("/invoices", response_model=list[InvoiceResponse])
 async def list_user_invoices(
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     limit: int = 10,
 ):
     """List user's invoices."""
@@ -345,7 +345,7 @@ async def list_user_invoices(
 
 @router.get("/invoices/upcoming")
 async def get_upcoming_invoice_endpoint(
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
 ):
     """Get upcoming invoice."""
     if not current_user.stripe_customer_id:
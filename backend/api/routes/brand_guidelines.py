@@ -15,7 +15,7 @@ from backend.db.models import (
     BrandGuideline,
     MemberRole,
 )
-from backend.api.dependencies import CurrentUser
+from backend.api.dependencies import SyncCurrentUser
 from backend.api.routes.organizations import require_org_role
 
 router = APIRouter()
@@ -138,7 +138,7 @@ def guideline_to_response(guideline: BrandGuideline) -> BrandGuidelineResponse:
 @router.get("/{org_id}/brand-guidelines", response_model=list[BrandGuidelineResponse])
 async def list_brand_guidelines(
     org_id: str,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
     active_only: bool = True,
 ):
@@ -164,7 +164,7 @@ async def list_brand_guidelines(
 async def get_brand_guideline(
     org_id: str,
     guideline_id: str,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Get a specific brand guideline."""
@@ -188,7 +188,7 @@ async def get_brand_guideline(
 async def create_brand_guideline(
     org_id: str,
     request: CreateBrandGuidelineRequest,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Create a new brand guideline."""
@@ -232,7 +232,7 @@ async def update_brand_guideline(
     org_id: str,
     guideline_id: str,
     request: UpdateBrandGuidelineRequest,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Update a brand guideline."""
@@ -301,7 +301,7 @@ async def update_brand_guideline(
 async def delete_brand_guideline(
     org_id: str,
     guideline_id: str,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Delete a brand guideline."""
@@ -329,7 +329,7 @@ async def check_compliance(
     org_id: str,
     guideline_id: str,
     request: ComplianceCheckRequest,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Check if content complies with brand guidelines."""
@@ -435,7 +435,7 @@ async def check_compliance(
 @router.get("/{org_id}/brand-guidelines/default", response_model=BrandGuidelineResponse | None)
 async def get_default_brand_guideline(
     org_id: str,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Get the default brand guideline for an organization."""
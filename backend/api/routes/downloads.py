@@ -3,17 +3,23 @@
 import os
 import tempfile
 from datetime import datetime, timedelta
+from functools import partial
 from pathlib import Path
 from typing import Literal
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
-from backend.db.base import get_db
+from backend.db.artifacts import get_artifact_store
+from backend.db.base import get_async_db
 from backend.db.models import Download, Generation, GenerationStatus, User
 from backend.api.dependencies import get_current_user, require_pro
+from backend.api.streaming import progress_event_response
+from backend.tasks.progress import ProgressReporter, make_event
 
 router = APIRouter()
 
@@ -42,7 +48,7 @@ class DownloadResponse(BaseModel):
 async def create_download(
     request: DownloadRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Create a download for a generation.
@@ -58,10 +64,10 @@ async def create_download(
         )
 
     # Get generation
-    generation = db.query(Generation).filter(
+    generation = (await db.scalars(select(Generation).where(
         Generation.id == request.generation_id,
         Generation.user_id == current_user.id,
-    ).first()
+    ))).first()
 
     if not generation:
         raise HTTPException(
@@ -76,11 +82,11 @@ async def create_download(
         )
 
     # Check if download already exists
-    existing = db.query(Download).filter(
+    existing = (await db.scalars(select(Download).where(
         Download.generation_id == generation.id,
         Download.format == request.format,
         Download.variation_index == request.variation_index,
-    ).first()
+    ))).first()
 
     if existing and existing.expires_at and existing.expires_at > datetime.utcnow():
         return DownloadResponse(
@@ -100,8 +106,8 @@ async def create_download(
         expires_at=datetime.utcnow() + timedelta(hours=24),
     )
     db.add(download)
-    db.commit()
-    db.refresh(download)
+    await db.commit()
+    ProgressReporter(download.id)("rendering")
 
     # Queue file generation
     background_tasks.add_task(
@@ -122,14 +128,14 @@ async def create_download(
 @router.get("/{download_id}", response_model=DownloadResponse)
 async def get_download_status(
     download_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get download status."""
-    download = db.query(Download).join(Generation).filter(
+    download = (await db.scalars(select(Download).join(Generation).where(
         Download.id == download_id,
         Generation.user_id == current_user.id,
-    ).first()
+    ))).first()
 
     if not download:
         raise HTTPException(
@@ -153,17 +159,53 @@ async def get_download_status(
         )
 
 
+@router.get("/{download_id}/events")
+async def stream_download_events(
+    download_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Stream download progress as server-sent events.
+
+    Emits ``progress`` events (rendering, then rendered or failed) and
+    closes once the file is ready.
+    """
+    download = (await db.scalars(select(Download).join(Generation).where(
+        Download.id == download_id,
+        Generation.user_id == current_user.id,
+    ))).first()
+
+    if not download:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Download not found",
+        )
+
+    ready = bool(download.file_path) and Path(download.file_path).exists()
+    current = make_event(download.id, "rendered" if ready else "rendering")
+
+    # Release the connection instead of holding it for the whole stream
+    await db.close()
+
+    return progress_event_response(download_id, current)
+
+
 @router.get("/{download_id}/file")
 async def download_file(
     download_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Download the generated file."""
-    download = db.query(Download).join(Generation).filter(
-        Download.id == download_id,
-        Generation.user_id == current_user.id,
-    ).first()
+    download = (await db.scalars(
+        select(Download)
+        .join(Generation)
+        .options(joinedload(Download.generation))
+        .where(
+            Download.id == download_id,
+            Generation.user_id == current_user.id,
+        )
+    )).first()
 
     if not download:
         raise HTTPException(
@@ -207,14 +249,14 @@ async def download_file(
 @router.delete("/{download_id}")
 async def delete_download(
     download_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Delete a download."""
-    download = db.query(Download).join(Generation).filter(
+    download = (await db.scalars(select(Download).join(Generation).where(
         Download.id == download_id,
         Generation.user_id == current_user.id,
-    ).first()
+    ))).first()
 
     if not download:
         raise HTTPException(
@@ -222,12 +264,15 @@ async def delete_download(
             detail="Download not found",
         )
 
-    # Delete file
-    if download.file_path and Path(download.file_path).exists():
+    # Release the shared artifact; garbage collection removes the file once
+    # no other download references it
+    if download.artifact_hash:
+        await db.run_sync(get_artifact_store().release, download.artifact_hash)
+    elif download.file_path and Path(download.file_path).exists():
         Path(download.file_path).unlink()
 
-    db.delete(download)
-    db.commit()
+    await db.delete(download)
+    await db.commit()
 
     return {"status": "deleted"}
 
@@ -242,6 +287,7 @@ async def generate_download_file(
     """Generate download file in background."""
     from backend.db.base import SessionLocal
 
+    report = ProgressReporter(download_id)
     db = SessionLocal()
     try:
         download = db.query(Download).filter(Download.id == download_id).first()
@@ -256,40 +302,43 @@ async def generate_download_file(
         else:
             dsl = generation.dsl
 
-        # Generate file
+        # Render, or reuse the file from an identical earlier render
         try:
-            file_path = DOWNLOAD_DIR / f"{download_id}.{format}"
-
-            if format == "pptx":
-                from backend.renderer import render_to_pptx
-                render_to_pptx(dsl, str(file_path))
-
-            elif format == "svg":
-                # SVG rendering
-                svg_content = render_to_svg(dsl)
-                file_path.write_text(svg_content)
-
-            elif format == "png":
-                # PNG rendering (would require additional libraries)
-                raise NotImplementedError("PNG export not yet implemented")
-
-            elif format == "pdf":
-                # PDF rendering (would require additional libraries)
-                raise NotImplementedError("PDF export not yet implemented")
-
-            # Update download record
-            download.file_path = str(file_path)
-            download.file_size = file_path.stat().st_size
+            get_artifact_store().attach(
+                db, download, dsl, partial(render_download, format=format),
+            )
             db.commit()
+            report("rendered")
 
         except Exception as e:
             # Log error but don't fail
             print(f"Error generating download: {e}")
+            report("failed", message=str(e))
 
     finally:
         db.close()
 
 
+def render_download(dsl: dict, file_path: Path, format: str) -> None:
+    """Render DSL to a file in the requested format."""
+    if format == "pptx":
+        from backend.renderer import render_to_pptx
+        render_to_pptx(dsl, str(file_path))
+
+    elif format == "svg":
+        # SVG rendering
+        svg_content = render_to_svg(dsl)
+        file_path.write_text(svg_content)
+
+    elif format == "png":
+        # PNG rendering (would require additional libraries)
+        raise NotImplementedError("PNG export not yet implemented")
+
+    elif format == "pdf":
+        # PDF rendering (would require additional libraries)
+        raise NotImplementedError("PDF export not yet implemented")
+
+
 def render_to_svg(dsl: dict) -> str:
     """Render DSL to SVG string."""
     # Simple SVG rendering for now
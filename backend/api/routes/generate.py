@@ -1,15 +1,32 @@
 """Generation routes."""
 
-from datetime import datetime
+import logging
+from pathlib import Path
 from typing import Any
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
-
-from backend.db.base import get_db
-from backend.db.models import Generation, GenerationStatus, User, UsageRecord
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from backend.db.base import get_async_db
+from backend.db.models import (
+    Generation,
+    GenerationBatch,
+    GenerationStatus,
+    OrganizationMember,
+    User,
+    UsageRecord,
+    generate_uuid,
+)
 from backend.api.dependencies import get_current_user, check_credits
+from backend.api.streaming import progress_event_response
+from backend.tasks.progress import ProgressReporter, make_event
+from backend.tasks.queue import get_task_queue
+
+logger = logging.getLogger("infographix.api")
 
 router = APIRouter()
 
@@ -54,18 +71,174 @@ class VariationsRequest(BaseModel):
     strategy: str = "diverse"
 
 
+class BatchGenerateItem(BaseModel):
+    """One prompt of a batch."""
+    prompt: str = Field(..., min_length=1, max_length=2000)
+    content: list[dict[str, str]] | None = None
+
+
+class BatchGenerateRequest(BaseModel):
+    """Request to generate many infographics with shared brand settings."""
+    items: list[BatchGenerateItem] = Field(..., min_length=1, max_length=100)
+    brand_colors: list[str] | None = None
+    brand_fonts: list[str] | None = None
+    formality: str = "professional"
+    combine_pptx: bool = False
+
+
+class BatchResult(BaseModel):
+    """Batch generation job with per-item results."""
+    id: str
+    status: str
+    item_count: int
+    completed_count: int
+    failed_count: int
+    items: list[GenerationResult]
+    pptx_url: str | None = None
+    processing_time_ms: int | None = None
+    created_at: str
+    completed_at: str | None = None
+    error_message: str | None = None
+
+
+def generation_result(generation: Generation) -> GenerationResult:
+    """Build the API representation of a generation."""
+    return GenerationResult(
+        id=generation.id,
+        status=generation.status.value,
+        archetype=generation.archetype,
+        archetype_confidence=generation.archetype_confidence,
+        dsl=generation.dsl,
+        style=generation.style,
+        variations=generation.variations,
+        processing_time_ms=generation.processing_time_ms,
+        created_at=generation.created_at.isoformat(),
+        completed_at=generation.completed_at.isoformat() if generation.completed_at else None,
+        error_message=generation.error_message,
+    )
+
+
+def batch_result(batch: GenerationBatch) -> BatchResult:
+    """Build the API representation of a batch."""
+    items = [generation_result(g) for g in batch.generations]
+    return BatchResult(
+        id=batch.id,
+        status=batch.status.value,
+        item_count=batch.item_count,
+        completed_count=sum(item.status == GenerationStatus.COMPLETED.value for item in items),
+        failed_count=sum(item.status == GenerationStatus.FAILED.value for item in items),
+        items=items,
+        pptx_url=f"/api/v1/generate/batch/{batch.id}/pptx" if batch.pptx_path else None,
+        processing_time_ms=batch.processing_time_ms,
+        created_at=batch.created_at.isoformat(),
+        completed_at=batch.completed_at.isoformat() if batch.completed_at else None,
+        error_message=batch.error_message,
+    )
+
+
+async def task_org(db: AsyncSession, user: User) -> str:
+    """Organization a user's tasks are scheduled under.
+
+    Users outside any organization are scheduled on their own.
+    """
+    org_id = await db.scalar(
+        select(OrganizationMember.organization_id)
+        .where(OrganizationMember.user_id == user.id)
+        .limit(1)
+    )
+    return org_id or f"user:{user.id}"
+
+
+async def enqueue_generation(
+    db: AsyncSession,
+    generation: Generation,
+    user: User,
+    task_name: str,
+    **kwargs,
+) -> None:
+    """Queue a generation for a worker.
+
+    The task is scheduled fairly against other tasks of the user's
+    organization, or of the user alone if they belong to none. If the
+    queue is unavailable the generation is marked failed and the credit
+    refunded.
+
+    Args:
+        db: Database session.
+        generation: Committed generation record.
+        user: User charged for the generation.
+        task_name: Registered task handler name.
+        **kwargs: Task arguments besides the generation ID.
+
+    Raises:
+        HTTPException: 503 if the task could not be queued.
+    """
+    org = await task_org(db, user)
+    try:
+        await get_task_queue().enqueue(
+            task_name, generation_id=generation.id, _org=org, **kwargs
+        )
+    except Exception as e:
+        logger.error(f"Queueing generation {generation.id} failed: {e}")
+        generation.status = GenerationStatus.FAILED
+        generation.error_message = "Generation queue unavailable"
+        user.credits_remaining += 1
+        await db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Generation queue unavailable, please retry",
+        )
+
+    ProgressReporter(generation.id)("queued")
+
+
+async def enqueue_batch(db: AsyncSession, batch: GenerationBatch, user: User) -> None:
+    """Queue a batch for a worker.
+
+    If the queue is unavailable the batch and its items are marked failed
+    and the credits refunded.
+
+    Args:
+        db: Database session.
+        batch: Committed batch record.
+        user: User charged for the batch.
+
+    Raises:
+        HTTPException: 503 if the task could not be queued.
+    """
+    org = await task_org(db, user)
+    try:
+        await get_task_queue().enqueue(
+            "process_generation_batch", batch_id=batch.id, _org=org
+        )
+    except Exception as e:
+        logger.error(f"Queueing batch {batch.id} failed: {e}")
+        batch.status = GenerationStatus.FAILED
+        batch.error_message = "Generation queue unavailable"
+        for generation in batch.generations:
+            generation.status = GenerationStatus.FAILED
+            generation.error_message = batch.error_message
+        user.credits_remaining += batch.item_count
+        await db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Generation queue unavailable, please retry",
+        )
+
+    ProgressReporter(batch.id)("queued")
+
+
 @router.post("", response_model=GenerateResponse)
 async def create_generation(
     request: GenerateRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
     _credits: None = Depends(check_credits),
 ):
     """Create a new generation job.
 
-    This queues the generation for background processing.
-    Poll the status endpoint to check progress.
+    This queues the generation for a worker to process.
+    Subscribe to the events endpoint to follow progress.
     """
     # Create generation record
     generation = Generation(
@@ -90,13 +263,13 @@ async def create_generation(
     # Deduct credits
     current_user.credits_remaining -= 1
 
-    db.commit()
-    db.refresh(generation)
+    await db.commit()
 
-    # Queue background processing
-    background_tasks.add_task(
-        process_generation,
-        generation_id=generation.id,
+    await enqueue_generation(
+        db,
+        generation,
+        current_user,
+        "process_generation",
         prompt=request.prompt,
         content=request.content,
         brand_colors=request.brand_colors,
@@ -111,17 +284,164 @@ async def create_generation(
     )
 
 
+@router.post("/batch", response_model=BatchResult)
+async def create_generation_batch(
+    request: BatchGenerateRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+    _credits: None = Depends(check_credits),
+):
+    """Create a batch of generations sharing brand settings.
+
+    Costs one credit per item. The whole batch is one job for a worker,
+    which runs every prompt through one batched inference pass and, if
+    ``combine_pptx`` is set, renders the completed items as one deck.
+    """
+    count = len(request.items)
+    if current_user.credits_remaining < count:
+        raise HTTPException(
+            status_code=status.HTTP_402_PAYMENT_REQUIRED,
+            detail=f"Batch needs {count} credits, {current_user.credits_remaining} remaining.",
+        )
+
+    batch = GenerationBatch(
+        user_id=current_user.id,
+        brand_colors=request.brand_colors,
+        brand_fonts=request.brand_fonts,
+        formality=request.formality,
+        combine_pptx=request.combine_pptx,
+        status=GenerationStatus.PENDING,
+        item_count=count,
+        generations=[
+            Generation(
+                id=generate_uuid(),
+                user_id=current_user.id,
+                prompt=item.prompt,
+                content=item.content,
+                brand_colors=request.brand_colors,
+                brand_fonts=request.brand_fonts,
+                status=GenerationStatus.PENDING,
+                batch_index=index,
+            )
+            for index, item in enumerate(request.items)
+        ],
+    )
+    db.add(batch)
+    await db.flush()
+
+    # Record usage in one multi-row insert
+    await db.execute(insert(UsageRecord), [
+        {
+            "user_id": current_user.id,
+            "action": "generate",
+            "credits_used": 1,
+            "generation_id": generation.id,
+            "extra_data": {"batch_id": batch.id},
+        }
+        for generation in batch.generations
+    ])
+
+    current_user.credits_remaining -= count
+
+    await db.commit()
+
+    await enqueue_batch(db, batch, current_user)
+
+    return batch_result(batch)
+
+
+async def _get_batch(
+    db: AsyncSession,
+    batch_id: str,
+    user: User,
+    with_items: bool = False,
+) -> GenerationBatch:
+    """Get a user's batch, optionally with its items, or raise 404."""
+    query = select(GenerationBatch).where(
+        GenerationBatch.id == batch_id,
+        GenerationBatch.user_id == user.id,
+    )
+    if with_items:
+        query = query.options(selectinload(GenerationBatch.generations))
+    batch = (await db.scalars(query)).first()
+
+    if not batch:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Batch not found",
+        )
+    return batch
+
+
+@router.get("/batch/{batch_id}", response_model=BatchResult)
+async def get_generation_batch(
+    batch_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get batch status and per-item results."""
+    return batch_result(await _get_batch(db, batch_id, current_user, with_items=True))
+
+
+@router.get("/batch/{batch_id}/events")
+async def stream_batch_events(
+    batch_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Stream batch progress as server-sent events.
+
+    Emits queued, processing, deck (when rendering the combined PPTX) and
+    completed or failed.
+    """
+    batch = await _get_batch(db, batch_id, current_user)
+    stages = {
+        GenerationStatus.PENDING: "queued",
+        GenerationStatus.PROCESSING: "processing",
+        GenerationStatus.COMPLETED: "completed",
+        GenerationStatus.FAILED: "failed",
+    }
+    current = make_event(batch.id, stages[batch.status], message=batch.error_message)
+
+    # Release the connection instead of holding it for the whole stream
+    await db.close()
+
+    return progress_event_response(batch_id, current)
+
+
+@router.get("/batch/{batch_id}/pptx")
+async def download_batch_pptx(
+    batch_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Download the combined PPTX of a batch's completed items."""
+    batch = await _get_batch(db, batch_id, current_user)
+
+    if not batch.pptx_path or not Path(batch.pptx_path).exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Combined PPTX not available",
+        )
+
+    return FileResponse(
+        path=batch.pptx_path,
+        filename=f"infographix_batch_{batch.id[:8]}.pptx",
+        media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    )
+
+
 @router.get("/{generation_id}", response_model=GenerationResult)
 async def get_generation(
     generation_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get generation status and result."""
-    generation = db.query(Generation).filter(
+    generation = (await db.scalars(select(Generation).where(
         Generation.id == generation_id,
         Generation.user_id == current_user.id,
-    ).first()
+    ))).first()
 
     if not generation:
         raise HTTPException(
@@ -129,67 +449,82 @@ async def get_generation(
             detail="Generation not found",
         )
 
-    return GenerationResult(
-        id=generation.id,
-        status=generation.status.value,
-        archetype=generation.archetype,
-        archetype_confidence=generation.archetype_confidence,
-        dsl=generation.dsl,
-        style=generation.style,
-        variations=generation.variations,
-        processing_time_ms=generation.processing_time_ms,
-        created_at=generation.created_at.isoformat(),
-        completed_at=generation.completed_at.isoformat() if generation.completed_at else None,
-        error_message=generation.error_message,
+    return generation_result(generation)
+
+
+@router.get("/{generation_id}/events")
+async def stream_generation_events(
+    generation_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Stream generation progress as server-sent events.
+
+    Emits a ``progress`` event per stage (queued, processing, classified,
+    layout, styled, variations n/m, completed or failed) and closes after
+    the last one. The database is read once when the stream opens.
+    """
+    generation = (await db.scalars(select(Generation).where(
+        Generation.id == generation_id,
+        Generation.user_id == current_user.id,
+    ))).first()
+
+    if not generation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Generation not found",
+        )
+
+    stages = {
+        GenerationStatus.PENDING: "queued",
+        GenerationStatus.PROCESSING: "processing",
+        GenerationStatus.COMPLETED: "completed",
+        GenerationStatus.FAILED: "failed",
+    }
+    current = make_event(
+        generation.id,
+        stages[generation.status],
+        message=generation.error_message,
     )
 
+    # Release the connection instead of holding it for the whole stream
+    await db.close()
+
+    return progress_event_response(generation_id, current)
+
 
 @router.get("", response_model=list[GenerationResult])
 async def list_generations(
     limit: int = 20,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """List user's generations."""
-    generations = db.query(Generation).filter(
-        Generation.user_id == current_user.id,
-    ).order_by(
-        Generation.created_at.desc()
-    ).offset(offset).limit(limit).all()
-
-    return [
-        GenerationResult(
-            id=g.id,
-            status=g.status.value,
-            archetype=g.archetype,
-            archetype_confidence=g.archetype_confidence,
-            dsl=g.dsl,
-            style=g.style,
-            variations=g.variations,
-            processing_time_ms=g.processing_time_ms,
-            created_at=g.created_at.isoformat(),
-            completed_at=g.completed_at.isoformat() if g.completed_at else None,
-            error_message=g.error_message,
-        )
-        for g in generations
-    ]
+    generations = (await db.scalars(
+        select(Generation)
+        .where(Generation.user_id == current_user.id)
+        .order_by(Generation.created_at.desc())
+        .offset(offset)
+        .limit(limit)
+    )).all()
+
+    return [generation_result(g) for g in generations]
 
 
 @router.post("/variations", response_model=GenerateResponse)
 async def create_variations(
     request: VariationsRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
     _credits: None = Depends(check_credits),
 ):
     """Generate additional variations for an existing generation."""
     # Get original generation
-    original = db.query(Generation).filter(
+    original = (await db.scalars(select(Generation).where(
         Generation.id == request.generation_id,
         Generation.user_id == current_user.id,
-    ).first()
+    ))).first()
 
     if not original:
         raise HTTPException(
@@ -226,13 +561,13 @@ async def create_variations(
 
     current_user.credits_remaining -= 1
 
-    db.commit()
-    db.refresh(generation)
+    await db.commit()
 
-    # Queue processing
-    background_tasks.add_task(
-        process_variations,
-        generation_id=generation.id,
+    await enqueue_generation(
+        db,
+        generation,
+        current_user,
+        "process_variations",
         original_dsl=original.dsl,
         archetype=original.archetype,
         count=request.count,
@@ -249,14 +584,14 @@ async def create_variations(
 @router.delete("/{generation_id}")
 async def delete_generation(
     generation_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Delete a generation."""
-    generation = db.query(Generation).filter(
+    generation = (await db.scalars(select(Generation).where(
         Generation.id == generation_id,
         Generation.user_id == current_user.id,
-    ).first()
+    ))).first()
 
     if not generation:
         raise HTTPException(
@@ -264,136 +599,7 @@ async def delete_generation(
             detail="Generation not found",
         )
 
-    db.delete(generation)
-    db.commit()
+    await db.delete(generation)
+    await db.commit()
 
     return {"status": "deleted"}
-
-
-# Background task functions
-async def process_generation(
-    generation_id: str,
-    prompt: str,
-    content: list[dict] | None,
-    brand_colors: list[str] | None,
-    brand_fonts: list[str] | None,
-    formality: str,
-    num_variations: int,
-):
-    """Process generation in background."""
-    from backend.db.base import SessionLocal
-    from ml.inference import InferenceEngine
-
-    db = SessionLocal()
-    try:
-        generation = db.query(Generation).filter(Generation.id == generation_id).first()
-        if not generation:
-            return
-
-        start_time = datetime.utcnow()
-        generation.status = GenerationStatus.PROCESSING
-        db.commit()
-
-        try:
-            # Run inference with trained ML models
-            engine = InferenceEngine(
-                models_dir="ml/models",
-                use_ml=True,
-            )
-
-            result = engine.generate(
-                prompt=prompt,
-                content=content,
-                brand_colors=brand_colors,
-                brand_fonts=brand_fonts,
-                formality=formality,
-            )
-
-            # Generate variations if requested
-            variations = None
-            if num_variations > 1:
-                variation_results = engine.generate_variations(
-                    prompt=prompt,
-                    count=num_variations,
-                    content=content,
-                    brand_colors=brand_colors,
-                    brand_fonts=brand_fonts,
-                    formality=formality,
-                )
-                variations = [v.dsl for v in variation_results]
-
-            # Update generation record
-            end_time = datetime.utcnow()
-            generation.archetype = result.archetype
-            generation.archetype_confidence = result.classification_confidence
-            generation.dsl = result.dsl
-            generation.style = {
-                "color_palette": result.style.color_palette,
-                "font_family": result.style.font_family,
-                "corner_radius": result.style.corner_radius,
-                "shadow": result.style.shadow,
-                "glow": result.style.glow,
-            }
-            generation.variations = variations
-            generation.status = GenerationStatus.COMPLETED
-            generation.completed_at = end_time
-            generation.processing_time_ms = int((end_time - start_time).total_seconds() * 1000)
-
-        except Exception as e:
-            generation.status = GenerationStatus.FAILED
-            generation.error_message = str(e)
-
-        db.commit()
-
-    finally:
-        db.close()
-
-
-async def process_variations(
-    generation_id: str,
-    original_dsl: dict,
-    archetype: str,
-    count: int,
-    strategy: str,
-):
-    """Process variation generation in background."""
-    from backend.db.base import SessionLocal
-    from backend.creativity import VariationEngine
-
-    db = SessionLocal()
-    try:
-        generation = db.query(Generation).filter(Generation.id == generation_id).first()
-        if not generation:
-            return
-
-        start_time = datetime.utcnow()
-        generation.status = GenerationStatus.PROCESSING
-        db.commit()
-
-        try:
-            # Generate variations
-            engine = VariationEngine()
-            original_dsl["archetype"] = archetype
-
-            results = engine.generate_variations(
-                dsl=original_dsl,
-                count=count,
-                strategy=strategy,
-            )
-
-            # Update generation
-            end_time = datetime.utcnow()
-            generation.dsl = original_dsl
-            generation.variations = [r.dsl for r in results]
-            generation.status = GenerationStatus.COMPLETED
-            generation.completed_at = end_time
-            generation.processing_time_ms = int((end_time - start_time).total_seconds() * 1000)
-
-        except Exception as e:
-            generation.status = GenerationStatus.FAILED
-            generation.error_message = str(e)
-
-        db.commit()
-
-    finally:
-        db.close()
@@ -55,3 +55,11 @@ async def readiness_check(db: Session = Depends(get_db)):
         ready=ready,
         checks=checks,
     )
+
+
+@router.get("/metrics/cache")
+async def cache_metrics():
+    """Generation cache hit/miss counters per stage."""
+    from backend.db.generation_cache import get_generation_cache
+
+    return {"generation": get_generation_cache().stats()}
@@ -16,7 +16,7 @@ from backend.db.models import (
     MemberRole,
     PlanType,
 )
-from backend.api.dependencies import CurrentUser
+from backend.api.dependencies import SyncCurrentUser
 from backend.auth.tokens import generate_token, hash_token
 
 router = APIRouter()
@@ -161,7 +161,7 @@ def require_org_role(
 @router.post("", response_model=OrganizationResponse)
 async def create_organization(
     request: CreateOrganizationRequest,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Create a new organization."""
@@ -212,7 +212,7 @@ async def create_organization(
 
 @router.get("", response_model=list[OrganizationResponse])
 async def list_organizations(
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """List organizations the user belongs to."""
@@ -259,7 +259,7 @@ async def list_organizations(
 @router.get("/{org_id}", response_model=OrganizationResponse)
 async def get_organization(
     org_id: str,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Get organization details."""
@@ -288,7 +288,7 @@ async def get_organization(
 async def update_organization(
     org_id: str,
     request: UpdateOrganizationRequest,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Update organization details."""
@@ -328,7 +328,7 @@ async def update_organization(
 @router.delete("/{org_id}")
 async def delete_organization(
     org_id: str,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Delete an organization (owner only)."""
@@ -355,7 +355,7 @@ async def delete_organization(
 @router.get("/{org_id}/members", response_model=list[MemberResponse])
 async def list_members(
     org_id: str,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """List organization members."""
@@ -385,7 +385,7 @@ async def list_members(
 async def invite_member(
     org_id: str,
     request: InviteMemberRequest,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Invite a user to the organization."""
@@ -463,7 +463,7 @@ async def invite_member(
 @router.post("/invitations/accept")
 async def accept_invitation(
     token: str,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Accept an organization invitation."""
@@ -508,7 +508,7 @@ async def update_member_role(
     org_id: str,
     member_id: str,
     request: UpdateMemberRoleRequest,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Update a member's role."""
@@ -569,7 +569,7 @@ async def update_member_role(
 async def remove_member(
     org_id: str,
     member_id: str,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Remove a member from the organization."""
@@ -602,7 +602,7 @@ async def remove_member(
 @router.post("/{org_id}/leave")
 async def leave_organization(
     org_id: str,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Leave an organization."""
@@ -641,7 +641,7 @@ async def leave_organization(
 async def transfer_ownership(
     org_id: str,
     new_owner_id: str,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Transfer organization ownership to another member."""
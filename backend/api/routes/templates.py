@@ -4,9 +4,10 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.base import get_db
+from backend.db.base import get_async_db
 from backend.db.models import Template, User
 from backend.api.dependencies import get_current_user, require_pro
 
@@ -66,31 +67,33 @@ async def list_templates(
     include_public: bool = True,
     limit: int = 20,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """List available templates."""
-    query = db.query(Template)
+    query = select(Template)
 
     # Filter by ownership or public
     if include_public:
-        query = query.filter(
+        query = query.where(
             (Template.user_id == current_user.id) | (Template.is_public == True)
         )
     else:
-        query = query.filter(Template.user_id == current_user.id)
+        query = query.where(Template.user_id == current_user.id)
 
     # Apply filters
     if category:
-        query = query.filter(Template.category == category)
+        query = query.where(Template.category == category)
     if archetype:
-        query = query.filter(Template.archetype == archetype)
+        query = query.where(Template.archetype == archetype)
 
     # Get total count
-    total = query.count()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
 
     # Get paginated results
-    templates = query.order_by(Template.use_count.desc()).offset(offset).limit(limit).all()
+    templates = (await db.scalars(
+        query.order_by(Template.use_count.desc()).offset(offset).limit(limit)
+    )).all()
 
     return TemplateListResponse(
         templates=[
@@ -118,29 +121,29 @@ async def list_templates(
 
 @router.get("/categories")
 async def list_categories(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """List available template categories."""
-    categories = db.query(Template.category).filter(
+    categories = (await db.scalars(select(Template.category).where(
         (Template.user_id == current_user.id) | (Template.is_public == True),
         Template.category.isnot(None),
-    ).distinct().all()
+    ).distinct())).all()
 
-    return {"categories": [c[0] for c in categories if c[0]]}
+    return {"categories": [c for c in categories if c]}
 
 
 @router.get("/{template_id}", response_model=TemplateResponse)
 async def get_template(
     template_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get a specific template."""
-    template = db.query(Template).filter(
+    template = (await db.scalars(select(Template).where(
         Template.id == template_id,
         (Template.user_id == current_user.id) | (Template.is_public == True),
-    ).first()
+    ))).first()
 
     if not template:
         raise HTTPException(
@@ -167,7 +170,7 @@ async def get_template(
 @router.post("", response_model=TemplateResponse)
 async def create_template(
     request: TemplateCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
     _pro: None = Depends(require_pro),
 ):
@@ -183,8 +186,7 @@ async def create_template(
         is_public=request.is_public,
     )
     db.add(template)
-    db.commit()
-    db.refresh(template)
+    await db.commit()
 
     return TemplateResponse(
         id=template.id,
@@ -206,14 +208,14 @@ async def create_template(
 async def update_template(
     template_id: str,
     request: TemplateUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Update a template."""
-    template = db.query(Template).filter(
+    template = (await db.scalars(select(Template).where(
         Template.id == template_id,
         Template.user_id == current_user.id,
-    ).first()
+    ))).first()
 
     if not template:
         raise HTTPException(
@@ -237,8 +239,7 @@ async def update_template(
     if request.is_public is not None:
         template.is_public = request.is_public
 
-    db.commit()
-    db.refresh(template)
+    await db.commit()
 
     return TemplateResponse(
         id=template.id,
@@ -259,14 +260,14 @@ async def update_template(
 @router.delete("/{template_id}")
 async def delete_template(
     template_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Delete a template."""
-    template = db.query(Template).filter(
+    template = (await db.scalars(select(Template).where(
         Template.id == template_id,
         Template.user_id == current_user.id,
-    ).first()
+    ))).first()
 
     if not template:
         raise HTTPException(
@@ -274,8 +275,8 @@ async def delete_template(
             detail="Template not found",
         )
 
-    db.delete(template)
-    db.commit()
+    await db.delete(template)
+    await db.commit()
 
     return {"status": "deleted"}
 
@@ -285,7 +286,7 @@ async def import_template(
     file: UploadFile = File(...),
     name: str | None = None,
     category: str | None = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
     _pro: None = Depends(require_pro),
 ):
@@ -320,8 +321,7 @@ async def import_template(
             parameters=result.parameters,
         )
         db.add(template)
-        db.commit()
-        db.refresh(template)
+        await db.commit()
 
         return TemplateResponse(
             id=template.id,
@@ -348,14 +348,14 @@ async def import_template(
 @router.post("/{template_id}/use")
 async def use_template(
     template_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Record template usage and increment counter."""
-    template = db.query(Template).filter(
+    template = (await db.scalars(select(Template).where(
         Template.id == template_id,
         (Template.user_id == current_user.id) | (Template.is_public == True),
-    ).first()
+    ))).first()
 
     if not template:
         raise HTTPException(
@@ -364,6 +364,6 @@ async def use_template(
         )
 
     template.use_count += 1
-    db.commit()
+    await db.commit()
 
     return {"use_count": template.use_count}
@@ -15,7 +15,7 @@ from backend.db.models import (
     WebhookEndpoint as WebhookEndpointModel,
     WebhookDelivery as WebhookDeliveryModel,
 )
-from backend.api.dependencies import CurrentUser
+from backend.api.dependencies import SyncCurrentUser
 from backend.api.routes.organizations import require_org_role
 from backend.enterprise.webhooks import WebhookEvent
 
@@ -116,7 +116,7 @@ def delivery_to_response(delivery: WebhookDeliveryModel) -> WebhookDeliveryRespo
 @router.get("/{org_id}/webhooks", response_model=list[WebhookEndpointResponse])
 async def list_webhooks(
     org_id: str,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """List webhook endpoints for an organization."""
@@ -133,7 +133,7 @@ async def list_webhooks(
 async def get_webhook(
     org_id: str,
     webhook_id: str,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Get a specific webhook endpoint."""
@@ -157,7 +157,7 @@ async def get_webhook(
 async def create_webhook(
     org_id: str,
     request: CreateWebhookRequest,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """
@@ -203,7 +203,7 @@ async def update_webhook(
     org_id: str,
     webhook_id: str,
     request: UpdateWebhookRequest,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Update a webhook endpoint."""
@@ -245,7 +245,7 @@ async def update_webhook(
 async def delete_webhook(
     org_id: str,
     webhook_id: str,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """Delete a webhook endpoint."""
@@ -272,7 +272,7 @@ async def delete_webhook(
 async def rotate_webhook_secret(
     org_id: str,
     webhook_id: str,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """
@@ -310,7 +310,7 @@ async def rotate_webhook_secret(
 async def list_webhook_deliveries(
     org_id: str,
     webhook_id: str,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
     success: bool | None = None,
     limit: int = Query(50, ge=1, le=100),
@@ -348,7 +348,7 @@ async def list_webhook_deliveries(
 async def test_webhook(
     org_id: str,
     webhook_id: str,
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
     db: Session = Depends(get_db),
 ):
     """
@@ -427,7 +427,7 @@ async def test_webhook(
 
 @router.get("/webhook-events")
 async def list_webhook_events(
-    current_user: CurrentUser,
+    current_user: SyncCurrentUser,
 ):
     """List available webhook event types."""
     events = []
@@ -0,0 +1,73 @@
+"""Server-sent event responses for job progress."""
+
+import asyncio
+
+from fastapi.responses import StreamingResponse
+
+from backend.tasks.progress import ProgressBroker, ProgressEvent, get_progress_broker
+
+
+def format_sse(event: ProgressEvent) -> str:
+    """Format a progress event as a server-sent event."""
+    return f"id: {event.timestamp}\nevent: progress\ndata: {event.to_json()}\n\n"
+
+
+def progress_event_response(
+    job_id: str,
+    current: ProgressEvent,
+    broker: ProgressBroker | None = None,
+    heartbeat: float = 15.0,
+) -> StreamingResponse:
+    """Stream a job's progress events until it completes or fails.
+
+    Args:
+        job_id: Generation or download ID.
+        current: The job's state from the database, sent first when the
+            broker has no events for it (e.g. after a restart).
+        broker: Progress broker. Defaults to the process-wide broker.
+        heartbeat: Seconds between keep-alive comments while idle.
+
+    Returns:
+        ``text/event-stream`` response.
+    """
+    broker = broker or get_progress_broker()
+
+    async def events():
+        if current.is_terminal:
+            yield format_sse(current)
+            return
+        if await broker.latest(job_id) is None:
+            yield format_sse(current)
+
+        stream = broker.subscribe(job_id)
+        pending: asyncio.Future | None = None
+        try:
+            while True:
+                if pending is None:
+                    pending = asyncio.ensure_future(anext(stream))
+                done, _ = await asyncio.wait({pending}, timeout=heartbeat)
+                if not done:
+                    # Keep proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+
+                try:
+                    event = pending.result()
+                except StopAsyncIteration:
+                    return
+                pending = None
+                yield format_sse(event)
+                if event.is_terminal:
+                    return
+        finally:
+            if pending is not None:
+                pending.cancel()
+                # The generator can't be closed while the read is running
+                await asyncio.gather(pending, return_exceptions=True)
+            await stream.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
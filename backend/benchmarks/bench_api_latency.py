@@ -0,0 +1,251 @@
+"""Measure API latency while generations are running.
+
+Clients poll ``GET /generate/{id}`` while others keep creating generations
+with ``POST /generate``, under three ways of running the generations (and
+an ``idle`` baseline without them):
+
+- ``inline``: on the API's event loop, as the route's background tasks did
+  before they were moved to the queue.
+- ``thread``: in a thread of the API process (background tasks calling
+  the engine through ``asyncio.to_thread``).
+- ``worker``: handed to a separate worker process, as the route now does
+  through the task queue.
+
+Each generation runs the rules-based engine and then spins the CPU for
+``--generation-ms`` to stand in for model inference. The spin holds the
+GIL, which torch kernels partly release, so ``thread`` is a worst case.
+On a single CPU the worker process competes with the API for the core, so
+``worker`` only separates from ``thread`` when cores are available.
+
+Usage:
+    python -m backend.benchmarks.bench_api_latency --duration 5
+    python -m backend.benchmarks.bench_api_latency --generation-ms 200 --pollers 32
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.db.base import Base, get_db
+from backend.db.models import Generation, GenerationStatus, Session as UserSession, User
+
+logging.basicConfig(level=logging.INFO)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+def generate(prompt: str, generation_ms: float) -> None:
+    """One generation: the engine, then CPU work standing in for inference."""
+    from ml.inference import get_inference_engine
+
+    get_inference_engine(use_ml=False).generate(prompt)
+    deadline = time.perf_counter() + generation_ms / 1000
+    while time.perf_counter() < deadline:
+        pass
+
+
+def worker_main(tasks, ready, generation_ms: float) -> None:
+    """Separate worker process: run generations until a None arrives."""
+    generate("warm up", 0)
+    ready.set()
+    while (prompt := tasks.get()) is not None:
+        generate(prompt, generation_ms)
+
+
+class InlineQueue:
+    """Runs each generation on the API's event loop."""
+
+    def __init__(self, generation_ms: float):
+        self.generation_ms = generation_ms
+        self.running: set[asyncio.Task] = set()
+
+    async def _run(self, prompt: str) -> None:
+        generate(prompt, self.generation_ms)
+
+    async def enqueue(self, name: str, *args, **kwargs) -> str:
+        task = asyncio.get_running_loop().create_task(self._run(kwargs["prompt"]))
+        self.running.add(task)
+        task.add_done_callback(self.running.discard)
+        return name
+
+    async def close(self) -> None:
+        await asyncio.gather(*self.running)
+
+
+class NoQueue(InlineQueue):
+    """Drops generations, for latency without generation load."""
+
+    async def enqueue(self, name: str, *args, **kwargs) -> str:
+        return name
+
+
+class ThreadQueue(InlineQueue):
+    """Runs each generation in a thread of the API process."""
+
+    async def _run(self, prompt: str) -> None:
+        await asyncio.to_thread(generate, prompt, self.generation_ms)
+
+
+class ProcessQueue:
+    """Hands each generation to a separate worker process."""
+
+    def __init__(self, generation_ms: float):
+        context = multiprocessing.get_context("spawn")
+        self.tasks = context.Queue()
+        ready = context.Event()
+        self.process = context.Process(
+            target=worker_main, args=(self.tasks, ready, generation_ms)
+        )
+        self.process.start()
+        ready.wait()
+
+    async def enqueue(self, name: str, *args, **kwargs) -> str:
+        self.tasks.put(kwargs["prompt"])
+        return name
+
+    async def close(self) -> None:
+        self.tasks.put(None)
+        await asyncio.to_thread(self.process.join)
+
+
+def make_app(queue):
+    """Generation routes over an in-memory database, enqueueing to ``queue``."""
+    from fastapi import FastAPI
+
+    from backend.api.routes import generate as generate_routes
+    from backend.api.routes.auth import hash_token
+
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    user = User(email="bench@example.com", password_hash="x", credits_remaining=10**9)
+    db.add(user)
+    db.commit()
+    db.add(UserSession(
+        user_id=user.id,
+        token_hash=hash_token("bench"),
+        expires_at=datetime.utcnow() + timedelta(hours=1),
+    ))
+    existing = Generation(user_id=user.id, prompt="done", status=GenerationStatus.COMPLETED)
+    db.add(existing)
+    db.commit()
+
+    app = FastAPI()
+    app.include_router(generate_routes.router, prefix="/generate")
+
+    def override_get_db():
+        yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    generate_routes.get_task_queue = lambda: queue
+    return app, existing.id
+
+
+async def bench_mode(
+    mode: str,
+    duration: float,
+    pollers: int,
+    generators: int,
+    generation_ms: float,
+) -> dict:
+    """Poll and create latency while generations run in ``mode``."""
+    import httpx
+
+    queues = {
+        "idle": NoQueue,
+        "inline": InlineQueue,
+        "thread": ThreadQueue,
+        "worker": ProcessQueue,
+    }
+    queue = queues[mode](generation_ms)
+    app, generation_id = make_app(queue)
+    latencies: dict[str, list[float]] = defaultdict(list)
+    headers = {"Authorization": "Bearer bench"}
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        stop = time.perf_counter() + duration
+
+        async def request(kind: str, method: str, url: str, **kwargs) -> None:
+            start = time.perf_counter()
+            response = await client.request(method, url, headers=headers, **kwargs)
+            response.raise_for_status()
+            latencies[kind].append((time.perf_counter() - start) * 1000)
+
+        async def poller() -> None:
+            while time.perf_counter() < stop:
+                await request("poll", "GET", f"/generate/{generation_id}")
+                await asyncio.sleep(0.02)
+
+        async def generator() -> None:
+            while time.perf_counter() < stop:
+                await request("create", "POST", "/generate", json={"prompt": "4-stage funnel"})
+                await asyncio.sleep(generation_ms / 1000)
+
+        await asyncio.gather(
+            *(poller() for _ in range(pollers)),
+            *(generator() for _ in range(generators)),
+        )
+        await queue.close()
+
+    row = {"mode": mode}
+    for kind, samples in latencies.items():
+        samples.sort()
+        row[f"{kind}_p50_ms"] = samples[len(samples) // 2]
+        row[f"{kind}_p99_ms"] = samples[int(len(samples) * 0.99) - 1]
+        row[f"{kind}_count"] = len(samples)
+    logger.info(
+        "%-6s  poll p50 %7.1fms  p99 %7.1fms (%d)  create p50 %7.1fms  p99 %7.1fms (%d)",
+        mode,
+        row["poll_p50_ms"], row["poll_p99_ms"], row["poll_count"],
+        row["create_p50_ms"], row["create_p99_ms"], row["create_count"],
+    )
+    return row
+
+
+async def run(
+    duration: float,
+    pollers: int,
+    generators: int,
+    generation_ms: float,
+) -> list[dict]:
+    """Run each mode in turn."""
+    logger.info("%d CPUs available; the worker process shares them with the API", _cpu_count())
+    return [
+        await bench_mode(mode, duration, pollers, generators, generation_ms)
+        for mode in ("idle", "inline", "thread", "worker")
+    ]
+
+
+def _cpu_count() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="API latency under generation load")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per mode")
+    parser.add_argument("--pollers", type=int, default=8, help="Concurrent polling clients")
+    parser.add_argument("--generators", type=int, default=2, help="Clients creating generations")
+    parser.add_argument("--generation-ms", type=float, default=100.0, help="CPU time per generation")
+
+    args = parser.parse_args()
+
+    asyncio.run(run(args.duration, args.pollers, args.generators, args.generation_ms))
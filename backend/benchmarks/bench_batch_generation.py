@@ -0,0 +1,219 @@
+"""Benchmark batch generation against one request per prompt.
+
+Two measurements for ``N`` prompts:
+
+- Submission: ``N`` calls to ``POST /generate`` against one call to
+  ``POST /generate/batch``, counting the SQL statements and commits each
+  issues. The queue drops tasks, so only the API's own work is timed.
+- Inference: ``InferenceEngine.generate`` per prompt against one
+  ``generate_batch`` call. Intent classification and style recommendation
+  use randomly initialized torch models (a DistilBERT-sized encoder with a
+  toy tokenizer, and the style MLP), so no checkpoint or download is
+  needed; layouts come from templates in both cases.
+
+Usage:
+    python -m backend.benchmarks.bench_batch_generation --prompts 20 100
+    python -m backend.benchmarks.bench_batch_generation --prompts 20 --encoder-layers 2
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.db.base import Base, get_db
+from backend.db.models import Session as UserSession, User
+
+logging.basicConfig(level=logging.INFO)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+PROMPTS = [
+    "Create a 4-stage sales funnel",
+    "Show our product roadmap for 2025 as a timeline",
+    "Make a pyramid of needs with five levels",
+    "Compare plan A versus plan B, listing pros and cons for each option",
+    "Draw a hub and spoke diagram with our platform at the core",
+    "A 2x2 matrix of effort versus impact",
+    "Process flow for onboarding new enterprise customers in six steps",
+    "Continuous improvement cycle",
+]
+
+
+def prompts(count: int) -> list[str]:
+    """``count`` distinct prompts, so no result is served from a cache."""
+    return [f"{PROMPTS[i % len(PROMPTS)]} (slide {i + 1})" for i in range(count)]
+
+
+class DropQueue:
+    """Accepts tasks without running them."""
+
+    async def enqueue(self, name: str, *args, **kwargs) -> str:
+        return name
+
+
+def make_app(credits: int):
+    """Generation routes over an in-memory database, counting statements."""
+    from fastapi import FastAPI
+
+    from backend.api.routes import generate as generate_routes
+    from backend.api.routes.auth import hash_token
+
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    user = User(email="bench@example.com", password_hash="x", credits_remaining=credits)
+    db.add(user)
+    db.commit()
+    db.add(UserSession(
+        user_id=user.id,
+        token_hash=hash_token("bench"),
+        expires_at=datetime.utcnow() + timedelta(hours=1),
+    ))
+    db.commit()
+
+    counts = {"statements": 0, "commits": 0}
+    event.listen(engine, "before_cursor_execute", lambda *args: counts.__setitem__(
+        "statements", counts["statements"] + 1
+    ))
+    event.listen(engine, "commit", lambda *args: counts.__setitem__("commits", counts["commits"] + 1))
+
+    app = FastAPI()
+    app.include_router(generate_routes.router, prefix="/generate")
+
+    def override_get_db():
+        yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    generate_routes.get_task_queue = DropQueue
+    return app, counts
+
+
+async def bench_submission(count: int) -> list[dict]:
+    """Time and database work to submit ``count`` prompts."""
+    import httpx
+
+    headers = {"Authorization": "Bearer bench"}
+    rows = []
+    for mode in ("single", "batch"):
+        app, counts = make_app(credits=count)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            counts.update(statements=0, commits=0)
+            start = time.perf_counter()
+            if mode == "single":
+                for prompt in prompts(count):
+                    response = await client.post("/generate", json={"prompt": prompt}, headers=headers)
+                    response.raise_for_status()
+            else:
+                response = await client.post(
+                    "/generate/batch",
+                    json={"items": [{"prompt": p} for p in prompts(count)]},
+                    headers=headers,
+                )
+                response.raise_for_status()
+            elapsed = time.perf_counter() - start
+
+        row = {"mode": mode, "prompts": count, "ms": elapsed * 1000, **counts}
+        logger.info(
+            "submit    %-6s %4d prompts  %8.1fms  %5d statements  %4d commits",
+            mode, count, row["ms"], row["statements"], row["commits"],
+        )
+        rows.append(row)
+    return rows
+
+
+class ToyTokenizer:
+    """Whitespace tokenizer standing in for the DistilBERT tokenizer."""
+
+    def __call__(self, texts, max_length, padding, truncation, return_tensors):
+        import torch
+
+        if isinstance(texts, str):
+            texts = [texts]
+        ids = [[hash(w) % 30000 + 100 for w in t.lower().split()][:max_length] for t in texts]
+        width = max(len(row) for row in ids) if padding == "longest" else max_length
+        input_ids = torch.zeros(len(ids), width, dtype=torch.long)
+        attention_mask = torch.zeros(len(ids), width, dtype=torch.long)
+        for i, row in enumerate(ids):
+            input_ids[i, :len(row)] = torch.tensor(row)
+            attention_mask[i, :len(row)] = 1
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+
+def build_engine(encoder_layers: int):
+    """Inference engine with random torch classification and style models."""
+    import torch
+    from transformers import DistilBertConfig, DistilBertModel
+
+    from ml.inference import InferenceEngine
+    from ml.models.intent_classifier.model import IntentClassifier
+    from ml.models.style_recommender.model import StyleRecommender
+
+    torch.manual_seed(0)
+    classifier = IntentClassifier()
+    classifier.encoder = DistilBertModel(DistilBertConfig(n_layers=encoder_layers))
+    classifier.tokenizer = ToyTokenizer()
+    classifier.classifier = torch.nn.Linear(classifier.encoder.config.dim, classifier.config.num_labels)
+    classifier._initialized = True
+    classifier.eval()
+
+    engine = InferenceEngine(use_ml=True)
+    engine.intent_classifier._model = classifier
+    style = engine.style_recommender
+    style._model = StyleRecommender().eval()
+    style.has_checkpoint = lambda: True
+    return engine
+
+
+def bench_inference(engine, count: int) -> list[dict]:
+    """Time to run ``count`` prompts through the pipeline."""
+    items = prompts(count)
+    rows = []
+    for mode in ("single", "batch"):
+        start = time.perf_counter()
+        if mode == "single":
+            results = [engine.generate(prompt) for prompt in items]
+        else:
+            results = engine.generate_batch(items)
+        elapsed = time.perf_counter() - start
+        assert len(results) == count
+
+        row = {"mode": mode, "prompts": count, "ms": elapsed * 1000}
+        logger.info(
+            "inference %-6s %4d prompts  %8.1fms  (%.1fms/prompt)",
+            mode, count, row["ms"], row["ms"] / count,
+        )
+        rows.append(row)
+    return rows
+
+
+async def run(counts: list[int], encoder_layers: int) -> dict:
+    """Run both measurements for each prompt count."""
+    submission = [row for count in counts for row in await bench_submission(count)]
+
+    engine = build_engine(encoder_layers)
+    bench_inference(engine, 4)  # Warm up
+    inference = [row for count in counts for row in bench_inference(engine, count)]
+    return {"submission": submission, "inference": inference}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark batch generation")
+    parser.add_argument("--prompts", type=int, nargs="+", default=[20, 100], help="Prompts per run")
+    parser.add_argument("--encoder-layers", type=int, default=6, help="DistilBERT encoder layers")
+
+    args = parser.parse_args()
+
+    asyncio.run(run(args.prompts, args.encoder_layers))
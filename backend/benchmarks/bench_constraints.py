@@ -0,0 +1,141 @@
+"""Benchmark the constraint pipeline on large scenes.
+
+Times ``ConstraintEngine.fix`` followed by ``ArchetypeRules.apply_rules``
+on scenes with ``n`` top-level shapes, a share of them groups with text
+children. Each size runs twice: with ``Shape.with_updates`` sharing
+unchanged sub-objects, and with it swapped for the previous
+``Shape(**shape.model_dump())`` rebuild, which dumps and re-validates every
+field including group children.
+
+Usage:
+    python -m backend.benchmarks.bench_constraints --shapes 10 100 1000
+"""
+
+import logging
+import random
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from backend.benchmarks.bench_pptx_writer import time_fn
+from backend.constraints import ArchetypeRules, ConstraintEngine
+from backend.dsl.schema import (
+    BoundingBox,
+    Effects,
+    Shadow,
+    Shape,
+    SlideMetadata,
+    SlideScene,
+    SolidFill,
+    Stroke,
+    TextContent,
+    TextRun,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _leaf(shape_id: str, rng: random.Random, x: int, y: int) -> Shape:
+    """Styled auto shape with a text label."""
+    return Shape(
+        id=shape_id,
+        type="autoShape",
+        auto_shape_type="roundRect",
+        bbox=BoundingBox(x=x, y=y, width=rng.randint(300000, 1500000), height=rng.randint(200000, 600000)),
+        fill=SolidFill(color="accent1"),
+        stroke=Stroke(color="#1E293B"),
+        effects=Effects(shadow=Shadow()),
+        text=TextContent(runs=[TextRun(text=f"Label {shape_id}", bold=True), TextRun(text=" detail")]),
+        metadata={"role": "item"},
+    )
+
+
+def make_scene(num_shapes: int, group_ratio: float = 0.2, seed: int = 0) -> SlideScene:
+    """Build a process-archetype scene with ``num_shapes`` top-level shapes."""
+    rng = random.Random(seed)
+    shapes = []
+    for i in range(num_shapes):
+        x = rng.randint(-200000, 11000000)
+        y = rng.randint(-200000, 6500000)
+        if rng.random() < group_ratio:
+            children = [_leaf(f"g{i}_{c}", rng, x + c * 100000, y) for c in range(8)]
+            shapes.append(Shape(
+                id=f"g{i}",
+                type="group",
+                z_index=rng.randint(0, 5),
+                bbox=BoundingBox(x=x, y=y, width=1800000, height=600000),
+                children=children,
+            ))
+        else:
+            shapes.append(_leaf(f"s{i}", rng, x, y).model_copy(update={"z_index": rng.randint(0, 5)}))
+    return SlideScene(shapes=shapes, metadata=SlideMetadata(archetype="process"))
+
+
+@contextmanager
+def rebuild_updates() -> Iterator[None]:
+    """Temporarily make ``Shape.with_updates`` dump and re-validate."""
+    original = Shape.with_updates
+
+    def with_updates(self: Shape, **changes: Any) -> Shape:
+        shape_dict = self.model_dump()
+        shape_dict.update(changes)
+        return Shape(**shape_dict)
+
+    Shape.with_updates = with_updates
+    try:
+        yield
+    finally:
+        Shape.with_updates = original
+
+
+def pipeline(scene: SlideScene) -> SlideScene:
+    """Constraint fixing followed by archetype rules."""
+    return ArchetypeRules.apply_rules(ConstraintEngine().fix(scene))
+
+
+def run(shape_counts: list[int], iterations: int, group_ratio: float) -> list[dict]:
+    """Run the benchmark for each shape count."""
+    rows = []
+    for num_shapes in shape_counts:
+        scene = make_scene(num_shapes, group_ratio)
+
+        shared = pipeline(scene)
+        with rebuild_updates():
+            rebuilt = pipeline(scene)
+            rebuild_p50, rebuild_p95 = time_fn(lambda: pipeline(scene), iterations)
+        assert shared.model_dump() == rebuilt.model_dump()
+
+        copy_p50, copy_p95 = time_fn(lambda: pipeline(scene), iterations)
+        logger.info(
+            "%5d shapes  dump+validate p50 %9.1fms p95 %9.1fms  "
+            "model_copy p50 %8.1fms p95 %8.1fms  speedup %5.1fx",
+            num_shapes, rebuild_p50, rebuild_p95, copy_p50, copy_p95, rebuild_p50 / copy_p50,
+        )
+        rows.append({
+            "shapes": num_shapes,
+            "rebuild_p50_ms": rebuild_p50,
+            "rebuild_p95_ms": rebuild_p95,
+            "copy_p50_ms": copy_p50,
+            "copy_p95_ms": copy_p95,
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the constraint pipeline")
+    parser.add_argument(
+        "--shapes",
+        type=int,
+        nargs="+",
+        default=[10, 100, 500, 1000],
+        help="Top-level shapes per scene",
+    )
+    parser.add_argument("--iterations", type=int, default=5, help="Timed runs per mode")
+    parser.add_argument("--group-ratio", type=float, default=0.2, help="Share of group shapes")
+
+    args = parser.parse_args()
+
+    run(args.shapes, args.iterations, args.group_ratio)
@@ -0,0 +1,333 @@
+"""Benchmark columnar NumPy geometry against per-shape Python loops.
+
+For slides with ``n`` shapes the benchmark times the scene-wide layout
+passes that now run on a ``SceneGeometry`` view:
+
+- ``ConstraintEngine._check_spacing``
+- ``SnappingConstraint.snap_shapes`` with grid, guide, canvas center and
+  canvas edge targets
+- ``OrientationVariation._arrange_radially``
+- ``ComponentDetector._is_circular_arrangement``
+
+Each one is compared with the per-shape loop it replaced (kept below as
+the reference) and the results are checked to agree: exactly for the EMU
+passes, to float rounding for the dict-based variation operator.
+``check_spacing`` is timed on a prebuilt view, as ``validate`` shares one
+view across checks; building the view is timed as its own row.
+
+``SpacingVariation._adjust_vertical_spacing`` stays a loop: each shape is
+placed below the previous one's new position, and solving that recurrence
+as a prefix scan (``columnar_vertical_spacing`` below) does not beat the
+loop once columns are read from and written back to the dicts. It is kept
+here so the comparison can be rerun.
+
+Usage:
+    python -m backend.benchmarks.bench_geometry --shapes 10 100 1000 5000
+"""
+
+import copy
+import logging
+import math
+import random
+from collections.abc import Iterator
+
+import numpy as np
+
+from backend.benchmarks.bench_pptx_writer import time_fn
+from backend.components.detector import ComponentDetector
+from backend.constraints import ConstraintEngine
+from backend.constraints.snapping import SnappingConstraint, SnapTarget, create_canvas_guides
+from backend.creativity.operators import OrientationVariation, SpacingVariation
+from backend.dsl.columnar import SceneGeometry
+from backend.dsl.schema import BoundingBox, Shape
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CANVAS_WIDTH = 12192000
+CANVAS_HEIGHT = 6858000
+
+
+def make_shapes(num_shapes: int, seed: int = 0) -> list[Shape]:
+    """Build ``num_shapes`` randomly placed shapes."""
+    rng = random.Random(seed)
+    return [
+        Shape(
+            id=f"s{i}",
+            type="autoShape",
+            bbox=BoundingBox(
+                x=rng.randint(0, CANVAS_WIDTH - 1500000),
+                y=rng.randint(0, CANVAS_HEIGHT - 800000),
+                width=rng.randint(100000, 1500000),
+                height=rng.randint(100000, 800000),
+            ),
+        )
+        for i in range(num_shapes)
+    ]
+
+
+def make_dicts(shapes: list[Shape]) -> list[dict]:
+    """DSL dicts for ``shapes``, stacked top to bottom as variation input."""
+    return [
+        {"id": s.id, "bbox": {"x": s.bbox.x, "y": i * 200, "width": s.bbox.width, "height": 150}}
+        for i, s in enumerate(shapes)
+    ]
+
+
+# Per-shape reference implementations
+
+def loop_check_spacing(shapes: list[Shape]) -> list[tuple[list[str], int]]:
+    """Spacing violations as (shape ids, suggested gap) pairs."""
+    if len(shapes) < 3:
+        return []
+    sorted_shapes = sorted(shapes, key=lambda s: s.bbox.y)
+    gaps = []
+    for i in range(len(sorted_shapes) - 1):
+        gap = sorted_shapes[i + 1].bbox.y - sorted_shapes[i].bbox.bottom
+        if gap > 0:
+            gaps.append(gap)
+    if len(gaps) < 2:
+        return []
+    avg_gap = sum(gaps) / len(gaps)
+    tolerance = avg_gap * 0.2
+    return [
+        ([sorted_shapes[i].id, sorted_shapes[i + 1].id], int(avg_gap))
+        for i, gap in enumerate(gaps)
+        if abs(gap - avg_gap) > tolerance
+    ]
+
+
+def loop_snap(constraint: SnappingConstraint, shape: Shape) -> Shape:
+    """Snap one shape, trying each target against its original position."""
+    bbox = shape.bbox
+    x, y, width, height = bbox.x, bbox.y, bbox.width, bbox.height
+    threshold = constraint.snap_threshold
+    best_x, best_y = x, y
+    for target in constraint.snap_targets:
+        sx, sy = x, y
+        if target == SnapTarget.GRID:
+            grid = constraint.grid_size
+            gx, gy = round(x / grid) * grid, round(y / grid) * grid
+            sx = gx if abs(x - gx) <= threshold else x
+            sy = gy if abs(y - gy) <= threshold else y
+            did_snap = sx != x or sy != y
+        elif target == SnapTarget.GUIDES:
+            did_snap = False
+            for guide in constraint.guides:
+                if guide.orientation == "vertical":
+                    candidates = [(x, 0), (x + width // 2, -width // 2)]
+                else:
+                    candidates = [(y, 0), (y + height // 2, -height // 2)]
+                for pos, offset in candidates:
+                    if abs(pos - guide.position) <= threshold:
+                        if guide.orientation == "vertical":
+                            sx = guide.position + offset
+                        else:
+                            sy = guide.position + offset
+                        did_snap = True
+                        break
+        elif target == SnapTarget.CANVAS_CENTER:
+            cx, cy = constraint.canvas_width // 2, constraint.canvas_height // 2
+            snap_x = abs(x + width // 2 - cx) <= threshold
+            snap_y = abs(y + height // 2 - cy) <= threshold
+            sx = cx - width // 2 if snap_x else x
+            sy = cy - height // 2 if snap_y else y
+            did_snap = snap_x or snap_y
+        else:
+            margin = 457200
+            did_snap = False
+            if abs(x - margin) <= threshold:
+                sx, did_snap = margin, True
+            if abs(x + width - (constraint.canvas_width - margin)) <= threshold:
+                sx, did_snap = constraint.canvas_width - margin - width, True
+            if abs(y - margin) <= threshold:
+                sy, did_snap = margin, True
+            if abs(y + height - (constraint.canvas_height - margin)) <= threshold:
+                sy, did_snap = constraint.canvas_height - margin - height, True
+        if did_snap:
+            best_x, best_y = sx, sy
+    if best_x == x and best_y == y:
+        return shape
+    return shape.with_updates(bbox=BoundingBox(x=best_x, y=best_y, width=width, height=height))
+
+
+def columnar_vertical_spacing(shapes: list[dict], multiplier: float) -> None:
+    """Scale vertical gaps as a linear recurrence over a columnar view.
+
+    ``new[i] = (1 - m) * (new[i - 1] + height[i - 1]) + m * y[i]`` for shapes
+    whose predecessor has a bbox, solved as a Hillis-Steele prefix scan of
+    the affine steps in ``log2(n)`` vectorized passes.
+    """
+    if len(shapes) < 2:
+        return
+    geometry = SceneGeometry.from_dicts(shapes, fields=("y", "height"))
+    has_bbox = geometry.has_bbox
+    moved = np.zeros(len(shapes), dtype=bool)
+    moved[1:] = has_bbox[1:] & has_bbox[:-1]
+
+    prev_height = np.concatenate(([0.0], geometry.height[:-1]))
+    scale = np.where(moved, 1 - multiplier, 0.0)
+    offset = np.where(
+        moved, (1 - multiplier) * prev_height + multiplier * geometry.y, geometry.y
+    )
+    step = 1
+    while step < len(offset):
+        offset[step:] = scale[step:] * offset[:-step] + offset[step:]
+        scale[step:] = scale[step:] * scale[:-step]
+        step *= 2
+    geometry.y = offset
+    geometry.to_dicts(rows=moved, fields=("y",))
+
+
+def loop_arrange_radially(shapes: list[dict]) -> None:
+    """Place shapes evenly around a circle, starting from the top."""
+    n = len(shapes)
+    all_w = [s["bbox"].get("width", 100) for s in shapes]
+    all_h = [s["bbox"].get("height", 50) for s in shapes]
+    center_x = sum(s["bbox"].get("x", 0) for s in shapes) / n + sum(all_w) / (2 * n)
+    center_y = sum(s["bbox"].get("y", 0) for s in shapes) / n + sum(all_h) / (2 * n)
+    radius = max(max(all_w), max(all_h)) * 1.5
+    for i, shape in enumerate(shapes):
+        angle = (2 * math.pi * i / n) - math.pi / 2
+        shape["bbox"]["x"] = center_x + radius * math.cos(angle) - all_w[i] / 2
+        shape["bbox"]["y"] = center_y + radius * math.sin(angle) - all_h[i] / 2
+
+
+def loop_is_circular(shapes: list[Shape]) -> bool:
+    """Whether shape centers lie at similar distances from their mean."""
+    center_x = sum(s.bbox.center_x for s in shapes) / len(shapes)
+    center_y = sum(s.bbox.center_y for s in shapes) / len(shapes)
+    distances = [
+        math.hypot(s.bbox.center_x - center_x, s.bbox.center_y - center_y) for s in shapes
+    ]
+    avg_dist = sum(distances) / len(distances)
+    variance = sum((d - avg_dist) ** 2 for d in distances) / len(distances)
+    return math.sqrt(variance) / avg_dist < 0.3 if avg_dist > 0 else False
+
+
+def _positions(shapes: list[dict]) -> list[float]:
+    return [v for s in shapes for v in (s["bbox"]["x"], s["bbox"]["y"])]
+
+
+def _fresh_copies(dicts: list[dict], iterations: int) -> Iterator[list[dict]]:
+    """Copies for one warm-up and ``iterations`` timed in-place runs."""
+    return iter([copy.deepcopy(dicts) for _ in range(iterations + 1)])
+
+
+def run(shape_counts: list[int], iterations: int) -> list[dict]:
+    """Run the benchmark for each shape count."""
+    engine = ConstraintEngine()
+    snapper = SnappingConstraint(
+        snap_threshold=200000,
+        guides=create_canvas_guides(),
+        snap_targets=[
+            SnapTarget.GRID,
+            SnapTarget.GUIDES,
+            SnapTarget.CANVAS_CENTER,
+            SnapTarget.CANVAS_EDGES,
+        ],
+    )
+    spacing = SpacingVariation()
+    orientation = OrientationVariation()
+    detector = ComponentDetector()
+
+    rows = []
+    for num_shapes in shape_counts:
+        shapes = make_shapes(num_shapes)
+        dicts = make_dicts(shapes)
+
+        violations = engine._check_spacing(shapes)
+        assert [(v.shape_ids, v.suggested_fix["gap"]) for v in violations] == (
+            loop_check_spacing(shapes)
+        )
+        assert [s.bbox for s in snapper.snap_shapes(shapes)] == [
+            loop_snap(snapper, s).bbox for s in shapes
+        ]
+        for vectorized, loop in (
+            (
+                lambda d: columnar_vertical_spacing(d, 1.3),
+                lambda d: spacing._adjust_vertical_spacing(d, 1.3),
+            ),
+            (orientation._arrange_radially, loop_arrange_radially),
+        ):
+            a, b = copy.deepcopy(dicts), copy.deepcopy(dicts)
+            vectorized(a)
+            loop(b)
+            assert all(
+                math.isclose(p, q, rel_tol=1e-9, abs_tol=1e-6)
+                for p, q in zip(_positions(a), _positions(b), strict=True)
+            )
+        assert detector._is_circular_arrangement(shapes) == loop_is_circular(shapes)
+
+        geometry = SceneGeometry.from_shapes(shapes)
+        # Variation operators mutate in place; each timed run gets fresh dicts
+        loop_copies = _fresh_copies(dicts, iterations)
+        numpy_copies = _fresh_copies(dicts, iterations)
+        loop_radial = _fresh_copies(dicts, iterations)
+        numpy_radial = _fresh_copies(dicts, iterations)
+        cases = (
+            (
+                "build_view",
+                lambda: [(s.bbox.x, s.bbox.y, s.bbox.width, s.bbox.height) for s in shapes],
+                lambda: SceneGeometry.from_shapes(shapes),
+            ),
+            (
+                "check_spacing",
+                lambda: loop_check_spacing(shapes),
+                lambda: engine._check_spacing(shapes, geometry),
+            ),
+            (
+                "snap_shapes",
+                lambda: [loop_snap(snapper, s) for s in shapes],
+                lambda: snapper.snap_shapes(shapes),
+            ),
+            (
+                "vertical_spacing",
+                lambda: spacing._adjust_vertical_spacing(next(loop_copies), 1.3),
+                lambda: columnar_vertical_spacing(next(numpy_copies), 1.3),
+            ),
+            (
+                "arrange_radially",
+                lambda: loop_arrange_radially(next(loop_radial)),
+                lambda: orientation._arrange_radially(next(numpy_radial)),
+            ),
+            (
+                "is_circular",
+                lambda: loop_is_circular(shapes),
+                lambda: detector._is_circular_arrangement(shapes),
+            ),
+        )
+        for name, loop, vectorized in cases:
+            loop_p50, _ = time_fn(loop, iterations)
+            numpy_p50, numpy_p95 = time_fn(vectorized, iterations)
+            logger.info(
+                "%5d shapes  %-17s loop p50 %8.2fms  numpy p50 %8.2fms p95 %8.2fms  "
+                "speedup %5.1fx",
+                num_shapes, name, loop_p50, numpy_p50, numpy_p95, loop_p50 / numpy_p50,
+            )
+            rows.append({
+                "shapes": num_shapes,
+                "pass": name,
+                "loop_p50_ms": loop_p50,
+                "numpy_p50_ms": numpy_p50,
+                "numpy_p95_ms": numpy_p95,
+            })
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark columnar scene geometry")
+    parser.add_argument(
+        "--shapes",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000, 5000],
+        help="Shapes per slide",
+    )
+    parser.add_argument("--iterations", type=int, default=5, help="Timed runs per pass")
+
+    args = parser.parse_args()
+
+    run(args.shapes, args.iterations)
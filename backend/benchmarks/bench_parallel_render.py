@@ -0,0 +1,72 @@
+"""Benchmark serial versus process-pool rendering of multi-slide decks.
+
+Each deck repeats a mixed-shape slide (see ``bench_pptx_writer.make_scene``)
+and is written by ``FastPPTXWriter`` in-process and by ``ParallelPPTXWriter``
+across ``--workers`` processes. The pool is warmed up before timing, so the
+figures exclude worker start-up but include pickling scenes out and slide
+parts back. Speedup is bounded by the core count of the machine.
+
+Usage:
+    python -m backend.benchmarks.bench_parallel_render --slides 10 100 500 --workers 4
+"""
+
+import logging
+
+from backend.benchmarks.bench_pptx_writer import make_scene, time_fn
+from backend.renderer import FastPPTXWriter, ParallelPPTXWriter, shutdown_render_pool
+from backend.renderer.parallel import default_workers
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def run(slide_counts: list[int], shapes: int, workers: int, iterations: int) -> list[dict]:
+    """Run the benchmark for each deck size."""
+    rows = []
+    scene = make_scene(shapes)
+    serial = FastPPTXWriter()
+    parallel = ParallelPPTXWriter(workers=workers, min_parallel_slides=1)
+    try:
+        for num_slides in slide_counts:
+            scenes = [scene] * num_slides
+            assert parallel.write(scenes) == serial.write(scenes)
+
+            serial_p50, serial_p95 = time_fn(lambda: serial.write(scenes), iterations)
+            parallel_p50, parallel_p95 = time_fn(lambda: parallel.write(scenes), iterations)
+            logger.info(
+                "%4d slides  serial p50 %8.1fms p95 %8.1fms  "
+                "parallel(%d) p50 %8.1fms p95 %8.1fms  speedup %.2fx",
+                num_slides, serial_p50, serial_p95,
+                workers, parallel_p50, parallel_p95, serial_p50 / parallel_p50,
+            )
+            rows.append({
+                "slides": num_slides,
+                "workers": workers,
+                "serial_p50_ms": serial_p50,
+                "serial_p95_ms": serial_p95,
+                "parallel_p50_ms": parallel_p50,
+                "parallel_p95_ms": parallel_p95,
+            })
+    finally:
+        shutdown_render_pool()
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark parallel deck rendering")
+    parser.add_argument(
+        "--slides",
+        type=int,
+        nargs="+",
+        default=[10, 100, 500],
+        help="Slides per deck",
+    )
+    parser.add_argument("--shapes", type=int, default=50, help="Shapes per slide")
+    parser.add_argument("--workers", type=int, default=default_workers(), help="Pool size")
+    parser.add_argument("--iterations", type=int, default=3, help="Timed runs per writer")
+
+    args = parser.parse_args()
+
+    run(args.slides, args.shapes, args.workers, args.iterations)
@@ -0,0 +1,158 @@
+"""Benchmark the template-based FastPPTXWriter against PPTXWriter.
+
+Each run renders decks whose slides carry a mix of auto shapes with text,
+text boxes, connectors and freeform paths, and reports per-slide render time
+and peak Python heap (tracemalloc) for both writers. tracemalloc does not
+see lxml's C allocations, so the heap figure understates PPTXWriter, whose
+slides live as lxml trees until the package is saved.
+
+Usage:
+    python -m backend.benchmarks.bench_pptx_writer --shapes 10 100 1000
+"""
+
+import gc
+import logging
+import math
+import statistics
+import time
+import tracemalloc
+from typing import Callable
+
+from backend.dsl.schema import (
+    BoundingBox,
+    Effects,
+    PathCommand,
+    Shadow,
+    Shape,
+    SlideScene,
+    SolidFill,
+    Stroke,
+    TextContent,
+    TextRun,
+)
+from backend.renderer import FastPPTXWriter, PPTXWriter
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def make_scene(num_shapes: int) -> SlideScene:
+    """Build a slide with ``num_shapes`` shapes of mixed types."""
+    shapes = []
+    for i in range(num_shapes):
+        bbox = BoundingBox(
+            x=(i * 91440) % 11000000,
+            y=(i * 45720) % 6000000,
+            width=914400,
+            height=457200,
+        )
+        kind = i % 4
+        if kind == 0:
+            shapes.append(Shape(
+                id=f"s{i}",
+                type="autoShape",
+                auto_shape_type="roundRect",
+                z_index=i,
+                bbox=bbox,
+                fill=SolidFill(color="accent1"),
+                stroke=Stroke(color="#1E293B"),
+                effects=Effects(shadow=Shadow()),
+                text=TextContent(runs=[TextRun(text=f"Item {i}", bold=True)], alignment="center"),
+            ))
+        elif kind == 1:
+            shapes.append(Shape(
+                id=f"s{i}",
+                type="text",
+                z_index=i,
+                bbox=bbox,
+                text=TextContent(runs=[TextRun(text=f"Label {i}"), TextRun(text=" detail")]),
+            ))
+        elif kind == 2:
+            shapes.append(Shape(
+                id=f"s{i}",
+                type="connector",
+                z_index=i,
+                bbox=bbox,
+                stroke=Stroke(color="#64748B", width=9525),
+            ))
+        else:
+            shapes.append(Shape(
+                id=f"s{i}",
+                type="freeform",
+                z_index=i,
+                bbox=bbox,
+                fill=SolidFill(color="#0D9488"),
+                path=[
+                    PathCommand(type="moveTo", x=0, y=0),
+                    PathCommand(type="lineTo", x=914400, y=0),
+                    PathCommand(type="lineTo", x=457200, y=457200),
+                    PathCommand(type="close"),
+                ],
+            ))
+    return SlideScene(shapes=shapes)
+
+
+def time_fn(fn: Callable[[], object], iterations: int) -> tuple[float, float]:
+    """Return (median, p95) latency in ms."""
+    fn()  # warm-up
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    p95_index = min(len(samples) - 1, math.ceil(0.95 * len(samples)) - 1)
+    return statistics.median(samples), samples[p95_index]
+
+
+def peak_memory_mb(fn: Callable[[], object]) -> float:
+    """Peak traced Python heap while running fn, in MB."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1e6
+
+
+def run(shape_counts: list[int], slides: int, iterations: int) -> list[dict]:
+    """Run the benchmark for each shape count."""
+    rows = []
+    for num_shapes in shape_counts:
+        scenes = [make_scene(num_shapes)] * slides
+        for name, writer in (("python-pptx", PPTXWriter()), ("fast", FastPPTXWriter())):
+            p50, p95 = time_fn(lambda: writer.write(scenes), iterations)
+            peak = peak_memory_mb(lambda: writer.write(scenes))
+            logger.info(
+                "%5d shapes  %-12s per-slide p50 %8.2fms  p95 %8.2fms  peak heap %7.1fMB",
+                num_shapes, name, p50 / slides, p95 / slides, peak,
+            )
+            rows.append({
+                "shapes": num_shapes,
+                "writer": name,
+                "slide_p50_ms": p50 / slides,
+                "slide_p95_ms": p95 / slides,
+                "peak_mb": peak,
+            })
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark PPTX writers")
+    parser.add_argument(
+        "--shapes",
+        type=int,
+        nargs="+",
+        default=[10, 100, 500, 1000],
+        help="Shapes per slide",
+    )
+    parser.add_argument("--slides", type=int, default=5, help="Slides per deck")
+    parser.add_argument("--iterations", type=int, default=5, help="Timed runs per writer")
+
+    args = parser.parse_args()
+
+    run(args.shapes, args.slides, args.iterations)
@@ -0,0 +1,266 @@
+"""Load-test the rate limiters.
+
+Three measurements:
+
+- Per-check latency and memory: the previous list-of-timestamps limiter
+  (kept below as the reference), the in-memory token bucket, and the Redis
+  limiter, over many clients with one hot client near its limit.
+- Quota across workers: one client spread over ``--workers`` limiter
+  instances. Per-process limiters grant N times the quota; Redis grants it
+  once.
+- End to end: concurrent requests through ``RateLimitMiddleware`` on a
+  minimal app over ASGI, reporting throughput and latency percentiles.
+
+Without ``--redis-url`` the Redis limiter runs against fakeredis, which
+executes the same Lua script in process; its latency is not Redis latency.
+
+Usage:
+    python -m backend.benchmarks.bench_rate_limit --clients 100000
+    python -m backend.benchmarks.bench_rate_limit --redis-url redis://localhost:6379/0
+"""
+
+import asyncio
+import gc
+import logging
+import random
+import statistics
+import time
+import tracemalloc
+from collections import defaultdict
+
+from backend.api.middleware.rate_limit import (
+    InMemoryRateLimiter,
+    RateLimitConfig,
+    RateLimitMiddleware,
+    RateLimitPolicy,
+    RedisRateLimiter,
+)
+
+logging.basicConfig(level=logging.INFO)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+class ListRateLimiter:
+    """The previous limiter: a list of timestamps per key, rebuilt per request."""
+
+    def __init__(self, config: RateLimitConfig):
+        self.config = config
+        self._requests: dict[str, list[float]] = defaultdict(list)
+
+    def is_allowed(
+        self, key: str, cost: int = 1, policy: RateLimitPolicy | None = None  # noqa: ARG002
+    ) -> tuple[bool, dict]:
+        policy = policy or self.config.default_policy
+        now = time.time()
+        window_start = now - policy.window_size
+        timestamps = [t for t in self._requests[key] if t > window_start]
+        self._requests[key] = timestamps
+        limit = policy.requests_per_minute
+        reset = int(now + policy.window_size)
+        if len(timestamps) >= limit:
+            return False, {"limit": limit, "remaining": 0, "reset": reset, "retry_after": 1}
+        timestamps.append(now)
+        return True, {"limit": limit, "remaining": limit - len(timestamps), "reset": reset}
+
+    async def check(
+        self, key: str, cost: int = 1, policy: RateLimitPolicy | None = None
+    ) -> tuple[bool, dict]:
+        return self.is_allowed(key, cost, policy)
+
+
+def make_keys(num_clients: int, num_requests: int, hot_share: float, seed: int = 0) -> list[str]:
+    """Client keys for ``num_requests`` requests; ``hot_share`` go to one client."""
+    rng = random.Random(seed)
+    return [
+        "hot" if rng.random() < hot_share else f"10.{i % 256}.{i // 256 % 256}.{i // 65536}"
+        for i in (rng.randrange(num_clients) for _ in range(num_requests))
+    ]
+
+
+def _redis_client(redis_url: str | None):
+    """Redis client for the URL, or an in-process fakeredis."""
+    if redis_url:
+        import redis.asyncio as aioredis
+
+        return aioredis.from_url(redis_url)
+    import fakeredis
+
+    return fakeredis.aioredis.FakeRedis()
+
+
+async def bench_checks(
+    config: RateLimitConfig, keys: list[str], redis_url: str | None
+) -> list[dict]:
+    """Per-check latency and state memory for each limiter."""
+    limiters = {
+        "list": ListRateLimiter(config),
+        "memory": InMemoryRateLimiter(config),
+        "redis": RedisRateLimiter(config, client=_redis_client(redis_url)),
+    }
+    rows = []
+    for name, limiter in limiters.items():
+        gc.collect()
+        tracemalloc.start()
+        samples = []
+        allowed = 0
+        for key in keys:
+            start = time.perf_counter()
+            ok, _ = await limiter.check(key)
+            samples.append((time.perf_counter() - start) * 1e6)
+            allowed += ok
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        samples.sort()
+        row = {
+            "limiter": name,
+            "mean_us": statistics.fmean(samples),
+            "p99_us": samples[int(len(samples) * 0.99) - 1],
+            "peak_mb": peak / 1e6,
+            "allowed": allowed,
+        }
+        logger.info(
+            "checks   %-6s  mean %7.1fus  p99 %7.1fus  peak heap %7.1fMB  allowed %d/%d",
+            name, row["mean_us"], row["p99_us"], row["peak_mb"], allowed, len(keys),
+        )
+        rows.append(row)
+    return rows
+
+
+async def bench_workers(
+    config: RateLimitConfig, workers: int, requests: int, redis_url: str | None
+) -> list[dict]:
+    """Requests granted to one client spread over ``workers`` limiters."""
+    if redis_url:
+        client = _redis_client(redis_url)
+        await client.delete(f"{config.key_prefix}shared")
+        clients = [client] * workers
+    else:
+        import fakeredis
+
+        server = fakeredis.FakeServer()
+        clients = [fakeredis.aioredis.FakeRedis(server=server) for _ in range(workers)]
+
+    setups = {
+        "memory": [InMemoryRateLimiter(config) for _ in range(workers)],
+        "redis": [RedisRateLimiter(config, client=c) for c in clients],
+    }
+    rows = []
+    for name, limiters in setups.items():
+        granted = 0
+        for i in range(requests):
+            ok, _ = await limiters[i % workers].check("shared")
+            granted += ok
+        logger.info(
+            "workers  %-6s  %d workers  granted %d of %d requests (capacity %d)",
+            name, workers, granted, requests, config.capacity,
+        )
+        rows.append({"limiter": name, "workers": workers, "granted": granted})
+    return rows
+
+
+async def bench_middleware(
+    config: RateLimitConfig,
+    limiter_name: str,
+    keys: list[str],
+    concurrency: int,
+    redis_url: str | None,
+) -> dict:
+    """Throughput and latency of requests through the middleware."""
+    import httpx
+    from fastapi import FastAPI
+    from fastapi.responses import PlainTextResponse
+
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> PlainTextResponse:
+        return PlainTextResponse("ok")
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        config=config,
+        get_key=lambda request: request.headers["X-Client"],
+    )
+    # Build the middleware stack so the limiter can be swapped in
+    app.middleware_stack = app.build_middleware_stack()
+    middleware = app.middleware_stack
+    while not isinstance(middleware, RateLimitMiddleware):
+        middleware = middleware.app
+    if limiter_name == "list":
+        middleware.limiter = ListRateLimiter(config)
+    elif limiter_name == "memory":
+        middleware.limiter = InMemoryRateLimiter(config)
+    else:
+        middleware.limiter = RedisRateLimiter(config, client=_redis_client(redis_url))
+
+    latencies: list[float] = []
+    statuses: dict[int, int] = defaultdict(int)
+    queue = iter(keys)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker() -> None:
+            for key in queue:
+                start = time.perf_counter()
+                response = await client.get("/ping", headers={"X-Client": key})
+                latencies.append((time.perf_counter() - start) * 1000)
+                statuses[response.status_code] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    row = {
+        "limiter": limiter_name,
+        "rps": len(keys) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2],
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+        "rejected": statuses[429],
+    }
+    logger.info(
+        "http     %-6s  %7.0f req/s  p50 %6.2fms  p99 %6.2fms  429s %d/%d",
+        limiter_name, row["rps"], row["p50_ms"], row["p99_ms"], row["rejected"], len(keys),
+    )
+    return row
+
+
+async def run(
+    num_clients: int,
+    num_requests: int,
+    workers: int,
+    concurrency: int,
+    redis_url: str | None,
+) -> list[dict]:
+    """Run all measurements."""
+    # A high per-minute limit keeps the hot client's old timestamp list long
+    config = RateLimitConfig(requests_per_minute=1000, burst_size=100, requests_per_hour=20000)
+    keys = make_keys(num_clients, num_requests, hot_share=0.2)
+
+    rows = await bench_checks(config, keys, redis_url)
+    rows += await bench_workers(
+        RateLimitConfig(requests_per_minute=60, burst_size=10, requests_per_hour=1000),
+        workers,
+        requests=400,
+        redis_url=redis_url,
+    )
+    http_keys = keys[: min(len(keys), 20000)]
+    for name in ("list", "memory", "redis"):
+        rows.append(await bench_middleware(config, name, http_keys, concurrency, redis_url))
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load-test the rate limiters")
+    parser.add_argument("--clients", type=int, default=100000, help="Distinct client keys")
+    parser.add_argument("--requests", type=int, default=200000, help="Limiter checks")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes simulated")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent HTTP clients")
+    parser.add_argument("--redis-url", default=None, help="Real Redis instead of fakeredis")
+
+    args = parser.parse_args()
+
+    asyncio.run(run(args.clients, args.requests, args.workers, args.concurrency, args.redis_url))
@@ -0,0 +1,168 @@
+"""Benchmark indexed overlap checks and clustering against pairwise scans.
+
+Slides are filled with ``n`` randomly placed shapes whose size shrinks with
+``sqrt(n)``, so shape density (and the number of real overlaps per shape)
+stays roughly constant as decks grow, as with imported slides that carry
+many small icons and flattened group members. For each size the benchmark
+times ``ConstraintEngine._check_overlaps``, ``_fix_overlaps`` and
+``ShapeClusterer.cluster`` against the pairwise scans they replaced and
+checks the results are identical.
+
+Usage:
+    python -m backend.benchmarks.bench_spatial_index --shapes 10 100 1000 5000
+"""
+
+import logging
+import math
+import random
+
+from backend.benchmarks.bench_pptx_writer import time_fn
+from backend.components.llm_detector import ShapeClusterer
+from backend.constraints import ConstraintEngine
+from backend.dsl.schema import BoundingBox, Shape
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CANVAS_WIDTH = 12192000
+CANVAS_HEIGHT = 6858000
+
+
+def make_shapes(num_shapes: int, seed: int = 0) -> list[Shape]:
+    """Build ``num_shapes`` randomly placed shapes at constant density."""
+    rng = random.Random(seed)
+    size = int(CANVAS_WIDTH / math.sqrt(max(num_shapes, 1)))
+    return [
+        Shape(
+            id=f"s{i}",
+            type="autoShape",
+            z_index=rng.randint(0, 3),
+            bbox=BoundingBox(
+                x=rng.randint(0, CANVAS_WIDTH - size),
+                y=rng.randint(0, CANVAS_HEIGHT - size // 2),
+                width=rng.randint(size // 4, size),
+                height=rng.randint(size // 8, size // 2),
+            ),
+        )
+        for i in range(num_shapes)
+    ]
+
+
+def pairwise_overlaps(engine: ConstraintEngine, shapes: list[Shape]) -> list[list[str]]:
+    """Overlapping pairs found by scanning every pair."""
+    return [
+        [a.id, b.id]
+        for i, a in enumerate(shapes)
+        for b in shapes[i + 1:]
+        if engine._shapes_overlap(a.bbox, b.bbox)
+    ]
+
+
+def pairwise_fix(engine: ConstraintEngine, shapes: list[Shape]) -> list[Shape]:
+    """Overlap fixing by scanning every earlier shape."""
+    fixed = sorted(shapes, key=lambda s: s.z_index)
+    for i in range(1, len(fixed)):
+        for j in range(i):
+            if engine._shapes_overlap(fixed[i].bbox, fixed[j].bbox):
+                new_y = fixed[j].bbox.bottom + 91440
+                if new_y + fixed[i].bbox.height <= engine.canvas_height:
+                    bbox = fixed[i].bbox
+                    shape_dict = fixed[i].model_dump()
+                    shape_dict["bbox"] = BoundingBox(
+                        x=bbox.x, y=new_y, width=bbox.width, height=bbox.height
+                    )
+                    fixed[i] = Shape(**shape_dict)
+    return fixed
+
+
+def pairwise_clusters(clusterer: ShapeClusterer, shapes: list[Shape]) -> set[frozenset[str]]:
+    """Connected components over every close pair."""
+    threshold = math.hypot(CANVAS_WIDTH, CANVAS_HEIGHT) * clusterer.distance_threshold_ratio
+    groups = {i: {i} for i in range(len(shapes))}
+    for i in range(len(shapes)):
+        for j in range(i + 1, len(shapes)):
+            if groups[i] is not groups[j] and clusterer._shapes_are_close(
+                shapes[i], shapes[j], threshold
+            ):
+                merged = groups[i] | groups[j]
+                for k in merged:
+                    groups[k] = merged
+    return {frozenset(shapes[i].id for i in g) for g in groups.values()}
+
+
+def run(shape_counts: list[int], iterations: int, cluster_ratio: float) -> list[dict]:
+    """Run the benchmark for each shape count."""
+    engine = ConstraintEngine()
+    clusterer = ShapeClusterer(distance_threshold_ratio=cluster_ratio)
+    rows = []
+    for num_shapes in shape_counts:
+        shapes = make_shapes(num_shapes)
+
+        violations = engine._check_overlaps(shapes)
+        assert [v.shape_ids for v in violations] == pairwise_overlaps(engine, shapes)
+        assert [s.bbox for s in engine._fix_overlaps(shapes)] == [
+            s.bbox for s in pairwise_fix(engine, shapes)
+        ]
+        clusters = clusterer.cluster(shapes, CANVAS_WIDTH, CANVAS_HEIGHT)
+        assert {frozenset(c.shape_ids) for c in clusters} == pairwise_clusters(clusterer, shapes)
+
+        # The pairwise scans are quadratic; time them once at large sizes
+        baseline_iterations = iterations if num_shapes <= 1000 else 1
+        cases = (
+            (
+                "check_overlaps",
+                lambda: pairwise_overlaps(engine, shapes),
+                lambda: engine._check_overlaps(shapes),
+            ),
+            (
+                "fix_overlaps",
+                lambda: pairwise_fix(engine, shapes),
+                lambda: engine._fix_overlaps(shapes),
+            ),
+            (
+                "cluster",
+                lambda: pairwise_clusters(clusterer, shapes),
+                lambda: clusterer.cluster(shapes, CANVAS_WIDTH, CANVAS_HEIGHT),
+            ),
+        )
+        for name, baseline, indexed in cases:
+            base_p50, _ = time_fn(baseline, baseline_iterations)
+            index_p50, index_p95 = time_fn(indexed, iterations)
+            logger.info(
+                "%5d shapes  %-15s pairwise p50 %9.1fms  indexed p50 %8.2fms p95 %8.2fms  "
+                "speedup %6.1fx  (%d overlaps, %d clusters)",
+                num_shapes, name, base_p50, index_p50, index_p95,
+                base_p50 / index_p50, len(violations), len(clusters),
+            )
+            rows.append({
+                "shapes": num_shapes,
+                "check": name,
+                "pairwise_p50_ms": base_p50,
+                "indexed_p50_ms": index_p50,
+                "indexed_p95_ms": index_p95,
+            })
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark spatial index checks")
+    parser.add_argument(
+        "--shapes",
+        type=int,
+        nargs="+",
+        default=[10, 100, 500, 1000, 5000],
+        help="Shapes per slide",
+    )
+    parser.add_argument("--iterations", type=int, default=5, help="Timed runs per check")
+    parser.add_argument(
+        "--cluster-ratio",
+        type=float,
+        default=0.02,
+        help="ShapeClusterer distance threshold as a ratio of the canvas diagonal",
+    )
+
+    args = parser.parse_args()
+
+    run(args.shapes, args.iterations, args.cluster_ratio)
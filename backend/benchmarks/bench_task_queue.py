@@ -0,0 +1,307 @@
+"""Benchmark the task queue and worker.
+
+Four measurements:
+
+- Queue overhead: enqueue and run no-op tasks one at a time through the
+  previous ``BRPOP`` queue (kept below as the reference) and the reliable
+  queue, which costs a few more round trips per task.
+- Worker throughput: tasks that wait ``--task-ms`` (standing in for I/O and
+  threaded generation) through a ``Worker`` at several concurrency levels.
+- Reliability: a worker that dies holding tasks and a handler that fails
+  some first attempts. Every task should still complete, with permanent
+  failures in the dead-letter list.
+- Fairness: one organization dumps a backlog of tasks while another sends
+  a steady trickle of interactive ones, with all tasks in one queue
+  (``fifo``, as before lanes), in the interactive lane from separate
+  organizations (``orgs``), and with the backlog in the batch lane
+  (``lanes``). Reports how long the trickle's tasks wait.
+
+Without ``--redis-url`` the queue runs against fakeredis, which executes
+the same commands and Lua in process; its latency is not Redis latency.
+
+Usage:
+    python -m backend.benchmarks.bench_task_queue --tasks 2000
+    python -m backend.benchmarks.bench_task_queue --redis-url redis://localhost:6379/0
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+
+from backend.tasks.queue import RedisTaskQueue, RetryPolicy, Task, TaskStatus
+from backend.tasks.worker import Worker, WorkerSettings
+
+logging.basicConfig(level=logging.INFO)
+logging.getLogger("infographix.worker").setLevel(logging.CRITICAL)
+logger = logging.getLogger(__name__)
+
+
+class BrpopTaskQueue:
+    """The previous queue: BRPOP then run, with the task saved as one JSON value."""
+
+    def __init__(self, client, queue_name: str):
+        self._redis = client
+        self.queue_name = queue_name
+        self._handlers = {}
+
+    def register(self, name, handler) -> None:
+        self._handlers[name] = handler
+
+    async def enqueue(self, name: str, *args, **kwargs) -> str:
+        task = Task(id=str(uuid.uuid4()), name=name, args=args, kwargs=kwargs)
+        await self._save(task)
+        await self._redis.lpush(f"tasks:{self.queue_name}:queue", task.id)
+        return task.id
+
+    async def _save(self, task: Task) -> None:
+        await self._redis.set(
+            f"tasks:{self.queue_name}:task:{task.id}", json.dumps(task.to_dict()), ex=86400
+        )
+
+    async def process_one(self, timeout: int = 1) -> Task | None:
+        result = await self._redis.brpop(f"tasks:{self.queue_name}:queue", timeout=timeout)
+        if not result:
+            return None
+        data = await self._redis.get(f"tasks:{self.queue_name}:task:{result[1]}")
+        task = Task.from_dict(json.loads(data))
+        task.status = TaskStatus.PROCESSING
+        await self._save(task)
+        task.result = await self._handlers[task.name](*task.args, **task.kwargs)
+        task.status = TaskStatus.COMPLETED
+        await self._save(task)
+        return task
+
+
+def _client_factory(redis_url: str | None):
+    """Factory for clients of one Redis, or of one in-process fakeredis."""
+    if redis_url:
+        import redis.asyncio as aioredis
+
+        return lambda: aioredis.from_url(redis_url, decode_responses=True)
+    import fakeredis
+
+    server = fakeredis.FakeServer()
+    return lambda: fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+
+
+def _queue(clients, name: str, **options) -> RedisTaskQueue:
+    return RedisTaskQueue(queue_name=f"bench-{name}-{uuid.uuid4().hex[:8]}", client=clients(), **options)
+
+
+async def noop() -> None:
+    return None
+
+
+async def bench_overhead(clients, num_tasks: int) -> list[dict]:
+    """Per-task cost of enqueueing and running no-op tasks serially."""
+    queues = {
+        "brpop": BrpopTaskQueue(clients(), f"bench-brpop-{uuid.uuid4().hex[:8]}"),
+        "reliable": _queue(clients, "overhead"),
+    }
+    rows = []
+    for name, queue in queues.items():
+        queue.register("noop", noop)
+        start = time.perf_counter()
+        for _ in range(num_tasks):
+            await queue.enqueue("noop")
+        enqueued = time.perf_counter()
+        for _ in range(num_tasks):
+            await queue.process_one(timeout=1)
+        done = time.perf_counter()
+        row = {
+            "queue": name,
+            "enqueue_us": (enqueued - start) / num_tasks * 1e6,
+            "process_us": (done - enqueued) / num_tasks * 1e6,
+        }
+        logger.info(
+            "overhead %-8s  enqueue %7.1fus/task  reserve+run+ack %7.1fus/task",
+            name, row["enqueue_us"], row["process_us"],
+        )
+        rows.append(row)
+    return rows
+
+
+async def _drain(worker: Worker, num_tasks: int) -> float:
+    """Run a worker until it has processed ``num_tasks``; returns seconds."""
+    worker.settings.max_jobs = num_tasks
+    start = time.perf_counter()
+    await worker.run()
+    return time.perf_counter() - start
+
+
+async def bench_throughput(
+    clients, num_tasks: int, task_ms: float, levels: list[int]
+) -> list[dict]:
+    """Tasks per second through a worker at each concurrency level."""
+
+    async def wait() -> None:
+        await asyncio.sleep(task_ms / 1000)
+
+    rows = []
+    for concurrency in levels:
+        queue = _queue(clients, f"c{concurrency}")
+        queue.register("wait", wait)
+        for _ in range(num_tasks):
+            await queue.enqueue("wait")
+
+        worker = Worker(
+            WorkerSettings(concurrency=concurrency, poll_delay=0.1, warm_up_models=False),
+            queue=queue,
+        )
+        elapsed = await _drain(worker, num_tasks)
+        row = {
+            "concurrency": concurrency,
+            "tasks_per_s": num_tasks / elapsed,
+            "processed": worker._jobs_processed,
+        }
+        logger.info(
+            "worker   concurrency %3d  %7.1f tasks/s  (%d x %.0fms tasks, ideal %7.1f/s)",
+            concurrency, row["tasks_per_s"], num_tasks, task_ms, concurrency * 1000 / task_ms,
+        )
+        rows.append(row)
+    return rows
+
+
+async def bench_reliability(clients, num_tasks: int) -> dict:
+    """Completion after a worker crash and transient handler failures."""
+    name = f"bench-reliability-{uuid.uuid4().hex[:8]}"
+    options = {
+        "visibility_timeout": 0.5,
+        "retry": RetryPolicy(max_retries=2, backoff_base=0.05),
+        "requeue_interval": 0.05,
+    }
+    attempts: dict[int, int] = {}
+
+    async def flaky(n: int) -> int:
+        attempts[n] = attempts.get(n, 0) + 1
+        if n % 50 == 0:
+            raise RuntimeError("permanent failure")
+        if n % 5 == 0 and attempts[n] == 1:
+            raise RuntimeError("transient failure")
+        return n
+
+    crashed = RedisTaskQueue(queue_name=name, client=clients(), **options)
+    survivor = RedisTaskQueue(queue_name=name, client=clients(), **options)
+    survivor.register("flaky", flaky)
+    ids = [await survivor.enqueue("flaky", n) for n in range(1, num_tasks + 1)]
+
+    # A worker reserves tasks and dies without acknowledging them
+    held = [await crashed.reserve(timeout=0) for _ in range(20)]
+
+    start = time.perf_counter()
+    worker = Worker(
+        WorkerSettings(concurrency=8, poll_delay=0.05, warm_up_models=False), queue=survivor
+    )
+    runner = asyncio.create_task(worker.run())
+    while True:
+        stats = await survivor.stats()
+        if not any(stats[k] for k in ("pending", "processing", "delayed")):
+            break
+        await asyncio.sleep(0.05)
+    worker._running = False
+    await runner
+    elapsed = time.perf_counter() - start
+
+    survivor._redis = clients()
+    tasks = [await survivor.get_task(task_id) for task_id in ids]
+    completed = sum(t.status == TaskStatus.COMPLETED for t in tasks)
+    dead = len(await survivor.dead_letters(limit=num_tasks))
+    row = {
+        "tasks": num_tasks,
+        "held_by_crashed_worker": len([t for t in held if t]),
+        "completed": completed,
+        "dead_lettered": dead,
+        "lost": num_tasks - completed - dead,
+        "seconds": elapsed,
+    }
+    logger.info(
+        "recovery %d tasks, %d held by a crashed worker: completed %d, dead-lettered %d, "
+        "lost %d in %.2fs",
+        num_tasks, row["held_by_crashed_worker"], completed, dead, row["lost"], elapsed,
+    )
+    return row
+
+
+async def bench_fairness(clients, backlog: int, task_ms: float) -> list[dict]:
+    """Wait time of interactive tasks queued behind another organization's backlog."""
+    trickle = 50
+    placements = {
+        "fifo": ({}, {}),
+        "orgs": ({"_org": "bulk"}, {"_org": "app"}),
+        "lanes": ({"_org": "bulk", "_lane": "batch"}, {"_org": "app"}),
+    }
+
+    async def work(queued_at: float | None = None) -> None:
+        if queued_at is not None:
+            waits.append(time.time() - queued_at)
+        await asyncio.sleep(task_ms / 1000)
+
+    rows = []
+    for mode, (bulk, app) in placements.items():
+        waits: list[float] = []
+        queue = _queue(clients, f"fair-{mode}", requeue_interval=0.05)
+        queue.register("work", work)
+        for _ in range(backlog):
+            await queue.enqueue("work", **bulk)
+
+        worker = Worker(
+            WorkerSettings(concurrency=4, poll_delay=0.05, shutdown_timeout=0, warm_up_models=False),
+            queue=queue,
+        )
+        runner = asyncio.create_task(worker.run())
+        for _ in range(trickle):
+            await queue.enqueue("work", time.time(), **app)
+            await asyncio.sleep(task_ms / 1000)
+        while len(waits) < trickle:
+            await asyncio.sleep(0.01)
+        worker._running = False
+        await runner
+
+        waits.sort()
+        row = {
+            "mode": mode,
+            "wait_p50_ms": waits[len(waits) // 2] * 1000,
+            "wait_p95_ms": waits[int(len(waits) * 0.95) - 1] * 1000,
+            "wait_max_ms": waits[-1] * 1000,
+        }
+        logger.info(
+            "fairness %-5s  interactive wait p50 %7.1fms  p95 %7.1fms  max %7.1fms  "
+            "(behind %d tasks)",
+            mode, row["wait_p50_ms"], row["wait_p95_ms"], row["wait_max_ms"], backlog,
+        )
+        rows.append(row)
+    return rows
+
+
+async def run(
+    num_tasks: int,
+    task_ms: float,
+    levels: list[int],
+    redis_url: str | None,
+) -> dict:
+    """Run all measurements."""
+    clients = _client_factory(redis_url)
+    return {
+        "overhead": await bench_overhead(clients, num_tasks),
+        "throughput": await bench_throughput(clients, min(num_tasks, 500), task_ms, levels),
+        "reliability": await bench_reliability(clients, min(num_tasks, 500)),
+        "fairness": await bench_fairness(clients, min(num_tasks, 500), task_ms),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the task queue")
+    parser.add_argument("--tasks", type=int, default=2000, help="Tasks per measurement")
+    parser.add_argument("--task-ms", type=float, default=20.0, help="Duration of each task")
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 4, 16], help="Worker concurrency levels"
+    )
+    parser.add_argument("--redis-url", default=None, help="Real Redis instead of fakeredis")
+
+    args = parser.parse_args()
+
+    asyncio.run(run(args.tasks, args.task_ms, args.concurrency, args.redis_url))
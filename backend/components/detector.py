@@ -4,6 +4,9 @@ import math
 from dataclasses import dataclass
 from typing import Any
 
+import numpy as np
+
+from backend.dsl.columnar import SceneGeometry
 from backend.dsl.schema import Shape, SlideScene
 
 
@@ -540,27 +543,27 @@ class ComponentDetector:
         if len(shapes) < 3:
             return False
 
+        geometry = SceneGeometry.from_shapes(shapes)
+        centers_x = geometry.center_x
+        centers_y = geometry.center_y
+
         # Calculate center point
-        center_x = sum(s.bbox.center_x for s in shapes) / len(shapes)
-        center_y = sum(s.bbox.center_y for s in shapes) / len(shapes)
+        center_x = int(centers_x.sum()) / len(shapes)
+        center_y = int(centers_y.sum()) / len(shapes)
 
         # Calculate distances from center
-        distances = []
-        for s in shapes:
-            dx = s.bbox.center_x - center_x
-            dy = s.bbox.center_y - center_y
-            distances.append(math.sqrt(dx * dx + dy * dy))
+        dx = centers_x - center_x
+        dy = centers_y - center_y
+        distances = np.sqrt(dx * dx + dy * dy)
 
         # Check if distances are similar (circular pattern)
-        if distances:
-            avg_dist = sum(distances) / len(distances)
-            variance = sum((d - avg_dist) ** 2 for d in distances) / len(distances)
-            std_dev = math.sqrt(variance)
-
-            # Low standard deviation relative to average = circular
-            return std_dev / avg_dist < 0.3 if avg_dist > 0 else False
+        avg_dist = float(distances.mean())
+        if avg_dist <= 0:
+            return False
+        std_dev = float(np.sqrt(((distances - avg_dist) ** 2).mean()))
 
-        return False
+        # Low standard deviation relative to average = circular
+        return std_dev / avg_dist < 0.3
 
     def _is_hub_spoke_pattern(self, shapes: list[Shape]) -> bool:
         """Check if shapes follow a hub and spoke pattern."""
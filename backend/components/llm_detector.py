@@ -6,6 +6,7 @@ from dataclasses import dataclass, field
 from typing import Any
 
 from backend.api.config import get_settings
+from backend.constraints.spatial import SpatialIndex, default_cell_size
 from backend.dsl.schema import Shape, SlideScene
 
 
@@ -92,10 +93,18 @@ class ShapeClusterer:
         clusters: list[set[int]] = [{i} for i in range(len(shapes))]
         shape_to_cluster: dict[int, int] = {i: i for i in range(len(shapes))}
 
-        # Merge clusters based on proximity
+        # Only shapes within the threshold of each other can merge; cells at
+        # least threshold-sized keep each query to a few cells
+        boxes = [shape.bbox for shape in shapes]
+        index = SpatialIndex.from_boxes(boxes, max(default_cell_size(boxes), int(threshold)))
+
+        # Merge clusters based on proximity, visiting pairs in scan order so
+        # clusters are built exactly as a full pairwise scan builds them
         for i, shape1 in enumerate(shapes):
-            for j, shape2 in enumerate(shapes[i + 1 :], start=i + 1):
-                if self._shapes_are_close(shape1, shape2, threshold):
+            for j in index.query(shape1.bbox, margin=threshold):
+                if j <= i or shape_to_cluster[i] == shape_to_cluster[j]:
+                    continue
+                if self._shapes_are_close(shape1, shapes[j], threshold):
                     # Merge clusters
                     cluster_i = shape_to_cluster[i]
                     cluster_j = shape_to_cluster[j]
@@ -11,6 +11,7 @@ from backend.constraints.snapping import (
     snap_to_grid,
     snap_to_guides,
 )
+from backend.constraints.spatial import SpatialIndex
 from backend.constraints.spacing import SpacingConstraint, SpacingType, apply_spacing, create_grid
 from backend.constraints.text_fitting import (
     OverflowAction,
@@ -36,6 +37,8 @@ __all__ = [
     "SpacingType",
     "apply_spacing",
     "create_grid",
+    # Spatial index
+    "SpatialIndex",
     # Snapping
     "Guide",
     "SnapTarget",
@@ -187,9 +187,7 @@ class AlignmentConstraint:
             width=shape.bbox.width,
             height=shape.bbox.height,
         )
-        shape_dict = shape.model_dump()
-        shape_dict["bbox"] = new_bbox
-        return Shape(**shape_dict)
+        return shape.with_updates(bbox=new_bbox)
 
     def _update_shape_y(self, shape: Shape, new_y: int) -> Shape:
         """Create a new shape with updated y position."""
@@ -202,9 +200,7 @@ class AlignmentConstraint:
             width=shape.bbox.width,
             height=shape.bbox.height,
         )
-        shape_dict = shape.model_dump()
-        shape_dict["bbox"] = new_bbox
-        return Shape(**shape_dict)
+        return shape.with_updates(bbox=new_bbox)
 
 
 def align_shapes(
@@ -266,8 +262,6 @@ def center_on_canvas(
             width=shape.bbox.width,
             height=shape.bbox.height,
         )
-        shape_dict = shape.model_dump()
-        shape_dict["bbox"] = new_bbox
-        fixed.append(Shape(**shape_dict))
+        fixed.append(shape.with_updates(bbox=new_bbox))
 
     return fixed
@@ -3,6 +3,10 @@
 from dataclasses import dataclass
 from typing import Callable
 
+import numpy as np
+
+from backend.constraints.spatial import SpatialIndex, default_cell_size
+from backend.dsl.columnar import SceneGeometry
 from backend.dsl.schema import BoundingBox, Shape, SlideScene
 
 
@@ -62,7 +66,8 @@ class ConstraintEngine:
         violations.extend(self._check_alignment(scene.shapes))
 
         # Check spacing
-        violations.extend(self._check_spacing(scene.shapes))
+        geometry = SceneGeometry.from_scene(scene)
+        violations.extend(self._check_spacing(scene.shapes, geometry))
 
         # Calculate score
         score = self._calculate_score(violations)
@@ -173,9 +178,15 @@ class ConstraintEngine:
             List of violations.
         """
         violations = []
+        index = SpatialIndex.from_boxes([shape.bbox for shape in shapes])
 
+        # Candidates come back in ascending order, so pairs are reported in
+        # the same order as a full pairwise scan
         for i, shape1 in enumerate(shapes):
-            for shape2 in shapes[i + 1:]:
+            for j in index.query(shape1.bbox):
+                if j <= i:
+                    continue
+                shape2 = shapes[j]
                 if self._shapes_overlap(shape1.bbox, shape2.bbox):
                     violations.append(
                         Violation(
@@ -222,11 +233,16 @@ class ConstraintEngine:
 
         return violations
 
-    def _check_spacing(self, shapes: list[Shape]) -> list[Violation]:
+    def _check_spacing(
+        self,
+        shapes: list[Shape],
+        geometry: SceneGeometry | None = None,
+    ) -> list[Violation]:
         """Check spacing consistency.
 
         Args:
             shapes: List of shapes to check.
+            geometry: Columnar view of ``shapes``, if already built.
 
         Returns:
             List of violations.
@@ -235,32 +251,31 @@ class ConstraintEngine:
 
         if len(shapes) < 3:
             return violations
+        if geometry is None:
+            geometry = SceneGeometry.from_shapes(shapes)
 
-        # Sort shapes by vertical position
-        sorted_shapes = sorted(shapes, key=lambda s: s.bbox.y)
+        # Sort shapes by vertical position (stable, like sorted())
+        order = np.argsort(geometry.y, kind="stable")
 
         # Check vertical spacing consistency
-        gaps = []
-        for i in range(len(sorted_shapes) - 1):
-            gap = sorted_shapes[i + 1].bbox.y - sorted_shapes[i].bbox.bottom
-            if gap > 0:
-                gaps.append(gap)
+        gaps = geometry.y[order][1:] - geometry.bottom[order][:-1]
+        gaps = gaps[gaps > 0]
 
         if len(gaps) >= 2:
-            avg_gap = sum(gaps) / len(gaps)
+            avg_gap = int(gaps.sum()) / len(gaps)
             tolerance = avg_gap * 0.2  # 20% tolerance
 
-            for i, gap in enumerate(gaps):
-                if abs(gap - avg_gap) > tolerance:
-                    violations.append(
-                        Violation(
-                            rule="spacing",
-                            message=f"Inconsistent vertical spacing between shapes",
-                            severity="info",
-                            shape_ids=[sorted_shapes[i].id, sorted_shapes[i + 1].id],
-                            suggested_fix={"gap": int(avg_gap)},
-                        )
+            # Gaps are indexed after dropping non-positive ones, as before
+            for i in np.flatnonzero(np.abs(gaps - avg_gap) > tolerance).tolist():
+                violations.append(
+                    Violation(
+                        rule="spacing",
+                        message=f"Inconsistent vertical spacing between shapes",
+                        severity="info",
+                        shape_ids=[shapes[order[i]].id, shapes[order[i + 1]].id],
+                        suggested_fix={"gap": int(avg_gap)},
                     )
+                )
 
         return violations
 
@@ -305,9 +320,7 @@ class ConstraintEngine:
                     height=bbox.height,
                 )
                 # Create new shape with fixed bbox
-                shape_dict = shape.model_dump()
-                shape_dict["bbox"] = new_bbox
-                fixed.append(Shape(**shape_dict))
+                fixed.append(shape.with_updates(bbox=new_bbox))
             else:
                 fixed.append(shape)
 
@@ -326,9 +339,22 @@ class ConstraintEngine:
         sorted_shapes = sorted(shapes, key=lambda s: s.z_index)
         fixed = list(sorted_shapes)
 
-        # Simple overlap resolution - push shapes down
+        if not fixed:
+            return fixed
+
+        # Index of shapes already placed (0..i-1), whose positions are final
+        index = SpatialIndex(default_cell_size([shape.bbox for shape in fixed]))
+        index.insert(0, fixed[0].bbox)
+
+        # Simple overlap resolution - push shapes down. Earlier shapes are
+        # visited in index order, re-querying after each push, exactly as a
+        # scan over j = 0..i-1 would see them
         for i in range(1, len(fixed)):
-            for j in range(i):
+            candidates = index.query(fixed[i].bbox)
+            k = 0
+            while k < len(candidates):
+                j = candidates[k]
+                k += 1
                 if self._shapes_overlap(fixed[i].bbox, fixed[j].bbox):
                     # Push shape i below shape j
                     new_y = fixed[j].bbox.bottom + 91440  # 0.1 inch gap
@@ -340,9 +366,10 @@ class ConstraintEngine:
                             width=bbox.width,
                             height=bbox.height,
                         )
-                        shape_dict = fixed[i].model_dump()
-                        shape_dict["bbox"] = new_bbox
-                        fixed[i] = Shape(**shape_dict)
+                        fixed[i] = fixed[i].with_updates(bbox=new_bbox)
+                        candidates = [c for c in index.query(new_bbox) if c > j]
+                        k = 0
+            index.insert(i, fixed[i].bbox)
 
         return fixed
 
@@ -372,9 +399,7 @@ class ConstraintEngine:
                     width=shape.bbox.width,
                     height=shape.bbox.height,
                 )
-                shape_dict = shape.model_dump()
-                shape_dict["bbox"] = new_bbox
-                fixed.append(Shape(**shape_dict))
+                fixed.append(shape.with_updates(bbox=new_bbox))
             else:
                 fixed.append(shape)
 
@@ -412,9 +437,7 @@ class ConstraintEngine:
                 width=shape.bbox.width,
                 height=shape.bbox.height,
             )
-            shape_dict = shape.model_dump()
-            shape_dict["bbox"] = new_bbox
-            fixed.append(Shape(**shape_dict))
+            fixed.append(shape.with_updates(bbox=new_bbox))
 
             current_y += shape.bbox.height + gap
 
@@ -254,9 +254,7 @@ class ArchetypeRules:
                 width=new_width,
                 height=shape.bbox.height,
             )
-            shape_dict = shape.model_dump()
-            shape_dict["bbox"] = new_bbox
-            fixed.append(Shape(**shape_dict))
+            fixed.append(shape.with_updates(bbox=new_bbox))
 
         return fixed
 
@@ -290,9 +288,7 @@ class ArchetypeRules:
                 width=new_width,
                 height=shape.bbox.height,
             )
-            shape_dict = shape.model_dump()
-            shape_dict["bbox"] = new_bbox
-            fixed.append(Shape(**shape_dict))
+            fixed.append(shape.with_updates(bbox=new_bbox))
 
         return fixed
 
@@ -318,9 +314,7 @@ class ArchetypeRules:
             width=hub.bbox.width,
             height=hub.bbox.height,
         )
-        shape_dict = hub.model_dump()
-        shape_dict["bbox"] = new_bbox
-        fixed[0] = Shape(**shape_dict)
+        fixed[0] = hub.with_updates(bbox=new_bbox)
 
         return fixed
 
@@ -354,9 +348,7 @@ class ArchetypeRules:
                 width=spoke.bbox.width,
                 height=spoke.bbox.height,
             )
-            shape_dict = spoke.model_dump()
-            shape_dict["bbox"] = new_bbox
-            fixed.append(Shape(**shape_dict))
+            fixed.append(spoke.with_updates(bbox=new_bbox))
 
         return fixed
 
@@ -388,9 +380,7 @@ class ArchetypeRules:
                 width=shape.bbox.width,
                 height=shape.bbox.height,
             )
-            shape_dict = shape.model_dump()
-            shape_dict["bbox"] = new_bbox
-            fixed.append(Shape(**shape_dict))
+            fixed.append(shape.with_updates(bbox=new_bbox))
 
         return fixed
 
@@ -430,9 +420,7 @@ class ArchetypeRules:
                 width=column_width,
                 height=shape.bbox.height,
             )
-            shape_dict = shape.model_dump()
-            shape_dict["bbox"] = new_bbox
-            fixed.append(Shape(**shape_dict))
+            fixed.append(shape.with_updates(bbox=new_bbox))
 
         return fixed
 
@@ -461,9 +449,7 @@ class ArchetypeRules:
                     width=max_width,
                     height=shape.bbox.height,
                 )
-                shape_dict = shape.model_dump()
-                shape_dict["bbox"] = new_bbox
-                fixed.append(Shape(**shape_dict))
+                fixed.append(shape.with_updates(bbox=new_bbox))
             else:
                 fixed.append(shape)
 
@@ -502,8 +488,6 @@ class ArchetypeRules:
                 width=shape.bbox.width,
                 height=shape.bbox.height,
             )
-            shape_dict = shape.model_dump()
-            shape_dict["bbox"] = new_bbox
-            fixed.append(Shape(**shape_dict))
+            fixed.append(shape.with_updates(bbox=new_bbox))
 
         return fixed
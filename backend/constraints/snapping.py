@@ -3,6 +3,9 @@
 from dataclasses import dataclass, field
 from enum import Enum
 
+import numpy as np
+
+from backend.dsl.columnar import SceneGeometry
 from backend.dsl.schema import BoundingBox, Shape
 
 
@@ -59,65 +62,29 @@ class SnappingConstraint:
         Returns:
             Tuple of (snapped shape, snap result).
         """
-        best_x = shape.bbox.x
-        best_y = shape.bbox.y
-        snap_type = None
-
-        # Try each snap target in order
-        for target in self.snap_targets:
-            if target == SnapTarget.GRID:
-                snapped_x, snapped_y, did_snap = self._snap_to_grid(
-                    shape.bbox.x, shape.bbox.y
-                )
-                if did_snap:
-                    best_x, best_y = snapped_x, snapped_y
-                    snap_type = "grid"
-
-            elif target == SnapTarget.GUIDES:
-                snapped_x, snapped_y, did_snap = self._snap_to_guides(
-                    shape.bbox.x, shape.bbox.y, shape.bbox
-                )
-                if did_snap:
-                    best_x, best_y = snapped_x, snapped_y
-                    snap_type = "guide"
-
-            elif target == SnapTarget.CANVAS_CENTER:
-                snapped_x, snapped_y, did_snap = self._snap_to_canvas_center(
-                    shape.bbox.x, shape.bbox.y, shape.bbox
-                )
-                if did_snap:
-                    best_x, best_y = snapped_x, snapped_y
-                    snap_type = "canvas_center"
-
-            elif target == SnapTarget.CANVAS_EDGES:
-                snapped_x, snapped_y, did_snap = self._snap_to_canvas_edges(
-                    shape.bbox.x, shape.bbox.y, shape.bbox
-                )
-                if did_snap:
-                    best_x, best_y = snapped_x, snapped_y
-                    snap_type = "canvas_edge"
+        geometry = SceneGeometry.from_shapes([shape])
+        best_x, best_y, snap_types = self._snap_geometry(geometry)
+        snapped_x, snapped_y = int(best_x[0]), int(best_y[0])
 
         # Create result
         result = SnapResult(
-            snapped=best_x != shape.bbox.x or best_y != shape.bbox.y,
+            snapped=snapped_x != shape.bbox.x or snapped_y != shape.bbox.y,
             original_x=shape.bbox.x,
             original_y=shape.bbox.y,
-            snapped_x=best_x,
-            snapped_y=best_y,
-            snap_type=snap_type,
+            snapped_x=snapped_x,
+            snapped_y=snapped_y,
+            snap_type=snap_types[0],
         )
 
         # Create snapped shape if needed
         if result.snapped:
             new_bbox = BoundingBox(
-                x=best_x,
-                y=best_y,
+                x=snapped_x,
+                y=snapped_y,
                 width=shape.bbox.width,
                 height=shape.bbox.height,
             )
-            shape_dict = shape.model_dump()
-            shape_dict["bbox"] = new_bbox
-            return Shape(**shape_dict), result
+            return shape.with_updates(bbox=new_bbox), result
 
         return shape, result
 
@@ -130,151 +97,170 @@ class SnappingConstraint:
         Returns:
             Snapped shapes.
         """
-        return [self.snap_shape(s)[0] for s in shapes]
+        if not shapes:
+            return []
+        geometry = SceneGeometry.from_shapes(shapes)
+        geometry.x, geometry.y, _ = self._snap_geometry(geometry)
+        return geometry.to_shapes(shapes)
+
+    def _snap_geometry(
+        self, geometry: SceneGeometry
+    ) -> tuple[np.ndarray, np.ndarray, list[str | None]]:
+        """Snap every shape in a columnar view.
+
+        Each target is tried from the original position, in order; the last
+        target that snaps a shape decides both of its coordinates.
+
+        Args:
+            geometry: Shapes to snap.
+
+        Returns:
+            Tuple of (snapped x, snapped y, snap type per shape).
+        """
+        x, y = geometry.x, geometry.y
+        best_x = x.copy()
+        best_y = y.copy()
+        snap_types = np.full(len(geometry), None, dtype=object)
+
+        snappers = {
+            SnapTarget.GRID: ("grid", lambda: self._snap_to_grid(x, y)),
+            SnapTarget.GUIDES: ("guide", lambda: self._snap_to_guides(x, y, geometry)),
+            SnapTarget.CANVAS_CENTER: (
+                "canvas_center",
+                lambda: self._snap_to_canvas_center(x, y, geometry),
+            ),
+            SnapTarget.CANVAS_EDGES: (
+                "canvas_edge",
+                lambda: self._snap_to_canvas_edges(x, y, geometry),
+            ),
+        }
+
+        # Try each snap target in order
+        for target in self.snap_targets:
+            if target not in snappers:
+                continue
+            snap_type, snap = snappers[target]
+            snapped_x, snapped_y, did_snap = snap()
+            best_x = np.where(did_snap, snapped_x, best_x)
+            best_y = np.where(did_snap, snapped_y, best_y)
+            snap_types[did_snap] = snap_type
+
+        return best_x, best_y, snap_types.tolist()
 
     def _snap_to_grid(
-        self, x: int, y: int
-    ) -> tuple[int, int, bool]:
+        self, x: np.ndarray, y: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
         """Snap coordinates to grid.
 
         Args:
-            x: X coordinate.
-            y: Y coordinate.
+            x: X coordinates.
+            y: Y coordinates.
 
         Returns:
             Tuple of (snapped_x, snapped_y, did_snap).
         """
-        # Find nearest grid lines
-        grid_x = round(x / self.grid_size) * self.grid_size
-        grid_y = round(y / self.grid_size) * self.grid_size
+        # Find nearest grid lines (np.round rounds half to even, like round())
+        grid_x = (np.round(x / self.grid_size) * self.grid_size).astype(np.int64)
+        grid_y = (np.round(y / self.grid_size) * self.grid_size).astype(np.int64)
 
         # Check if within threshold
-        x_diff = abs(x - grid_x)
-        y_diff = abs(y - grid_y)
-
-        snapped_x = grid_x if x_diff <= self.snap_threshold else x
-        snapped_y = grid_y if y_diff <= self.snap_threshold else y
+        snapped_x = np.where(np.abs(x - grid_x) <= self.snap_threshold, grid_x, x)
+        snapped_y = np.where(np.abs(y - grid_y) <= self.snap_threshold, grid_y, y)
 
-        did_snap = snapped_x != x or snapped_y != y
+        did_snap = (snapped_x != x) | (snapped_y != y)
         return snapped_x, snapped_y, did_snap
 
     def _snap_to_guides(
-        self, x: int, y: int, bbox: BoundingBox
-    ) -> tuple[int, int, bool]:
+        self, x: np.ndarray, y: np.ndarray, geometry: SceneGeometry
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
         """Snap to guide lines.
 
         Args:
-            x: X coordinate.
-            y: Y coordinate.
-            bbox: Shape bounding box (for center/edge snapping).
+            x: X coordinates.
+            y: Y coordinates.
+            geometry: Shape sizes (for center snapping).
 
         Returns:
             Tuple of (snapped_x, snapped_y, did_snap).
         """
+        width, height = geometry.width, geometry.height
         snapped_x = x
         snapped_y = y
-        did_snap = False
+        did_snap = np.zeros(len(x), dtype=bool)
 
+        # Later guides override earlier ones; on each guide the leading
+        # edge is checked before the center
         for guide in self.guides:
             if guide.orientation == "vertical":
-                # Check left edge, center, and right edge
-                positions = [
-                    (x, x),  # Left edge
-                    (x + bbox.width // 2, x + bbox.width // 2 - guide.position),
-                    (x + bbox.width, x - bbox.width),  # Right edge
-                ]
-
-                for pos, offset in [(x, 0), (x + bbox.width // 2, -bbox.width // 2)]:
-                    if abs(pos - guide.position) <= self.snap_threshold:
-                        snapped_x = guide.position + offset
-                        did_snap = True
-                        break
+                edge = np.abs(x - guide.position) <= self.snap_threshold
+                center = ~edge & (np.abs(x + width // 2 - guide.position) <= self.snap_threshold)
+                snapped_x = np.where(edge, guide.position, snapped_x)
+                snapped_x = np.where(center, guide.position + -width // 2, snapped_x)
+                did_snap |= edge | center
 
             elif guide.orientation == "horizontal":
-                for pos, offset in [(y, 0), (y + bbox.height // 2, -bbox.height // 2)]:
-                    if abs(pos - guide.position) <= self.snap_threshold:
-                        snapped_y = guide.position + offset
-                        did_snap = True
-                        break
+                edge = np.abs(y - guide.position) <= self.snap_threshold
+                center = ~edge & (np.abs(y + height // 2 - guide.position) <= self.snap_threshold)
+                snapped_y = np.where(edge, guide.position, snapped_y)
+                snapped_y = np.where(center, guide.position + -height // 2, snapped_y)
+                did_snap |= edge | center
 
         return snapped_x, snapped_y, did_snap
 
     def _snap_to_canvas_center(
-        self, x: int, y: int, bbox: BoundingBox
-    ) -> tuple[int, int, bool]:
+        self, x: np.ndarray, y: np.ndarray, geometry: SceneGeometry
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
         """Snap shape center to canvas center.
 
         Args:
-            x: X coordinate.
-            y: Y coordinate.
-            bbox: Shape bounding box.
+            x: X coordinates.
+            y: Y coordinates.
+            geometry: Shape sizes.
 
         Returns:
             Tuple of (snapped_x, snapped_y, did_snap).
         """
         center_x = self.canvas_width // 2
         center_y = self.canvas_height // 2
+        half_width = geometry.width // 2
+        half_height = geometry.height // 2
 
-        shape_center_x = x + bbox.width // 2
-        shape_center_y = y + bbox.height // 2
-
-        snapped_x = x
-        snapped_y = y
-        did_snap = False
-
-        if abs(shape_center_x - center_x) <= self.snap_threshold:
-            snapped_x = center_x - bbox.width // 2
-            did_snap = True
-
-        if abs(shape_center_y - center_y) <= self.snap_threshold:
-            snapped_y = center_y - bbox.height // 2
-            did_snap = True
+        snap_x = np.abs(x + half_width - center_x) <= self.snap_threshold
+        snap_y = np.abs(y + half_height - center_y) <= self.snap_threshold
 
-        return snapped_x, snapped_y, did_snap
+        snapped_x = np.where(snap_x, center_x - half_width, x)
+        snapped_y = np.where(snap_y, center_y - half_height, y)
+        return snapped_x, snapped_y, snap_x | snap_y
 
     def _snap_to_canvas_edges(
-        self, x: int, y: int, bbox: BoundingBox
-    ) -> tuple[int, int, bool]:
+        self, x: np.ndarray, y: np.ndarray, geometry: SceneGeometry
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
         """Snap shape edges to canvas edges.
 
         Args:
-            x: X coordinate.
-            y: Y coordinate.
-            bbox: Shape bounding box.
+            x: X coordinates.
+            y: Y coordinates.
+            geometry: Shape sizes.
 
         Returns:
             Tuple of (snapped_x, snapped_y, did_snap).
         """
-        snapped_x = x
-        snapped_y = y
-        did_snap = False
+        width, height = geometry.width, geometry.height
 
         # Margin for edge snapping
         margin = 457200  # 0.5 inch
+        right_margin = self.canvas_width - margin
+        bottom_margin = self.canvas_height - margin
 
-        # Left edge
-        if abs(x - margin) <= self.snap_threshold:
-            snapped_x = margin
-            did_snap = True
-
-        # Right edge
-        right = x + bbox.width
-        if abs(right - (self.canvas_width - margin)) <= self.snap_threshold:
-            snapped_x = self.canvas_width - margin - bbox.width
-            did_snap = True
+        left = np.abs(x - margin) <= self.snap_threshold
+        right = np.abs(x + width - right_margin) <= self.snap_threshold
+        top = np.abs(y - margin) <= self.snap_threshold
+        bottom = np.abs(y + height - bottom_margin) <= self.snap_threshold
 
-        # Top edge
-        if abs(y - margin) <= self.snap_threshold:
-            snapped_y = margin
-            did_snap = True
-
-        # Bottom edge
-        bottom = y + bbox.height
-        if abs(bottom - (self.canvas_height - margin)) <= self.snap_threshold:
-            snapped_y = self.canvas_height - margin - bbox.height
-            did_snap = True
-
-        return snapped_x, snapped_y, did_snap
+        # The right and bottom edges win over left and top
+        snapped_x = np.where(right, right_margin - width, np.where(left, margin, x))
+        snapped_y = np.where(bottom, bottom_margin - height, np.where(top, margin, y))
+        return snapped_x, snapped_y, left | right | top | bottom
 
 
 def snap_to_grid(
@@ -416,8 +402,6 @@ def align_to_shape(
             width=bbox.width,
             height=bbox.height,
         )
-        shape_dict = shape_to_align.model_dump()
-        shape_dict["bbox"] = new_bbox
-        return Shape(**shape_dict)
+        return shape_to_align.with_updates(bbox=new_bbox)
 
     return shape_to_align
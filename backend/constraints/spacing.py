@@ -80,9 +80,7 @@ class SpacingConstraint:
                 width=shape.bbox.width,
                 height=shape.bbox.height,
             )
-            shape_dict = shape.model_dump()
-            shape_dict["bbox"] = new_bbox
-            fixed.append(Shape(**shape_dict))
+            fixed.append(shape.with_updates(bbox=new_bbox))
             current_y += shape.bbox.height + gap
 
         return fixed
@@ -110,9 +108,7 @@ class SpacingConstraint:
                 width=shape.bbox.width,
                 height=shape.bbox.height,
             )
-            shape_dict = shape.model_dump()
-            shape_dict["bbox"] = new_bbox
-            fixed.append(Shape(**shape_dict))
+            fixed.append(shape.with_updates(bbox=new_bbox))
             current_x += shape.bbox.width + gap
 
         return fixed
@@ -136,9 +132,7 @@ class SpacingConstraint:
                     width=shape.bbox.width,
                     height=shape.bbox.height,
                 )
-                shape_dict = shape.model_dump()
-                shape_dict["bbox"] = new_bbox
-                fixed.append(Shape(**shape_dict))
+                fixed.append(shape.with_updates(bbox=new_bbox))
             return fixed
         else:
             sorted_shapes = sorted(self.shapes, key=lambda s: s.bbox.center_x)
@@ -157,9 +151,7 @@ class SpacingConstraint:
                     width=shape.bbox.width,
                     height=shape.bbox.height,
                 )
-                shape_dict = shape.model_dump()
-                shape_dict["bbox"] = new_bbox
-                fixed.append(Shape(**shape_dict))
+                fixed.append(shape.with_updates(bbox=new_bbox))
             return fixed
 
     def _fixed_gap(self) -> list[Shape]:
@@ -183,9 +175,7 @@ class SpacingConstraint:
                 width=shape.bbox.width,
                 height=shape.bbox.height,
             )
-            shape_dict = shape.model_dump()
-            shape_dict["bbox"] = new_bbox
-            fixed.append(Shape(**shape_dict))
+            fixed.append(shape.with_updates(bbox=new_bbox))
             current_y += shape.bbox.height + self.gap
 
         return fixed
@@ -204,9 +194,7 @@ class SpacingConstraint:
                 width=shape.bbox.width,
                 height=shape.bbox.height,
             )
-            shape_dict = shape.model_dump()
-            shape_dict["bbox"] = new_bbox
-            fixed.append(Shape(**shape_dict))
+            fixed.append(shape.with_updates(bbox=new_bbox))
             current_x += shape.bbox.width + self.gap
 
         return fixed
@@ -275,8 +263,6 @@ def create_grid(
             width=shape.bbox.width,
             height=shape.bbox.height,
         )
-        shape_dict = shape.model_dump()
-        shape_dict["bbox"] = new_bbox
-        fixed.append(Shape(**shape_dict))
+        fixed.append(shape.with_updates(bbox=new_bbox))
 
     return fixed
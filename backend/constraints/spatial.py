@@ -0,0 +1,110 @@
+"""Uniform grid spatial index over shape bounding boxes.
+
+Overlap and proximity checks compare shapes pairwise. The index buckets
+boxes into square cells so a query only visits boxes in the cells it
+touches, turning the scans into roughly linear work for typical slides.
+Queries return candidates; callers still apply their exact predicate, so
+results are identical to the pairwise scans.
+"""
+
+import math
+from collections import defaultdict
+from collections.abc import Iterator, Sequence
+
+from backend.dsl.schema import BoundingBox
+
+# Upper bound on grid resolution along the longer axis of the indexed extent
+MAX_CELLS_PER_AXIS = 128
+
+
+class SpatialIndex:
+    """Uniform grid mapping cells to the keys of the boxes that touch them."""
+
+    def __init__(self, cell_size: int) -> None:
+        """Initialize an empty index.
+
+        Args:
+            cell_size: Cell edge length in EMUs.
+        """
+        self.cell_size = max(1, int(cell_size))
+        self._cells: defaultdict[tuple[int, int], list[int]] = defaultdict(list)
+        self._size = 0
+
+    @classmethod
+    def from_boxes(
+        cls,
+        boxes: Sequence[BoundingBox],
+        cell_size: int | None = None,
+    ) -> "SpatialIndex":
+        """Build an index keyed by each box's position in ``boxes``.
+
+        Args:
+            boxes: Boxes to index.
+            cell_size: Cell edge length. Defaults to ``default_cell_size(boxes)``.
+
+        Returns:
+            Populated index.
+        """
+        index = cls(cell_size or default_cell_size(boxes))
+        for key, bbox in enumerate(boxes):
+            index.insert(key, bbox)
+        return index
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _cell_range(
+        self, x0: int, y0: int, x1: int, y1: int
+    ) -> Iterator[tuple[int, int]]:
+        """Cells covering the closed rectangle [x0, x1] x [y0, y1]."""
+        size = self.cell_size
+        for cx in range(x0 // size, x1 // size + 1):
+            for cy in range(y0 // size, y1 // size + 1):
+                yield cx, cy
+
+    def insert(self, key: int, bbox: BoundingBox) -> None:
+        """Add a box under ``key``."""
+        for cell in self._cell_range(bbox.x, bbox.y, bbox.right, bbox.bottom):
+            self._cells[cell].append(key)
+        self._size += 1
+
+    def query(self, bbox: BoundingBox, margin: float = 0) -> list[int]:
+        """Get keys of boxes that may lie within ``margin`` of ``bbox``.
+
+        Every box whose distance to ``bbox`` is at most ``margin`` is
+        returned; others may be too.
+
+        Args:
+            bbox: Query box.
+            margin: Distance to expand the query box by on every side.
+
+        Returns:
+            Candidate keys in ascending order.
+        """
+        pad = math.ceil(margin)
+        cells = self._cells
+        found: set[int] = set()
+        for cell in self._cell_range(
+            bbox.x - pad, bbox.y - pad, bbox.right + pad, bbox.bottom + pad
+        ):
+            keys = cells.get(cell)
+            if keys:
+                found.update(keys)
+        return sorted(found)
+
+
+def default_cell_size(boxes: Sequence[BoundingBox]) -> int:
+    """Pick a cell size from the average box size and the overall extent.
+
+    Cells roughly the size of a typical box keep both the number of cells
+    per box and the number of boxes per cell small; the extent bound stops
+    tiny boxes from producing an excessively fine grid.
+    """
+    if not boxes:
+        return 1
+    average = sum(b.width + b.height for b in boxes) // (2 * len(boxes))
+    extent = max(
+        max(b.right for b in boxes) - min(b.x for b in boxes),
+        max(b.bottom for b in boxes) - min(b.y for b in boxes),
+    )
+    return max(1, average, extent // MAX_CELLS_PER_AXIS)
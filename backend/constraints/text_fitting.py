@@ -221,9 +221,7 @@ class TextFittingConstraint:
             alignment=shape.text.alignment,
         )
 
-        shape_dict = shape.model_dump()
-        shape_dict["text"] = new_text
-        return Shape(**shape_dict)
+        return shape.with_updates(text=new_text)
 
     def _truncate_text(self, shape: Shape, metrics: TextMetrics) -> Shape:
         """Truncate text to fit within shape.
@@ -275,9 +273,7 @@ class TextFittingConstraint:
             alignment=shape.text.alignment,
         )
 
-        shape_dict = shape.model_dump()
-        shape_dict["text"] = new_text
-        return Shape(**shape_dict)
+        return shape.with_updates(text=new_text)
 
     def _expand_shape(self, shape: Shape, metrics: TextMetrics) -> Shape:
         """Expand shape to fit text.
@@ -306,9 +302,7 @@ class TextFittingConstraint:
             height=new_height,
         )
 
-        shape_dict = shape.model_dump()
-        shape_dict["bbox"] = new_bbox
-        return Shape(**shape_dict)
+        return shape.with_updates(bbox=new_bbox)
 
     def _wrap_text(self, shape: Shape, metrics: TextMetrics) -> Shape:
         """Wrap text to fit within shape width.
@@ -363,9 +357,7 @@ class TextFittingConstraint:
             alignment=shape.text.alignment,
         )
 
-        shape_dict = shape.model_dump()
-        shape_dict["text"] = new_text
-        return Shape(**shape_dict)
+        return shape.with_updates(text=new_text)
 
 
 def check_text_overflow(shapes: list[Shape]) -> list[tuple[Shape, TextFitResult]]:
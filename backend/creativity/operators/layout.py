@@ -3,7 +3,10 @@
 import random
 from typing import Any
 
+import numpy as np
+
 from backend.creativity.operators.base import VariationOperator, VariationParams
+from backend.dsl.columnar import SceneGeometry
 
 
 class LabelPlacementVariation(VariationOperator):
@@ -192,29 +195,27 @@ class OrientationVariation(VariationOperator):
 
     def _arrange_radially(self, shapes: list[dict]) -> None:
         """Arrange shapes in a radial pattern."""
-        import math
-
         n = len(shapes)
         if n == 0:
             return
 
         # Calculate bounding box of all shapes
-        all_x = [s.get("bbox", {}).get("x", 0) for s in shapes]
-        all_y = [s.get("bbox", {}).get("y", 0) for s in shapes]
-        all_w = [s.get("bbox", {}).get("width", 100) for s in shapes]
-        all_h = [s.get("bbox", {}).get("height", 50) for s in shapes]
-
-        center_x = sum(all_x) / n + sum(all_w) / (2 * n)
-        center_y = sum(all_y) / n + sum(all_h) / (2 * n)
-        radius = max(max(all_w), max(all_h)) * 1.5
+        geometry = SceneGeometry.from_dicts(
+            shapes,
+            default_width=100,
+            default_height=50,
+            fields=("x", "y", "width", "height"),
+        )
+        width, height = geometry.width, geometry.height
 
-        for i, shape in enumerate(shapes):
-            angle = (2 * math.pi * i / n) - math.pi / 2  # Start from top
-            bbox = shape.get("bbox", {})
-            w, h = bbox.get("width", 100), bbox.get("height", 50)
+        center_x = geometry.x.sum() / n + width.sum() / (2 * n)
+        center_y = geometry.y.sum() / n + height.sum() / (2 * n)
+        radius = max(width.max(), height.max()) * 1.5
 
-            bbox["x"] = center_x + radius * math.cos(angle) - w / 2
-            bbox["y"] = center_y + radius * math.sin(angle) - h / 2
+        angle = (2 * np.pi * np.arange(n) / n) - np.pi / 2  # Start from top
+        geometry.x = center_x + radius * np.cos(angle) - width / 2
+        geometry.y = center_y + radius * np.sin(angle) - height / 2
+        geometry.to_dicts()
 
     def _arrange_horizontally(self, shapes: list[dict]) -> None:
         """Arrange shapes horizontally."""
@@ -1,12 +1,22 @@
 """Database module for Infographix."""
 
-from backend.db.base import Base, get_db, engine, SessionLocal
+from backend.db.base import (
+    Base,
+    get_db,
+    get_async_db,
+    engine,
+    async_engine,
+    SessionLocal,
+    AsyncSessionLocal,
+)
 from backend.db.models import (
     User,
     Session,
     APIKey,
     Generation,
+    GenerationBatch,
     Download,
+    RenderArtifact,
     Template,
     Organization,
     OrganizationMember,
@@ -17,13 +27,18 @@ from backend.db.models import (
 __all__ = [
     "Base",
     "get_db",
+    "get_async_db",
     "engine",
+    "async_engine",
     "SessionLocal",
+    "AsyncSessionLocal",
     "User",
     "Session",
     "APIKey",
     "Generation",
+    "GenerationBatch",
     "Download",
+    "RenderArtifact",
     "Template",
     "Organization",
     "OrganizationMember",
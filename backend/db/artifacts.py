@@ -0,0 +1,261 @@
+"""Content-addressed store for rendered download artifacts.
+
+Downloads of byte-identical scenes share one rendered file. Artifacts are
+keyed by a SHA-256 of the canonical DSL, the output format and the renderer
+version, stored once under ``<root>/<hash[:2]>/<hash>.<format>`` and
+reference-counted by the downloads that point at them. Expired downloads
+release their reference; ``collect_garbage`` deletes only blobs nobody
+references any more.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.db.models import Download, RenderArtifact
+from backend.renderer.pptx_writer import RENDERER_VERSION
+
+# Renders a DSL dict to the given path
+RenderFn = Callable[[dict[str, Any], Path], None]
+
+
+def canonical_dsl(dsl: dict[str, Any]) -> bytes:
+    """Serialize a DSL dict to canonical JSON bytes."""
+    return json.dumps(dsl, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class ArtifactStore:
+    """Deduplicating, reference-counted store for rendered files."""
+
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        renderer_version: str = RENDERER_VERSION,
+    ):
+        """Initialize the artifact store.
+
+        Args:
+            root: Directory for blobs. Defaults to ``$DOWNLOAD_DIR/artifacts``.
+            renderer_version: Included in every key so renderer changes
+                never serve stale files.
+        """
+        if root is None:
+            root = Path(os.getenv("DOWNLOAD_DIR", "downloads")) / "artifacts"
+        self.root = Path(root)
+        self.renderer_version = renderer_version
+
+    def content_hash(self, dsl: dict[str, Any], format: str) -> str:
+        """Compute the artifact key for a DSL and output format."""
+        digest = hashlib.sha256()
+        digest.update(f"{format}\0{self.renderer_version}\0".encode("utf-8"))
+        digest.update(canonical_dsl(dsl))
+        return digest.hexdigest()
+
+    def blob_path(self, content_hash: str, format: str) -> Path:
+        """Get the on-disk location for an artifact."""
+        return self.root / content_hash[:2] / f"{content_hash}.{format}"
+
+    def _write_blob(self, dsl: dict[str, Any], path: Path, render: RenderFn) -> None:
+        """Render into a temp file and atomically move it into place."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=path.suffix)
+        os.close(fd)
+        try:
+            render(dsl, Path(tmp))
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+
+    def _increment(self, db: Session, content_hash: str) -> bool:
+        """Atomically add a reference; False if the row has gone."""
+        updated = db.query(RenderArtifact).filter(
+            RenderArtifact.content_hash == content_hash,
+        ).update(
+            {
+                RenderArtifact.ref_count: RenderArtifact.ref_count + 1,
+                RenderArtifact.last_used_at: datetime.utcnow(),
+            },
+            synchronize_session=False,
+        )
+        return updated == 1
+
+    def acquire(
+        self,
+        db: Session,
+        dsl: dict[str, Any],
+        format: str,
+        render: RenderFn,
+    ) -> RenderArtifact:
+        """Get the artifact for a DSL, rendering it only if needed.
+
+        Adds one reference. The caller commits the session together with
+        the download that holds the reference.
+
+        Args:
+            db: Database session.
+            dsl: Scene DSL to render.
+            format: Output format (file extension).
+            render: Renders the DSL to a path on a miss.
+
+        Returns:
+            Artifact row for the rendered file.
+        """
+        content_hash = self.content_hash(dsl, format)
+        path = self.blob_path(content_hash, format)
+
+        # Two attempts: garbage collection may delete the row between the
+        # lookup and the reference increment
+        for _ in range(2):
+            artifact = db.get(RenderArtifact, content_hash)
+            if artifact is not None and Path(artifact.file_path).exists():
+                if self._increment(db, content_hash):
+                    db.expire(artifact)
+                    return artifact
+                continue
+
+            if not path.exists():
+                self._write_blob(dsl, path, render)
+            size = path.stat().st_size
+
+            if artifact is not None:
+                # Row survived but the file was lost; point it at the new blob
+                artifact.file_path = str(path)
+                artifact.file_size = size
+                db.flush()
+            else:
+                try:
+                    with db.begin_nested():
+                        db.add(RenderArtifact(
+                            content_hash=content_hash,
+                            format=format,
+                            renderer_version=self.renderer_version,
+                            file_path=str(path),
+                            file_size=size,
+                            ref_count=0,
+                        ))
+                except IntegrityError:
+                    # Another worker inserted the same artifact first
+                    pass
+
+            if self._increment(db, content_hash):
+                artifact = db.get(RenderArtifact, content_hash)
+                db.expire(artifact)
+                return artifact
+
+        raise RuntimeError(f"Could not acquire artifact {content_hash}")
+
+    def attach(
+        self,
+        db: Session,
+        download: Download,
+        dsl: dict[str, Any],
+        render: RenderFn,
+    ) -> RenderArtifact:
+        """Acquire the artifact for a download and point the download at it.
+
+        Args:
+            db: Database session.
+            download: Download record to fill in.
+            dsl: Scene DSL to render.
+            render: Renders the DSL to a path on a miss.
+
+        Returns:
+            Artifact now referenced by the download.
+        """
+        artifact = self.acquire(db, dsl, download.format, render)
+        # Re-rendering a download swaps its reference rather than adding one
+        self.release(db, download.artifact_hash)
+        download.artifact_hash = artifact.content_hash
+        download.file_path = artifact.file_path
+        download.file_size = artifact.file_size
+        return artifact
+
+    def release(self, db: Session, content_hash: str | None) -> None:
+        """Drop one reference to an artifact.
+
+        The file is left in place; ``collect_garbage`` removes it once no
+        references remain.
+        """
+        if not content_hash:
+            return
+        db.query(RenderArtifact).filter(
+            RenderArtifact.content_hash == content_hash,
+            RenderArtifact.ref_count > 0,
+        ).update(
+            {RenderArtifact.ref_count: RenderArtifact.ref_count - 1},
+            synchronize_session=False,
+        )
+
+    def collect_garbage(self, db: Session, grace: timedelta = timedelta(minutes=10)) -> int:
+        """Delete artifacts with no remaining references.
+
+        Counts that drifted (downloads removed by a cascade rather than
+        released) are reconciled for artifacts idle longer than ``grace``.
+
+        Args:
+            db: Database session.
+            grace: Minimum idle time before a drifted count is reset.
+
+        Returns:
+            Number of blobs deleted.
+        """
+        cutoff = datetime.utcnow() - grace
+        referenced = db.query(Download.artifact_hash).filter(
+            Download.artifact_hash.isnot(None),
+        )
+        db.query(RenderArtifact).filter(
+            RenderArtifact.ref_count > 0,
+            RenderArtifact.last_used_at < cutoff,
+            RenderArtifact.content_hash.notin_(referenced),
+        ).update({RenderArtifact.ref_count: 0}, synchronize_session=False)
+
+        candidates = db.query(RenderArtifact.content_hash, RenderArtifact.file_path).filter(
+            RenderArtifact.ref_count <= 0,
+        ).all()
+
+        deleted = 0
+        for content_hash, file_path in candidates:
+            # Conditional delete: a concurrent acquire wins over collection
+            removed = db.query(RenderArtifact).filter(
+                RenderArtifact.content_hash == content_hash,
+                RenderArtifact.ref_count <= 0,
+            ).delete(synchronize_session=False)
+            if not removed:
+                continue
+            path = Path(file_path)
+            if path.exists():
+                path.unlink()
+                deleted += 1
+
+        db.commit()
+        return deleted
+
+    def stats(self, db: Session) -> dict[str, int]:
+        """Get artifact counts and total stored bytes."""
+        count, total_bytes, refs = db.query(
+            func.count(RenderArtifact.content_hash),
+            func.coalesce(func.sum(RenderArtifact.file_size), 0),
+            func.coalesce(func.sum(RenderArtifact.ref_count), 0),
+        ).one()
+        return {"artifacts": count, "bytes": int(total_bytes), "references": int(refs)}
+
+
+# Process-wide artifact store (lazy initialized)
+_artifact_store: ArtifactStore | None = None
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Get the default artifact store."""
+    global _artifact_store
+    if _artifact_store is None:
+        _artifact_store = ArtifactStore()
+    return _artifact_store
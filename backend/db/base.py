@@ -1,9 +1,10 @@
 """Database base configuration."""
 
 import os
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 # Database URL from environment
@@ -36,6 +37,50 @@ else:
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers for the API's request path
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Get the async driver URL for a database URL.
+
+    Args:
+        url: Database URL, with or without a driver.
+
+    Returns:
+        The same database with its async driver, e.g.
+        ``postgresql+asyncpg://`` for ``postgresql://``.
+    """
+    scheme, _, rest = url.partition("://")
+    backend = scheme.split("+")[0]
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        return url
+    return f"{backend}+{driver}://{rest}"
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or async_database_url(DATABASE_URL)
+
+if ASYNC_DATABASE_URL.startswith("sqlite"):
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        echo=os.getenv("SQL_ECHO", "false").lower() == "true",
+    )
+else:
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_size=10,
+        max_overflow=20,
+        pool_pre_ping=True,
+        echo=os.getenv("SQL_ECHO", "false").lower() == "true",
+    )
+
+# Objects stay readable after commit; reloading them would need awaited IO
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Base class for models
 Base = declarative_base()
 
@@ -53,6 +98,16 @@ def get_db() -> Generator:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session.
+
+    Yields:
+        Async database session.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db() -> None:
     """Initialize database tables."""
     Base.metadata.create_all(bind=engine)
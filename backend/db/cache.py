@@ -2,6 +2,7 @@
 
 import json
 import os
+from collections import OrderedDict
 from datetime import timedelta
 from typing import Any
 
@@ -20,19 +21,27 @@ class CacheConfig:
         redis_url: str | None = None,
         default_ttl: int = 3600,
         prefix: str = "infographix:",
+        max_entries: int | None = None,
     ):
         self.redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
         self.default_ttl = default_ttl
         self.prefix = prefix
+        # Only enforced by the in-memory cache; Redis relies on maxmemory-policy
+        self.max_entries = max_entries
 
 
 class InMemoryCache:
-    """Simple in-memory cache fallback when Redis is not available."""
+    """Simple in-memory cache fallback when Redis is not available.
+
+    Entries expire after their TTL. When ``config.max_entries`` is set, the
+    least recently used entry is evicted once the cache is full.
+    """
 
     def __init__(self, config: CacheConfig):
         self.config = config
-        self._cache: dict[str, tuple[Any, float | None]] = {}
+        self._cache: OrderedDict[str, tuple[Any, float | None]] = OrderedDict()
         self._prefix = config.prefix
+        self.evictions = 0
 
     def _full_key(self, key: str) -> str:
         return f"{self._prefix}{key}"
@@ -49,6 +58,7 @@ class InMemoryCache:
             del self._cache[full_key]
             return None
 
+        self._cache.move_to_end(full_key)
         return value
 
     def set(
@@ -63,6 +73,13 @@ class InMemoryCache:
         ttl = ttl or self.config.default_ttl
         expires_at = time.time() + ttl if ttl else None
         self._cache[full_key] = (value, expires_at)
+        self._cache.move_to_end(full_key)
+
+        max_entries = self.config.max_entries
+        if max_entries:
+            while len(self._cache) > max_entries:
+                self._cache.popitem(last=False)
+                self.evictions += 1
         return True
 
     def delete(self, key: str) -> bool:
@@ -0,0 +1,384 @@
+"""Content-addressed cache for generation results.
+
+Generation requests are normalized and hashed into a stable key, so
+identical requests skip the ML pipeline entirely. Intermediate results for
+the classification, layout and style stages are cached separately, which
+lets requests that only partly match an earlier one (same prompt, new brand
+colors) reuse the stages they share.
+
+Entries live in the shared cache from ``backend.db.cache``: Redis when it is
+reachable, otherwise a bounded in-memory LRU.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from backend.db.cache import CacheConfig, InMemoryCache, RedisCache, get_cache
+
+# Bump when the cached payload layout or the pipeline output changes
+CACHE_VERSION = 1
+
+STAGES = ("result", "classification", "layout", "style")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so trivially different prompts share entries."""
+    return " ".join(prompt.split())
+
+
+def canonical_hash(data: Any) -> str:
+    """Stable SHA-256 of a JSON-serializable value.
+
+    Dict keys are sorted so insertion order never changes the hash.
+    """
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class StageStats:
+    """Hit/miss counters for one cache stage."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict[str, float]:
+        """Convert to dictionary for metrics endpoints."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class GenerationCache:
+    """Caches full generation results and per-stage pipeline results.
+
+    Implements the ``StageCache`` protocol expected by
+    ``InferenceEngine.generate``.
+    """
+
+    def __init__(
+        self,
+        cache: InMemoryCache | RedisCache | None = None,
+        ttl: int = 86400,
+        namespace: str = "gen",
+    ):
+        """Initialize the generation cache.
+
+        Args:
+            cache: Backing cache. Defaults to a dedicated cache with an
+                LRU bound from ``GENERATION_CACHE_MAX_ENTRIES``.
+            ttl: Entry time-to-live in seconds.
+            namespace: Key prefix inside the backing cache.
+        """
+        if cache is None:
+            cache = get_cache(CacheConfig(
+                default_ttl=ttl,
+                max_entries=int(os.getenv("GENERATION_CACHE_MAX_ENTRIES", "10000")),
+            ))
+        self.cache = cache
+        self.ttl = ttl
+        self.namespace = namespace
+        self._stats = {stage: StageStats() for stage in STAGES}
+        self._lock = threading.Lock()
+
+    def _key(self, stage: str, inputs: dict[str, Any]) -> str:
+        return f"{self.namespace}:v{CACHE_VERSION}:{stage}:{canonical_hash(inputs)}"
+
+    def _record(self, stage: str, hit: bool) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(stage, StageStats())
+            if hit:
+                stats.hits += 1
+            else:
+                stats.misses += 1
+
+    def _get(self, stage: str, inputs: dict[str, Any]) -> dict[str, Any] | None:
+        try:
+            value = self.cache.get(self._key(stage, inputs))
+        except Exception:
+            # A cache outage must never fail a generation
+            value = None
+
+        # Values are stored as JSON text; Redis hands them back decoded
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError:
+                value = None
+
+        self._record(stage, value is not None)
+        return value
+
+    def _set(self, stage: str, inputs: dict[str, Any], value: dict[str, Any]) -> None:
+        # Serialize up front so callers never share mutable state with the cache
+        try:
+            self.cache.set(self._key(stage, inputs), json.dumps(value, default=str), self.ttl)
+        except Exception:
+            pass
+
+    @staticmethod
+    def request_inputs(
+        prompt: str,
+        content: list[dict[str, str]] | None = None,
+        brand_colors: list[str] | None = None,
+        brand_fonts: list[str] | None = None,
+        formality: str = "professional",
+        num_variations: int = 1,
+        engine: str = "",
+    ) -> dict[str, Any]:
+        """Build the normalized inputs that identify a generation request.
+
+        Args:
+            prompt: User prompt.
+            content: Optional content items.
+            brand_colors: Optional brand colors.
+            brand_fonts: Optional brand fonts.
+            formality: Style formality.
+            num_variations: Number of variations requested.
+            engine: Identifier of the engine configuration serving the request.
+
+        Returns:
+            Inputs dict suitable for hashing.
+        """
+        return {
+            "prompt": normalize_prompt(prompt),
+            "content": content or None,
+            "brand_colors": brand_colors or None,
+            "brand_fonts": brand_fonts or None,
+            "formality": formality,
+            "num_variations": num_variations,
+            "engine": engine,
+        }
+
+    def get_result(self, inputs: dict[str, Any]) -> dict[str, Any] | None:
+        """Get a cached full generation result."""
+        return self._get("result", inputs)
+
+    def set_result(self, inputs: dict[str, Any], result: dict[str, Any]) -> None:
+        """Cache a full generation result."""
+        self._set("result", inputs, result)
+
+    def get_stage(self, stage: str, inputs: dict[str, Any]) -> dict[str, Any] | None:
+        """Get a cached pipeline stage result."""
+        if "prompt" in inputs:
+            inputs = {**inputs, "prompt": normalize_prompt(inputs["prompt"])}
+        return self._get(stage, inputs)
+
+    def set_stage(self, stage: str, inputs: dict[str, Any], value: dict[str, Any]) -> None:
+        """Cache a pipeline stage result."""
+        if "prompt" in inputs:
+            inputs = {**inputs, "prompt": normalize_prompt(inputs["prompt"])}
+        self._set(stage, inputs, value)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Get hit/miss counters per stage."""
+        with self._lock:
+            return {stage: s.to_dict() for stage, s in self._stats.items()}
+
+    def reset_stats(self) -> None:
+        """Zero all hit/miss counters."""
+        with self._lock:
+            self._stats = {stage: StageStats() for stage in STAGES}
+
+
+def _result_payload(result: Any) -> dict[str, Any]:
+    """Cacheable payload of an ``InferenceResult``, without variations."""
+    return {
+        "archetype": result.archetype,
+        "archetype_confidence": result.classification_confidence,
+        "dsl": result.dsl,
+        "style": {
+            "color_palette": result.style.color_palette,
+            "font_family": result.style.font_family,
+            "corner_radius": result.style.corner_radius,
+            "shadow": result.style.shadow,
+            "glow": result.style.glow,
+        },
+        "variations": None,
+    }
+
+
+def run_cached_generation(
+    engine: Any,
+    prompt: str,
+    content: list[dict] | None = None,
+    brand_colors: list[str] | None = None,
+    brand_fonts: list[str] | None = None,
+    formality: str = "professional",
+    num_variations: int = 1,
+    cache: GenerationCache | None = None,
+    on_progress: Callable[..., None] | None = None,
+) -> dict[str, Any]:
+    """Run a generation through the cache.
+
+    A full-result hit returns without touching the engine. On a miss, the
+    engine runs with per-stage caching and the result is stored.
+
+    Args:
+        engine: ``InferenceEngine`` to run on a miss.
+        prompt: User prompt.
+        content: Optional content items.
+        brand_colors: Optional brand colors.
+        brand_fonts: Optional brand fonts.
+        formality: Style formality.
+        num_variations: Number of variations to generate.
+        cache: Generation cache. Defaults to the process-wide cache.
+        on_progress: Optional stage callback passed to the engine. Not
+            called on a full-result hit.
+
+    Returns:
+        Dict with ``archetype``, ``archetype_confidence``, ``dsl``, ``style``,
+        ``variations`` and ``cached`` (True on a full-result hit).
+    """
+    cache = cache or get_generation_cache()
+    inputs = cache.request_inputs(
+        prompt=prompt,
+        content=content,
+        brand_colors=brand_colors,
+        brand_fonts=brand_fonts,
+        formality=formality,
+        num_variations=num_variations,
+        engine=f"{engine.models_dir}:{engine.use_ml}",
+    )
+
+    cached = cache.get_result(inputs)
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    result = engine.generate(
+        prompt=prompt,
+        content=content,
+        brand_colors=brand_colors,
+        brand_fonts=brand_fonts,
+        formality=formality,
+        cache=cache,
+        on_progress=on_progress,
+    )
+
+    variations = None
+    if num_variations > 1:
+        variation_results = engine.generate_variations(
+            prompt=prompt,
+            count=num_variations,
+            content=content,
+            brand_colors=brand_colors,
+            brand_fonts=brand_fonts,
+            formality=formality,
+            cache=cache,
+            on_progress=on_progress,
+        )
+        variations = [v.dsl for v in variation_results]
+
+    payload = {**_result_payload(result), "variations": variations}
+    cache.set_result(inputs, payload)
+    return {**payload, "cached": False}
+
+
+def run_cached_batch(
+    engine: Any,
+    prompts: list[str],
+    contents: list[list[dict] | None] | None = None,
+    brand_colors: list[str] | None = None,
+    brand_fonts: list[str] | None = None,
+    formality: str = "professional",
+    cache: GenerationCache | None = None,
+) -> list[dict[str, Any]]:
+    """Run a batch of single-variation generations through the cache.
+
+    Full-result entries are shared with ``run_cached_generation``. The
+    prompts that miss run through ``engine.generate_batch`` together; if
+    the batch fails, they are retried one by one so a bad prompt only fails
+    its own item.
+
+    Args:
+        engine: ``InferenceEngine`` to run on a miss.
+        prompts: User prompts.
+        contents: Optional content items for each prompt.
+        brand_colors: Optional brand colors for all prompts.
+        brand_fonts: Optional brand fonts for all prompts.
+        formality: Style formality.
+        cache: Generation cache. Defaults to the process-wide cache.
+
+    Returns:
+        One dict per prompt, in order: the keys of ``run_cached_generation``,
+        or ``error`` if that prompt failed.
+    """
+    cache = cache or get_generation_cache()
+    contents = contents or [None] * len(prompts)
+    inputs = [
+        cache.request_inputs(
+            prompt=prompt,
+            content=content,
+            brand_colors=brand_colors,
+            brand_fonts=brand_fonts,
+            formality=formality,
+            engine=f"{engine.models_dir}:{engine.use_ml}",
+        )
+        for prompt, content in zip(prompts, contents)
+    ]
+
+    outcomes: list[dict[str, Any] | None] = []
+    for item_inputs in inputs:
+        cached = cache.get_result(item_inputs)
+        outcomes.append({**cached, "cached": True} if cached is not None else None)
+
+    missing = [index for index, outcome in enumerate(outcomes) if outcome is None]
+    if not missing:
+        return outcomes
+
+    shared = {
+        "brand_colors": brand_colors,
+        "brand_fonts": brand_fonts,
+        "formality": formality,
+        "cache": cache,
+    }
+    try:
+        results = engine.generate_batch(
+            [prompts[index] for index in missing],
+            contents=[contents[index] for index in missing],
+            **shared,
+        )
+    except Exception:
+        results = []
+        for index in missing:
+            try:
+                results.append(engine.generate(prompts[index], content=contents[index], **shared))
+            except Exception as e:
+                results.append(e)
+
+    for index, result in zip(missing, results):
+        if isinstance(result, Exception):
+            outcomes[index] = {"error": str(result)}
+            continue
+        payload = _result_payload(result)
+        cache.set_result(inputs[index], payload)
+        outcomes[index] = {**payload, "cached": False}
+    return outcomes
+
+
+# Process-wide generation cache (lazy initialized)
+_generation_cache: GenerationCache | None = None
+_generation_cache_lock = threading.Lock()
+
+
+def get_generation_cache() -> GenerationCache:
+    """Get the process-wide generation cache."""
+    global _generation_cache
+    if _generation_cache is None:
+        with _generation_cache_lock:
+            if _generation_cache is None:
+                _generation_cache = GenerationCache()
+    return _generation_cache
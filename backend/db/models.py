@@ -231,6 +231,10 @@ class Generation(Base):
     processing_time_ms = Column(Integer, nullable=True)
     model_version = Column(String(50), nullable=True)
 
+    # Batch this generation belongs to, and its position in it
+    batch_id = Column(String(36), ForeignKey("generation_batches.id", ondelete="CASCADE"), nullable=True, index=True)
+    batch_index = Column(Integer, nullable=True)
+
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     completed_at = Column(DateTime, nullable=True)
@@ -238,11 +242,53 @@ class Generation(Base):
     # Relationships
     user = relationship("User", back_populates="generations")
     downloads = relationship("Download", back_populates="generation", cascade="all, delete-orphan")
+    batch = relationship("GenerationBatch", back_populates="generations")
 
     def __repr__(self) -> str:
         return f"<Generation {self.id[:8]} ({self.status})>"
 
 
+class GenerationBatch(Base):
+    """Batch generation job: many prompts sharing brand settings."""
+
+    __tablename__ = "generation_batches"
+
+    id = Column(String(36), primary_key=True, default=generate_uuid)
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    # Settings shared by every item
+    brand_colors = Column(JSON, nullable=True)
+    brand_fonts = Column(JSON, nullable=True)
+    formality = Column(String(20), default="professional")
+    combine_pptx = Column(Boolean, default=False)
+
+    # Status
+    status = Column(SQLEnum(GenerationStatus), default=GenerationStatus.PENDING)
+    item_count = Column(Integer, nullable=False)
+    error_message = Column(Text, nullable=True)
+
+    # Combined deck of the completed items, if requested
+    pptx_path = Column(String(500), nullable=True)
+
+    # Metadata
+    processing_time_ms = Column(Integer, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+
+    # Relationships
+    generations = relationship(
+        "Generation",
+        back_populates="batch",
+        order_by="Generation.batch_index",
+        cascade="all, delete-orphan",
+    )
+
+    def __repr__(self) -> str:
+        return f"<GenerationBatch {self.id[:8]} ({self.item_count} items, {self.status})>"
+
+
 class Download(Base):
     """Download record model."""
 
@@ -255,6 +301,12 @@ class Download(Base):
     format = Column(String(10), nullable=False)  # pptx, pdf, png, svg
     file_path = Column(String(500), nullable=False)
     file_size = Column(Integer, nullable=True)
+    artifact_hash = Column(
+        String(64),
+        ForeignKey("render_artifacts.content_hash"),
+        nullable=True,
+        index=True,
+    )
 
     # Variation index (if applicable)
     variation_index = Column(Integer, nullable=True)
@@ -265,11 +317,43 @@ class Download(Base):
 
     # Relationships
     generation = relationship("Generation", back_populates="downloads")
+    artifact = relationship("RenderArtifact", back_populates="downloads")
 
     def __repr__(self) -> str:
         return f"<Download {self.format} for {self.generation_id[:8]}>"
 
 
+class RenderArtifact(Base):
+    """Content-addressed rendered file shared by downloads.
+
+    Keyed by a hash of the canonical DSL, output format and renderer
+    version, so identical scenes are rendered and stored once.
+    """
+
+    __tablename__ = "render_artifacts"
+
+    content_hash = Column(String(64), primary_key=True)
+    format = Column(String(10), nullable=False)
+    renderer_version = Column(String(20), nullable=False)
+
+    # File info
+    file_path = Column(String(500), nullable=False)
+    file_size = Column(Integer, nullable=True)
+
+    # Number of downloads pointing at this file
+    ref_count = Column(Integer, default=0, nullable=False)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    downloads = relationship("Download", back_populates="artifact")
+
+    def __repr__(self) -> str:
+        return f"<RenderArtifact {self.content_hash[:12]} ({self.ref_count} refs)>"
+
+
 class Template(Base):
     """Custom template model (Pro+)."""
 
@@ -22,6 +22,7 @@ from backend.dsl.schema import (
     ThemeColors,
     Transform,
 )
+from backend.dsl.columnar import SceneGeometry
 
 __all__ = [
     "BoundingBox",
@@ -33,6 +34,7 @@ __all__ = [
     "GradientFill",
     "GradientStop",
     "PathCommand",
+    "SceneGeometry",
     "Shadow",
     "Shape",
     "ShapeType",
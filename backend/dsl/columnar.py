@@ -0,0 +1,197 @@
+"""Columnar view of scene geometry.
+
+Layout code that walks shapes one by one pays for several attribute
+lookups per shape and runs its math in the interpreter. ``SceneGeometry``
+copies x/y/width/height/rotation into NumPy arrays once, so scene-wide
+checks and transforms run as vectorized operations, and writes results
+back to the shapes (or DSL dicts) in a single pass.
+
+Views built from ``Shape`` models hold int64 EMUs, so integer arithmetic
+(floor division for centers, exact sums) matches ``BoundingBox``. Views
+built from DSL dicts hold float64, since variation operators write
+fractional positions.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from backend.dsl.schema import BoundingBox, Shape, SlideScene
+
+# Columns a view carries, in constructor order
+DICT_FIELDS = ("x", "y", "width", "height", "rotation")
+
+
+@dataclass
+class SceneGeometry:
+    """Shape geometry as parallel NumPy arrays, one row per shape."""
+
+    x: np.ndarray
+    y: np.ndarray
+    width: np.ndarray
+    height: np.ndarray
+    rotation: np.ndarray
+    # Source bbox dicts for views built from DSL dicts (None where missing)
+    bboxes: list[dict[str, Any] | None] | None = None
+
+    @classmethod
+    def from_shapes(cls, shapes: Sequence[Shape]) -> "SceneGeometry":
+        """Build a view of ``Shape`` models.
+
+        Args:
+            shapes: Shapes in row order.
+
+        Returns:
+            Geometry with int64 position and size columns.
+        """
+        coords = np.array(
+            [(s.bbox.x, s.bbox.y, s.bbox.width, s.bbox.height) for s in shapes],
+            dtype=np.int64,
+        ).reshape(-1, 4)
+        rotation = np.fromiter(
+            (s.transform.rotation for s in shapes), dtype=np.float64, count=len(shapes)
+        )
+        return cls(
+            x=coords[:, 0],
+            y=coords[:, 1],
+            width=coords[:, 2],
+            height=coords[:, 3],
+            rotation=rotation,
+        )
+
+    @classmethod
+    def from_scene(cls, scene: SlideScene) -> "SceneGeometry":
+        """Build a view of a scene's top-level shapes."""
+        return cls.from_shapes(scene.shapes)
+
+    @classmethod
+    def from_dicts(
+        cls,
+        shapes: Sequence[dict[str, Any]],
+        default_width: float = 0,
+        default_height: float = 0,
+        fields: Sequence[str] = DICT_FIELDS,
+    ) -> "SceneGeometry":
+        """Build a view of DSL shape dicts.
+
+        Missing keys read as 0 (or the given size defaults), as the dict
+        based operators treat them. Reading a column costs about as much as
+        the per-shape loop it replaces, so callers list only the columns
+        they use.
+
+        Args:
+            shapes: Shape dicts in row order.
+            default_width: Width for bboxes without one.
+            default_height: Height for bboxes without one.
+            fields: Columns to read; the others are left as zeros.
+
+        Returns:
+            Geometry with float64 columns that can write back into the dicts.
+        """
+        bboxes = [s.get("bbox") for s in shapes]
+        empty: dict[str, Any] = {}
+        sources = [b or empty for b in bboxes]
+        defaults = {"x": 0, "y": 0, "width": default_width, "height": default_height}
+
+        columns = {}
+        for name in DICT_FIELDS:
+            if name not in fields:
+                columns[name] = np.zeros(len(shapes))
+            elif name == "rotation":
+                columns[name] = np.fromiter(
+                    ((s.get("transform") or empty).get("rotation", 0) for s in shapes),
+                    dtype=np.float64,
+                    count=len(shapes),
+                )
+            else:
+                default = defaults[name]
+                columns[name] = np.fromiter(
+                    (b.get(name, default) for b in sources),
+                    dtype=np.float64,
+                    count=len(shapes),
+                )
+        return cls(**columns, bboxes=bboxes)
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    @property
+    def right(self) -> np.ndarray:
+        """Right edges."""
+        return self.x + self.width
+
+    @property
+    def bottom(self) -> np.ndarray:
+        """Bottom edges."""
+        return self.y + self.height
+
+    @property
+    def center_x(self) -> np.ndarray:
+        """Horizontal centers, rounded down like ``BoundingBox.center_x``."""
+        return self.x + self.width // 2
+
+    @property
+    def center_y(self) -> np.ndarray:
+        """Vertical centers, rounded down like ``BoundingBox.center_y``."""
+        return self.y + self.height // 2
+
+    @property
+    def has_bbox(self) -> np.ndarray:
+        """Rows whose dict has a non-empty bbox (all rows for model views)."""
+        if self.bboxes is None:
+            return np.ones(len(self), dtype=bool)
+        return np.array([bool(b) for b in self.bboxes], dtype=bool)
+
+    def to_shapes(self, shapes: Sequence[Shape]) -> list[Shape]:
+        """Write geometry back to ``Shape`` models.
+
+        Only shapes whose bounding box changed are copied; the rest are
+        returned as-is.
+
+        Args:
+            shapes: The shapes this view was built from, in row order.
+
+        Returns:
+            Updated shapes.
+        """
+        result = []
+        for shape, x, y, width, height in zip(
+            shapes,
+            self.x.tolist(),
+            self.y.tolist(),
+            self.width.tolist(),
+            self.height.tolist(),
+            strict=True,
+        ):
+            bbox = shape.bbox
+            if x != bbox.x or y != bbox.y or width != bbox.width or height != bbox.height:
+                shape = shape.with_updates(
+                    bbox=BoundingBox(x=x, y=y, width=width, height=height)
+                )
+            result.append(shape)
+        return result
+
+    def to_dicts(
+        self,
+        rows: np.ndarray | None = None,
+        fields: Sequence[str] = ("x", "y"),
+    ) -> None:
+        """Write columns back into the source bbox dicts in place.
+
+        Args:
+            rows: Boolean mask of rows to write. Defaults to every row.
+            fields: Columns to write.
+        """
+        if self.bboxes is None:
+            raise ValueError("Geometry was not built from DSL dicts")
+        columns = [(name, getattr(self, name).tolist()) for name in fields]
+        indices = range(len(self)) if rows is None else np.flatnonzero(rows).tolist()
+        for i in indices:
+            bbox = self.bboxes[i]
+            if bbox is None:
+                continue
+            for name, values in columns:
+                bbox[name] = values[i]
+
@@ -356,6 +356,22 @@ class Shape(BaseModel):
     # Metadata
     metadata: dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
 
+    def with_updates(self, **changes: Any) -> "Shape":
+        """Copy the shape with some fields replaced.
+
+        Unchanged fields (fill, effects, text, children) are shared with this
+        shape rather than dumped and re-validated, so moving a group does not
+        rebuild its children. Shapes are frozen, so sharing is safe.
+
+        Args:
+            **changes: Field values to replace. They are not validated, so
+                pass model instances (e.g. a ``BoundingBox``), not dicts.
+
+        Returns:
+            Updated shape.
+        """
+        return self.model_copy(update=changes)
+
 
 # ============================================================================
 # Canvas & Scene Models
@@ -11,16 +11,36 @@ Renders DSL scene graphs to pixel-perfect PPTX files including:
 - Transform properties (rotation, flip_h, flip_v)
 """
 
+from backend.renderer.fast_writer import FastPPTXWriter, SlideXMLRenderer, render_slide_xml
+from backend.renderer.parallel import (
+    ParallelPPTXWriter,
+    get_render_pool,
+    shutdown_render_pool,
+)
 from backend.renderer.path_renderer import PathRenderer
-from backend.renderer.pptx_writer import PPTXWriter
+from backend.renderer.pptx_writer import (
+    RENDERER_VERSION,
+    PPTXWriter,
+    render_to_pptx,
+    scene_from_dsl,
+)
 from backend.renderer.shape_renderer import ShapeRenderer
 from backend.renderer.style_renderer import StyleRenderer
 from backend.renderer.text_renderer import TextRenderer
 
 __all__ = [
+    "FastPPTXWriter",
+    "get_render_pool",
+    "ParallelPPTXWriter",
     "PathRenderer",
     "PPTXWriter",
+    "RENDERER_VERSION",
+    "render_to_pptx",
+    "render_slide_xml",
+    "scene_from_dsl",
     "ShapeRenderer",
+    "shutdown_render_pool",
+    "SlideXMLRenderer",
     "StyleRenderer",
     "TextRenderer",
 ]
@@ -0,0 +1,995 @@
+"""Template-based fast PPTX writer.
+
+``PPTXWriter`` builds every slide through python-pptx's object model, which
+creates and mutates an lxml element per attribute. This writer produces the
+same package by serializing DrawingML straight from the scene graph:
+
+* The blank presentation package is saved and parsed once per process
+  (``PackageTemplate``). Only ``presentation.xml``, its relationships and
+  ``[Content_Types].xml`` are patched per deck; every other part is copied
+  verbatim.
+* Each ``SlideScene`` is rendered to slide XML text by ``SlideXMLRenderer``.
+  Rendering a slide is independent of the rest of the deck, so slides can be
+  rendered in any order or process and assembled afterwards.
+* Parts are written into the zip in a single pass, slides as they are
+  rendered and ``[Content_Types].xml`` last, so ``stream`` can send a deck
+  while it is still being rendered.
+
+The output is XML-equivalent (canonical XML) to ``PPTXWriter``, including its
+quirks, so the two writers are interchangeable.
+"""
+
+import posixpath
+import re
+import threading
+import zipfile
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO
+
+from lxml import etree
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.spec import default_content_types
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import qn
+from pptx.oxml.simpletypes import ST_Angle, ST_PositiveFixedAngle, ST_PositiveFixedPercentage
+from pptx.parts.image import Image
+from pptx.shapes.autoshape import AutoShapeType
+from pptx.util import Emu, Pt
+
+from backend.dsl.schema import (
+    DashStyle,
+    Effects,
+    Fill,
+    GradientFill,
+    NoFill,
+    PathCommand,
+    PathCommandType,
+    Shape,
+    ShapeType,
+    SlideScene,
+    SolidFill,
+    Stroke,
+    TextContent,
+    ThemeColors,
+)
+from backend.renderer.path_renderer import PathRenderer
+from backend.renderer.shape_renderer import AUTO_SHAPE_MAP
+from backend.renderer.style_renderer import StyleRenderer
+from backend.renderer.text_renderer import TextRenderer
+
+PRESENTATION_PART = "ppt/presentation.xml"
+PRESENTATION_RELS_PART = "ppt/_rels/presentation.xml.rels"
+CONTENT_TYPES_PART = "[Content_Types].xml"
+
+# Fixed zip timestamp so identical decks produce identical bytes
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Target size of the chunks yielded by FastPPTXWriter.stream
+STREAM_CHUNK_SIZE = 64 * 1024
+
+XML_HEADER = "<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n"
+
+SLIDE_OPEN = (
+    '<p:sld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+    ' xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main"'
+    ' xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    "<p:cSld>"
+)
+SPTREE_OPEN = (
+    '<p:spTree><p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+    "<p:grpSpPr/>"
+)
+SLIDE_CLOSE = (
+    "</p:spTree></p:cSld><p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sld>"
+)
+
+RELS_OPEN = '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+
+# p:style blocks python-pptx adds to new auto shapes and connectors
+SHAPE_STYLE = (
+    '<p:style><a:lnRef idx="1"><a:schemeClr val="accent1"/></a:lnRef>'
+    '<a:fillRef idx="3"><a:schemeClr val="accent1"/></a:fillRef>'
+    '<a:effectRef idx="2"><a:schemeClr val="accent1"/></a:effectRef>'
+    '<a:fontRef idx="minor"><a:schemeClr val="lt1"/></a:fontRef></p:style>'
+)
+CONNECTOR_STYLE = (
+    '<p:style><a:lnRef idx="2"><a:schemeClr val="accent1"/></a:lnRef>'
+    '<a:fillRef idx="0"><a:schemeClr val="accent1"/></a:fillRef>'
+    '<a:effectRef idx="1"><a:schemeClr val="accent1"/></a:effectRef>'
+    '<a:fontRef idx="minor"><a:schemeClr val="tx1"/></a:fontRef></p:style>'
+)
+EMPTY_SHAPE_TEXT = (
+    '<p:txBody><a:bodyPr rtlCol="0" anchor="ctr"/><a:lstStyle/>'
+    '<a:p><a:pPr algn="ctr"/></a:p></p:txBody>'
+)
+EMPTY_TEXTBOX_TEXT = (
+    '<p:txBody><a:bodyPr wrap="none"><a:spAutoFit/></a:bodyPr><a:lstStyle/><a:p/></p:txBody>'
+)
+
+# Default stops of a new python-pptx gradient fill
+DEFAULT_GRADIENT_STOPS = (
+    '<a:gs pos="0"><a:schemeClr val="accent1"><a:tint val="100000"/>'
+    '<a:shade val="100000"/><a:satMod val="130000"/></a:schemeClr></a:gs>',
+    '<a:gs pos="100000"><a:schemeClr val="accent1"><a:tint val="50000"/>'
+    '<a:shade val="100000"/><a:satMod val="350000"/></a:schemeClr></a:gs>',
+)
+
+DASH_VALUES = {
+    DashStyle.SOLID: "solid",
+    DashStyle.DASH: "dash",
+    DashStyle.DOT: "sysDot",
+    DashStyle.DASH_DOT: "dashDot",
+    DashStyle.LONG_DASH: "lgDash",
+}
+ALIGN_VALUES = {"left": "l", "center": "ctr", "right": "r", "justify": "just"}
+ANCHOR_VALUES = {"top": "t", "middle": "ctr", "bottom": "b"}
+
+# bodyPr inset defaults; python-pptx omits attributes equal to these
+DEFAULT_INSETS = (
+    ("lIns", "margin_left", 91440),
+    ("rIns", "margin_right", 91440),
+    ("tIns", "margin_top", 45720),
+    ("bIns", "margin_bottom", 45720),
+)
+
+EMU_PER_INCH = 914400
+
+_CTRL_CHARS = re.compile(r"([\x00-\x08\x0B-\x1F])")
+
+
+def _text(value: str) -> str:
+    """Escape element text the way lxml serializes it."""
+    value = value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return value.replace("\r", "&#13;")
+
+
+def _attr(value: str) -> str:
+    """Escape an attribute value the way lxml serializes it."""
+    value = value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return (
+        value.replace('"', "&quot;")
+        .replace("\n", "&#10;")
+        .replace("\r", "&#13;")
+        .replace("\t", "&#9;")
+    )
+
+
+def _run_text(value: str) -> str:
+    """Escape run text, including python-pptx's ``_xHHHH_`` control-char escapes."""
+    return _text(_CTRL_CHARS.sub(lambda m: f"_x{ord(m.group(1)):04X}_", value))
+
+
+@dataclass(frozen=True)
+class ImageRef:
+    """An image embedded by a slide, identified by content hash."""
+
+    path: str
+    sha1: str
+    ext: str
+    content_type: str
+
+
+@dataclass
+class SlidePart:
+    """Serialized slide XML plus the images it embeds.
+
+    ``images[i]`` is the target of relationship ``rId{i + 2}``; ``rId1`` is
+    always the slide layout.
+    """
+
+    xml: bytes
+    images: list[ImageRef] = field(default_factory=list)
+
+
+class _SlideContext:
+    """Per-slide rendering state: shape ids, image rIds and color lookups."""
+
+    def __init__(self, theme: ThemeColors):
+        self.theme = theme
+        self.next_id = 2
+        self.images: list[ImageRef] = []
+        self.image_rids: dict[str, str] = {}
+        self.colors: dict[tuple[str, str], str] = {}
+
+    def take_id(self) -> int:
+        shape_id = self.next_id
+        self.next_id += 1
+        return shape_id
+
+    def image_rid(self, ref: ImageRef) -> str:
+        # The same image twice on a slide shares one relationship
+        rid = self.image_rids.get(ref.sha1)
+        if rid is None:
+            self.images.append(ref)
+            rid = f"rId{len(self.images) + 1}"
+            self.image_rids[ref.sha1] = rid
+        return rid
+
+
+class SlideXMLRenderer:
+    """Serializes a SlideScene to slide XML without the python-pptx object model."""
+
+    def __init__(self) -> None:
+        """Initialize the slide renderer."""
+        self.style_renderer = StyleRenderer()
+        self.text_renderer = TextRenderer()
+        self.path_renderer = PathRenderer()
+        self._images: dict[str, tuple[ImageRef, int, int] | None] = {}
+
+    def render(self, scene: SlideScene) -> SlidePart:
+        """Render one scene to slide XML.
+
+        Args:
+            scene: The SlideScene to render.
+
+        Returns:
+            SlidePart with the slide XML and embedded image references.
+        """
+        ctx = _SlideContext(scene.theme)
+        out = [XML_HEADER, SLIDE_OPEN]
+        self._background(out, scene.canvas.background)
+        out.append(SPTREE_OPEN)
+
+        for shape in sorted(scene.shapes, key=lambda s: s.z_index):
+            self._shape(out, shape, ctx)
+
+        out.append(SLIDE_CLOSE)
+        return SlidePart(xml="".join(out).encode("utf-8"), images=ctx.images)
+
+    # ------------------------------------------------------------------
+    # Colors
+
+    def _color(self, color: str, ctx: _SlideContext) -> str:
+        key = ("style", color)
+        value = ctx.colors.get(key)
+        if value is None:
+            value = str(self.style_renderer._resolve_color(color, ctx.theme))
+            ctx.colors[key] = value
+        return value
+
+    def _text_color(self, color: str, ctx: _SlideContext) -> str:
+        key = ("text", color)
+        value = ctx.colors.get(key)
+        if value is None:
+            value = str(self.text_renderer._resolve_color(color, ctx.theme))
+            ctx.colors[key] = value
+        return value
+
+    # ------------------------------------------------------------------
+    # Shapes
+
+    def _shape(self, out: list[str], shape: Shape, ctx: _SlideContext) -> None:
+        if shape.type == ShapeType.AUTO_SHAPE:
+            self._auto_shape(out, shape, ctx)
+        elif shape.type == ShapeType.TEXT:
+            self._text_box(out, shape, ctx)
+        elif shape.type == ShapeType.IMAGE:
+            self._image(out, shape, ctx)
+        elif shape.type == ShapeType.GROUP:
+            # Groups are flattened, matching ShapeRenderer
+            for child in shape.children or ():
+                self._shape(out, child, ctx)
+        elif shape.type == ShapeType.FREEFORM:
+            self._freeform(out, shape, ctx)
+        elif shape.type == ShapeType.CONNECTOR:
+            self._connector(out, shape, ctx)
+
+    def _xfrm(self, shape: Shape, x: int, y: int, cx: int, cy: int) -> str:
+        transform = shape.transform
+        attrs = ""
+        if transform.rotation != 0:
+            attrs += f' rot="{ST_Angle.convert_to_xml(transform.rotation)}"'
+        if transform.flip_h:
+            attrs += ' flipH="1"'
+        if transform.flip_v:
+            attrs += ' flipV="1"'
+        return f'<a:xfrm{attrs}><a:off x="{x}" y="{y}"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+
+    def _auto_shape(
+        self,
+        out: list[str],
+        shape: Shape,
+        ctx: _SlideContext,
+        geometry: str | None = None,
+        basename: str | None = None,
+    ) -> None:
+        if geometry is None:
+            shape_type_name = (shape.auto_shape_type or "rectangle").lower()
+            prst, basename = _autoshape_info(AUTO_SHAPE_MAP.get(shape_type_name, MSO_SHAPE.RECTANGLE))
+            geometry = f'<a:prstGeom prst="{prst}"><a:avLst/></a:prstGeom>'
+
+        shape_id = ctx.take_id()
+        bbox = shape.bbox
+        out.append(
+            f'<p:sp><p:nvSpPr><p:cNvPr id="{shape_id}" name="{basename} {shape_id - 1}"/>'
+            f"<p:cNvSpPr/><p:nvPr/></p:nvSpPr><p:spPr>"
+        )
+        out.append(self._xfrm(shape, bbox.x, bbox.y, bbox.width, bbox.height))
+        out.append(geometry)
+        out.append(self._fill(shape.fill, ctx, default=""))
+        out.append(self._line(shape.stroke, ctx))
+        out.append(self._effects(shape.effects))
+        out.append("</p:spPr>")
+        out.append(SHAPE_STYLE)
+        if shape.text and shape.text.runs:
+            out.append(self._text_body(shape.text, ctx, textbox=False))
+        else:
+            out.append(EMPTY_SHAPE_TEXT)
+        out.append("</p:sp>")
+
+    def _text_box(self, out: list[str], shape: Shape, ctx: _SlideContext) -> None:
+        shape_id = ctx.take_id()
+        bbox = shape.bbox
+        out.append(
+            f'<p:sp><p:nvSpPr><p:cNvPr id="{shape_id}" name="TextBox {shape_id - 1}"/>'
+            f'<p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr><p:spPr>'
+        )
+        out.append(self._xfrm(shape, bbox.x, bbox.y, bbox.width, bbox.height))
+        out.append('<a:prstGeom prst="rect"><a:avLst/></a:prstGeom><a:noFill/></p:spPr>')
+        if shape.text and shape.text.runs:
+            out.append(self._text_body(shape.text, ctx, textbox=True))
+        else:
+            out.append(EMPTY_TEXTBOX_TEXT)
+        out.append("</p:sp>")
+
+    def _image(self, out: list[str], shape: Shape, ctx: _SlideContext) -> None:
+        if not shape.image_path:
+            return
+
+        bbox = shape.bbox
+        loaded = self._load_image(shape.image_path)
+        if loaded is None:
+            # Unreadable image: grey placeholder rectangle, as ShapeRenderer does
+            shape_id = ctx.take_id()
+            out.append(
+                f'<p:sp><p:nvSpPr><p:cNvPr id="{shape_id}" name="Rectangle {shape_id - 1}"/>'
+                f"<p:cNvSpPr/><p:nvPr/></p:nvSpPr><p:spPr>"
+                f'<a:xfrm><a:off x="{bbox.x}" y="{bbox.y}"/>'
+                f'<a:ext cx="{bbox.width}" cy="{bbox.height}"/></a:xfrm>'
+                f'<a:prstGeom prst="rect"><a:avLst/></a:prstGeom>'
+                f'<a:solidFill><a:srgbClr val="CCCCCC"/></a:solidFill></p:spPr>'
+                f"{SHAPE_STYLE}{EMPTY_SHAPE_TEXT}</p:sp>"
+            )
+            return
+
+        ref, native_cx, native_cy = loaded
+        cx, cy = _scale_picture(bbox.width, bbox.height, native_cx, native_cy)
+        rid = ctx.image_rid(ref)
+        shape_id = ctx.take_id()
+        descr = _attr(posixpath.basename(shape.image_path.replace("\\", "/")))
+        out.append(
+            f'<p:pic><p:nvPicPr><p:cNvPr id="{shape_id}" name="Picture {shape_id - 1}" descr="{descr}"/>'
+            f'<p:cNvPicPr><a:picLocks noChangeAspect="1"/></p:cNvPicPr><p:nvPr/></p:nvPicPr>'
+            f'<p:blipFill><a:blip r:embed="{rid}"/><a:stretch><a:fillRect/></a:stretch></p:blipFill>'
+            f'<p:spPr><a:xfrm><a:off x="{bbox.x}" y="{bbox.y}"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+            f'<a:prstGeom prst="rect"><a:avLst/></a:prstGeom></p:spPr></p:pic>'
+        )
+
+    def _load_image(self, path: str) -> tuple[ImageRef, int, int] | None:
+        """Sniff an image once per renderer; None if python-pptx cannot embed it."""
+        if path in self._images:
+            return self._images[path]
+        try:
+            image = Image.from_file(path)
+            width_px, height_px = image.size
+            horz_dpi, vert_dpi = image.dpi
+            loaded = (
+                ImageRef(path=path, sha1=image.sha1, ext=image.ext, content_type=image.content_type),
+                int(EMU_PER_INCH * width_px / horz_dpi),
+                int(EMU_PER_INCH * height_px / vert_dpi),
+            )
+        except Exception:
+            loaded = None
+        self._images[path] = loaded
+        return loaded
+
+    def _connector(self, out: list[str], shape: Shape, ctx: _SlideContext) -> None:
+        shape_id = ctx.take_id()
+        bbox = shape.bbox
+        out.append(
+            f'<p:cxnSp><p:nvCxnSpPr><p:cNvPr id="{shape_id}" name="Connector {shape_id - 1}"/>'
+            f"<p:cNvCxnSpPr/><p:nvPr/></p:nvCxnSpPr><p:spPr>"
+            f'<a:xfrm><a:off x="{bbox.x}" y="{bbox.y}"/>'
+            f'<a:ext cx="{bbox.width}" cy="{bbox.height}"/></a:xfrm>'
+            f'<a:prstGeom prst="line"><a:avLst/></a:prstGeom>'
+        )
+        if shape.stroke:
+            out.append(self._line(shape.stroke, ctx))
+        out.append("</p:spPr>")
+        out.append(CONNECTOR_STYLE)
+        out.append("</p:cxnSp>")
+
+    def _freeform(self, out: list[str], shape: Shape, ctx: _SlideContext) -> None:
+        if not shape.path:
+            return
+
+        if not self.path_renderer._is_simple_path(shape.path):
+            self._complex_freeform(out, shape, ctx)
+            return
+
+        # Mirrors python-pptx's FreeformBuilder: only the first moveTo and
+        # the lineTo segments are used, normalized to their bounding box
+        start_x = start_y = 0
+        for cmd in shape.path:
+            if cmd.type == PathCommandType.MOVE_TO and cmd.x is not None:
+                start_x = cmd.x
+                start_y = cmd.y or 0
+                break
+        points = [(start_x, start_y)]
+        for cmd in shape.path:
+            if cmd.type == PathCommandType.LINE_TO and cmd.x is not None and cmd.y is not None:
+                points.append((cmd.x, cmd.y))
+
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        min_x, min_y = min(xs), min(ys)
+        width, height = max(xs) - min_x, max(ys) - min_y
+
+        segments = [f'<a:moveTo><a:pt x="{start_x - min_x}" y="{start_y - min_y}"/></a:moveTo>']
+        for x, y in points[1:]:
+            segments.append(f'<a:lnTo><a:pt x="{x - min_x}" y="{y - min_y}"/></a:lnTo>')
+
+        shape_id = ctx.take_id()
+        bbox = shape.bbox
+        out.append(
+            f'<p:sp><p:nvSpPr><p:cNvPr id="{shape_id}" name="Freeform {shape_id - 1}"/>'
+            f"<p:cNvSpPr/><p:nvPr/></p:nvSpPr><p:spPr>"
+        )
+        out.append(self._xfrm(shape, bbox.x + min_x, bbox.y + min_y, width, height))
+        out.append(
+            '<a:custGeom><a:avLst/><a:gdLst/><a:ahLst/><a:cxnLst/>'
+            '<a:rect l="l" t="t" r="r" b="b"/><a:pathLst>'
+            f'<a:path w="{width}" h="{height}">{"".join(segments)}</a:path>'
+            "</a:pathLst></a:custGeom>"
+        )
+        # The builder starts with an explicit noFill that pattern fills keep
+        out.append(self._fill(shape.fill, ctx, default="<a:noFill/>"))
+        out.append(self._line(shape.stroke, ctx))
+        out.append(self._effects(shape.effects))
+        out.append("</p:spPr>")
+        out.append(SHAPE_STYLE)
+        out.append(EMPTY_SHAPE_TEXT)
+        out.append("</p:sp>")
+
+    def _complex_freeform(self, out: list[str], shape: Shape, ctx: _SlideContext) -> None:
+        bbox = shape.bbox
+        geometry = (
+            '<a:custGeom><a:avLst/><a:gdLst/><a:cxnLst/><a:rect l="0" t="0" r="r" b="b"/>'
+            f'<a:pathLst><a:path w="{bbox.width}" h="{bbox.height}">{_path_commands(shape.path)}'
+            "</a:path></a:pathLst></a:custGeom>"
+        )
+        self._auto_shape(out, shape, ctx, geometry=geometry, basename="Rectangle")
+
+    # ------------------------------------------------------------------
+    # Styles
+
+    def _fill(self, fill: Fill, ctx: _SlideContext, default: str) -> str:
+        if isinstance(fill, NoFill) or fill.type == "none":
+            return "<a:noFill/>"
+        if isinstance(fill, SolidFill) or fill.type == "solid":
+            color = self._color(fill.color, ctx)
+            if fill.alpha < 1.0:
+                return (
+                    f'<a:solidFill><a:srgbClr val="{color}">'
+                    f'<a:alpha val="{int(fill.alpha * 100000)}"/></a:srgbClr></a:solidFill>'
+                )
+            return f'<a:solidFill><a:srgbClr val="{color}"/></a:solidFill>'
+        if isinstance(fill, GradientFill) or fill.type == "gradient":
+            # python-pptx only exposes the two default stops
+            stops = list(DEFAULT_GRADIENT_STOPS)
+            for i, stop in enumerate(fill.stops[: len(stops)]):
+                stops[i] = (
+                    f'<a:gs pos="{ST_PositiveFixedPercentage.convert_to_xml(stop.position)}">'
+                    f'<a:srgbClr val="{self._color(stop.color, ctx)}"/></a:gs>'
+                )
+            return (
+                f'<a:gradFill rotWithShape="1"><a:gsLst>{"".join(stops)}</a:gsLst>'
+                f"{_gradient_lin(fill)}</a:gradFill>"
+            )
+        return default
+
+    def _line(self, stroke: Stroke | None, ctx: _SlideContext) -> str:
+        if stroke is None:
+            return "<a:ln><a:noFill/></a:ln>"
+        width = f' w="{stroke.width}"' if stroke.width else ""
+        dash = DASH_VALUES.get(stroke.dash_style, "solid")
+        return (
+            f'<a:ln{width}><a:solidFill><a:srgbClr val="{self._color(stroke.color, ctx)}"/>'
+            f'</a:solidFill><a:prstDash val="{dash}"/></a:ln>'
+        )
+
+    def _effects(self, effects: Effects) -> str:
+        # StyleRenderer appends effectLst/sp3d in the order they are first needed
+        effect_list: list[str] = []
+        sp3d = ""
+        order: list[str] = []
+
+        if effects.shadow:
+            shadow = effects.shadow
+            effect_list.append(
+                f'<a:outerShdw blurRad="{shadow.blur_radius}" dist="{shadow.distance}"'
+                f' dir="{int(shadow.angle * 60000)}" algn="tl" rotWithShape="0">'
+                f'<a:srgbClr val="{_attr(shadow.color.lstrip("#"))}">'
+                f'<a:alpha val="{int(shadow.alpha * 100000)}"/></a:srgbClr></a:outerShdw>'
+            )
+            order.append("effectLst")
+        if effects.glow:
+            glow = effects.glow
+            effect_list.append(
+                f'<a:glow rad="{glow.radius}"><a:srgbClr val="{_attr(glow.color.lstrip("#"))}">'
+                f'<a:alpha val="{int(glow.alpha * 100000)}"/></a:srgbClr></a:glow>'
+            )
+            order.append("effectLst")
+        if effects.reflection:
+            r = effects.reflection
+            effect_list.append(
+                f'<a:reflection blurRad="{r.blur_radius}" stA="{int(r.start_alpha * 100000)}"'
+                f' endA="{int(r.end_alpha * 100000)}" dist="{r.distance}"'
+                f' dir="{int(r.direction * 60000)}" sx="{int(r.scale_x * 100000)}"'
+                f' sy="{int(r.scale_y * 100000)}" algn="bl" rotWithShape="0"/>'
+            )
+            order.append("effectLst")
+        if effects.bevel:
+            bevel = effects.bevel
+            sp3d = (
+                f'<a:sp3d><a:bevelT w="{bevel.width}" h="{bevel.height}"'
+                f' prst="{bevel.type}"/></a:sp3d>'
+            )
+            order.append("sp3d")
+        if effects.soft_edges:
+            effect_list.append(f'<a:softEdge rad="{effects.soft_edges}"/>')
+            order.append("effectLst")
+
+        parts = {
+            "effectLst": f"<a:effectLst>{''.join(effect_list)}</a:effectLst>",
+            "sp3d": sp3d,
+        }
+        return "".join(parts[name] for name in dict.fromkeys(order))
+
+    def _text_body(self, text: TextContent, ctx: _SlideContext, textbox: bool) -> str:
+        attrs = ' wrap="square"' if text.word_wrap else ' wrap="none"'
+        if not textbox:
+            attrs = ' rtlCol="0"' + attrs
+        for name, margin, default in DEFAULT_INSETS:
+            value = getattr(text, margin)
+            if value != default:
+                attrs += f' {name}="{value}"'
+        attrs += f' anchor="{ANCHOR_VALUES.get(text.vertical_alignment, "ctr")}"'
+
+        if text.auto_fit == "shrink":
+            autofit = "<a:normAutofit/>"
+        else:
+            autofit = "<a:spAutoFit/>" if textbox else ""
+        body_pr = f"<a:bodyPr{attrs}>{autofit}</a:bodyPr>" if autofit else f"<a:bodyPr{attrs}/>"
+
+        runs = []
+        for run in text.runs:
+            size = Emu(Pt(run.font_size / 100)).centipoints
+            runs.append(
+                f'<a:r><a:rPr sz="{size}" b="{int(run.bold)}" i="{int(run.italic)}"'
+                f' u="{"sng" if run.underline else "none"}"><a:solidFill>'
+                f'<a:srgbClr val="{self._text_color(run.color, ctx)}"/></a:solidFill>'
+                f'<a:latin typeface="{_attr(run.font_family)}"/></a:rPr>'
+                f"<a:t>{_run_text(run.text)}</a:t></a:r>"
+            )
+
+        align = ALIGN_VALUES.get(text.alignment, "l")
+        return (
+            f"<p:txBody>{body_pr}<a:lstStyle/>"
+            f'<a:p><a:pPr algn="{align}"/>{"".join(runs)}</a:p></p:txBody>'
+        )
+
+    def _background(self, out: list[str], fill: Fill) -> None:
+        if isinstance(fill, NoFill) or fill.type == "none":
+            return
+        if isinstance(fill, SolidFill) or fill.type == "solid":
+            color = str(self.style_renderer._parse_color(fill.color))
+            body = f'<a:solidFill><a:srgbClr val="{color}"/></a:solidFill>'
+        elif isinstance(fill, GradientFill) or fill.type == "gradient":
+            # Background gradients keep python-pptx's default stops
+            body = (
+                f'<a:gradFill rotWithShape="1"><a:gsLst>{"".join(DEFAULT_GRADIENT_STOPS)}'
+                f"</a:gsLst>{_gradient_lin(fill)}</a:gradFill>"
+            )
+        else:
+            return
+        out.append(f"<p:bg><p:bgPr>{body}<a:effectLst/></p:bgPr></p:bg>")
+
+
+def _path_commands(commands: list[PathCommand]) -> str:
+    """Serialize path commands, skipping incomplete ones as PathRenderer does."""
+    out = []
+    for cmd in commands:
+        if cmd.type == PathCommandType.MOVE_TO:
+            if cmd.x is not None and cmd.y is not None:
+                out.append(f'<a:moveTo><a:pt x="{cmd.x}" y="{cmd.y}"/></a:moveTo>')
+        elif cmd.type == PathCommandType.LINE_TO:
+            if cmd.x is not None and cmd.y is not None:
+                out.append(f'<a:lnTo><a:pt x="{cmd.x}" y="{cmd.y}"/></a:lnTo>')
+        elif cmd.type == PathCommandType.CURVE_TO:
+            if None not in (cmd.x, cmd.y, cmd.x1, cmd.y1, cmd.x2, cmd.y2):
+                out.append(
+                    f'<a:cubicBezTo><a:pt x="{cmd.x1}" y="{cmd.y1}"/><a:pt x="{cmd.x2}" y="{cmd.y2}"/>'
+                    f'<a:pt x="{cmd.x}" y="{cmd.y}"/></a:cubicBezTo>'
+                )
+        elif cmd.type == PathCommandType.QUAD_TO:
+            if None not in (cmd.x, cmd.y, cmd.x1, cmd.y1):
+                out.append(
+                    f'<a:quadBezTo><a:pt x="{cmd.x1}" y="{cmd.y1}"/>'
+                    f'<a:pt x="{cmd.x}" y="{cmd.y}"/></a:quadBezTo>'
+                )
+        elif cmd.type == PathCommandType.ARC_TO:
+            attrs = ""
+            if cmd.width_radius is not None:
+                attrs += f' wR="{cmd.width_radius}"'
+            if cmd.height_radius is not None:
+                attrs += f' hR="{cmd.height_radius}"'
+            if cmd.start_angle is not None:
+                attrs += f' stAng="{int(cmd.start_angle * 60000)}"'
+            if cmd.swing_angle is not None:
+                attrs += f' swAng="{int(cmd.swing_angle * 60000)}"'
+            out.append(f"<a:arcTo{attrs}/>")
+        elif cmd.type == PathCommandType.CLOSE:
+            out.append("<a:close/>")
+    return "".join(out)
+
+
+def _gradient_lin(fill: GradientFill) -> str:
+    """Linear gradient angle element; non-linear gradients keep the default."""
+    if fill.gradient_type.value == "linear":
+        angle = ST_PositiveFixedAngle.convert_to_xml(360.0 - fill.angle)
+        return f'<a:lin scaled="0" ang="{angle}"/>'
+    return '<a:lin scaled="0"/>'
+
+
+_AUTOSHAPE_INFO: dict[MSO_SHAPE, tuple[str, str]] = {}
+
+
+def _autoshape_info(mso_shape: MSO_SHAPE) -> tuple[str, str]:
+    """Preset geometry name and shape-name basename for an auto shape type."""
+    info = _AUTOSHAPE_INFO.get(mso_shape)
+    if info is None:
+        autoshape_type = AutoShapeType(mso_shape)
+        info = (autoshape_type.prst, autoshape_type.basename)
+        _AUTOSHAPE_INFO[mso_shape] = info
+    return info
+
+
+def _scale_picture(cx: int, cy: int, native_cx: int, native_cy: int) -> tuple[int, int]:
+    """Picture extents, following python-pptx's ImagePart.scale."""
+    if cx and cy:
+        return cx, cy
+    if cx:
+        return cx, int(round(native_cy * float(cx) / float(native_cx)))
+    if cy:
+        return int(round(native_cx * float(cy) / float(native_cy))), cy
+    return native_cx, native_cy
+
+
+class PackageTemplate:
+    """The blank presentation package, saved and parsed once.
+
+    Static parts are kept as bytes and copied verbatim into every deck.
+    """
+
+    def __init__(self) -> None:
+        """Build the template from python-pptx's default presentation."""
+        prs = Presentation()
+        buffer = BytesIO()
+        prs.save(buffer)
+
+        with zipfile.ZipFile(buffer) as archive:
+            self.part_names = [n for n in archive.namelist() if n != CONTENT_TYPES_PART]
+            self.parts = {name: archive.read(name) for name in self.part_names}
+            content_types = etree.fromstring(archive.read(CONTENT_TYPES_PART))
+
+        # Slides use the blank layout, as PPTXWriter does
+        layout = prs.slide_layouts[6].part.partname
+        self.layout_target = layout.relative_ref("/ppt/slides/")
+
+        self.defaults: dict[str, str] = {}
+        self.overrides: dict[str, str] = {}
+        for elem in content_types:
+            if elem.tag == qn("ct:Default"):
+                self.defaults[elem.get("Extension")] = elem.get("ContentType")
+            else:
+                self.overrides[elem.get("PartName")] = elem.get("ContentType")
+
+        rels = etree.fromstring(self.parts[PRESENTATION_RELS_PART])
+        used = {int(rel.get("Id")[3:]) for rel in rels if rel.get("Id", "").startswith("rId")}
+        self._next_rid = max(used, default=0) + 1
+
+    def presentation_xml(self, width: int, height: int, slide_count: int) -> bytes:
+        """presentation.xml with the slide list and slide size filled in."""
+        presentation = parse_xml(self.parts[PRESENTATION_PART])
+        presentation.get_or_add_sldSz()
+        presentation.sldSz.cx = Emu(width)
+        presentation.sldSz.cy = Emu(height)
+        sld_id_lst = presentation.get_or_add_sldIdLst()
+        for i in range(slide_count):
+            sld_id_lst._add_sldId(id=256 + i, rId=self.slide_rid(i))
+        return etree.tostring(presentation, encoding="UTF-8", standalone=True)
+
+    def presentation_rels_xml(self, slide_count: int) -> bytes:
+        """Presentation relationships with one entry per slide."""
+        rels = etree.fromstring(self.parts[PRESENTATION_RELS_PART])
+        for i in range(slide_count):
+            etree.SubElement(
+                rels,
+                qn("pr:Relationship"),
+                Id=self.slide_rid(i),
+                Type=RT.SLIDE,
+                Target=f"slides/slide{i + 1}.xml",
+            )
+        return etree.tostring(rels, encoding="UTF-8", standalone=True)
+
+    def slide_rid(self, index: int) -> str:
+        """Relationship id of the index-th slide in presentation.xml.rels."""
+        return f"rId{self._next_rid + index}"
+
+    def content_types_xml(self, slide_count: int, media: dict[str, str]) -> bytes:
+        """[Content_Types].xml for a deck.
+
+        Args:
+            slide_count: Number of slides.
+            media: Media part names (``ppt/media/image1.png``) to content types.
+        """
+        defaults = dict(self.defaults)
+        overrides = dict(self.overrides)
+        for i in range(slide_count):
+            overrides[f"/ppt/slides/slide{i + 1}.xml"] = CT.PML_SLIDE
+        for name, content_type in media.items():
+            ext = posixpath.splitext(name)[1][1:]
+            if (ext.lower(), content_type) in default_content_types:
+                defaults[ext] = content_type
+            else:
+                overrides[f"/{name}"] = content_type
+
+        out = [XML_HEADER, '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">']
+        for ext, content_type in sorted(defaults.items()):
+            out.append(f'<Default Extension="{_attr(ext)}" ContentType="{_attr(content_type)}"/>')
+        for part_name, content_type in sorted(overrides.items()):
+            out.append(f'<Override PartName="{_attr(part_name)}" ContentType="{_attr(content_type)}"/>')
+        out.append("</Types>")
+        return "".join(out).encode("utf-8")
+
+    def slide_rels_xml(self, image_targets: list[str]) -> bytes:
+        """Slide relationships: the layout, then one entry per image."""
+        out = [
+            XML_HEADER,
+            RELS_OPEN,
+            f'<Relationship Id="rId1" Type="{RT.SLIDE_LAYOUT}" Target="{self.layout_target}"/>',
+        ]
+        for i, target in enumerate(image_targets, start=2):
+            out.append(f'<Relationship Id="rId{i}" Type="{RT.IMAGE}" Target="{_attr(target)}"/>')
+        out.append("</Relationships>")
+        return "".join(out).encode("utf-8")
+
+
+# Process-wide package template (lazy initialized)
+_package_template: PackageTemplate | None = None
+_package_template_lock = threading.Lock()
+
+
+def get_package_template() -> PackageTemplate:
+    """Get the process-wide blank package template."""
+    global _package_template
+    if _package_template is None:
+        with _package_template_lock:
+            if _package_template is None:
+                _package_template = PackageTemplate()
+    return _package_template
+
+
+def render_slide_xml(scene: SlideScene) -> SlidePart:
+    """Render one scene to a standalone slide part.
+
+    Module-level so it can be shipped to worker processes.
+    """
+    return SlideXMLRenderer().render(scene)
+
+
+class FastPPTXWriter:
+    """Drop-in replacement for ``PPTXWriter`` that serializes XML directly."""
+
+    def __init__(self, template: PackageTemplate | None = None) -> None:
+        """Initialize the fast writer.
+
+        Args:
+            template: Package template. Defaults to the process-wide template.
+        """
+        self.template = template or get_package_template()
+
+    def iter_slides(self, scenes: list[SlideScene]) -> Iterator[SlidePart]:
+        """Render scenes to slide parts lazily, in order."""
+        # A fresh renderer per deck so image files are re-read on every write
+        renderer = SlideXMLRenderer()
+        for scene in scenes:
+            yield renderer.render(scene)
+
+    def render_slides(self, scenes: list[SlideScene]) -> list[SlidePart]:
+        """Render every scene to a slide part, in order."""
+        return list(self.iter_slides(scenes))
+
+    def iter_parts(
+        self,
+        scenes: list[SlideScene],
+        slides: Iterable[SlidePart] | None = None,
+    ) -> Iterator[tuple[str, bytes]]:
+        """Yield ``(part name, bytes)`` for every part of the package.
+
+        Slides are rendered as they are yielded and media is read one file
+        at a time, so only one slide is held in memory at once.
+
+        Args:
+            scenes: Scenes in slide order.
+            slides: Pre-rendered slide parts for ``scenes``, if available.
+
+        Yields:
+            Zip member names and their contents.
+        """
+        if not scenes:
+            raise ValueError("At least one scene is required")
+        if slides is None:
+            slides = self.iter_slides(scenes)
+
+        template = self.template
+        canvas = scenes[0].canvas
+        for name in template.part_names:
+            if name == PRESENTATION_PART:
+                yield name, template.presentation_xml(canvas.width, canvas.height, len(scenes))
+            elif name == PRESENTATION_RELS_PART:
+                yield name, template.presentation_rels_xml(len(scenes))
+            elif name != CONTENT_TYPES_PART:
+                yield name, template.parts[name]
+
+        # Deduplicate media across the deck by content hash, numbering parts
+        # in order of first use as python-pptx does
+        media: dict[str, str] = {}
+        media_paths: dict[str, str] = {}
+        media_names: dict[str, str] = {}
+        for i, slide in enumerate(slides, start=1):
+            for ref in slide.images:
+                if ref.sha1 not in media_names:
+                    name = f"ppt/media/image{len(media_names) + 1}.{ref.ext}"
+                    media_names[ref.sha1] = name
+                    media[name] = ref.content_type
+                    media_paths[name] = ref.path
+
+            yield f"ppt/slides/slide{i}.xml", slide.xml
+            targets = ["../media/" + posixpath.basename(media_names[ref.sha1]) for ref in slide.images]
+            yield f"ppt/slides/_rels/slide{i}.xml.rels", template.slide_rels_xml(targets)
+
+        for name, path in media_paths.items():
+            yield name, Path(path).read_bytes()
+
+        # Written last: the media types are only known once every slide is rendered
+        yield CONTENT_TYPES_PART, template.content_types_xml(len(scenes), media)
+
+    def stream(
+        self,
+        scenes: list[SlideScene],
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        """Render scenes to PPTX as an iterator of zip chunks.
+
+        Slides are rendered while the archive is being consumed, so the
+        package is never held in memory as a whole. Suitable as the body of
+        a ``StreamingResponse``.
+
+        Args:
+            scenes: List of SlideScene objects to render.
+            chunk_size: Compressed bytes to buffer before yielding a chunk.
+
+        Returns:
+            Iterator over consecutive chunks of the PPTX file.
+
+        Raises:
+            ValueError: If no scenes are given (raised before streaming starts).
+        """
+        if not scenes:
+            raise ValueError("At least one scene is required")
+        return _stream_zip(self.iter_parts(scenes), chunk_size)
+
+    def write(
+        self,
+        scenes: list[SlideScene],
+        output: str | Path | BinaryIO | None = None,
+        slides: Iterable[SlidePart] | None = None,
+    ) -> bytes | None:
+        """Write scene graphs to a PPTX file.
+
+        Args:
+            scenes: List of SlideScene objects to render.
+            output: Output path, file object, or None to return bytes.
+            slides: Pre-rendered slide parts for ``scenes``, if available.
+
+        Returns:
+            PPTX bytes if output is None, otherwise None.
+        """
+        parts = self.iter_parts(scenes, slides)
+        if output is None:
+            buffer = BytesIO()
+            _write_zip(buffer, parts)
+            return buffer.getvalue()
+        elif isinstance(output, (str, Path)):
+            with open(output, "wb") as f:
+                _write_zip(f, parts)
+            return None
+        else:
+            _write_zip(output, parts)
+            return None
+
+    def write_single(
+        self,
+        scene: SlideScene,
+        output: str | Path | BinaryIO | None = None,
+    ) -> bytes | None:
+        """Write a single scene to a PPTX file.
+
+        Args:
+            scene: SlideScene to render.
+            output: Output path, file object, or None to return bytes.
+
+        Returns:
+            PPTX bytes if output is None, otherwise None.
+        """
+        return self.write([scene], output)
+
+
+def _zip_info(name: str) -> zipfile.ZipInfo:
+    """Zip entry header with a fixed timestamp."""
+    info = zipfile.ZipInfo(name, date_time=ZIP_DATE_TIME)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.external_attr = 0o600 << 16
+    return info
+
+
+def _write_zip(stream: BinaryIO, parts: Iterator[tuple[str, bytes]]) -> None:
+    """Write package parts to a deflated zip archive."""
+    with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, data in parts:
+            archive.writestr(_zip_info(name), data)
+
+
+class _ChunkSink:
+    """Write-only, unseekable file object that buffers zip output."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        """Take everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        self.size = 0
+        return data
+
+
+def _stream_zip(parts: Iterator[tuple[str, bytes]], chunk_size: int) -> Iterator[bytes]:
+    """Zip package parts into an unseekable sink, yielding its output in chunks."""
+    # Without seek/tell, zipfile writes sizes in data descriptors after each
+    # entry instead of patching local headers, so output is strictly sequential
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, data in parts:
+            archive.writestr(_zip_info(name), data)
+            if sink.size >= chunk_size:
+                yield sink.drain()
+    if sink.size:
+        yield sink.drain()
@@ -0,0 +1,130 @@
+"""Multi-process rendering for large decks.
+
+Slides are independent once serialized by ``SlideXMLRenderer``: each one is
+rendered to a ``SlidePart`` in a process pool, and the package is assembled
+in the parent in a single pass by ``FastPPTXWriter``. Results are consumed in
+submission order, and media numbering and deduplication happen during
+assembly, so the output is byte-identical to a serial ``FastPPTXWriter`` run.
+"""
+
+import math
+import multiprocessing
+import os
+import threading
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from backend.dsl.schema import SlideScene
+from backend.renderer.fast_writer import (
+    FastPPTXWriter,
+    PackageTemplate,
+    SlidePart,
+    SlideXMLRenderer,
+)
+
+# Below this many slides the pool round-trip costs more than it saves
+DEFAULT_MIN_PARALLEL_SLIDES = 16
+
+
+def default_workers() -> int:
+    """Worker count from ``RENDER_WORKERS``, defaulting to the CPU count."""
+    return int(os.getenv("RENDER_WORKERS", "0")) or os.cpu_count() or 1
+
+
+def render_slide_chunk(scenes: list[SlideScene]) -> list[SlidePart]:
+    """Render a batch of scenes with one renderer (runs in a worker)."""
+    renderer = SlideXMLRenderer()
+    return [renderer.render(scene) for scene in scenes]
+
+
+class ParallelPPTXWriter(FastPPTXWriter):
+    """FastPPTXWriter that renders slides across a process pool."""
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        min_parallel_slides: int = DEFAULT_MIN_PARALLEL_SLIDES,
+        executor: Executor | None = None,
+        template: PackageTemplate | None = None,
+    ) -> None:
+        """Initialize the parallel writer.
+
+        Args:
+            workers: Pool size. Defaults to ``default_workers()``.
+            min_parallel_slides: Decks smaller than this render in-process.
+            executor: Executor to use instead of the shared render pool.
+            template: Package template. Defaults to the process-wide template.
+        """
+        super().__init__(template)
+        self.workers = workers or default_workers()
+        self.min_parallel_slides = min_parallel_slides
+        self.executor = executor
+
+    def iter_slides(self, scenes: list[SlideScene]) -> Iterator[SlidePart]:
+        """Render scenes to slide parts in the pool, yielding them in order."""
+        if len(scenes) < self.min_parallel_slides or self.workers <= 1:
+            yield from super().iter_slides(scenes)
+            return
+
+        # A few chunks per worker balances uneven slides against IPC overhead
+        chunk_size = max(1, math.ceil(len(scenes) / (self.workers * 4)))
+        chunks = deque(scenes[i:i + chunk_size] for i in range(0, len(scenes), chunk_size))
+
+        executor = self.executor or get_render_pool(self.workers)
+        pending: deque[Future] = deque()
+        done = 0
+        try:
+            while chunks or pending:
+                # Bound the chunks in flight so streamed decks stay bounded in memory
+                while chunks and len(pending) < self.workers * 2:
+                    pending.append(executor.submit(render_slide_chunk, chunks.popleft()))
+                for slide in pending.popleft().result():
+                    yield slide
+                    done += 1
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); drop the pool and finish serially
+            if self.executor is None:
+                shutdown_render_pool()
+            yield from super().iter_slides(scenes[done:])
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+# Process-wide render pool (lazy initialized)
+_render_pool: ProcessPoolExecutor | None = None
+_render_pool_workers = 0
+_render_pool_lock = threading.Lock()
+
+
+def get_render_pool(workers: int | None = None) -> ProcessPoolExecutor:
+    """Get the shared render pool, creating or resizing it as needed.
+
+    Workers are started with ``forkserver`` where available so they never
+    inherit the parent's threads or open connections.
+    """
+    global _render_pool, _render_pool_workers
+    workers = workers or default_workers()
+    with _render_pool_lock:
+        if _render_pool is None or _render_pool_workers != workers:
+            if _render_pool is not None:
+                _render_pool.shutdown(wait=False, cancel_futures=True)
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context(
+                "forkserver" if "forkserver" in methods else "spawn"
+            )
+            _render_pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            _render_pool_workers = workers
+        return _render_pool
+
+
+def shutdown_render_pool() -> None:
+    """Stop the shared render pool, if running."""
+    global _render_pool, _render_pool_workers
+    with _render_pool_lock:
+        if _render_pool is not None:
+            _render_pool.shutdown(wait=True, cancel_futures=True)
+            _render_pool = None
+            _render_pool_workers = 0
@@ -87,44 +87,30 @@ class PathRenderer:
         if not shape.path:
             return None
 
-        # Find starting point
-        start_x = shape.bbox.x
-        start_y = shape.bbox.y
+        # Find starting point (path coordinates are relative to the bbox)
+        start_x = 0
+        start_y = 0
 
         for cmd in shape.path:
             if cmd.type == PathCommandType.MOVE_TO and cmd.x is not None:
-                start_x = shape.bbox.x + cmd.x
-                start_y = shape.bbox.y + (cmd.y or 0)
+                start_x = cmd.x
+                start_y = cmd.y or 0
                 break
 
         builder = slide.shapes.build_freeform(Emu(start_x), Emu(start_y))
 
-        # Track current position for relative moves
-        curr_x = start_x
-        curr_y = start_y
-
         for cmd in shape.path:
-            if cmd.type == PathCommandType.MOVE_TO:
-                # Move is handled by starting position or line segment
-                if cmd.x is not None:
-                    curr_x = shape.bbox.x + cmd.x
-                    curr_y = shape.bbox.y + (cmd.y or 0)
-
-            elif cmd.type == PathCommandType.LINE_TO:
+            if cmd.type == PathCommandType.LINE_TO:
                 if cmd.x is not None and cmd.y is not None:
-                    abs_x = shape.bbox.x + cmd.x
-                    abs_y = shape.bbox.y + cmd.y
                     builder.add_line_segments(
-                        [(Emu(abs_x), Emu(abs_y))],
+                        [(Emu(cmd.x), Emu(cmd.y))],
                         close=False,
                     )
-                    curr_x = abs_x
-                    curr_y = abs_y
 
             elif cmd.type == PathCommandType.CLOSE:
                 pass  # Close is implicit
 
-        return builder.convert_to_shape(Emu(start_x), Emu(start_y))
+        return builder.convert_to_shape(Emu(shape.bbox.x), Emu(shape.bbox.y))
 
     def _render_complex_path(self, slide: Slide, shape: Shape) -> Any | None:
         """Render a complex path with Bezier curves using XML.
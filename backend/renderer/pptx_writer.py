@@ -1,16 +1,22 @@
 """High-level PPTX generation from DSL scene graphs."""
 
+import copy
+import math
 from io import BytesIO
 from pathlib import Path
-from typing import BinaryIO, Union
+from typing import Any, BinaryIO, Union
 
 from pptx import Presentation
 from pptx.util import Emu
 
-from backend.dsl.schema import SlideScene
+from backend.dsl.schema import EMU_PER_POINT, SlideScene
+from backend.renderer.fast_writer import FastPPTXWriter
 from backend.renderer.shape_renderer import ShapeRenderer
 from backend.renderer.style_renderer import StyleRenderer
 
+# Bump whenever a change to the renderer alters the bytes it produces
+RENDERER_VERSION = "2"
+
 
 class PPTXWriter:
     """Generates PPTX files from DSL scene graphs."""
@@ -51,8 +57,7 @@ class PPTXWriter:
         if output is None:
             buffer = BytesIO()
             prs.save(buffer)
-            buffer.seek(0)
-            return buffer.read()
+            return buffer.getvalue()
         elif isinstance(output, (str, Path)):
             prs.save(str(output))
             return None
@@ -115,3 +120,79 @@ class PPTXWriter:
         prs.slide_width = Emu(width)
         prs.slide_height = Emu(height)
         return prs
+
+
+def _normalize_effects(effects: dict[str, Any], fill_color: str) -> dict[str, Any]:
+    """Translate style-token effects into schema effects.
+
+    The inference engine emits shadows and glows as style tokens, e.g.
+    ``{"type": "soft", "blur": 4, "offset_x": 2, "offset_y": 2}`` in points
+    with an ``#RRGGBBAA`` color. Schema-shaped effects pass through untouched.
+    """
+    effects = dict(effects)
+
+    shadow = effects.get("shadow")
+    if isinstance(shadow, dict) and shadow.get("type") not in (None, "outer", "inner"):
+        color = shadow.get("color", "#000000")
+        alpha = 0.5
+        if len(color) == 9:
+            alpha = int(color[7:9], 16) / 255
+            color = color[:7]
+        distance = math.hypot(shadow.get("offset_x", 0), shadow.get("offset_y", 0))
+        effects["shadow"] = {
+            "type": "outer",
+            "color": color,
+            "alpha": round(alpha, 3),
+            "blur_radius": int(shadow.get("blur", 4) * EMU_PER_POINT),
+            "distance": int(distance * EMU_PER_POINT),
+        }
+
+    glow = effects.get("glow")
+    if isinstance(glow, dict) and "color" not in glow:
+        effects["glow"] = {
+            "color": fill_color,
+            "radius": int(glow.get("radius", 5) * EMU_PER_POINT),
+        }
+
+    return effects
+
+
+def scene_from_dsl(dsl: Union[SlideScene, dict[str, Any]]) -> SlideScene:
+    """Build a SlideScene from a generation DSL dict.
+
+    Args:
+        dsl: Scene graph dict as stored on generations, or a SlideScene.
+
+    Returns:
+        Validated SlideScene.
+    """
+    if isinstance(dsl, SlideScene):
+        return dsl
+
+    data = copy.deepcopy(dsl)
+    for shape in data.get("shapes", []):
+        effects = shape.get("effects")
+        if isinstance(effects, dict):
+            fill = shape.get("fill")
+            fill_color = fill.get("color", "#000000") if isinstance(fill, dict) else "#000000"
+            shape["effects"] = _normalize_effects(effects, fill_color)
+
+    return SlideScene.model_validate(data)
+
+
+def render_to_pptx(
+    dsl: Union[SlideScene, dict[str, Any]],
+    output: Union[str, Path, BinaryIO, None] = None,
+) -> bytes | None:
+    """Render a single DSL scene to a PPTX file.
+
+    Uses ``FastPPTXWriter``, whose output is equivalent to ``PPTXWriter``.
+
+    Args:
+        dsl: Scene graph dict or SlideScene.
+        output: Output path, file object, or None to return bytes.
+
+    Returns:
+        PPTX bytes if output is None, otherwise None.
+    """
+    return FastPPTXWriter().write_single(scene_from_dsl(dsl), output)
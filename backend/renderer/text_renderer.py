@@ -3,7 +3,7 @@
 from typing import Any
 
 from pptx.dml.color import RGBColor
-from pptx.enum.text import MSO_ANCHOR, PP_ALIGN
+from pptx.enum.text import MSO_ANCHOR, MSO_AUTO_SIZE, PP_ALIGN
 from pptx.util import Emu, Pt
 
 from backend.dsl.schema import TextContent, TextRun, ThemeColors
@@ -63,11 +63,11 @@ class TextRenderer:
             text_content.vertical_alignment,
             MSO_ANCHOR.MIDDLE,
         )
-        text_frame.anchor = vertical_align
+        text_frame.vertical_anchor = vertical_align
 
         # Set auto-fit
         if text_content.auto_fit == "shrink":
-            text_frame.auto_size = True
+            text_frame.auto_size = MSO_AUTO_SIZE.TEXT_TO_FIT_SHAPE
         elif text_content.auto_fit == "shape":
             # Resize shape to fit text - not directly supported
             pass
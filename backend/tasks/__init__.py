@@ -1,9 +1,10 @@
 """Background task queue for Infographix."""
 
-from backend.tasks.queue import TaskQueue, get_task_queue
+from backend.tasks.queue import RetryPolicy, TaskQueue, get_task_queue
 from backend.tasks.worker import WorkerSettings, run_worker
 
 __all__ = [
+    "RetryPolicy",
     "TaskQueue",
     "get_task_queue",
     "WorkerSettings",
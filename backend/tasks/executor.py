@@ -0,0 +1,66 @@
+"""Bounded pool for CPU-bound task stages.
+
+Inference and variation generation run here rather than on the worker's
+event loop, so a worker running several tasks at once keeps reserving,
+acknowledging and publishing progress while they compute. The pool is
+sized to the cores available instead of the task concurrency, so extra
+concurrent tasks queue for a core rather than oversubscribing it.
+
+It is a thread pool: the warm inference engine, its caches and progress
+callbacks are per-process objects, and torch and NumPy release the GIL in
+their kernels.
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+def default_cpu_workers() -> int:
+    """Pool size from ``INFERENCE_WORKERS``, defaulting to the CPU count."""
+    return int(os.getenv("INFERENCE_WORKERS", "0")) or os.cpu_count() or 1
+
+
+# Process-wide CPU pool (lazy initialized)
+_cpu_pool: ThreadPoolExecutor | None = None
+_cpu_pool_workers = 0
+_cpu_pool_lock = threading.Lock()
+
+
+def get_cpu_pool(workers: int | None = None) -> ThreadPoolExecutor:
+    """Get the shared CPU pool, creating or resizing it as needed."""
+    global _cpu_pool, _cpu_pool_workers
+    workers = workers or default_cpu_workers()
+    with _cpu_pool_lock:
+        if _cpu_pool is None or _cpu_pool_workers != workers:
+            if _cpu_pool is not None:
+                _cpu_pool.shutdown(wait=False)
+            _cpu_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="inference")
+            _cpu_pool_workers = workers
+        return _cpu_pool
+
+
+def shutdown_cpu_pool() -> None:
+    """Stop the shared CPU pool, if running."""
+    global _cpu_pool, _cpu_pool_workers
+    with _cpu_pool_lock:
+        if _cpu_pool is not None:
+            _cpu_pool.shutdown(wait=True, cancel_futures=True)
+            _cpu_pool = None
+            _cpu_pool_workers = 0
+
+
+async def run_cpu_bound(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a function in the shared CPU pool and await its result."""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    with _cpu_pool_lock:
+        pool = _cpu_pool
+    return await loop.run_in_executor(pool or get_cpu_pool(), call)
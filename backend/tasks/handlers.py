@@ -1,11 +1,77 @@
 """Task handlers for background processing."""
 
+import asyncio
 import os
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 
+from backend.db.artifacts import get_artifact_store
 from backend.db.base import SessionLocal
-from backend.db.models import Generation, GenerationStatus, Download
+from backend.db.models import Generation, GenerationBatch, GenerationStatus, Download
+from backend.tasks.executor import run_cpu_bound
+from backend.tasks.progress import ProgressReporter
+
+
+def _start_generation(generation_id: str) -> datetime | None:
+    """Mark a generation as processing.
+
+    Returns:
+        Start time, or None if the generation is gone or already finished
+        (e.g. the task was delivered again after a worker restart).
+    """
+    db = SessionLocal()
+    try:
+        generation = db.query(Generation).filter(Generation.id == generation_id).first()
+        if not generation or generation.status in (
+            GenerationStatus.COMPLETED, GenerationStatus.FAILED,
+        ):
+            return None
+        generation.status = GenerationStatus.PROCESSING
+        db.commit()
+        return datetime.utcnow()
+    finally:
+        db.close()
+
+
+def _finish_generation(
+    generation_id: str,
+    start_time: datetime,
+    fields: dict | None = None,
+    error: str | None = None,
+) -> int | None:
+    """Store a generation's outcome.
+
+    Args:
+        generation_id: Generation record ID.
+        start_time: When processing started.
+        fields: Result columns to set on success.
+        error: Error message on failure.
+
+    Returns:
+        Processing time in milliseconds, or None on failure.
+    """
+    db = SessionLocal()
+    try:
+        generation = db.query(Generation).filter(Generation.id == generation_id).first()
+        if not generation:
+            return None
+        if error is not None:
+            generation.status = GenerationStatus.FAILED
+            generation.error_message = error
+            db.commit()
+            return None
+
+        end_time = datetime.utcnow()
+        for name, value in (fields or {}).items():
+            setattr(generation, name, value)
+        generation.status = GenerationStatus.COMPLETED
+        generation.completed_at = end_time
+        generation.processing_time_ms = int((end_time - start_time).total_seconds() * 1000)
+        db.commit()
+        return generation.processing_time_ms
+    finally:
+        db.close()
 
 
 async def process_generation_task(
@@ -19,6 +85,9 @@ async def process_generation_task(
 ) -> dict:
     """Process a generation task.
 
+    Database access runs in threads and inference in the CPU pool, so the
+    worker's event loop stays free for its other tasks.
+
     Args:
         generation_id: Generation record ID.
         prompt: User prompt.
@@ -31,77 +100,57 @@ async def process_generation_task(
     Returns:
         Task result with generation details.
     """
-    from ml.inference import InferenceEngine
-
-    db = SessionLocal()
-    try:
-        generation = db.query(Generation).filter(Generation.id == generation_id).first()
-        if not generation:
-            return {"error": "Generation not found"}
+    from backend.db.generation_cache import run_cached_generation
+    from ml.inference import get_inference_engine
 
-        start_time = datetime.utcnow()
-        generation.status = GenerationStatus.PROCESSING
-        db.commit()
+    report = ProgressReporter(generation_id)
+    start_time = await asyncio.to_thread(_start_generation, generation_id)
+    if start_time is None:
+        return {"error": "Generation not found or already processed"}
+    report("processing")
 
-        try:
-            # Run inference
-            engine = InferenceEngine(use_ml=False)
-
-            result = engine.generate(
-                prompt=prompt,
-                content=content,
-                brand_colors=brand_colors,
-                brand_fonts=brand_fonts,
-                formality=formality,
-            )
-
-            # Generate variations if requested
-            variations = None
-            if num_variations > 1:
-                variation_results = engine.generate_variations(
-                    prompt=prompt,
-                    count=num_variations,
-                    content=content,
-                    brand_colors=brand_colors,
-                    brand_fonts=brand_fonts,
-                    formality=formality,
-                )
-                variations = [v.dsl for v in variation_results]
-
-            # Update generation record
-            end_time = datetime.utcnow()
-            generation.archetype = result.archetype
-            generation.archetype_confidence = result.classification_confidence
-            generation.dsl = result.dsl
-            generation.style = {
-                "color_palette": result.style.color_palette,
-                "font_family": result.style.font_family,
-                "corner_radius": result.style.corner_radius,
-                "shadow": result.style.shadow,
-                "glow": result.style.glow,
-            }
-            generation.variations = variations
-            generation.status = GenerationStatus.COMPLETED
-            generation.completed_at = end_time
-            generation.processing_time_ms = int((end_time - start_time).total_seconds() * 1000)
-
-            db.commit()
-
-            return {
-                "success": True,
-                "archetype": result.archetype,
-                "processing_time_ms": generation.processing_time_ms,
-            }
-
-        except Exception as e:
-            generation.status = GenerationStatus.FAILED
-            generation.error_message = str(e)
-            db.commit()
-
-            return {"error": str(e)}
+    try:
+        # Run inference on the worker's shared engine
+        engine = get_inference_engine(use_ml=False)
+
+        outcome = await run_cpu_bound(
+            run_cached_generation,
+            engine,
+            prompt=prompt,
+            content=content,
+            brand_colors=brand_colors,
+            brand_fonts=brand_fonts,
+            formality=formality,
+            num_variations=num_variations,
+            on_progress=report,
+        )
 
-    finally:
-        db.close()
+    except Exception as e:
+        await asyncio.to_thread(_finish_generation, generation_id, start_time, error=str(e))
+        report("failed", message=str(e))
+
+        return {"error": str(e)}
+
+    processing_time_ms = await asyncio.to_thread(
+        _finish_generation,
+        generation_id,
+        start_time,
+        {
+            "archetype": outcome["archetype"],
+            "archetype_confidence": outcome["archetype_confidence"],
+            "dsl": outcome["dsl"],
+            "style": outcome["style"],
+            "variations": outcome["variations"],
+        },
+    )
+    report("completed")
+
+    return {
+        "success": True,
+        "archetype": outcome["archetype"],
+        "processing_time_ms": processing_time_ms,
+        "cached": outcome["cached"],
+    }
 
 
 async def process_variations_task(
@@ -125,53 +174,197 @@ async def process_variations_task(
     """
     from backend.creativity import VariationEngine
 
-    db = SessionLocal()
+    report = ProgressReporter(generation_id)
+    start_time = await asyncio.to_thread(_start_generation, generation_id)
+    if start_time is None:
+        return {"error": "Generation not found or already processed"}
+    report("variations", 0, count)
+
     try:
-        generation = db.query(Generation).filter(Generation.id == generation_id).first()
-        if not generation:
-            return {"error": "Generation not found"}
+        # Generate variations
+        engine = VariationEngine()
+        original_dsl["archetype"] = archetype
+
+        results = await run_cpu_bound(
+            engine.generate_variations,
+            dsl=original_dsl,
+            count=count,
+            strategy=strategy,
+        )
+        report("variations", len(results), count)
 
-        start_time = datetime.utcnow()
-        generation.status = GenerationStatus.PROCESSING
+    except Exception as e:
+        await asyncio.to_thread(_finish_generation, generation_id, start_time, error=str(e))
+        report("failed", message=str(e))
+
+        return {"error": str(e)}
+
+    await asyncio.to_thread(
+        _finish_generation,
+        generation_id,
+        start_time,
+        {"dsl": original_dsl, "variations": [r.dsl for r in results]},
+    )
+    report("completed")
+
+    return {
+        "success": True,
+        "variations_count": len(results),
+    }
+
+
+def _start_batch(batch_id: str) -> tuple[datetime, dict, bool] | None:
+    """Mark a batch and its items as processing.
+
+    Returns:
+        Start time, the batch's inputs for ``run_cached_batch`` and whether
+        a combined PPTX was requested; None if the batch is gone or already
+        finished.
+    """
+    db = SessionLocal()
+    try:
+        batch = db.query(GenerationBatch).filter(GenerationBatch.id == batch_id).first()
+        if not batch or batch.status in (GenerationStatus.COMPLETED, GenerationStatus.FAILED):
+            return None
+        batch.status = GenerationStatus.PROCESSING
+        for generation in batch.generations:
+            generation.status = GenerationStatus.PROCESSING
         db.commit()
+        return datetime.utcnow(), {
+            "prompts": [g.prompt for g in batch.generations],
+            "contents": [g.content for g in batch.generations],
+            "brand_colors": batch.brand_colors,
+            "brand_fonts": batch.brand_fonts,
+            "formality": batch.formality,
+        }, batch.combine_pptx
+    finally:
+        db.close()
 
-        try:
-            # Generate variations
-            engine = VariationEngine()
-            original_dsl["archetype"] = archetype
-
-            results = engine.generate_variations(
-                dsl=original_dsl,
-                count=count,
-                strategy=strategy,
-            )
 
-            # Update generation
-            end_time = datetime.utcnow()
-            generation.dsl = original_dsl
-            generation.variations = [r.dsl for r in results]
+def _finish_batch(
+    batch_id: str,
+    start_time: datetime,
+    outcomes: list[dict] | None = None,
+    error: str | None = None,
+) -> list[dict]:
+    """Store a batch's per-item outcomes in one transaction.
+
+    Args:
+        batch_id: Generation batch ID.
+        start_time: When processing started.
+        outcomes: Per-item results of ``run_cached_batch``, in item order.
+        error: Error message if the whole batch failed.
+
+    Returns:
+        DSLs of the completed items, in item order.
+    """
+    db = SessionLocal()
+    try:
+        batch = db.query(GenerationBatch).filter(GenerationBatch.id == batch_id).first()
+        if not batch:
+            return []
+
+        end_time = datetime.utcnow()
+        processing_time_ms = int((end_time - start_time).total_seconds() * 1000)
+        outcomes = outcomes or [{"error": error}] * len(batch.generations)
+        completed = []
+        for generation, outcome in zip(batch.generations, outcomes):
+            if "error" in outcome:
+                generation.status = GenerationStatus.FAILED
+                generation.error_message = outcome["error"]
+                continue
+            for name in ("archetype", "archetype_confidence", "dsl", "style"):
+                setattr(generation, name, outcome[name])
             generation.status = GenerationStatus.COMPLETED
             generation.completed_at = end_time
-            generation.processing_time_ms = int((end_time - start_time).total_seconds() * 1000)
+            generation.processing_time_ms = processing_time_ms
+            completed.append(outcome["dsl"])
 
-            db.commit()
+        batch.status = GenerationStatus.COMPLETED if completed else GenerationStatus.FAILED
+        batch.error_message = error
+        batch.completed_at = end_time
+        batch.processing_time_ms = processing_time_ms
+        db.commit()
+        return completed
+    finally:
+        db.close()
 
-            return {
-                "success": True,
-                "variations_count": len(results),
-            }
 
-        except Exception as e:
-            generation.status = GenerationStatus.FAILED
-            generation.error_message = str(e)
+def _attach_deck(batch_id: str, pptx_path: str | None, error: str | None = None) -> None:
+    """Record a batch's combined deck, or why it could not be built."""
+    db = SessionLocal()
+    try:
+        batch = db.query(GenerationBatch).filter(GenerationBatch.id == batch_id).first()
+        if batch:
+            batch.pptx_path = pptx_path
+            if error:
+                batch.error_message = f"Combined PPTX failed: {error}"
             db.commit()
-
-            return {"error": str(e)}
-
     finally:
         db.close()
 
 
+def _render_deck(dsls: list[dict], file_path: Path) -> None:
+    """Render DSLs as the slides of one PPTX file."""
+    from backend.renderer import FastPPTXWriter, scene_from_dsl
+
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    FastPPTXWriter().write([scene_from_dsl(dsl) for dsl in dsls], file_path)
+
+
+async def process_generation_batch_task(batch_id: str) -> dict:
+    """Process a batch generation task.
+
+    Every item's prompt goes through one batched inference pass; results
+    are stored together, and the completed items are optionally rendered
+    as one multi-slide PPTX.
+
+    Args:
+        batch_id: Generation batch ID.
+
+    Returns:
+        Task result with item counts.
+    """
+    from backend.db.generation_cache import run_cached_batch
+    from ml.inference import get_inference_engine
+
+    report = ProgressReporter(batch_id)
+    started = await asyncio.to_thread(_start_batch, batch_id)
+    if started is None:
+        return {"error": "Batch not found or already processed"}
+    start_time, inputs, combine_pptx = started
+    report("processing")
+
+    try:
+        engine = get_inference_engine(use_ml=False)
+        outcomes = await run_cpu_bound(run_cached_batch, engine, **inputs)
+    except Exception as e:
+        await asyncio.to_thread(_finish_batch, batch_id, start_time, error=str(e))
+        report("failed", message=str(e))
+        return {"error": str(e)}
+
+    completed = await asyncio.to_thread(_finish_batch, batch_id, start_time, outcomes)
+    if not completed:
+        report("failed", message="Every item failed")
+        return {"error": "Every item failed"}
+
+    if combine_pptx:
+        report("deck")
+        file_path = Path(os.getenv("DOWNLOAD_DIR", "downloads")) / "batches" / f"{batch_id}.pptx"
+        try:
+            await run_cpu_bound(_render_deck, completed, file_path)
+            await asyncio.to_thread(_attach_deck, batch_id, str(file_path))
+        except Exception as e:
+            await asyncio.to_thread(_attach_deck, batch_id, None, str(e))
+    report("completed")
+
+    return {
+        "success": True,
+        "completed": len(completed),
+        "failed": len(outcomes) - len(completed),
+    }
+
+
 async def generate_download_task(
     download_id: str,
     generation_id: str,
@@ -189,9 +382,7 @@ async def generate_download_task(
     Returns:
         Task result.
     """
-    DOWNLOAD_DIR = Path(os.getenv("DOWNLOAD_DIR", "downloads"))
-    DOWNLOAD_DIR.mkdir(exist_ok=True)
-
+    report = ProgressReporter(download_id)
     db = SessionLocal()
     try:
         download = db.query(Download).filter(Download.id == download_id).first()
@@ -207,34 +398,22 @@ async def generate_download_task(
             dsl = generation.dsl
 
         try:
-            file_path = DOWNLOAD_DIR / f"{download_id}.{format}"
-
-            if format == "pptx":
-                from backend.renderer import render_to_pptx
-                render_to_pptx(dsl, str(file_path))
-
-            elif format == "svg":
-                svg_content = _render_to_svg(dsl)
-                file_path.write_text(svg_content)
-
-            elif format == "png":
-                raise NotImplementedError("PNG export not yet implemented")
-
-            elif format == "pdf":
-                raise NotImplementedError("PDF export not yet implemented")
-
-            # Update download record
-            download.file_path = str(file_path)
-            download.file_size = file_path.stat().st_size
+            report("rendering")
+            # Render, or reuse the file from an identical earlier render
+            get_artifact_store().attach(
+                db, download, dsl, partial(_render_file, format=format),
+            )
             db.commit()
+            report("rendered")
 
             return {
                 "success": True,
-                "file_path": str(file_path),
+                "file_path": download.file_path,
                 "file_size": download.file_size,
             }
 
         except Exception as e:
+            report("failed", message=str(e))
             return {"error": str(e)}
 
     finally:
@@ -254,10 +433,13 @@ async def cleanup_expired_downloads_task() -> dict:
             Download.expires_at < datetime.utcnow(),
         ).all()
 
+        store = get_artifact_store()
         deleted_count = 0
         for download in expired:
-            # Delete file
-            if download.file_path:
+            if download.artifact_hash:
+                # Shared blob: drop this download's reference only
+                store.release(db, download.artifact_hash)
+            elif download.file_path:
                 path = Path(download.file_path)
                 if path.exists():
                     path.unlink()
@@ -267,6 +449,9 @@ async def cleanup_expired_downloads_task() -> dict:
 
         db.commit()
 
+        # Delete blobs no remaining download references
+        deleted_count += store.collect_garbage(db)
+
         return {
             "success": True,
             "expired_count": len(expired),
@@ -277,6 +462,23 @@ async def cleanup_expired_downloads_task() -> dict:
         db.close()
 
 
+def _render_file(dsl: dict, file_path: Path, format: str) -> None:
+    """Render DSL to a file in the requested format."""
+    if format == "pptx":
+        from backend.renderer import render_to_pptx
+        render_to_pptx(dsl, str(file_path))
+
+    elif format == "svg":
+        svg_content = _render_to_svg(dsl)
+        file_path.write_text(svg_content)
+
+    elif format == "png":
+        raise NotImplementedError("PNG export not yet implemented")
+
+    elif format == "pdf":
+        raise NotImplementedError("PDF export not yet implemented")
+
+
 def _render_to_svg(dsl: dict) -> str:
     """Render DSL to SVG string."""
     canvas = dsl.get("canvas", {"width": 960, "height": 540})
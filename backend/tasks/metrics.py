@@ -0,0 +1,77 @@
+"""Queue wait and run time metrics per lane.
+
+The worker records how long each task waited in its lane before being
+reserved and how long it ran. Percentiles over a sliding window of recent
+tasks show whether interactive tasks are held up by batch load.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+
+
+@dataclass
+class LaneSamples:
+    """Recent wait and run times of one lane, in seconds."""
+    window: int = 1000
+    count: int = 0
+    waits: deque = field(default_factory=deque)
+    runs: deque = field(default_factory=deque)
+
+    def __post_init__(self):
+        self.waits = deque(self.waits, maxlen=self.window)
+        self.runs = deque(self.runs, maxlen=self.window)
+
+    def add(self, wait: float, run: float) -> None:
+        """Record one task."""
+        self.count += 1
+        self.waits.append(wait)
+        self.runs.append(run)
+
+    def to_dict(self) -> dict[str, float]:
+        """Summarize as task count and millisecond percentiles."""
+        waits = sorted(self.waits)
+        runs = sorted(self.runs)
+        return {
+            "count": self.count,
+            "wait_p50_ms": _percentile(waits, 0.5) * 1000,
+            "wait_p95_ms": _percentile(waits, 0.95) * 1000,
+            "wait_max_ms": (waits[-1] if waits else 0.0) * 1000,
+            "run_p50_ms": _percentile(runs, 0.5) * 1000,
+        }
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted samples; 0 if there are none."""
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+class LaneMetrics:
+    """Wait and run time percentiles per lane over recent tasks."""
+
+    def __init__(self, window: int = 1000):
+        """Initialize metrics.
+
+        Args:
+            window: Tasks per lane the percentiles are computed over.
+        """
+        self.window = window
+        self._lanes: dict[str, LaneSamples] = {}
+
+    def record(self, lane: str, wait: float, run: float) -> None:
+        """Record a finished task.
+
+        Args:
+            lane: Lane the task ran from.
+            wait: Seconds from entering the lane to being reserved.
+            run: Seconds the task ran.
+        """
+        samples = self._lanes.get(lane)
+        if samples is None:
+            samples = self._lanes[lane] = LaneSamples(self.window)
+        samples.add(wait, run)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """Get the summary of each lane that has run tasks."""
+        return {lane: samples.to_dict() for lane, samples in self._lanes.items()}
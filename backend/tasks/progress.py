@@ -0,0 +1,336 @@
+"""Progress events for background jobs.
+
+Task handlers publish stage-level ``ProgressEvent``s for a job (a generation
+or a download); API clients subscribe to them over server-sent events
+instead of polling the database. Events go through Redis pub/sub when Redis
+is reachable, so a worker process and the API process that holds the client
+connection can be different. Otherwise an in-process broker delivers them,
+which covers jobs run by the API's own background tasks.
+
+The latest event of each job is kept as a snapshot, so a client that
+connects mid-job starts from the current stage.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from dataclasses import asdict, dataclass, field
+
+try:
+    import redis
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger("infographix.worker")
+
+# Overall progress reported when each stage is reached
+STAGE_PROGRESS = {
+    "queued": 0.0,
+    "processing": 0.05,
+    "classified": 0.25,
+    "layout": 0.5,
+    "styled": 0.7,
+    "variations": 0.7,  # Advances to 0.95 as variations complete
+    "deck": 0.9,  # Batch items stored, combined PPTX rendering
+    "rendering": 0.1,
+    "rendered": 1.0,
+    "completed": 1.0,
+    "failed": 1.0,
+}
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+@dataclass
+class ProgressEvent:
+    """One progress update for a job."""
+    job_id: str
+    stage: str
+    status: str = "processing"
+    progress: float = 0.0
+    current: int | None = None
+    total: int | None = None
+    message: str | None = None
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def is_terminal(self) -> bool:
+        """Whether no further events follow."""
+        return self.status in TERMINAL_STATUSES
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return asdict(self)
+
+    def to_json(self) -> str:
+        """Serialize to JSON."""
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, data: str | bytes) -> "ProgressEvent":
+        """Create from JSON."""
+        return cls(**json.loads(data))
+
+
+def make_event(
+    job_id: str,
+    stage: str,
+    current: int | None = None,
+    total: int | None = None,
+    message: str | None = None,
+) -> ProgressEvent:
+    """Build the event for reaching a stage.
+
+    Args:
+        job_id: Generation or download ID.
+        stage: Stage name from ``STAGE_PROGRESS``.
+        current: Items done within the stage (e.g. variation n).
+        total: Items in the stage (e.g. variations requested).
+        message: Optional detail, such as an error message.
+
+    Returns:
+        Event with overall progress and status filled in.
+    """
+    progress = STAGE_PROGRESS.get(stage, 0.0)
+    if stage == "variations" and total:
+        progress += (STAGE_PROGRESS["completed"] - 0.05 - progress) * (current or 0) / total
+    if stage in TERMINAL_STATUSES:
+        status = stage
+    elif stage == "rendered":
+        status = "completed"
+    elif stage == "queued":
+        status = "pending"
+    else:
+        status = "processing"
+    return ProgressEvent(
+        job_id=job_id,
+        stage=stage,
+        status=status,
+        progress=round(progress, 4),
+        current=current,
+        total=total,
+        message=message,
+    )
+
+
+class InMemoryProgressBroker:
+    """In-process progress broker.
+
+    ``publish`` may be called from any thread; subscribers receive events on
+    their own event loop.
+    """
+
+    def __init__(self, max_jobs: int = 10_000):
+        self.max_jobs = max_jobs
+        self._latest: OrderedDict[str, ProgressEvent] = OrderedDict()
+        self._subscribers: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, event: ProgressEvent) -> None:
+        """Publish an event to the job's subscribers."""
+        with self._lock:
+            self._latest[event.job_id] = event
+            self._latest.move_to_end(event.job_id)
+            while len(self._latest) > self.max_jobs:
+                self._latest.popitem(last=False)
+            subscribers = list(self._subscribers.get(event.job_id, ()))
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                # Subscriber's loop has closed
+                pass
+
+    async def latest(self, job_id: str) -> ProgressEvent | None:
+        """Get the most recent event for a job."""
+        with self._lock:
+            return self._latest.get(job_id)
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[ProgressEvent]:
+        """Yield the job's current state and then each new event.
+
+        Ends after a terminal event.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        subscriber = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.setdefault(job_id, set()).add(subscriber)
+            latest = self._latest.get(job_id)
+
+        try:
+            if latest:
+                yield latest
+                if latest.is_terminal:
+                    return
+            while True:
+                event = await queue.get()
+                yield event
+                if event.is_terminal:
+                    return
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(job_id)
+                if subscribers is not None:
+                    subscribers.discard(subscriber)
+                    if not subscribers:
+                        del self._subscribers[job_id]
+
+
+class RedisProgressBroker:
+    """Progress broker shared across processes through Redis pub/sub.
+
+    Publishing is synchronous so handlers can report from engine threads.
+    If Redis fails, events are delivered in-process instead.
+    """
+
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        prefix: str = "infographix:progress:",
+        ttl: int = 3600,
+    ):
+        if not REDIS_AVAILABLE:
+            raise ImportError("redis package not installed")
+
+        self.redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        self.prefix = prefix
+        self.ttl = ttl
+        self._client = redis.from_url(self.redis_url)
+        self._async_client: aioredis.Redis | None = None
+        self.fallback = InMemoryProgressBroker()
+
+    def _channel(self, job_id: str) -> str:
+        return f"{self.prefix}{job_id}"
+
+    def _latest_key(self, job_id: str) -> str:
+        return f"{self.prefix}{job_id}:latest"
+
+    def _get_async_client(self) -> "aioredis.Redis":
+        if self._async_client is None:
+            self._async_client = aioredis.from_url(self.redis_url)
+        return self._async_client
+
+    def publish(self, event: ProgressEvent) -> None:
+        """Publish an event to the job's subscribers."""
+        data = event.to_json()
+        try:
+            pipe = self._client.pipeline()
+            pipe.set(self._latest_key(event.job_id), data, ex=self.ttl)
+            pipe.publish(self._channel(event.job_id), data)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Progress publish failed, delivering in-process: {e}")
+            self.fallback.publish(event)
+
+    async def latest(self, job_id: str) -> ProgressEvent | None:
+        """Get the most recent event for a job."""
+        try:
+            data = await self._get_async_client().get(self._latest_key(job_id))
+        except redis.RedisError:
+            return await self.fallback.latest(job_id)
+        return ProgressEvent.from_json(data) if data else None
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[ProgressEvent]:
+        """Yield the job's current state and then each new event.
+
+        Ends after a terminal event.
+        """
+        client = self._get_async_client()
+        try:
+            pubsub = client.pubsub()
+            # Subscribe before reading the snapshot so no event falls between
+            await pubsub.subscribe(self._channel(job_id))
+        except redis.RedisError:
+            async for event in self.fallback.subscribe(job_id):
+                yield event
+            return
+
+        try:
+            latest = await self.latest(job_id)
+            if latest:
+                yield latest
+                if latest.is_terminal:
+                    return
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                event = ProgressEvent.from_json(message["data"])
+                if latest and event.timestamp <= latest.timestamp:
+                    # Already seen in the snapshot
+                    continue
+                yield event
+                if event.is_terminal:
+                    return
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        """Close Redis connections."""
+        self._client.close()
+        if self._async_client:
+            await self._async_client.aclose()
+            self._async_client = None
+
+
+ProgressBroker = InMemoryProgressBroker | RedisProgressBroker
+
+# Global broker instance
+_broker_instance: ProgressBroker | None = None
+
+
+def get_progress_broker(redis_url: str | None = None) -> ProgressBroker:
+    """Get the process-wide progress broker.
+
+    Returns a Redis broker if Redis is reachable, otherwise in-process.
+    """
+    global _broker_instance
+
+    if _broker_instance is not None:
+        return _broker_instance
+
+    if REDIS_AVAILABLE:
+        try:
+            broker = RedisProgressBroker(redis_url)
+            broker._client.ping()
+            _broker_instance = broker
+            return _broker_instance
+        except Exception:
+            pass
+
+    _broker_instance = InMemoryProgressBroker()
+    return _broker_instance
+
+
+class ProgressReporter:
+    """Publishes the stages of one job.
+
+    Instances are callable, matching the ``on_progress`` callback taken by
+    ``InferenceEngine.generate``. Publishing never raises, so progress
+    reporting cannot fail a job.
+    """
+
+    def __init__(self, job_id: str, broker: ProgressBroker | None = None):
+        self.job_id = job_id
+        self.broker = broker or get_progress_broker()
+
+    def __call__(
+        self,
+        stage: str,
+        current: int | None = None,
+        total: int | None = None,
+        message: str | None = None,
+    ) -> None:
+        """Report that the job reached a stage."""
+        try:
+            self.broker.publish(make_event(self.job_id, stage, current, total, message))
+        except Exception as e:
+            logger.warning(f"Progress report for {self.job_id} failed: {e}")
@@ -1,25 +1,68 @@
-"""Task queue implementation."""
+"""Task queue implementation.
+
+The Redis queue is a reliable queue. A worker reserves a task by moving its
+id from its pending list to a processing list and taking a lease that
+expires after ``visibility_timeout`` seconds, in one script; a running task
+renews its lease periodically. A task leaves the processing list only when
+it is acknowledged, scheduled for retry or dead-lettered, so tasks held by a
+worker that dies are re-delivered once their lease expires. Failed tasks are
+retried with exponential backoff up to ``RetryPolicy.max_retries`` times and
+then moved to a dead-letter list.
+
+Tasks are queued in lanes, served in priority order: ``interactive`` (user
+requests waiting on a result), ``batch`` (bulk work) and ``maintenance``
+(housekeeping). Within a lane each organization has its own list, and
+organizations are served by weighted fair queuing: each has a virtual
+time that advances by ``1 / weight`` per task taken, and the organization
+with the lowest virtual time goes next. One organization queueing 500
+tasks therefore delays another organization's next task by at most one
+task per organization ahead of it, not by 500.
+
+Delivery is at-least-once: handlers should be safe to run again for a task
+that was interrupted.
+"""
 
 import asyncio
+import heapq
 import json
+import logging
 import os
+import random
+import time
 import uuid
+from collections import deque
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Any, Callable
 
 try:
+    import redis
     import redis.asyncio as aioredis
     REDIS_AVAILABLE = True
 except ImportError:
     REDIS_AVAILABLE = False
 
+logger = logging.getLogger("infographix.worker")
+
+# Lanes in priority order: a worker takes from the first lane with a task
+LANES = ("interactive", "batch", "maintenance")
+DEFAULT_LANE = "interactive"
+# Lane for tasks enqueued without one
+TASK_LANES = {
+    "process_generation_batch": "batch",
+    "cleanup_downloads": "maintenance",
+}
+# Organization for tasks enqueued without one
+DEFAULT_ORG = "default"
+
 
 class TaskStatus(str, Enum):
     """Task status."""
     PENDING = "pending"
     PROCESSING = "processing"
+    RETRYING = "retrying"
     COMPLETED = "completed"
     FAILED = "failed"
 
@@ -34,6 +77,10 @@ class Task:
     status: TaskStatus = TaskStatus.PENDING
     result: Any = None
     error: str | None = None
+    attempts: int = 0
+    lane: str = DEFAULT_LANE
+    org: str = DEFAULT_ORG
+    queued_at: float | None = None  # Unix time it last entered its lane
     created_at: datetime = field(default_factory=datetime.utcnow)
     started_at: datetime | None = None
     completed_at: datetime | None = None
@@ -48,6 +95,10 @@ class Task:
             "status": self.status.value,
             "result": self.result,
             "error": self.error,
+            "attempts": self.attempts,
+            "lane": self.lane,
+            "org": self.org,
+            "queued_at": self.queued_at,
             "created_at": self.created_at.isoformat(),
             "started_at": self.started_at.isoformat() if self.started_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
@@ -64,78 +115,279 @@ class Task:
             status=TaskStatus(data.get("status", "pending")),
             result=data.get("result"),
             error=data.get("error"),
+            attempts=int(data.get("attempts", 0)),
+            lane=data.get("lane") or DEFAULT_LANE,
+            org=data.get("org") or DEFAULT_ORG,
+            queued_at=float(data["queued_at"]) if data.get("queued_at") else None,
             created_at=datetime.fromisoformat(data["created_at"]) if data.get("created_at") else datetime.utcnow(),
             started_at=datetime.fromisoformat(data["started_at"]) if data.get("started_at") else None,
             completed_at=datetime.fromisoformat(data["completed_at"]) if data.get("completed_at") else None,
         )
 
 
+@dataclass
+class RetryPolicy:
+    """Retry schedule for failed tasks."""
+    # Retries after the first attempt; 0 disables retries
+    max_retries: int = 3
+    # Delay before the first retry, doubled for each further retry
+    backoff_base: float = 2.0  # seconds
+    backoff_max: float = 300.0  # seconds
+    # Random spread so retries of tasks that failed together don't align
+    jitter: float = 0.1
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before retrying after ``attempt`` failed."""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** max(0, attempt - 1))
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+
+def _new_task(name: str, args: tuple, kwargs: dict, lane: str | None, org: str | None) -> Task:
+    """Build a task for ``enqueue``, resolving its lane."""
+    lane = lane or TASK_LANES.get(name, DEFAULT_LANE)
+    if lane not in LANES:
+        raise ValueError(f"Unknown lane: {lane}")
+    return Task(
+        id=str(uuid.uuid4()),
+        name=name,
+        args=args,
+        kwargs=kwargs,
+        lane=lane,
+        org=org or DEFAULT_ORG,
+    )
+
+
+async def _call_handler(handler: Callable, task: Task) -> Any:
+    """Run a handler; synchronous handlers run in a thread."""
+    if asyncio.iscoroutinefunction(handler):
+        return await handler(*task.args, **task.kwargs)
+    return await asyncio.to_thread(handler, *task.args, **task.kwargs)
+
+
 class InMemoryTaskQueue:
-    """In-memory task queue for development."""
+    """In-memory task queue for development.
+
+    Follows the same lanes, fair scheduling, and reserve, acknowledge and
+    retry protocol as ``RedisTaskQueue`` within one process.
+    """
 
-    def __init__(self, queue_name: str = "default"):
+    def __init__(
+        self,
+        queue_name: str = "default",
+        visibility_timeout: float = 300.0,
+        retry: RetryPolicy | None = None,
+    ):
         self.queue_name = queue_name
+        self.visibility_timeout = visibility_timeout
+        self.retry = retry or RetryPolicy()
         self._tasks: dict[str, Task] = {}
-        self._queue: asyncio.Queue = asyncio.Queue()
+        # Lane -> organization -> pending task ids
+        self._lanes: dict[str, dict[str, deque[str]]] = {lane: {} for lane in LANES}
+        # Lane -> virtual time of each organization with pending tasks
+        self._vtimes: dict[str, dict[str, float]] = {lane: {} for lane in LANES}
+        self._clocks: dict[str, float] = dict.fromkeys(LANES, 0.0)
+        self._weights: dict[str, float] = {}
+        self._ready: asyncio.Event | None = None
+        self._ready_loop: asyncio.AbstractEventLoop | None = None
+        # Task id -> lease deadline
+        self._processing: dict[str, float] = {}
+        # (ready at, task id) heap of retries waiting out their backoff
+        self._delayed: list[tuple[float, str]] = []
+        self._dead: list[str] = []
         self._handlers: dict[str, Callable] = {}
 
+    def _ready_event(self) -> asyncio.Event:
+        """Event set when tasks arrive, for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._ready_loop is not loop:
+            self._ready = asyncio.Event()
+            self._ready_loop = loop
+        return self._ready
+
+    def _push(self, task_id: str, front: bool = False) -> None:
+        """Queue a task on its organization's list in its lane."""
+        task = self._tasks[task_id]
+        orgs = self._lanes[task.lane]
+        if task.org not in orgs:
+            orgs[task.org] = deque()
+            # Joins at the lane's virtual time: no credit for time spent idle
+            self._vtimes[task.lane][task.org] = self._clocks[task.lane]
+        if front:
+            orgs[task.org].appendleft(task_id)
+        else:
+            orgs[task.org].append(task_id)
+        task.queued_at = time.time()
+        self._ready_event().set()
+
+    def _take(self, lanes: Sequence[str]) -> str | None:
+        """Pop the next task id from the first of ``lanes`` with one."""
+        for lane in lanes:
+            vtimes = self._vtimes[lane]
+            if not vtimes:
+                continue
+            org = min(vtimes, key=vtimes.get)
+            pending = self._lanes[lane][org]
+            task_id = pending.popleft()
+            self._clocks[lane] = vtimes[org]
+            if pending:
+                vtimes[org] += 1 / self._weights.get(org, 1)
+            else:
+                del vtimes[org]
+                del self._lanes[lane][org]
+            return task_id
+        return None
+
+    async def set_org_weight(self, org: str, weight: float) -> None:
+        """Set an organization's share of each lane relative to others (default 1)."""
+        self._weights[org] = weight
+
     async def enqueue(
         self,
         name: str,
         *args,
+        _lane: str | None = None,
+        _org: str | None = None,
         **kwargs,
     ) -> str:
-        """Add task to queue."""
-        task_id = str(uuid.uuid4())
-        task = Task(
-            id=task_id,
-            name=name,
-            args=args,
-            kwargs=kwargs,
-        )
-        self._tasks[task_id] = task
-        await self._queue.put(task_id)
-        return task_id
+        """Add task to queue.
+
+        Args:
+            name: Registered handler name.
+            *args: Handler arguments.
+            _lane: Lane. Defaults to ``TASK_LANES`` for the task, else interactive.
+            _org: Organization the task counts against for fair scheduling.
+            **kwargs: Handler keyword arguments.
+        """
+        task = _new_task(name, args, kwargs, _lane, _org)
+        self._tasks[task.id] = task
+        self._push(task.id)
+        return task.id
 
     async def get_task(self, task_id: str) -> Task | None:
         """Get task by ID."""
         return self._tasks.get(task_id)
 
-    async def process_one(self) -> Task | None:
-        """Process one task from queue."""
-        try:
-            task_id = self._queue.get_nowait()
-        except asyncio.QueueEmpty:
-            return None
+    def requeue_expired(self) -> int:
+        """Return expired leases and due retries to the queue."""
+        now = time.monotonic()
+        moved = 0
+        for task_id, deadline in list(self._processing.items()):
+            if deadline <= now:
+                del self._processing[task_id]
+                self._push(task_id, front=True)
+                moved += 1
+        while self._delayed and self._delayed[0][0] <= now:
+            _, task_id = heapq.heappop(self._delayed)
+            self._push(task_id, front=True)
+            moved += 1
+        return moved
+
+    async def reserve(
+        self,
+        timeout: float = 0,
+        lanes: Sequence[str] = LANES,
+    ) -> Task | None:
+        """Take the next task and lease it to the caller.
+
+        Args:
+            timeout: Seconds to wait for a task; 0 returns immediately.
+            lanes: Lanes to take from, in priority order.
+
+        Returns:
+            The reserved task, or None if none became available.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            self.requeue_expired()
+            task_id = self._take(lanes)
+            if task_id is not None:
+                break
+            now = time.monotonic()
+            if now >= deadline:
+                return None
+            # Wake for an enqueue, or when the next retry becomes due
+            wait = deadline - now
+            if self._delayed:
+                wait = min(wait, self._delayed[0][0] - now)
+            ready = self._ready_event()
+            ready.clear()
+            try:
+                await asyncio.wait_for(ready.wait(), timeout=max(0.0, wait))
+            except asyncio.TimeoutError:
+                pass
+
+        task = self._tasks[task_id]
+        self._processing[task_id] = time.monotonic() + self.visibility_timeout
+        task.attempts += 1
+        task.status = TaskStatus.PROCESSING
+        task.started_at = datetime.utcnow()
+        return task
 
-        task = self._tasks.get(task_id)
-        if not task:
-            return None
+    async def extend_lease(self, task: Task) -> None:
+        """Renew the lease of a running task."""
+        if task.id in self._processing:
+            self._processing[task.id] = time.monotonic() + self.visibility_timeout
 
-        handler = self._handlers.get(task.name)
-        if not handler:
+    async def ack(self, task: Task, result: Any = None) -> Task:
+        """Mark a reserved task as completed."""
+        self._processing.pop(task.id, None)
+        task.result = result
+        task.status = TaskStatus.COMPLETED
+        task.completed_at = datetime.utcnow()
+        return task
+
+    async def fail(self, task: Task, error: str) -> Task:
+        """Retry a reserved task after backoff, or dead-letter it."""
+        self._processing.pop(task.id, None)
+        task.error = error
+        if task.attempts <= self.retry.max_retries:
+            task.status = TaskStatus.RETRYING
+            ready_at = time.monotonic() + self.retry.delay(task.attempts)
+            heapq.heappush(self._delayed, (ready_at, task.id))
+            self._ready_event().set()
+        else:
             task.status = TaskStatus.FAILED
-            task.error = f"No handler for task: {task.name}"
-            return task
+            task.completed_at = datetime.utcnow()
+            self._dead.append(task.id)
+        return task
 
-        task.status = TaskStatus.PROCESSING
-        task.started_at = datetime.utcnow()
+    async def release(self, task: Task) -> None:
+        """Return a reserved task to the queue without counting the attempt."""
+        if self._processing.pop(task.id, None) is not None:
+            task.attempts -= 1
+            task.status = TaskStatus.PENDING
+            self._push(task.id, front=True)
 
-        try:
-            if asyncio.iscoroutinefunction(handler):
-                result = await handler(*task.args, **task.kwargs)
-            else:
-                result = handler(*task.args, **task.kwargs)
+    async def execute(self, task: Task) -> Task:
+        """Run a reserved task's handler and record the outcome."""
+        handler = self._handlers.get(task.name)
+        if not handler:
+            return await self._dead_letter(task, f"No handler for task: {task.name}")
 
-            task.result = result
-            task.status = TaskStatus.COMPLETED
+        try:
+            result = await _call_handler(handler, task)
+        except asyncio.CancelledError:
+            await self.release(task)
+            raise
         except Exception as e:
-            task.error = str(e)
-            task.status = TaskStatus.FAILED
+            return await self.fail(task, str(e))
+        return await self.ack(task, result)
 
+    async def _dead_letter(self, task: Task, error: str) -> Task:
+        self._processing.pop(task.id, None)
+        task.error = error
+        task.status = TaskStatus.FAILED
         task.completed_at = datetime.utcnow()
+        self._dead.append(task.id)
         return task
 
+    async def process_one(self, timeout: float = 0) -> Task | None:
+        """Reserve and run one task from the queue."""
+        task = await self.reserve(timeout)
+        if task is None:
+            return None
+        return await self.execute(task)
+
     def register(self, name: str, handler: Callable) -> None:
         """Register a task handler."""
         self._handlers[name] = handler
@@ -143,135 +395,556 @@ class InMemoryTaskQueue:
     async def process_all(self) -> int:
         """Process all pending tasks."""
         count = 0
-        while not self._queue.empty():
-            await self.process_one()
+        while await self.process_one() is not None:
             count += 1
         return count
 
+    async def dead_letters(self, limit: int = 100) -> list[Task]:
+        """Get tasks that exhausted their retries, oldest first."""
+        return [self._tasks[task_id] for task_id in self._dead[:limit]]
+
+    async def retry_dead(self, task_id: str) -> bool:
+        """Move a dead-lettered task back to the queue."""
+        if task_id not in self._dead:
+            return False
+        self._dead.remove(task_id)
+        task = self._tasks[task_id]
+        task.attempts = 0
+        task.status = TaskStatus.PENDING
+        self._push(task_id)
+        return True
+
+    async def lane_depths(self) -> dict[str, int]:
+        """Get the number of pending tasks in each lane."""
+        return {
+            lane: sum(len(pending) for pending in orgs.values())
+            for lane, orgs in self._lanes.items()
+        }
+
+    async def stats(self) -> dict[str, int]:
+        """Get the number of tasks in each state."""
+        return {
+            "pending": sum((await self.lane_depths()).values()),
+            "processing": len(self._processing),
+            "delayed": len(self._delayed),
+            "dead": len(self._dead),
+        }
+
+
+# Lua shared by the scripts below. Keys are built from the queue's prefix
+# (ARGV[1]), so all of a queue's keys must live on one Redis node.
+# push() queues a task id on its organization's list in its lane; an
+# organization entering the lane joins at the lane's virtual time.
+_PUSH_LUA = """
+local prefix = ARGV[1]
+local now = tonumber(ARGV[2])
+
+local function push(id, front)
+    local task = prefix .. 'task:' .. id
+    local lane, org = unpack(redis.call('HMGET', task, 'lane', 'org'))
+    if not lane then
+        return false
+    end
+    local lane_key = prefix .. 'lane:' .. lane
+    local list = lane_key .. ':org:' .. org
+    if front then
+        redis.call('RPUSH', list, id)
+    else
+        redis.call('LPUSH', list, id)
+    end
+    if not redis.call('ZSCORE', lane_key .. ':orgs', org) then
+        local clock = redis.call('GET', lane_key .. ':clock') or 0
+        redis.call('ZADD', lane_key .. ':orgs', clock, org)
+    end
+    redis.call('HSET', task, 'status', 'pending', 'queued_at', ARGV[2])
+    redis.call('HINCRBY', prefix .. 'depth', lane, 1)
+    redis.call('LPUSH', prefix .. 'wakeup:' .. lane, 1)
+    redis.call('LTRIM', prefix .. 'wakeup:' .. lane, 0, 99)
+    return true
+end
+"""
+
+# Args: prefix, now, task id, '1' to queue at the front.
+# Queues a new or returned task, dropping any reservation it holds.
+PUSH_SCRIPT = _PUSH_LUA + """
+redis.call('LREM', prefix .. 'processing', 1, ARGV[3])
+redis.call('ZREM', prefix .. 'leases', ARGV[3])
+return push(ARGV[3], ARGV[4] == '1')
+"""
+
+# Args: prefix, now, visibility timeout (s), max tasks to move.
+# Re-delivers tasks whose lease expired and releases retries whose backoff
+# has elapsed, at the front of their organization's list.
+REQUEUE_SCRIPT = _PUSH_LUA + """
+local leases = prefix .. 'leases'
+local processing = prefix .. 'processing'
+local delayed = prefix .. 'delayed'
+local moved = 0
+
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', leases, '-inf', now, 'LIMIT', 0, ARGV[4])) do
+    redis.call('ZREM', leases, id)
+    if redis.call('LREM', processing, 1, id) > 0 and push(id, true) then
+        moved = moved + 1
+    end
+end
+
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', delayed, '-inf', now, 'LIMIT', 0, ARGV[4])) do
+    redis.call('ZREM', delayed, id)
+    if push(id, true) then
+        moved = moved + 1
+    end
+end
+return moved
+"""
+
+# Args: prefix, now, visibility timeout (s), started at (ISO), lanes...
+# Takes the next task from the first lane that has one: from the
+# organization with the lowest virtual time, which then advances by
+# 1 / weight. Leases the task and returns {id, task fields}.
+RESERVE_SCRIPT = """
+local prefix = ARGV[1]
+local now = tonumber(ARGV[2])
+
+for i = 5, #ARGV do
+    local lane = ARGV[i]
+    local lane_key = prefix .. 'lane:' .. lane
+    local orgs = lane_key .. ':orgs'
+    while true do
+        local head = redis.call('ZRANGE', orgs, 0, 0, 'WITHSCORES')
+        if #head == 0 then
+            break
+        end
+        local org, vtime = head[1], tonumber(head[2])
+        local list = lane_key .. ':org:' .. org
+        local id = redis.call('RPOP', list)
+        if id then
+            if redis.call('LLEN', list) > 0 then
+                local weight = tonumber(redis.call('HGET', prefix .. 'weights', org)) or 1
+                redis.call('ZADD', orgs, vtime + 1 / weight, org)
+            else
+                redis.call('ZREM', orgs, org)
+            end
+            redis.call('SET', lane_key .. ':clock', vtime)
+            redis.call('HINCRBY', prefix .. 'depth', lane, -1)
+
+            redis.call('LPUSH', prefix .. 'processing', id)
+            redis.call('ZADD', prefix .. 'leases', now + tonumber(ARGV[3]), id)
+            local task = prefix .. 'task:' .. id
+            redis.call('HINCRBY', task, 'attempts', 1)
+            redis.call('HSET', task, 'status', 'processing', 'started_at', ARGV[4])
+            return {id, redis.call('HGETALL', task)}
+        end
+        redis.call('ZREM', orgs, org)
+    end
+end
+return false
+"""
+
 
 class RedisTaskQueue:
-    """Redis-based task queue for production."""
+    """Redis-based task queue for production.
+
+    Keys, under ``tasks:{queue_name}:``:
+
+    - ``lane:{lane}:org:{org}``: an organization's pending task ids in a
+      lane (list; pushed left, taken right)
+    - ``lane:{lane}:orgs``: virtual time of each organization with pending
+      tasks in the lane (sorted set)
+    - ``lane:{lane}:clock``: virtual time of the lane's last reservation
+    - ``depth``: pending tasks per lane (hash)
+    - ``weights``: organization weights (hash; default 1)
+    - ``wakeup:{lane}``: tokens pushed as tasks enter the lane, to wake
+      workers blocked on it (list)
+    - ``processing``: reserved task ids (list)
+    - ``leases``: lease deadline per reserved task (sorted set)
+    - ``delayed``: retry time per task waiting out its backoff (sorted set)
+    - ``dead``: task ids that exhausted their retries (list)
+    - ``task:{id}``: task fields (hash), updated field by field
+    """
 
     def __init__(
         self,
         redis_url: str | None = None,
         queue_name: str = "default",
+        visibility_timeout: float = 300.0,
+        retry: RetryPolicy | None = None,
+        client: "aioredis.Redis | None" = None,
+        task_ttl: int = 86400 * 7,
+        requeue_interval: float = 1.0,
     ):
+        """Initialize the queue.
+
+        Args:
+            redis_url: Redis URL. Defaults to REDIS_URL.
+            queue_name: Queue name used in keys.
+            visibility_timeout: Seconds a reserved task stays invisible to
+                other workers without a lease renewal.
+            retry: Retry schedule for failed tasks.
+            client: Redis client. Defaults to one for ``redis_url``.
+            task_ttl: Seconds finished tasks are kept.
+            requeue_interval: Minimum seconds between requeue sweeps.
+        """
         if not REDIS_AVAILABLE:
             raise ImportError("redis package not installed")
 
         self.redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
         self.queue_name = queue_name
-        self._redis: aioredis.Redis | None = None
+        self.visibility_timeout = visibility_timeout
+        self.retry = retry or RetryPolicy()
+        self.task_ttl = task_ttl
+        self.requeue_interval = requeue_interval
+        self._redis: aioredis.Redis | None = client
+        self._scripts: dict[str, Any] = {}
+        self._last_requeue = 0.0
         self._handlers: dict[str, Callable] = {}
 
     async def _get_redis(self) -> aioredis.Redis:
         """Get Redis connection."""
         if self._redis is None:
-            self._redis = aioredis.from_url(self.redis_url)
+            self._redis = aioredis.from_url(self.redis_url, decode_responses=True)
         return self._redis
 
-    def _queue_key(self) -> str:
-        return f"tasks:{self.queue_name}:queue"
+    async def _script(self, source: str):
+        """Get a registered script for the current connection."""
+        redis = await self._get_redis()
+        script = self._scripts.get(source)
+        if script is None or script.registered_client is not redis:
+            script = self._scripts[source] = redis.register_script(source)
+        return script
+
+    @property
+    def _prefix(self) -> str:
+        return f"tasks:{self.queue_name}:"
+
+    def _key(self, name: str) -> str:
+        return f"{self._prefix}{name}"
 
     def _task_key(self, task_id: str) -> str:
-        return f"tasks:{self.queue_name}:task:{task_id}"
+        return self._key(f"task:{task_id}")
+
+    @staticmethod
+    def _encode(task: Task) -> dict[str, str]:
+        """Task fields as hash values."""
+        data = task.to_dict()
+        fields = {
+            "name": task.name,
+            "args": json.dumps(data["args"]),
+            "kwargs": json.dumps(data["kwargs"]),
+            "status": data["status"],
+            "attempts": str(task.attempts),
+            "lane": task.lane,
+            "org": task.org,
+            "created_at": data["created_at"],
+        }
+        return fields
+
+    @staticmethod
+    def _decode(task_id: str, fields: dict) -> Task:
+        """Task from hash values."""
+        fields = {
+            k.decode() if isinstance(k, bytes) else k: v.decode() if isinstance(v, bytes) else v
+            for k, v in fields.items()
+        }
+        return Task.from_dict({
+            "id": task_id,
+            "name": fields["name"],
+            "args": json.loads(fields.get("args", "[]")),
+            "kwargs": json.loads(fields.get("kwargs", "{}")),
+            "status": fields.get("status", "pending"),
+            "result": json.loads(fields["result"]) if fields.get("result") else None,
+            "error": fields.get("error") or None,
+            "attempts": fields.get("attempts", 0),
+            "lane": fields.get("lane"),
+            "org": fields.get("org"),
+            "queued_at": fields.get("queued_at"),
+            "created_at": fields.get("created_at"),
+            "started_at": fields.get("started_at") or None,
+            "completed_at": fields.get("completed_at") or None,
+        })
+
+    async def _push(self, pipe, task_id: str, front: bool = False) -> None:
+        """Add queueing the task on its organization's list to a pipeline."""
+        push = await self._script(PUSH_SCRIPT)
+        await push(keys=[], args=[self._prefix, time.time(), task_id, int(front)], client=pipe)
+
+    async def set_org_weight(self, org: str, weight: float) -> None:
+        """Set an organization's share of each lane relative to others (default 1)."""
+        redis = await self._get_redis()
+        await redis.hset(self._key("weights"), org, weight)
 
     async def enqueue(
         self,
         name: str,
         *args,
+        _lane: str | None = None,
+        _org: str | None = None,
         **kwargs,
     ) -> str:
-        """Add task to queue."""
+        """Add task to queue.
+
+        Args:
+            name: Registered handler name.
+            *args: Handler arguments.
+            _lane: Lane. Defaults to ``TASK_LANES`` for the task, else interactive.
+            _org: Organization the task counts against for fair scheduling.
+            **kwargs: Handler keyword arguments.
+        """
         redis = await self._get_redis()
+        task = _new_task(name, args, kwargs, _lane, _org)
 
-        task_id = str(uuid.uuid4())
-        task = Task(
-            id=task_id,
-            name=name,
-            args=args,
-            kwargs=kwargs,
-        )
-
-        # Store task
-        await redis.set(
-            self._task_key(task_id),
-            json.dumps(task.to_dict()),
-            ex=86400 * 7,  # 7 days
-        )
-
-        # Add to queue
-        await redis.lpush(self._queue_key(), task_id)
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._task_key(task.id), mapping=self._encode(task))
+            pipe.expire(self._task_key(task.id), self.task_ttl)
+            await self._push(pipe, task.id)
+            await pipe.execute()
 
-        return task_id
+        return task.id
 
     async def get_task(self, task_id: str) -> Task | None:
         """Get task by ID."""
         redis = await self._get_redis()
-        data = await redis.get(self._task_key(task_id))
-        if not data:
+        fields = await redis.hgetall(self._task_key(task_id))
+        if not fields:
             return None
-        return Task.from_dict(json.loads(data))
+        return self._decode(task_id, fields)
+
+    async def requeue_expired(self) -> int:
+        """Return expired leases and due retries to the queue."""
+        requeue = await self._script(REQUEUE_SCRIPT)
+        self._last_requeue = time.monotonic()
+        return await requeue(
+            keys=[],
+            args=[self._prefix, time.time(), self.visibility_timeout, 1000],
+        )
 
-    async def process_one(self, timeout: int = 5) -> Task | None:
-        """Process one task from queue."""
+    async def reserve(
+        self,
+        timeout: float = 5,
+        lanes: Sequence[str] = LANES,
+    ) -> Task | None:
+        """Take the next task and lease it to the caller.
+
+        Args:
+            timeout: Seconds to block waiting for a task; 0 returns immediately.
+            lanes: Lanes to take from, in priority order.
+
+        Returns:
+            The reserved task, or None if none became available.
+        """
         redis = await self._get_redis()
-
-        # Block until task available
-        result = await redis.brpop(self._queue_key(), timeout=timeout)
-        if not result:
+        reserve = await self._script(RESERVE_SCRIPT)
+        deadline = time.monotonic() + timeout
+        while True:
+            if time.monotonic() - self._last_requeue >= self.requeue_interval:
+                await self.requeue_expired()
+
+            reserved = await reserve(keys=[], args=[
+                self._prefix,
+                time.time(),
+                self.visibility_timeout,
+                datetime.utcnow().isoformat(),
+                *lanes,
+            ])
+            if reserved:
+                break
+
+            # Block in slices so due retries are moved to the queue meanwhile
+            wait = min(deadline - time.monotonic(), max(self.requeue_interval, 0.05))
+            if wait <= 0:
+                return None
+            await redis.blpop([self._key(f"wakeup:{lane}") for lane in lanes], timeout=wait)
+
+        task_id, flat = reserved
+        if isinstance(task_id, bytes):
+            task_id = task_id.decode()
+        fields = dict(zip(flat[::2], flat[1::2]))
+        if not fields.get("name") and not fields.get(b"name"):
+            # Task data expired; drop the id
+            await self._remove_reserved(task_id)
+            await redis.delete(self._task_key(task_id))
             return None
 
-        _, task_id = result
-        task = await self.get_task(task_id)
-        if not task:
+        task = self._decode(task_id, fields)
+        if task.attempts > self.retry.max_retries + 1:
+            # Re-delivered too often, e.g. it keeps crashing its worker
+            await self._dead_letter(task, task.error or "Exceeded delivery attempts")
             return None
+        return task
 
-        handler = self._handlers.get(task.name)
-        if not handler:
-            task.status = TaskStatus.FAILED
-            task.error = f"No handler for task: {task.name}"
-            await self._save_task(task)
-            return task
+    async def _remove_reserved(self, task_id: str, pipe=None) -> None:
+        """Drop a task from the processing list and its lease."""
+        if pipe is None:
+            redis = await self._get_redis()
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.lrem(self._key("processing"), 1, task_id)
+                pipe.zrem(self._key("leases"), task_id)
+                await pipe.execute()
+            return
+        pipe.lrem(self._key("processing"), 1, task_id)
+        pipe.zrem(self._key("leases"), task_id)
+
+    async def extend_lease(self, task: Task) -> None:
+        """Renew the lease of a running task."""
+        redis = await self._get_redis()
+        await redis.zadd(
+            self._key("leases"),
+            {task.id: time.time() + self.visibility_timeout},
+            xx=True,
+        )
 
-        task.status = TaskStatus.PROCESSING
-        task.started_at = datetime.utcnow()
-        await self._save_task(task)
+    async def ack(self, task: Task, result: Any = None) -> Task:
+        """Mark a reserved task as completed."""
+        redis = await self._get_redis()
+        task.result = result
+        task.status = TaskStatus.COMPLETED
+        task.completed_at = datetime.utcnow()
 
-        try:
-            if asyncio.iscoroutinefunction(handler):
-                result = await handler(*task.args, **task.kwargs)
-            else:
-                result = handler(*task.args, **task.kwargs)
+        async with redis.pipeline(transaction=True) as pipe:
+            await self._remove_reserved(task.id, pipe)
+            pipe.hset(self._task_key(task.id), mapping={
+                "status": task.status.value,
+                "result": json.dumps(result, default=str),
+                "completed_at": task.completed_at.isoformat(),
+            })
+            pipe.expire(self._task_key(task.id), self.task_ttl)
+            await pipe.execute()
+        return task
 
-            task.result = result
-            task.status = TaskStatus.COMPLETED
-        except Exception as e:
-            task.error = str(e)
-            task.status = TaskStatus.FAILED
+    async def fail(self, task: Task, error: str) -> Task:
+        """Retry a reserved task after backoff, or dead-letter it."""
+        if task.attempts > self.retry.max_retries:
+            return await self._dead_letter(task, error)
+
+        redis = await self._get_redis()
+        task.error = error
+        task.status = TaskStatus.RETRYING
+        ready_at = time.time() + self.retry.delay(task.attempts)
+
+        async with redis.pipeline(transaction=True) as pipe:
+            await self._remove_reserved(task.id, pipe)
+            pipe.zadd(self._key("delayed"), {task.id: ready_at})
+            pipe.hset(self._task_key(task.id), mapping={
+                "status": task.status.value,
+                "error": error,
+            })
+            await pipe.execute()
+        return task
 
+    async def _dead_letter(self, task: Task, error: str) -> Task:
+        """Move a reserved task to the dead-letter list."""
+        redis = await self._get_redis()
+        task.error = error
+        task.status = TaskStatus.FAILED
         task.completed_at = datetime.utcnow()
-        await self._save_task(task)
+
+        async with redis.pipeline(transaction=True) as pipe:
+            await self._remove_reserved(task.id, pipe)
+            pipe.lpush(self._key("dead"), task.id)
+            pipe.hset(self._task_key(task.id), mapping={
+                "status": task.status.value,
+                "error": error,
+                "completed_at": task.completed_at.isoformat(),
+            })
+            # Keep dead tasks until they are inspected
+            pipe.persist(self._task_key(task.id))
+            await pipe.execute()
+        logger.error(f"Task {task.id} ({task.name}) dead-lettered: {error}")
         return task
 
-    async def _save_task(self, task: Task) -> None:
-        """Save task to Redis."""
+    async def release(self, task: Task) -> None:
+        """Return a reserved task to the queue without counting the attempt."""
         redis = await self._get_redis()
-        await redis.set(
-            self._task_key(task.id),
-            json.dumps(task.to_dict()),
-            ex=86400 * 7,
-        )
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hincrby(self._task_key(task.id), "attempts", -1)
+            await self._push(pipe, task.id, front=True)
+            await pipe.execute()
+        task.attempts -= 1
+        task.status = TaskStatus.PENDING
+
+    async def _keep_leased(self, task: Task) -> None:
+        """Renew a running task's lease until cancelled."""
+        interval = self.visibility_timeout / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.extend_lease(task)
+            except Exception as e:
+                logger.warning(f"Lease renewal for task {task.id} failed: {e}")
+
+    async def execute(self, task: Task) -> Task:
+        """Run a reserved task's handler and record the outcome."""
+        handler = self._handlers.get(task.name)
+        if not handler:
+            return await self._dead_letter(task, f"No handler for task: {task.name}")
+
+        heartbeat = asyncio.create_task(self._keep_leased(task))
+        try:
+            result = await _call_handler(handler, task)
+        except asyncio.CancelledError:
+            await self.release(task)
+            raise
+        except Exception as e:
+            return await self.fail(task, str(e))
+        finally:
+            heartbeat.cancel()
+        return await self.ack(task, result)
+
+    async def process_one(self, timeout: float = 5) -> Task | None:
+        """Reserve and run one task from the queue."""
+        task = await self.reserve(timeout)
+        if task is None:
+            return None
+        return await self.execute(task)
 
     def register(self, name: str, handler: Callable) -> None:
         """Register a task handler."""
         self._handlers[name] = handler
 
+    async def dead_letters(self, limit: int = 100) -> list[Task]:
+        """Get tasks that exhausted their retries, oldest first."""
+        redis = await self._get_redis()
+        task_ids = await redis.lrange(self._key("dead"), -limit, -1)
+        tasks = [await self.get_task(task_id) for task_id in reversed(task_ids)]
+        return [task for task in tasks if task]
+
+    async def retry_dead(self, task_id: str) -> bool:
+        """Move a dead-lettered task back to the queue."""
+        redis = await self._get_redis()
+        if not await redis.lrem(self._key("dead"), 1, task_id):
+            return False
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._task_key(task_id), "attempts", 0)
+            pipe.expire(self._task_key(task_id), self.task_ttl)
+            await self._push(pipe, task_id)
+            await pipe.execute()
+        return True
+
+    async def lane_depths(self) -> dict[str, int]:
+        """Get the number of pending tasks in each lane."""
+        redis = await self._get_redis()
+        depths = await redis.hgetall(self._key("depth"))
+        return {lane: int(depths.get(lane, 0)) for lane in LANES}
+
+    async def stats(self) -> dict[str, int]:
+        """Get the number of tasks in each state."""
+        redis = await self._get_redis()
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hvals(self._key("depth"))
+            pipe.llen(self._key("processing"))
+            pipe.zcard(self._key("delayed"))
+            pipe.llen(self._key("dead"))
+            depths, processing, delayed, dead = await pipe.execute()
+        return {
+            "pending": sum(int(depth) for depth in depths),
+            "processing": processing,
+            "delayed": delayed,
+            "dead": dead,
+        }
+
     async def close(self) -> None:
         """Close Redis connection."""
         if self._redis:
-            await self._redis.close()
+            await self._redis.aclose()
             self._redis = None
 
 
@@ -285,10 +958,17 @@ _queue_instance: TaskQueue | None = None
 def get_task_queue(
     redis_url: str | None = None,
     queue_name: str = "default",
+    **options,
 ) -> TaskQueue:
     """Get task queue instance.
 
-    Returns Redis queue if available, otherwise in-memory queue.
+    Returns a Redis queue if Redis is reachable, otherwise an in-memory
+    queue, which only a worker in the same process can consume.
+
+    Args:
+        redis_url: Redis URL.
+        queue_name: Queue name.
+        **options: ``visibility_timeout`` and ``retry`` for a new queue.
     """
     global _queue_instance
 
@@ -297,10 +977,13 @@ def get_task_queue(
 
     if REDIS_AVAILABLE:
         try:
-            _queue_instance = RedisTaskQueue(redis_url, queue_name)
+            queue = RedisTaskQueue(redis_url, queue_name, **options)
+            with redis.from_url(queue.redis_url, socket_connect_timeout=1) as client:
+                client.ping()
+            _queue_instance = queue
             return _queue_instance
         except Exception:
             pass
 
-    _queue_instance = InMemoryTaskQueue(queue_name)
+    _queue_instance = InMemoryTaskQueue(queue_name, **options)
     return _queue_instance
@@ -4,9 +4,13 @@ import asyncio
 import logging
 import os
 import signal
+import time
+from collections import Counter
 from dataclasses import dataclass
 
-from backend.tasks.queue import get_task_queue, TaskQueue
+from backend.tasks.executor import get_cpu_pool, shutdown_cpu_pool
+from backend.tasks.metrics import LaneMetrics
+from backend.tasks.queue import LANES, get_task_queue, RetryPolicy, Task, TaskQueue
 
 logger = logging.getLogger("infographix.worker")
 
@@ -17,8 +21,33 @@ class WorkerSettings:
     queue_name: str = "default"
     redis_url: str | None = None
     max_jobs: int = 0  # 0 = unlimited
-    poll_delay: float = 0.5
+    poll_delay: float = 0.5  # Seconds to wait for a task before checking for shutdown
     shutdown_timeout: float = 30.0
+    warm_up_models: bool = True
+    # Tasks run at once; generation runs in threads, so I/O overlaps with it
+    concurrency: int = 4
+    # Seconds before a task held by an unresponsive worker is re-delivered
+    visibility_timeout: float = 300.0
+    max_retries: int = 3
+    # Threads for inference; 0 = INFERENCE_WORKERS or the CPU count
+    cpu_workers: int = 0
+    # Tasks run at once per lane, within concurrency. Lanes left out use
+    # the defaults: interactive may use every slot, batch half of them and
+    # maintenance one, so batch load always leaves room for interactive tasks
+    lane_limits: dict[str, int] | None = None
+    # Seconds between queue depth and wait time log lines; 0 disables them
+    metrics_interval: float = 60.0
+
+    def lane_limit(self, lane: str) -> int:
+        """Tasks of ``lane`` that may run at once."""
+        if self.lane_limits and lane in self.lane_limits:
+            return self.lane_limits[lane]
+        defaults = {
+            "interactive": self.concurrency,
+            "batch": max(1, self.concurrency // 2),
+            "maintenance": 1,
+        }
+        return defaults[lane]
 
 
 class Worker:
@@ -27,76 +56,181 @@ class Worker:
     Processes tasks from the queue continuously.
     """
 
-    def __init__(self, settings: WorkerSettings | None = None):
+    def __init__(self, settings: WorkerSettings | None = None, queue: TaskQueue | None = None):
         self.settings = settings or WorkerSettings()
-        self.queue: TaskQueue | None = None
+        self.queue: TaskQueue | None = queue
         self._running = False
+        self._jobs_started = 0
         self._jobs_processed = 0
+        self._in_flight: set[asyncio.Task] = set()
+        # Running tasks per lane
+        self._running_lanes: Counter[str] = Counter()
+        self._slot_freed = asyncio.Event()
+        self.metrics = LaneMetrics()
 
     async def startup(self) -> None:
         """Initialize worker."""
-        self.queue = get_task_queue(
-            redis_url=self.settings.redis_url,
-            queue_name=self.settings.queue_name,
-        )
+        if self.queue is None:
+            self.queue = get_task_queue(
+                redis_url=self.settings.redis_url,
+                queue_name=self.settings.queue_name,
+                visibility_timeout=self.settings.visibility_timeout,
+                retry=RetryPolicy(max_retries=self.settings.max_retries),
+            )
 
         # Register task handlers
         self._register_handlers()
+        get_cpu_pool(self.settings.cpu_workers or None)
+
+        # Load and warm the shared inference engine before taking jobs
+        if self.settings.warm_up_models:
+            from ml.inference import get_engine_registry
+
+            registry = get_engine_registry()
+            await asyncio.to_thread(registry.get, use_ml=False)
+            logger.info(f"Inference engines warm: {registry.timings()}")
 
-        logger.info(f"Worker started for queue: {self.settings.queue_name}")
+        logger.info(
+            f"Worker started for queue: {self.settings.queue_name} "
+            f"(concurrency {self.settings.concurrency})"
+        )
 
     def _register_handlers(self) -> None:
         """Register all task handlers."""
         from backend.tasks.handlers import (
             process_generation_task,
+            process_generation_batch_task,
             process_variations_task,
             generate_download_task,
             cleanup_expired_downloads_task,
         )
 
         self.queue.register("process_generation", process_generation_task)
+        self.queue.register("process_generation_batch", process_generation_batch_task)
         self.queue.register("process_variations", process_variations_task)
         self.queue.register("generate_download", generate_download_task)
         self.queue.register("cleanup_downloads", cleanup_expired_downloads_task)
 
     async def shutdown(self) -> None:
-        """Graceful shutdown."""
+        """Graceful shutdown.
+
+        Waits up to ``shutdown_timeout`` for running tasks; tasks still
+        running after that are cancelled and returned to the queue.
+        """
         logger.info("Worker shutting down...")
         self._running = False
 
+        if self._in_flight:
+            _, pending = await asyncio.wait(
+                self._in_flight, timeout=self.settings.shutdown_timeout
+            )
+            for job in pending:
+                job.cancel()
+            if pending:
+                logger.warning(f"Returning {len(pending)} unfinished tasks to the queue")
+                await asyncio.gather(*pending, return_exceptions=True)
+
         if hasattr(self.queue, "close"):
             await self.queue.close()
+        shutdown_cpu_pool()
 
         logger.info(f"Worker stopped. Processed {self._jobs_processed} jobs.")
 
+    def _open_lanes(self) -> list[str]:
+        """Lanes with a free slot, in priority order."""
+        if sum(self._running_lanes.values()) >= self.settings.concurrency:
+            return []
+        return [
+            lane for lane in LANES
+            if self._running_lanes[lane] < self.settings.lane_limit(lane)
+        ]
+
+    async def _execute(self, task: Task) -> None:
+        """Run one reserved task and free its slot."""
+        wait = time.time() - task.queued_at if task.queued_at else 0.0
+        start = time.perf_counter()
+        try:
+            task = await self.queue.execute(task)
+            self._jobs_processed += 1
+            if task.error:
+                logger.error(f"Task {task.id} {task.status.value}: {task.error}")
+            else:
+                logger.info(f"Task {task.id} completed")
+        except Exception as e:
+            logger.exception(f"Task {task.id} could not be recorded: {e}")
+        finally:
+            self.metrics.record(task.lane, wait, time.perf_counter() - start)
+            self._running_lanes[task.lane] -= 1
+            self._slot_freed.set()
+
+    async def _log_metrics(self) -> None:
+        """Log queue depth and wait times every ``metrics_interval``."""
+        while True:
+            await asyncio.sleep(self.settings.metrics_interval)
+            try:
+                depths = await self.queue.lane_depths()
+            except Exception as e:
+                logger.warning(f"Reading queue depths failed: {e}")
+                continue
+            logger.info(f"Queue depth by lane: {depths}; tasks by lane: {self.metrics.snapshot()}")
+
     async def run(self) -> None:
-        """Run worker main loop."""
+        """Run worker main loop.
+
+        Keeps up to ``concurrency`` tasks running, reserving the next task
+        as soon as a slot frees up. A lane at its limit is skipped, so its
+        backlog cannot take the slots of higher-priority lanes.
+        """
         await self.startup()
         self._running = True
+        reporter = None
+        if self.settings.metrics_interval > 0:
+            reporter = asyncio.create_task(self._log_metrics())
 
         try:
             while self._running:
                 # Check job limit
-                if self.settings.max_jobs > 0 and self._jobs_processed >= self.settings.max_jobs:
+                if self.settings.max_jobs > 0 and self._jobs_started >= self.settings.max_jobs:
                     logger.info(f"Reached max jobs limit: {self.settings.max_jobs}")
                     break
 
-                # Process one task
-                task = await self.queue.process_one()
-
-                if task:
-                    self._jobs_processed += 1
-                    if task.error:
-                        logger.error(f"Task {task.id} failed: {task.error}")
-                    else:
-                        logger.info(f"Task {task.id} completed")
-                else:
-                    # No task available, wait before polling again
+                lanes = self._open_lanes()
+                if not lanes:
+                    self._slot_freed.clear()
+                    try:
+                        await asyncio.wait_for(
+                            self._slot_freed.wait(), timeout=self.settings.poll_delay
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                # Waits up to poll_delay for a task; with some lanes full,
+                # look again soon in case one of their slots frees up
+                timeout = self.settings.poll_delay
+                if len(lanes) < len(LANES):
+                    timeout = min(timeout, 0.1)
+                try:
+                    task = await self.queue.reserve(timeout=timeout, lanes=lanes)
+                except Exception as e:
+                    logger.error(f"Reserving a task failed: {e}")
                     await asyncio.sleep(self.settings.poll_delay)
+                    continue
+
+                if task is None:
+                    continue
+
+                self._jobs_started += 1
+                self._running_lanes[task.lane] += 1
+                job = asyncio.create_task(self._execute(task))
+                self._in_flight.add(job)
+                job.add_done_callback(self._in_flight.discard)
 
         except asyncio.CancelledError:
             pass
         finally:
+            if reporter is not None:
+                reporter.cancel()
             await self.shutdown()
 
 
@@ -132,6 +266,8 @@ def main():
     parser.add_argument("--queue", default="default", help="Queue name")
     parser.add_argument("--redis-url", help="Redis URL")
     parser.add_argument("--max-jobs", type=int, default=0, help="Max jobs to process (0=unlimited)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Tasks to run at once")
+    parser.add_argument("--cpu-workers", type=int, default=0, help="Inference threads (0=CPU count)")
     args = parser.parse_args()
 
     logging.basicConfig(
@@ -143,6 +279,8 @@ def main():
         queue_name=args.queue,
         redis_url=args.redis_url,
         max_jobs=args.max_jobs,
+        concurrency=args.concurrency,
+        cpu_workers=args.cpu_workers,
     )
 
     asyncio.run(run_worker(settings))
@@ -3,22 +3,22 @@
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 from datetime import datetime, timedelta
 
-from backend.db.base import Base, get_db
+from backend.db.base import Base, async_database_url, get_async_db, get_db
 from backend.db.models import User, Session as UserSession, Template
 from backend.api.routes.auth import hash_password, hash_token
 
 
 @pytest.fixture(scope="function")
-def test_db():
-    """Create test database with thread-safe SQLite."""
+def test_db(tmp_path):
+    """Create a SQLite test database file, shared with the async session."""
     engine = create_engine(
-        "sqlite:///:memory:",
+        f"sqlite:///{tmp_path / 'test.db'}",
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
     )
     Base.metadata.create_all(bind=engine)
     TestSession = sessionmaker(bind=engine)
@@ -64,10 +64,20 @@ def client(test_db):
 
     app = create_app()
 
+    async_engine = create_async_engine(
+        async_database_url(str(test_db.get_bind().url)), poolclass=NullPool
+    )
+    TestAsyncSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
     def override_get_db():
         yield test_db
 
+    async def override_get_async_db():
+        async with TestAsyncSession() as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
 
     with TestClient(app) as client:
         yield client
@@ -1,15 +1,21 @@
 """Tests for API routes."""
 
+import io
+import json
+import threading
+import time
+
 import pytest
 from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
 
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 
-from backend.db.base import Base, get_db
+from backend.db.base import Base, async_database_url, get_async_db, get_db
 from backend.db.models import (
     User,
     Session as UserSession,
@@ -23,12 +29,11 @@ from backend.api.routes.auth import hash_password, hash_token
 
 # Test fixtures
 @pytest.fixture(scope="function")
-def test_db():
-    """Create test database with thread-safe SQLite."""
+def test_db(tmp_path):
+    """Create a SQLite test database file, shared with the async session."""
     engine = create_engine(
-        "sqlite:///:memory:",
+        f"sqlite:///{tmp_path / 'test.db'}",
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
     )
     Base.metadata.create_all(bind=engine)
     TestSession = sessionmaker(bind=engine)
@@ -74,10 +79,20 @@ def client(test_db):
 
     app = create_app()
 
+    async_engine = create_async_engine(
+        async_database_url(str(test_db.get_bind().url)), poolclass=NullPool
+    )
+    TestAsyncSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
     def override_get_db():
         yield test_db
 
+    async def override_get_async_db():
+        async with TestAsyncSession() as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
 
     with TestClient(app) as client:
         yield client
@@ -232,6 +247,247 @@ class TestGenerateRoutes:
         data = response.json()
         assert len(data) == 3
 
+    def test_generation_events_for_finished_generation(
+        self, client, test_db, test_user, test_session
+    ):
+        """Test the event stream of a finished generation is its final state."""
+        generation = Generation(
+            user_id=test_user.id,
+            prompt="Test prompt",
+            status=GenerationStatus.FAILED,
+            error_message="boom",
+        )
+        test_db.add(generation)
+        test_db.commit()
+        generation_id = generation.id
+
+        response = client.get(
+            f"/api/v1/generate/{generation_id}/events",
+            headers={"Authorization": f"Bearer {test_session}"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [
+            json.loads(line[len("data: "):])
+            for line in response.text.splitlines()
+            if line.startswith("data: ")
+        ]
+        assert len(events) == 1
+        assert events[0]["status"] == "failed"
+        assert events[0]["message"] == "boom"
+
+    def test_generation_events_stream_progress(
+        self, client, test_db, test_user, test_session, monkeypatch
+    ):
+        """Test stage events are pushed to the client until completion."""
+        from backend.tasks import progress
+
+        broker = progress.InMemoryProgressBroker()
+        monkeypatch.setattr(progress, "_broker_instance", broker)
+
+        generation = Generation(
+            user_id=test_user.id,
+            prompt="Test prompt",
+            status=GenerationStatus.PENDING,
+        )
+        test_db.add(generation)
+        test_db.commit()
+        generation_id = generation.id
+
+        def work():
+            report = progress.ProgressReporter(generation_id, broker)
+            for stage in ("processing", "classified", "layout", "styled", "completed"):
+                time.sleep(0.05)
+                report(stage)
+
+        worker = threading.Timer(0.2, work)
+        worker.start()
+        response = client.get(
+            f"/api/v1/generate/{generation_id}/events",
+            headers={"Authorization": f"Bearer {test_session}"},
+        )
+        worker.join()
+
+        stages = [
+            json.loads(line[len("data: "):])["stage"]
+            for line in response.text.splitlines()
+            if line.startswith("data: ")
+        ]
+        assert stages[0] == "queued"
+        assert stages[-1] == "completed"
+        assert set(stages) <= {"queued", "processing", "classified", "layout", "styled", "completed"}
+
+    def test_generation_events_not_found(self, client, test_session):
+        """Test streaming events of another user's or unknown generation."""
+        response = client.get(
+            "/api/v1/generate/nonexistent-id/events",
+            headers={"Authorization": f"Bearer {test_session}"},
+        )
+        assert response.status_code == 404
+
+    def test_create_generation_enqueues_task(
+        self, client, test_session, monkeypatch
+    ):
+        """Test generation is handed to the worker queue, not run in the API."""
+        from backend.api.routes import generate
+        from backend.tasks.queue import InMemoryTaskQueue
+
+        queue = InMemoryTaskQueue()
+        monkeypatch.setattr(generate, "get_task_queue", lambda: queue)
+
+        response = client.post(
+            "/api/v1/generate",
+            json={"prompt": "Create a funnel", "num_variations": 2},
+            headers={"Authorization": f"Bearer {test_session}"},
+        )
+        assert response.status_code == 200
+
+        [task] = queue._tasks.values()
+        assert task.name == "process_generation"
+        assert task.kwargs["generation_id"] == response.json()["id"]
+        assert task.kwargs["num_variations"] == 2
+        assert task.lane == "interactive"
+        assert task.org.startswith("user:")
+
+    def test_create_generation_queue_unavailable(
+        self, client, test_db, test_user, test_session, monkeypatch
+    ):
+        """Test a queue outage fails the generation and refunds the credit."""
+        from backend.api.routes import generate
+
+        class DownQueue:
+            async def enqueue(self, name, *args, **kwargs):
+                raise ConnectionError("redis down")
+
+        monkeypatch.setattr(generate, "get_task_queue", DownQueue)
+        initial_credits = test_user.credits_remaining
+
+        response = client.post(
+            "/api/v1/generate",
+            json={"prompt": "Create a funnel"},
+            headers={"Authorization": f"Bearer {test_session}"},
+        )
+        assert response.status_code == 503
+
+        test_db.refresh(test_user)
+        assert test_user.credits_remaining == initial_credits
+        generation = test_db.query(Generation).one()
+        assert generation.status == GenerationStatus.FAILED
+
+    async def test_generation_task_updates_record(self, test_db, test_user, monkeypatch):
+        """Test the worker handler runs the engine and stores the result."""
+        from backend.tasks import handlers
+
+        generation = Generation(
+            user_id=test_user.id,
+            prompt="4-stage process",
+            status=GenerationStatus.PENDING,
+        )
+        test_db.add(generation)
+        test_db.commit()
+        monkeypatch.setattr(
+            handlers, "SessionLocal", sessionmaker(bind=test_db.get_bind())
+        )
+
+        result = await handlers.process_generation_task(generation.id, "4-stage process")
+        assert result["success"]
+
+        test_db.refresh(generation)
+        assert generation.status == GenerationStatus.COMPLETED
+        assert generation.dsl is not None
+
+        # A second delivery of the same task does not redo the work
+        again = await handlers.process_generation_task(generation.id, "4-stage process")
+        assert "error" in again
+
+    def test_create_batch_enqueues_one_task(
+        self, client, test_db, test_user, test_session, monkeypatch
+    ):
+        """Test a batch is one batch-lane task, charged one credit per item."""
+        from backend.api.routes import generate
+        from backend.db.models import UsageRecord
+        from backend.tasks.queue import InMemoryTaskQueue
+
+        queue = InMemoryTaskQueue()
+        monkeypatch.setattr(generate, "get_task_queue", lambda: queue)
+
+        response = client.post(
+            "/api/v1/generate/batch",
+            json={
+                "items": [{"prompt": "Sales funnel"}, {"prompt": "Roadmap timeline"}],
+                "brand_colors": ["#112233"],
+            },
+            headers={"Authorization": f"Bearer {test_session}"},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["item_count"] == 2
+        assert [item["status"] for item in data["items"]] == ["pending", "pending"]
+
+        [task] = queue._tasks.values()
+        assert task.name == "process_generation_batch"
+        assert task.kwargs == {"batch_id": data["id"]}
+        assert task.lane == "batch"
+
+        test_db.refresh(test_user)
+        assert test_user.credits_remaining == 8
+        records = test_db.query(UsageRecord).all()
+        assert sorted(r.generation_id for r in records) == sorted(i["id"] for i in data["items"])
+
+    def test_create_batch_needs_credit_per_item(self, client, test_db, test_session):
+        """Test a batch larger than the remaining credits is refused."""
+        response = client.post(
+            "/api/v1/generate/batch",
+            json={"items": [{"prompt": f"Funnel {n}"} for n in range(11)]},
+            headers={"Authorization": f"Bearer {test_session}"},
+        )
+        assert response.status_code == 402
+        assert test_db.query(Generation).count() == 0
+
+    def test_batch_task_stores_results_and_deck(
+        self, client, test_db, test_session, tmp_path, monkeypatch
+    ):
+        """Test the worker handler fills every item and renders one deck."""
+        import asyncio
+        import zipfile
+
+        from backend.api.routes import generate
+        from backend.tasks import handlers
+        from backend.tasks.queue import InMemoryTaskQueue
+
+        monkeypatch.setattr(generate, "get_task_queue", InMemoryTaskQueue)
+        monkeypatch.setattr(handlers, "SessionLocal", sessionmaker(bind=test_db.get_bind()))
+        monkeypatch.setenv("DOWNLOAD_DIR", str(tmp_path))
+        headers = {"Authorization": f"Bearer {test_session}"}
+
+        batch_id = client.post(
+            "/api/v1/generate/batch",
+            json={
+                "items": [
+                    {"prompt": "4-stage sales funnel"},
+                    {"prompt": "Timeline", "content": [{"title": "Q1"}, {"title": "Q2"}]},
+                    {"prompt": "Three level pyramid"},
+                ],
+                "combine_pptx": True,
+            },
+            headers=headers,
+        ).json()["id"]
+
+        result = asyncio.run(handlers.process_generation_batch_task(batch_id))
+        assert result == {"success": True, "completed": 3, "failed": 0}
+
+        test_db.expire_all()
+        data = client.get(f"/api/v1/generate/batch/{batch_id}", headers=headers).json()
+        assert data["status"] == "completed"
+        assert data["completed_count"] == 3
+        assert [item["archetype"] for item in data["items"]] == ["funnel", "timeline", "pyramid"]
+
+        deck = client.get(data["pptx_url"], headers=headers)
+        assert deck.status_code == 200
+        with zipfile.ZipFile(io.BytesIO(deck.content)) as package:
+            slides = [n for n in package.namelist() if n.startswith("ppt/slides/slide")]
+        assert len(slides) == 3
+
 
 class TestTemplateRoutes:
     """Tests for template routes."""
@@ -303,6 +559,195 @@ class TestRateLimiting:
         assert "X-RateLimit-Limit" in response.headers
         assert "X-RateLimit-Remaining" in response.headers
 
+    def test_burst_then_refill(self, monkeypatch):
+        """Test a client can burst past the per-minute rate, then refills."""
+        from backend.api.middleware import rate_limit
+        from backend.api.middleware.rate_limit import InMemoryRateLimiter, RateLimitConfig
+
+        now = [1_000_000.0]
+        monkeypatch.setattr(rate_limit.time, "time", lambda: now[0])
+        limiter = InMemoryRateLimiter(RateLimitConfig(requests_per_minute=60, burst_size=5))
+
+        results = [limiter.is_allowed("client")[0] for _ in range(66)]
+        assert results == [True] * 65 + [False]
+        _, info = limiter.is_allowed("client")
+        assert info["retry_after"] == 1
+
+        # One token per second at 60 requests per minute
+        now[0] += 2
+        assert [limiter.is_allowed("client")[0] for _ in range(3)] == [True, True, False]
+        # Other clients have their own bucket
+        assert limiter.is_allowed("other")[0]
+
+    def test_hourly_limit(self, monkeypatch):
+        """Test requests_per_hour caps usage over a sliding hour."""
+        from backend.api.middleware import rate_limit
+        from backend.api.middleware.rate_limit import InMemoryRateLimiter, RateLimitConfig
+
+        now = [3600 * 1000.0]
+        monkeypatch.setattr(rate_limit.time, "time", lambda: now[0])
+        limiter = InMemoryRateLimiter(
+            RateLimitConfig(requests_per_minute=600, burst_size=0, requests_per_hour=20)
+        )
+
+        assert sum(limiter.is_allowed("client")[0] for _ in range(30)) == 20
+        allowed, info = limiter.is_allowed("client")
+        assert not allowed
+        assert info["remaining"] == 0
+
+        # Half way through the next hour, half of the previous hour still counts
+        now[0] += 3600 * 1.5
+        assert sum(limiter.is_allowed("client")[0] for _ in range(30)) == 10
+
+    def test_local_state_is_bounded(self):
+        """Test least recently seen clients are dropped past max_local_keys."""
+        from backend.api.middleware.rate_limit import InMemoryRateLimiter, RateLimitConfig
+
+        limiter = InMemoryRateLimiter(RateLimitConfig(max_local_keys=100))
+        for i in range(1000):
+            limiter.is_allowed(f"10.0.{i // 256}.{i % 256}")
+
+        assert len(limiter) == 100
+
+    async def test_redis_limits_are_shared_across_workers(self):
+        """Test limiters in different workers share one quota through Redis."""
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        from backend.api.middleware.rate_limit import (
+            InMemoryRateLimiter,
+            RateLimitConfig,
+            RedisRateLimiter,
+        )
+
+        config = RateLimitConfig(requests_per_minute=30, burst_size=5, requests_per_hour=100)
+        server = fakeredis.FakeServer()
+        workers = [
+            RedisRateLimiter(config, client=fakeredis.aioredis.FakeRedis(server=server))
+            for _ in range(4)
+        ]
+
+        results = [await workers[i % 4].check("client") for i in range(60)]
+
+        # Same decisions as a single local limiter
+        local = InMemoryRateLimiter(config)
+        expected = [local.is_allowed("client") for _ in range(60)]
+        assert [allowed for allowed, _ in results] == [allowed for allowed, _ in expected]
+        assert sum(allowed for allowed, _ in results) == 35
+        # 30 requests per minute refill a token every 2 seconds
+        assert results[-1][1]["retry_after"] in (1, 2)
+
+    async def test_redis_down_falls_back_to_local_share(self):
+        """Test an unreachable Redis falls back to this worker's share of the limits."""
+        pytest.importorskip("redis")
+        import redis.asyncio as aioredis
+
+        from backend.api.middleware.rate_limit import RateLimitConfig, RedisRateLimiter
+
+        config = RateLimitConfig(
+            requests_per_minute=40, burst_size=0, requests_per_hour=0, local_workers=4
+        )
+        client = aioredis.from_url("redis://127.0.0.1:1/0", socket_connect_timeout=0.1)
+        limiter = RedisRateLimiter(config, client=client)
+
+        results = [(await limiter.check("client"))[0] for _ in range(12)]
+
+        assert results == [True] * 10 + [False] * 2
+        assert limiter.fallback.is_allowed("other")[0]
+
+    def test_route_table_matching(self):
+        """Test route templates match by method, parameters and prefix."""
+        from backend.api.middleware.rate_limit import RouteRule, RouteTable
+
+        generate = RouteRule(bucket="generate", cost=2)
+        poll = RouteRule(bucket="poll")
+        default = RouteRule(bucket="defaults")
+        exempt = RouteRule(exempt=True)
+        table = RouteTable({
+            "POST /api/v1/generate": generate,
+            "GET /api/v1/generate/{generation_id}": poll,
+            "/api/v1/generate/defaults": default,
+            "/docs/*": exempt,
+        })
+
+        assert table.match("POST", "/api/v1/generate") is generate
+        assert table.match("POST", "/api/v1/generate/") is generate
+        assert table.match("GET", "/api/v1/generate") is None
+        assert table.match("GET", "/api/v1/generate/abc123") is poll
+        assert table.match("DELETE", "/api/v1/generate/abc123") is None
+        # Literal segments win over parameters
+        assert table.match("GET", "/api/v1/generate/defaults") is default
+        assert table.match("GET", "/docs") is exempt
+        assert table.match("GET", "/docs/oauth2-redirect") is exempt
+        assert table.match("GET", "/documents") is None
+
+    def test_polling_does_not_starve_generation(self):
+        """Test per-route buckets and per-plan policies are applied."""
+        from fastapi import FastAPI
+
+        from backend.api.middleware.rate_limit import (
+            RateLimitConfig,
+            RateLimitIdentity,
+            RateLimitMiddleware,
+            RateLimitPolicy,
+            RouteRule,
+        )
+
+        app = FastAPI()
+
+        @app.post("/generate")
+        async def generate() -> dict:
+            return {}
+
+        @app.get("/generate/{generation_id}")
+        async def poll(generation_id: str) -> dict:
+            return {}
+
+        async def get_identity(request):
+            plan = request.headers.get("X-Plan")
+            return RateLimitIdentity(f"user-{plan}", plan) if plan else None
+
+        app.add_middleware(
+            RateLimitMiddleware,
+            config=RateLimitConfig(
+                requests_per_minute=5,
+                burst_size=0,
+                routes={
+                    "POST /generate": RouteRule(bucket="generate", cost=2),
+                    "GET /generate/{generation_id}": RouteRule(bucket="poll"),
+                },
+                policies={
+                    "free": {
+                        "generate": RateLimitPolicy(requests_per_minute=4, burst_size=0),
+                        "poll": RateLimitPolicy(requests_per_minute=3, burst_size=0),
+                    },
+                    "enterprise": {
+                        "default": RateLimitPolicy(requests_per_minute=100, burst_size=0),
+                    },
+                },
+            ),
+            get_identity=get_identity,
+        )
+        client = TestClient(app)
+        free = {"X-Plan": "free"}
+
+        polls = [client.get("/generate/abc", headers=free).status_code for _ in range(5)]
+        assert polls == [200] * 3 + [429] * 2
+
+        # Generation has its own bucket; each request costs two tokens
+        generations = [client.post("/generate", headers=free) for _ in range(3)]
+        assert [r.status_code for r in generations] == [200, 200, 429]
+        assert generations[0].headers["X-RateLimit-Limit"] == "4"
+
+        enterprise = {"X-Plan": "enterprise"}
+        assert all(
+            client.post("/generate", headers=enterprise).status_code == 200
+            for _ in range(20)
+        )
+
+        # Unauthenticated clients get the default limits
+        anonymous = [client.get("/generate/abc").status_code for _ in range(6)]
+        assert anonymous == [200] * 5 + [429]
+
 
 class TestSecurityHeaders:
     """Tests for security headers."""
@@ -0,0 +1,177 @@
+"""Tests for the content-addressed render artifact store."""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.db.artifacts import ArtifactStore
+from backend.db.base import Base
+from backend.db.models import Download, Generation, RenderArtifact, User
+
+
+@pytest.fixture
+def db_session():
+    """Create a test database session."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    yield session
+
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def generation(db_session):
+    """Completed generation to attach downloads to."""
+    user = User(email="artifacts@example.com")
+    db_session.add(user)
+    db_session.flush()
+    generation = Generation(user_id=user.id, prompt="5-stage sales funnel")
+    db_session.add(generation)
+    db_session.commit()
+    return generation
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Artifact store rooted in a temp directory."""
+    return ArtifactStore(root=tmp_path / "artifacts")
+
+
+DSL = {
+    "canvas": {"width": 12192000, "height": 6858000},
+    "shapes": [{
+        "id": "box",
+        "type": "autoShape",
+        "auto_shape_type": "rect",
+        "bbox": {"x": 914400, "y": 914400, "width": 2743200, "height": 914400},
+        "fill": {"type": "solid", "color": "#0D9488"},
+    }],
+}
+
+
+class CountingRenderer:
+    """Render function that records how often it ran."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, dsl, path: Path) -> None:
+        self.calls += 1
+        path.write_text(f"rendered {len(dsl['shapes'])} shapes")
+
+
+def make_download(db_session, generation, store, render, dsl=DSL, **kwargs):
+    """Create a download and attach its artifact."""
+    download = Download(generation_id=generation.id, format="pptx", file_path="", **kwargs)
+    db_session.add(download)
+    store.attach(db_session, download, dsl, render)
+    db_session.commit()
+    return download
+
+
+class TestArtifactStore:
+    """Tests for ArtifactStore."""
+
+    def test_hash_is_canonical(self, store):
+        """Test key order does not change the hash, but format and version do."""
+        reordered = {"shapes": DSL["shapes"], "canvas": DSL["canvas"]}
+        assert store.content_hash(DSL, "pptx") == store.content_hash(reordered, "pptx")
+        assert store.content_hash(DSL, "pptx") != store.content_hash(DSL, "svg")
+
+        other = ArtifactStore(root=store.root, renderer_version="other")
+        assert other.content_hash(DSL, "pptx") != store.content_hash(DSL, "pptx")
+
+    def test_identical_dsl_rendered_once(self, db_session, generation, store):
+        """Test identical downloads share one rendered blob."""
+        render = CountingRenderer()
+        first = make_download(db_session, generation, store, render)
+        second = make_download(db_session, generation, store, render, variation_index=1)
+
+        assert render.calls == 1
+        assert first.file_path == second.file_path
+        assert len(list(store.root.rglob("*.pptx"))) == 1
+
+        artifact = db_session.get(RenderArtifact, first.artifact_hash)
+        assert artifact.ref_count == 2
+
+    def test_different_dsl_rendered_separately(self, db_session, generation, store):
+        """Test distinct DSLs get distinct artifacts."""
+        render = CountingRenderer()
+        changed = {**DSL, "canvas": {"width": 9144000, "height": 6858000}}
+        first = make_download(db_session, generation, store, render)
+        second = make_download(db_session, generation, store, render, dsl=changed)
+
+        assert render.calls == 2
+        assert first.artifact_hash != second.artifact_hash
+
+    def test_gc_keeps_referenced_blobs(self, db_session, generation, store):
+        """Test garbage collection only deletes unreferenced blobs."""
+        render = CountingRenderer()
+        first = make_download(db_session, generation, store, render)
+        make_download(db_session, generation, store, render, variation_index=1)
+        path = Path(first.file_path)
+
+        store.release(db_session, first.artifact_hash)
+        db_session.delete(first)
+        db_session.commit()
+
+        assert store.collect_garbage(db_session) == 0
+        assert path.exists()
+
+    def test_gc_deletes_unreferenced_blobs(self, db_session, generation, store):
+        """Test the last release makes a blob collectable."""
+        render = CountingRenderer()
+        download = make_download(db_session, generation, store, render)
+        path = Path(download.file_path)
+        content_hash = download.artifact_hash
+
+        store.release(db_session, content_hash)
+        db_session.delete(download)
+        db_session.commit()
+
+        assert store.collect_garbage(db_session) == 1
+        assert not path.exists()
+        assert db_session.get(RenderArtifact, content_hash) is None
+
+    def test_gc_reconciles_cascade_deletes(self, db_session, generation, store):
+        """Test references dropped without release are reclaimed after the grace period."""
+        render = CountingRenderer()
+        download = make_download(db_session, generation, store, render)
+        path = Path(download.file_path)
+
+        # Deleting the download directly leaves the stored count at 1
+        db_session.delete(download)
+        db_session.commit()
+
+        assert store.collect_garbage(db_session) == 0
+        assert path.exists()
+
+        assert store.collect_garbage(db_session, grace=timedelta(seconds=-1)) == 1
+        assert not path.exists()
+
+    def test_lost_blob_is_rerendered(self, db_session, generation, store):
+        """Test a missing file is rendered again on the next acquire."""
+        render = CountingRenderer()
+        first = make_download(db_session, generation, store, render)
+        Path(first.file_path).unlink()
+
+        second = make_download(db_session, generation, store, render, variation_index=1)
+
+        assert render.calls == 2
+        assert Path(second.file_path).exists()
+
+    def test_reattach_swaps_reference(self, db_session, generation, store):
+        """Test re-rendering the same download does not leak a reference."""
+        render = CountingRenderer()
+        download = make_download(db_session, generation, store, render)
+        store.attach(db_session, download, DSL, render)
+        db_session.commit()
+
+        artifact = db_session.get(RenderArtifact, download.artifact_hash)
+        assert artifact.ref_count == 1
@@ -0,0 +1,183 @@
+"""Tests for the cache layer and the generation result cache."""
+
+import pytest
+
+from backend.db.cache import CacheConfig, InMemoryCache
+from backend.db.generation_cache import (
+    GenerationCache,
+    canonical_hash,
+    run_cached_batch,
+    run_cached_generation,
+)
+
+
+@pytest.fixture
+def generation_cache():
+    """Generation cache backed by a fresh in-memory cache."""
+    return GenerationCache(cache=InMemoryCache(CacheConfig(max_entries=100)))
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Rule-based inference engine that counts classifier calls."""
+    from ml.inference import InferenceEngine
+
+    engine = InferenceEngine(models_dir=tmp_path, use_ml=False)
+    classifier = engine.intent_classifier
+    original = classifier.predict
+    engine.classify_calls = 0
+
+    def counting_predict(prompt):
+        engine.classify_calls += 1
+        return original(prompt)
+
+    classifier.predict = counting_predict
+    return engine
+
+
+class TestInMemoryCache:
+    """Tests for the in-memory cache fallback."""
+
+    def test_lru_eviction(self):
+        """Test least recently used entries are evicted first."""
+        cache = InMemoryCache(CacheConfig(max_entries=2))
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # "b" is now least recently used
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.evictions == 1
+
+    def test_unbounded_by_default(self):
+        """Test no eviction happens without max_entries."""
+        cache = InMemoryCache(CacheConfig())
+        for i in range(50):
+            cache.set(str(i), i)
+        assert cache.get("0") == 0
+        assert cache.evictions == 0
+
+    def test_ttl_expiry(self, monkeypatch):
+        """Test entries expire after their TTL."""
+        import time
+
+        cache = InMemoryCache(CacheConfig())
+        cache.set("key", "value", ttl=10)
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 11)
+        assert cache.get("key") is None
+
+
+class TestGenerationCache:
+    """Tests for content-addressed generation caching."""
+
+    def test_canonical_hash_ignores_key_order(self):
+        """Test hashing is independent of dict insertion order."""
+        assert canonical_hash({"a": 1, "b": [1, 2]}) == canonical_hash({"b": [1, 2], "a": 1})
+        assert canonical_hash({"a": 1}) != canonical_hash({"a": 2})
+
+    def test_request_inputs_normalize_prompt(self):
+        """Test whitespace-only prompt differences share a key."""
+        a = GenerationCache.request_inputs("5-stage  sales funnel ")
+        b = GenerationCache.request_inputs("5-stage sales funnel")
+        assert canonical_hash(a) == canonical_hash(b)
+
+    def test_full_result_hit_skips_engine(self, engine, generation_cache):
+        """Test repeated requests are served without running the pipeline."""
+        first = run_cached_generation(engine, "5-stage sales funnel", cache=generation_cache)
+        second = run_cached_generation(engine, "5-stage sales funnel", cache=generation_cache)
+
+        assert first["cached"] is False
+        assert second["cached"] is True
+        assert engine.classify_calls == 1
+        assert second["dsl"] == first["dsl"]
+        assert second["style"] == first["style"]
+        assert generation_cache.stats()["result"]["hits"] == 1
+
+    def test_partial_hit_reuses_stages(self, engine, generation_cache):
+        """Test a request differing only in brand colors reuses classification and layout."""
+        run_cached_generation(engine, "Create a 4-stage process", cache=generation_cache)
+        result = run_cached_generation(
+            engine,
+            "Create a 4-stage process",
+            brand_colors=["#112233", "#445566"],
+            cache=generation_cache,
+        )
+
+        stats = generation_cache.stats()
+        assert result["cached"] is False
+        assert engine.classify_calls == 1
+        assert stats["classification"]["hits"] == 1
+        assert stats["layout"]["hits"] == 1
+        assert stats["style"]["misses"] == 2
+
+    def test_cached_values_are_isolated(self, engine, generation_cache):
+        """Test mutating a returned result does not corrupt the cache."""
+        first = run_cached_generation(engine, "Timeline of our roadmap", cache=generation_cache)
+        first["dsl"]["shapes"] = []
+
+        second = run_cached_generation(engine, "Timeline of our roadmap", cache=generation_cache)
+        assert second["dsl"]["shapes"] != []
+
+    def test_matches_uncached_pipeline(self, engine, generation_cache):
+        """Test cached stages produce the same DSL as a plain run."""
+        plain = engine.generate("Pyramid with three levels")
+        engine.generate("Pyramid with three levels", cache=generation_cache)
+        cached = engine.generate("Pyramid with three levels", cache=generation_cache)
+
+        assert cached.dsl == plain.dsl
+        assert cached.archetype == plain.archetype
+        assert cached.parameters == plain.parameters
+
+    def test_cache_errors_fall_through(self, engine):
+        """Test a failing backing cache never fails generation."""
+
+        class BrokenCache:
+            def get(self, key):
+                raise ConnectionError("down")
+
+            def set(self, key, value, ttl=None):
+                raise ConnectionError("down")
+
+        cache = GenerationCache(cache=BrokenCache())
+        result = run_cached_generation(engine, "Simple cycle", cache=cache)
+        assert result["cached"] is False
+        assert result["dsl"]
+
+
+class TestCachedBatch:
+    """Tests for running batches through the generation cache."""
+
+    def test_shares_results_with_single_generations(self, engine, generation_cache):
+        """Test batch items hit results of earlier single generations and vice versa."""
+        single = run_cached_generation(engine, "5-stage sales funnel", cache=generation_cache)
+        outcomes = run_cached_batch(
+            engine, ["5-stage sales funnel", "Timeline of our roadmap"], cache=generation_cache
+        )
+
+        assert [o["cached"] for o in outcomes] == [True, False]
+        assert outcomes[0]["dsl"] == single["dsl"]
+        again = run_cached_generation(engine, "Timeline of our roadmap", cache=generation_cache)
+        assert again["cached"] is True
+        assert again["dsl"] == outcomes[1]["dsl"]
+
+    def test_failing_prompt_fails_only_its_item(self, engine, generation_cache, monkeypatch):
+        """Test a prompt that breaks the batch is retried alone and reported."""
+        original = engine.generate
+
+        def generate(prompt, **kwargs):
+            if prompt == "bad":
+                raise ValueError("unparseable")
+            return original(prompt, **kwargs)
+
+        def generate_batch(prompts, **kwargs):
+            raise ValueError("batch failed")
+
+        monkeypatch.setattr(engine, "generate", generate)
+        monkeypatch.setattr(engine, "generate_batch", generate_batch)
+
+        outcomes = run_cached_batch(engine, ["Simple cycle", "bad"], cache=generation_cache)
+        assert outcomes[0]["dsl"]
+        assert outcomes[1] == {"error": "unparseable"}
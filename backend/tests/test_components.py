@@ -773,6 +773,43 @@ class TestShapeClusterer:
         assert bounds["width"] == 160  # 200 + 60 - 100 = 160
         assert bounds["height"] == 170  # 300 + 70 - 200 = 170
 
+    def test_matches_connected_components(self):
+        """Test indexed clustering finds the same groups as a pairwise scan."""
+        import random
+
+        from backend.components.llm_detector import ShapeClusterer
+
+        rng = random.Random(11)
+        shapes = [
+            Shape(
+                id=f"s{i}",
+                type="autoShape",
+                bbox=BoundingBox(
+                    x=rng.randint(0, 12000000),
+                    y=rng.randint(0, 6800000),
+                    width=rng.randint(0, 800000),
+                    height=rng.randint(0, 500000),
+                ),
+            )
+            for i in range(120)
+        ]
+        clusterer = ShapeClusterer(distance_threshold_ratio=0.04)
+        threshold = (12192000**2 + 6858000**2) ** 0.5 * 0.04
+
+        # Reference: connected components over every close pair
+        groups = {i: {i} for i in range(len(shapes))}
+        for i in range(len(shapes)):
+            for j in range(i + 1, len(shapes)):
+                if clusterer._shapes_are_close(shapes[i], shapes[j], threshold) and groups[i] is not groups[j]:
+                    merged = groups[i] | groups[j]
+                    for k in merged:
+                        groups[k] = merged
+        expected = {frozenset(shapes[i].id for i in g) for g in groups.values()}
+
+        clusters = clusterer.cluster(shapes, 12192000, 6858000)
+        assert {frozenset(c.shape_ids) for c in clusters} == expected
+        assert len(clusters) == len(expected)
+
 
 class TestLLMPatternDetector:
     """Tests for the LLM-enhanced pattern detector."""
@@ -527,6 +527,41 @@ class TestSnappingConstraint:
         # Check shape is centered
         assert snapped.bbox.center_x == center_x
 
+    def test_snap_shapes_matches_snap_shape(self) -> None:
+        """Test snapping a whole scene matches snapping shapes one at a time."""
+        import random
+
+        rng = random.Random(7)
+        shapes = [
+            Shape(
+                id=f"s{i}",
+                type=ShapeType.AUTO_SHAPE,
+                bbox=BoundingBox(
+                    x=rng.randint(0, 11000000),
+                    y=rng.randint(0, 6000000),
+                    width=rng.randint(100000, 1500000),
+                    height=rng.randint(100000, 800000),
+                ),
+            )
+            for i in range(200)
+        ]
+        constraint = SnappingConstraint(
+            snap_threshold=300000,
+            guides=create_canvas_guides(),
+            snap_targets=[
+                SnapTarget.GRID,
+                SnapTarget.GUIDES,
+                SnapTarget.CANVAS_CENTER,
+                SnapTarget.CANVAS_EDGES,
+            ],
+        )
+
+        snapped = constraint.snap_shapes(shapes)
+
+        one_by_one = [constraint.snap_shape(s)[0] for s in shapes]
+        assert [s.bbox for s in snapped] == [s.bbox for s in one_by_one]
+        assert any(a.bbox != b.bbox for a, b in zip(snapped, shapes))
+
 
 # ============================================================================
 # Text Fitting Tests
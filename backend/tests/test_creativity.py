@@ -238,6 +238,25 @@ class TestLayoutOperators:
         for shape in result["shapes"]:
             assert shape["bbox"]["x"] == 50  # Left margin
 
+    def test_radial_arrangement(self, sample_dsl):
+        """Test radial orientation places shape centers on one circle."""
+        import math
+
+        shapes = sample_dsl["shapes"]
+        OrientationVariation()._arrange_radially(shapes)
+
+        centers = [
+            (s["bbox"]["x"] + s["bbox"]["width"] / 2, s["bbox"]["y"] + s["bbox"]["height"] / 2)
+            for s in shapes
+        ]
+        cx = sum(c[0] for c in centers) / len(centers)
+        cy = sum(c[1] for c in centers) / len(centers)
+        radii = [math.hypot(x - cx, y - cy) for x, y in centers]
+
+        assert radii == pytest.approx([600 * 1.5] * len(shapes))
+        # First shape sits at the top of the circle
+        assert centers[0][1] == pytest.approx(cy - 600 * 1.5)
+
 
 class TestBrandConstraintChecker:
     """Tests for brand constraint checker."""
@@ -141,6 +141,29 @@ class TestShape:
         assert len(shape.text.runs) == 1
         assert shape.text.runs[0].text == "Hello World"
 
+    def test_with_updates_shares_unchanged_fields(self) -> None:
+        """Test updating a group shares its children instead of rebuilding them."""
+        child = Shape(
+            id="child",
+            type=ShapeType.AUTO_SHAPE,
+            bbox=BoundingBox(x=0, y=0, width=100, height=100),
+            text=TextContent(runs=[TextRun(text="Child")]),
+        )
+        group = Shape(
+            id="group",
+            type=ShapeType.GROUP,
+            bbox=BoundingBox(x=0, y=0, width=100, height=100),
+            children=[child],
+        )
+        new_bbox = BoundingBox(x=500, y=0, width=100, height=100)
+
+        moved = group.with_updates(bbox=new_bbox)
+
+        assert moved.bbox == new_bbox
+        assert group.bbox.x == 0
+        assert moved.children[0] is child
+        assert moved.model_dump() == {**group.model_dump(), "bbox": new_bbox.model_dump()}
+
 
 class TestSlideScene:
     """Tests for SlideScene model."""
@@ -0,0 +1,174 @@
+"""Tests for job progress events."""
+
+import asyncio
+import threading
+
+import pytest
+
+from backend.tasks.progress import (
+    InMemoryProgressBroker,
+    ProgressEvent,
+    ProgressReporter,
+    make_event,
+)
+
+
+async def collect(broker, job_id: str) -> list[ProgressEvent]:
+    """Read a job's event stream to the end."""
+    return [event async for event in broker.subscribe(job_id)]
+
+
+class TestProgressEvents:
+    """Tests for progress event construction."""
+
+    def test_stage_status_and_progress(self):
+        """Test stages map to statuses and increasing progress."""
+        stages = ["queued", "processing", "classified", "layout", "styled", "completed"]
+        events = [make_event("gen-1", stage) for stage in stages]
+
+        assert [e.status for e in events] == ["pending"] + ["processing"] * 4 + ["completed"]
+        assert [e.progress for e in events] == sorted(e.progress for e in events)
+        assert events[-1].is_terminal
+        assert make_event("dl-1", "rendered").is_terminal
+
+    def test_variation_progress(self):
+        """Test variation events advance between styled and completed."""
+        events = [make_event("gen-1", "variations", n, 4) for n in range(5)]
+
+        assert events[0].progress == make_event("gen-1", "styled").progress
+        assert all(a.progress < b.progress for a, b in zip(events, events[1:]))
+        assert events[-1].progress < 1.0
+
+    def test_json_roundtrip(self):
+        """Test events survive serialization."""
+        event = make_event("gen-1", "failed", message="boom")
+        assert ProgressEvent.from_json(event.to_json()) == event
+
+
+class TestInMemoryProgressBroker:
+    """Tests for the in-process broker."""
+
+    async def test_subscriber_receives_events_until_terminal(self):
+        """Test a subscriber gets each event and the stream ends on completion."""
+        broker = InMemoryProgressBroker()
+        task = asyncio.create_task(collect(broker, "gen-1"))
+        await asyncio.sleep(0)
+
+        report = ProgressReporter("gen-1", broker)
+        for stage in ("processing", "classified", "layout", "styled", "completed"):
+            report(stage)
+        report("classified")  # After completion; not delivered
+
+        events = await asyncio.wait_for(task, timeout=1)
+        assert [e.stage for e in events] == [
+            "processing", "classified", "layout", "styled", "completed",
+        ]
+
+    async def test_late_subscriber_starts_from_latest(self):
+        """Test a subscriber joining mid-job first gets the current stage."""
+        broker = InMemoryProgressBroker()
+        report = ProgressReporter("gen-1", broker)
+        report("processing")
+        report("layout")
+
+        task = asyncio.create_task(collect(broker, "gen-1"))
+        await asyncio.sleep(0)
+        report("completed")
+
+        events = await asyncio.wait_for(task, timeout=1)
+        assert [e.stage for e in events] == ["layout", "completed"]
+
+        # Finished jobs replay only their final event
+        assert [e.stage for e in await collect(broker, "gen-1")] == ["completed"]
+
+    async def test_publish_from_worker_thread(self):
+        """Test events published from another thread reach the subscriber."""
+        broker = InMemoryProgressBroker()
+        task = asyncio.create_task(collect(broker, "gen-1"))
+        await asyncio.sleep(0)
+
+        def work():
+            report = ProgressReporter("gen-1", broker)
+            for n in range(1, 4):
+                report("variations", n, 3)
+            report("completed")
+
+        thread = threading.Thread(target=work)
+        thread.start()
+        events = await asyncio.wait_for(task, timeout=1)
+        thread.join()
+
+        assert [(e.stage, e.current) for e in events] == [
+            ("variations", 1), ("variations", 2), ("variations", 3), ("completed", None),
+        ]
+
+    async def test_snapshots_are_bounded(self):
+        """Test only the most recent jobs keep a snapshot."""
+        broker = InMemoryProgressBroker(max_jobs=10)
+        for i in range(50):
+            broker.publish(make_event(f"gen-{i}", "completed"))
+
+        assert await broker.latest("gen-0") is None
+        assert (await broker.latest("gen-49")).stage == "completed"
+
+    async def test_unsubscribes_on_close(self):
+        """Test subscriptions are removed when the stream is closed early."""
+        broker = InMemoryProgressBroker()
+        stream = broker.subscribe("gen-1")
+        broker.publish(make_event("gen-1", "processing"))
+        assert (await anext(stream)).stage == "processing"
+
+        await stream.aclose()
+        assert broker._subscribers == {}
+
+
+class TestRedisProgressBroker:
+    """Tests for the Redis broker."""
+
+    async def test_events_cross_processes(self):
+        """Test events published on one broker reach another broker's subscriber."""
+        fakeredis = pytest.importorskip("fakeredis")
+        from backend.tasks.progress import RedisProgressBroker
+
+        server = fakeredis.FakeServer()
+        publisher = RedisProgressBroker()
+        publisher._client = fakeredis.FakeRedis(server=server)
+        subscriber = RedisProgressBroker()
+        subscriber._async_client = fakeredis.aioredis.FakeRedis(server=server)
+
+        report = ProgressReporter("gen-1", publisher)
+        report("processing")
+        task = asyncio.create_task(collect(subscriber, "gen-1"))
+        await asyncio.sleep(0.05)
+        report("styled")
+        report("completed")
+
+        events = await asyncio.wait_for(task, timeout=2)
+        assert [e.stage for e in events] == ["processing", "styled", "completed"]
+
+
+class TestEngineProgress:
+    """Tests for stage callbacks from the inference engine."""
+
+    def test_generation_reports_stages(self, tmp_path):
+        """Test the engine reports each stage in order."""
+        from backend.db.cache import CacheConfig, InMemoryCache
+        from backend.db.generation_cache import GenerationCache, run_cached_generation
+        from ml.inference import InferenceEngine
+
+        engine = InferenceEngine(models_dir=tmp_path, use_ml=False)
+        cache = GenerationCache(cache=InMemoryCache(CacheConfig()))
+        calls = []
+
+        run_cached_generation(
+            engine,
+            "4-stage process",
+            num_variations=3,
+            cache=cache,
+            on_progress=lambda stage, *args: calls.append((stage, *args)),
+        )
+
+        assert calls[:3] == [("classified",), ("layout",), ("styled",)]
+        variations = [c for c in calls if c[0] == "variations"]
+        assert variations[0] == ("variations", 1, 3)
+        assert [c[1] for c in variations] == sorted(c[1] for c in variations)
@@ -343,6 +343,337 @@ class TestPPTXWriter:
         prs = Presentation(io.BytesIO(result))
         assert len(prs.slides) == 1
 
+    def test_render_to_pptx_engine_dsl(self):
+        """Test rendering a generation DSL with style-token effects."""
+        from backend.renderer import render_to_pptx, scene_from_dsl
+
+        dsl = {
+            "canvas": {"width": 12192000, "height": 6858000},
+            "shapes": [{
+                "id": "layer_0",
+                "type": "autoShape",
+                "auto_shape_type": "trapezoid",
+                "bbox": {"x": 1219200, "y": 1219200, "width": 9753600, "height": 795528},
+                "fill": {"type": "solid", "color": "#0D9488"},
+                "effects": {
+                    "shadow": {"type": "soft", "blur": 4, "offset_x": 2, "offset_y": 2, "color": "#00000040"},
+                    "glow": {"type": "subtle", "radius": 4},
+                },
+                "text": {"runs": [{"text": "Awareness"}]},
+            }],
+            "theme": {"accent1": "#0D9488"},
+            "font_family": "Inter",
+        }
+
+        scene = scene_from_dsl(dsl)
+        assert scene.shapes[0].effects.shadow.type == "outer"
+        assert scene.shapes[0].effects.shadow.alpha == pytest.approx(0x40 / 255, abs=1e-3)
+        assert scene.shapes[0].effects.glow.color == "#0D9488"
+
+        prs = Presentation(io.BytesIO(render_to_pptx(dsl)))
+        assert len(prs.slides) == 1
+
+
+    def test_freeform_and_shrink_text(self):
+        """Test freeform paths are placed at their bbox and shrink auto-fit renders."""
+        from pptx.enum.text import MSO_AUTO_SIZE
+
+        from backend.dsl.schema import PathCommand
+
+        scene = SlideScene(shapes=[
+            Shape(
+                id="path",
+                type="freeform",
+                bbox=BoundingBox(x=914400, y=457200, width=1828800, height=914400),
+                path=[
+                    PathCommand(type="moveTo", x=0, y=0),
+                    PathCommand(type="lineTo", x=1828800, y=0),
+                    PathCommand(type="lineTo", x=1828800, y=914400),
+                    PathCommand(type="close"),
+                ],
+            ),
+            Shape(
+                id="label",
+                type="text",
+                bbox=BoundingBox(x=0, y=0, width=914400, height=457200),
+                text=TextContent(runs=[TextRun(text="Shrink me")], auto_fit="shrink"),
+            ),
+        ])
+
+        prs = Presentation(io.BytesIO(PPTXWriter().write_single(scene)))
+        freeform, label = prs.slides[0].shapes
+        assert (freeform.left, freeform.top) == (914400, 457200)
+        assert (freeform.width, freeform.height) == (1828800, 914400)
+        assert label.text_frame.auto_size == MSO_AUTO_SIZE.TEXT_TO_FIT_SHAPE
+
+
+class TestFastPPTXWriter:
+    """Tests for the template-based FastPPTXWriter."""
+
+    @staticmethod
+    def _parts(data: bytes) -> dict[str, bytes]:
+        """Read a PPTX into {part name: canonical bytes}."""
+        import zipfile
+
+        from lxml import etree
+
+        parts = {}
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            for name in archive.namelist():
+                blob = archive.read(name)
+                if name.endswith((".xml", ".rels")):
+                    blob = etree.tostring(etree.fromstring(blob), method="c14n")
+                parts[name] = blob
+        return parts
+
+    @pytest.fixture
+    def varied_scene(self):
+        """Scene exercising every shape type and style path."""
+        from backend.dsl.schema import (
+            Bevel,
+            GradientFill,
+            GradientStop,
+            Glow,
+            PathCommand,
+        )
+
+        return SlideScene(
+            canvas=Canvas(background=SolidFill(color="#F8FAFC")),
+            shapes=[
+                Shape(
+                    id="card",
+                    type="autoShape",
+                    auto_shape_type="roundRect",
+                    z_index=2,
+                    bbox=BoundingBox(x=914400, y=914400, width=2743200, height=914400),
+                    transform=Transform(rotation=-15, flip_h=True),
+                    fill=SolidFill(color="accent2", alpha=0.8),
+                    stroke=Stroke(color="#1E293B", width=12700, dash_style="dash"),
+                    effects=Effects(
+                        shadow=Shadow(),
+                        glow=Glow(color="#00FF00"),
+                        bevel=Bevel(),
+                        soft_edges=12700,
+                    ),
+                    text=TextContent(
+                        runs=[
+                            TextRun(text="Q3 <results> & more", bold=True, color="accent1"),
+                            TextRun(text=" detail", italic=True, underline=True, font_size=1201),
+                        ],
+                        alignment="center",
+                        vertical_alignment="top",
+                        auto_fit="shrink",
+                        margin_left=0,
+                    ),
+                ),
+                Shape(
+                    id="title",
+                    type="text",
+                    bbox=BoundingBox(x=0, y=0, width=9144000, height=685800),
+                    text=TextContent(runs=[TextRun(text="Title", font_family="Inter")]),
+                ),
+                Shape(
+                    id="band",
+                    type="autoShape",
+                    auto_shape_type="chevron",
+                    bbox=BoundingBox(x=0, y=4572000, width=9144000, height=457200),
+                    fill=GradientFill(stops=[
+                        GradientStop(position=0.0, color="#0D9488"),
+                        GradientStop(position=1.0, color="#14B8A6"),
+                    ], angle=45),
+                ),
+                Shape(
+                    id="link",
+                    type="connector",
+                    bbox=BoundingBox(x=100, y=200, width=3000, height=4000),
+                    stroke=Stroke(color="#000000", width=9525),
+                ),
+                Shape(
+                    id="group",
+                    type="group",
+                    bbox=BoundingBox(x=0, y=0, width=1, height=1),
+                    children=[
+                        Shape(
+                            id="tri",
+                            type="freeform",
+                            bbox=BoundingBox(x=500000, y=500000, width=100000, height=100000),
+                            path=[
+                                PathCommand(type="moveTo", x=10, y=20),
+                                PathCommand(type="lineTo", x=100000, y=0),
+                                PathCommand(type="lineTo", x=50000, y=100000),
+                                PathCommand(type="close"),
+                            ],
+                        ),
+                        Shape(
+                            id="curve",
+                            type="freeform",
+                            bbox=BoundingBox(x=0, y=0, width=100000, height=100000),
+                            fill=SolidFill(color="#FF0000"),
+                            path=[
+                                PathCommand(type="moveTo", x=0, y=0),
+                                PathCommand(type="curveTo", x=100000, y=0, x1=1, y1=2, x2=3, y2=4),
+                                PathCommand(type="arcTo", width_radius=5, height_radius=5,
+                                            start_angle=0, swing_angle=90),
+                                PathCommand(type="close"),
+                            ],
+                        ),
+                    ],
+                ),
+                Shape(
+                    id="missing",
+                    type="image",
+                    bbox=BoundingBox(x=0, y=0, width=914400, height=914400),
+                    image_path="/nonexistent/logo.png",
+                ),
+            ],
+        )
+
+    def test_matches_pptx_writer(self, varied_scene):
+        """Test every package part is XML-equivalent to PPTXWriter output."""
+        from backend.renderer import FastPPTXWriter
+
+        second = varied_scene.model_copy(update={"canvas": Canvas()})
+        scenes = [varied_scene, second]
+
+        expected = self._parts(PPTXWriter().write(scenes))
+        actual = self._parts(FastPPTXWriter().write(scenes))
+
+        assert actual.keys() == expected.keys()
+        for name in expected:
+            assert actual[name] == expected[name], name
+
+    def test_images_deduplicated(self, tmp_path):
+        """Test an image used on several slides is embedded once."""
+        import zipfile
+
+        from PIL import Image
+
+        from backend.renderer import FastPPTXWriter
+
+        image_path = tmp_path / "logo.png"
+        Image.new("RGB", (4, 4), "red").save(image_path)
+        picture = Shape(
+            id="logo",
+            type="image",
+            bbox=BoundingBox(x=0, y=0, width=914400, height=914400),
+            image_path=str(image_path),
+        )
+        scene = SlideScene(shapes=[picture, picture.model_copy(update={"id": "logo2"})])
+
+        data = FastPPTXWriter().write([scene, scene])
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            media = [n for n in archive.namelist() if n.startswith("ppt/media/")]
+        assert media == ["ppt/media/image1.png"]
+
+        prs = Presentation(io.BytesIO(data))
+        assert [len(slide.shapes) for slide in prs.slides] == [2, 2]
+        assert self._parts(data) == self._parts(PPTXWriter().write([scene, scene]))
+
+    def test_write_to_file(self, sample_slide_scene, tmp_path):
+        """Test writing to a path and rejecting empty decks."""
+        from backend.renderer import FastPPTXWriter
+
+        scene = SlideScene(**sample_slide_scene)
+        output = tmp_path / "fast.pptx"
+        assert FastPPTXWriter().write_single(scene, output) is None
+
+        prs = Presentation(str(output))
+        assert len(prs.slides) == 1
+        assert prs.slide_width == scene.canvas.width
+
+        with pytest.raises(ValueError):
+            FastPPTXWriter().write([])
+
+    def test_stream_matches_write(self, varied_scene):
+        """Test streamed chunks form the same package as write()."""
+        from backend.renderer import FastPPTXWriter
+
+        scenes = [varied_scene] * 3
+        chunks = list(FastPPTXWriter().stream(scenes, chunk_size=1024))
+        data = b"".join(chunks)
+
+        assert len(chunks) > 1
+        assert self._parts(data) == self._parts(FastPPTXWriter().write(scenes))
+        assert len(Presentation(io.BytesIO(data)).slides) == 3
+
+        with pytest.raises(ValueError):
+            FastPPTXWriter().stream([])
+
+    def test_stream_renders_lazily(self, varied_scene, monkeypatch):
+        """Test chunks are yielded before the whole deck is rendered."""
+        from backend.renderer import FastPPTXWriter, SlideXMLRenderer
+
+        rendered = []
+        render = SlideXMLRenderer.render
+
+        def counting_render(self, scene):
+            rendered.append(scene)
+            return render(self, scene)
+
+        monkeypatch.setattr(SlideXMLRenderer, "render", counting_render)
+        chunks = FastPPTXWriter().stream([varied_scene] * 20, chunk_size=1024)
+
+        next(chunks)
+        assert len(rendered) < 20
+        for _ in chunks:
+            pass
+        assert len(rendered) == 20
+
+
+class TestParallelPPTXWriter:
+    """Tests for process-pool slide rendering."""
+
+    def test_matches_serial_output(self, tmp_path):
+        """Test pooled rendering keeps slide order and shared media byte-for-byte."""
+        from PIL import Image
+
+        from backend.renderer import FastPPTXWriter, ParallelPPTXWriter, shutdown_render_pool
+
+        image_path = tmp_path / "logo.png"
+        Image.new("RGB", (4, 4), "blue").save(image_path)
+        scenes = [
+            SlideScene(shapes=[
+                Shape(
+                    id=f"title{i}",
+                    type="text",
+                    bbox=BoundingBox(x=0, y=0, width=914400, height=457200),
+                    text=TextContent(runs=[TextRun(text=f"Slide {i}")]),
+                ),
+                Shape(
+                    id=f"logo{i}",
+                    type="image",
+                    bbox=BoundingBox(x=0, y=914400, width=914400, height=914400),
+                    image_path=str(image_path),
+                ),
+            ])
+            for i in range(6)
+        ]
+
+        try:
+            writer = ParallelPPTXWriter(workers=2, min_parallel_slides=2)
+            data = writer.write(scenes)
+        finally:
+            shutdown_render_pool()
+
+        assert data == FastPPTXWriter().write(scenes)
+        prs = Presentation(io.BytesIO(data))
+        titles = [slide.shapes[0].text_frame.text for slide in prs.slides]
+        assert titles == [f"Slide {i}" for i in range(6)]
+
+    def test_broken_pool_falls_back_to_serial(self, sample_slide_scene):
+        """Test a dead worker pool degrades to in-process rendering."""
+        from concurrent.futures.process import BrokenProcessPool
+
+        from backend.renderer import FastPPTXWriter, ParallelPPTXWriter
+
+        class BrokenExecutor:
+            def submit(self, fn, *args):
+                raise BrokenProcessPool("worker died")
+
+        scenes = [SlideScene(**sample_slide_scene)] * 3
+        writer = ParallelPPTXWriter(workers=2, min_parallel_slides=1, executor=BrokenExecutor())
+        assert writer.write(scenes) == FastPPTXWriter().write(scenes)
+
 
 class TestConstraintEngine:
     """Tests for the constraint engine."""
@@ -440,6 +771,49 @@ class TestConstraintEngine:
         overlap_violations = [v for v in result.violations if v.rule == "overlap"]
         assert len(overlap_violations) > 0
 
+    def test_overlap_check_matches_pairwise_scan(self):
+        """Test the indexed overlap check reports the same pairs in the same order."""
+        import random
+
+        rng = random.Random(3)
+        shapes = [
+            Shape(
+                id=f"s{i}",
+                type="autoShape",
+                bbox=BoundingBox(
+                    x=rng.randint(0, 12000000),
+                    y=rng.randint(0, 6800000),
+                    width=rng.choice([0, 100000, 900000, 12192000]),
+                    height=rng.choice([0, 100000, 600000]),
+                ),
+            )
+            for i in range(150)
+        ]
+        engine = ConstraintEngine()
+
+        expected = [
+            [a.id, b.id]
+            for i, a in enumerate(shapes)
+            for b in shapes[i + 1:]
+            if engine._shapes_overlap(a.bbox, b.bbox)
+        ]
+        assert [v.shape_ids for v in engine._check_overlaps(shapes)] == expected
+
+    def test_fix_overlaps_pushes_in_scan_order(self):
+        """Test overlap fixing re-checks earlier shapes after each push."""
+        engine = ConstraintEngine()
+        shapes = [
+            Shape(id="a", type="autoShape", bbox=BoundingBox(x=0, y=0, width=1000000, height=500000)),
+            Shape(id="b", type="autoShape", bbox=BoundingBox(x=0, y=600000, width=1000000, height=500000)),
+            Shape(id="c", type="autoShape", bbox=BoundingBox(x=0, y=100000, width=1000000, height=500000)),
+        ]
+
+        fixed = engine._fix_overlaps(shapes)
+
+        # c is pushed below a, lands on b, and is pushed below b
+        assert fixed[2].bbox.y == 600000 + 500000 + 91440
+        assert engine._check_overlaps(fixed) == []
+
 
 class TestArchetypeRules:
     """Tests for archetype-specific layout rules."""
@@ -0,0 +1,388 @@
+"""Tests for the task queue and worker."""
+
+import asyncio
+
+import pytest
+
+from backend.tasks.queue import InMemoryTaskQueue, RetryPolicy, TaskStatus
+from backend.tasks.worker import Worker, WorkerSettings
+
+FAST_RETRY = RetryPolicy(max_retries=2, backoff_base=0.01, jitter=0)
+
+
+@pytest.fixture
+def redis_queue():
+    """Factory for Redis queues sharing one fakeredis server."""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    from backend.tasks.queue import RedisTaskQueue
+
+    server = fakeredis.FakeServer()
+
+    def make(**options) -> RedisTaskQueue:
+        options.setdefault("retry", FAST_RETRY)
+        options.setdefault("requeue_interval", 0)
+        return RedisTaskQueue(
+            queue_name="test",
+            client=fakeredis.aioredis.FakeRedis(server=server, decode_responses=True),
+            **options,
+        )
+
+    return make
+
+
+@pytest.fixture(params=["memory", "redis"])
+def any_queue(request):
+    """Factory for queues of each implementation."""
+    if request.param == "memory":
+        return InMemoryTaskQueue
+    return request.getfixturevalue("redis_queue")
+
+
+async def reserve_orgs(queue, count: int, **options) -> list[str]:
+    """Organizations of the next ``count`` reserved tasks."""
+    return [(await queue.reserve(timeout=0, **options)).org for _ in range(count)]
+
+
+def flaky(failures: int):
+    """Handler that fails its first ``failures`` calls."""
+
+    async def handler(value):
+        handler.calls += 1
+        if handler.calls <= failures:
+            raise RuntimeError(f"failure {handler.calls}")
+        return value
+
+    handler.calls = 0
+    return handler
+
+
+async def drain(queue, timeout: float = 0.2) -> list:
+    """Process tasks until none arrive within ``timeout``."""
+    tasks = []
+    while (task := await queue.process_one(timeout=timeout)) is not None:
+        tasks.append(task)
+    return tasks
+
+
+class TestRetryPolicy:
+    """Tests for retry backoff."""
+
+    def test_backoff_doubles_up_to_max(self):
+        """Test delays grow exponentially and are capped."""
+        policy = RetryPolicy(backoff_base=1, backoff_max=5, jitter=0)
+        assert [policy.delay(n) for n in range(1, 6)] == [1, 2, 4, 5, 5]
+
+    def test_jitter_bounds(self):
+        """Test jitter stays within its fraction of the delay."""
+        policy = RetryPolicy(backoff_base=10, jitter=0.1)
+        assert all(9 <= policy.delay(1) <= 11 for _ in range(100))
+
+
+class TestInMemoryTaskQueue:
+    """Tests for the in-memory queue."""
+
+    async def test_retries_then_completes(self):
+        """Test a transient failure is retried after backoff."""
+        queue = InMemoryTaskQueue(retry=FAST_RETRY)
+        queue.register("flaky", flaky(failures=2))
+        task_id = await queue.enqueue("flaky", 7)
+
+        await drain(queue)
+
+        task = await queue.get_task(task_id)
+        assert task.status == TaskStatus.COMPLETED
+        assert task.result == 7
+        assert task.attempts == 3
+
+    async def test_dead_letters_after_max_retries(self):
+        """Test a task that keeps failing ends in the dead-letter list."""
+        queue = InMemoryTaskQueue(retry=FAST_RETRY)
+        queue.register("flaky", flaky(failures=10))
+        task_id = await queue.enqueue("flaky", 7)
+
+        await drain(queue)
+
+        task = await queue.get_task(task_id)
+        assert task.status == TaskStatus.FAILED
+        assert task.error == "failure 3"
+        assert [t.id for t in await queue.dead_letters()] == [task_id]
+        assert await queue.stats() == {"pending": 0, "processing": 0, "delayed": 0, "dead": 1}
+
+        assert await queue.retry_dead(task_id)
+        queue.register("flaky", flaky(failures=0))
+        await drain(queue)
+        assert (await queue.get_task(task_id)).status == TaskStatus.COMPLETED
+
+    async def test_expired_lease_is_redelivered(self):
+        """Test a task reserved by a worker that stopped responding runs again."""
+        queue = InMemoryTaskQueue(visibility_timeout=0.05)
+        task = await queue.reserve()
+        assert task is None
+
+        task_id = await queue.enqueue("noop")
+        assert (await queue.reserve()).id == task_id
+        assert await queue.reserve() is None
+
+        await asyncio.sleep(0.06)
+        redelivered = await queue.reserve()
+        assert redelivered.id == task_id
+        assert redelivered.attempts == 2
+
+    async def test_sync_handler_runs_in_thread(self):
+        """Test synchronous handlers don't block the event loop."""
+        queue = InMemoryTaskQueue()
+        queue.register("add", lambda a, b: a + b)
+        task_id = await queue.enqueue("add", 2, 3)
+
+        await queue.process_one()
+        assert (await queue.get_task(task_id)).result == 5
+
+
+class TestScheduling:
+    """Tests for lanes and fair scheduling, on both queues."""
+
+    async def test_lanes_served_in_priority_order(self, any_queue):
+        """Test interactive tasks go before batch and maintenance tasks."""
+        queue = any_queue()
+        await queue.enqueue("cleanup_downloads")
+        await queue.enqueue("work", _lane="batch")
+        await queue.enqueue("work")
+        assert await queue.lane_depths() == {"interactive": 1, "batch": 1, "maintenance": 1}
+
+        lanes = [(await queue.reserve(timeout=0)).lane for _ in range(3)]
+        assert lanes == ["interactive", "batch", "maintenance"]
+        assert (await queue.stats())["pending"] == 0
+
+    async def test_reserve_limited_to_lanes(self, any_queue):
+        """Test a reservation only takes from the lanes asked for."""
+        queue = any_queue()
+        await queue.enqueue("work", _lane="batch")
+        assert await queue.reserve(timeout=0, lanes=["interactive"]) is None
+        assert (await queue.reserve(timeout=0, lanes=["batch"])).lane == "batch"
+
+        with pytest.raises(ValueError):
+            await queue.enqueue("work", _lane="urgent")
+
+    async def test_orgs_take_turns(self, any_queue):
+        """Test one organization's backlog doesn't hold up another's tasks."""
+        queue = any_queue()
+        for _ in range(6):
+            await queue.enqueue("work", _org="a")
+        for _ in range(2):
+            await queue.enqueue("work", _org="b")
+
+        assert await reserve_orgs(queue, 8) == ["a", "b", "a", "b", "a", "a", "a", "a"]
+
+    async def test_late_org_goes_next(self, any_queue):
+        """Test an organization joining a busy lane waits for no backlog."""
+        queue = any_queue()
+        for _ in range(10):
+            await queue.enqueue("work", _org="a")
+        await reserve_orgs(queue, 5)
+
+        await queue.enqueue("work", _org="b")
+        assert await reserve_orgs(queue, 2) == ["b", "a"]
+
+    async def test_org_weights(self, any_queue):
+        """Test a heavier organization gets a proportionally larger share."""
+        queue = any_queue()
+        await queue.set_org_weight("a", 2)
+        for _ in range(6):
+            await queue.enqueue("work", _org="a")
+            await queue.enqueue("work", _org="b")
+
+        orgs = await reserve_orgs(queue, 6)
+        assert orgs.count("a") == 4
+
+    async def test_released_task_keeps_its_place(self, any_queue):
+        """Test a released task goes back to the front of its organization's list."""
+        queue = any_queue()
+        first = await queue.enqueue("work")
+        await queue.enqueue("work")
+
+        task = await queue.reserve(timeout=0)
+        await queue.release(task)
+        assert (await queue.reserve(timeout=0)).id == first
+
+
+class TestRedisTaskQueue:
+    """Tests for the reliable Redis queue."""
+
+    async def test_ack_stores_result(self, redis_queue):
+        """Test a completed task leaves the processing list with its result."""
+        queue = redis_queue()
+        queue.register("echo", flaky(failures=0))
+        task_id = await queue.enqueue("echo", {"value": 1})
+
+        task = await queue.reserve(timeout=0)
+        assert task.status == TaskStatus.PROCESSING
+        assert (await queue.stats())["processing"] == 1
+
+        await queue.execute(task)
+        stored = await queue.get_task(task_id)
+        assert stored.status == TaskStatus.COMPLETED
+        assert stored.result == {"value": 1}
+        assert stored.attempts == 1
+        assert await queue.stats() == {"pending": 0, "processing": 0, "delayed": 0, "dead": 0}
+
+    async def test_crashed_worker_tasks_are_redelivered(self, redis_queue):
+        """Test tasks held by a dead worker go to another after the lease expires."""
+        crashed = redis_queue(visibility_timeout=0.05)
+        survivor = redis_queue(visibility_timeout=0.05)
+        survivor.register("echo", flaky(failures=0))
+        ids = [await survivor.enqueue("echo", n) for n in range(3)]
+
+        assert await crashed.reserve(timeout=0) is not None
+        assert await crashed.reserve(timeout=0) is not None
+
+        await asyncio.sleep(0.06)
+        tasks = await drain(survivor)
+
+        assert sorted(t.id for t in tasks) == sorted(ids)
+        assert all(t.status == TaskStatus.COMPLETED for t in tasks)
+
+    async def test_lease_renewed_while_running(self, redis_queue):
+        """Test a long task is not redelivered while its worker is alive."""
+        queue = redis_queue(visibility_timeout=0.09)
+        other = redis_queue(visibility_timeout=0.09)
+
+        async def slow():
+            await asyncio.sleep(0.2)
+            return "done"
+
+        queue.register("slow", slow)
+        await queue.enqueue("slow")
+        running = asyncio.create_task(queue.process_one(timeout=0))
+
+        await asyncio.sleep(0.15)
+        assert await other.reserve(timeout=0) is None
+        assert (await running).result == "done"
+
+    async def test_retries_then_dead_letters(self, redis_queue):
+        """Test failures back off, retry and finally dead-letter."""
+        queue = redis_queue()
+        handler = flaky(failures=10)
+        queue.register("flaky", handler)
+        task_id = await queue.enqueue("flaky", 1)
+
+        task = await queue.process_one(timeout=0)
+        assert task.status == TaskStatus.RETRYING
+        assert (await queue.stats())["delayed"] == 1
+
+        await drain(queue)
+        stored = await queue.get_task(task_id)
+        assert handler.calls == 3
+        assert stored.status == TaskStatus.FAILED
+        assert stored.error == "failure 3"
+        assert [t.id for t in await queue.dead_letters()] == [task_id]
+
+        assert await queue.retry_dead(task_id)
+        assert (await queue.stats())["dead"] == 0
+        assert (await queue.reserve(timeout=0)).id == task_id
+
+    async def test_cancelled_task_is_released(self, redis_queue):
+        """Test a task cancelled at shutdown returns to the queue."""
+        queue = redis_queue()
+
+        async def hang():
+            await asyncio.sleep(10)
+
+        queue.register("hang", hang)
+        task_id = await queue.enqueue("hang")
+        running = asyncio.create_task(queue.process_one(timeout=0))
+        await asyncio.sleep(0.01)
+        running.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+
+        stored = await queue.get_task(task_id)
+        assert stored.status == TaskStatus.PENDING
+        assert stored.attempts == 0
+        assert (await queue.stats())["pending"] == 1
+
+
+class TestWorker:
+    """Tests for the worker loop."""
+
+    async def test_batch_backlog_leaves_room_for_interactive(self):
+        """Test batch tasks stay within their lane limit while interactive ones run."""
+        queue = InMemoryTaskQueue()
+        running = {"interactive": 0, "batch": 0}
+        peak = dict(running)
+        finished = []
+
+        def work(lane):
+            async def handler(n):
+                running[lane] += 1
+                peak[lane] = max(peak[lane], running[lane])
+                await asyncio.sleep(0.02)
+                running[lane] -= 1
+                finished.append((lane, n))
+            return handler
+
+        queue.register("batch", work("batch"))
+        queue.register("interactive", work("interactive"))
+        for n in range(6):
+            await queue.enqueue("batch", n, _lane="batch")
+        await queue.enqueue("interactive", 0)
+
+        worker = Worker(
+            WorkerSettings(concurrency=4, max_jobs=7, poll_delay=0.01, warm_up_models=False),
+            queue=queue,
+        )
+        await asyncio.wait_for(worker.run(), timeout=5)
+
+        assert peak == {"interactive": 1, "batch": 2}
+        assert finished.index(("interactive", 0)) < 2
+        metrics = worker.metrics.snapshot()
+        assert metrics["batch"]["count"] == 6
+        assert metrics["interactive"]["count"] == 1
+        assert metrics["batch"]["wait_max_ms"] > metrics["interactive"]["wait_max_ms"]
+
+    async def test_runs_tasks_concurrently(self):
+        """Test the worker keeps up to ``concurrency`` tasks running."""
+        queue = InMemoryTaskQueue()
+        running = 0
+        peak = 0
+
+        async def work():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+
+        queue.register("work", work)
+        for _ in range(12):
+            await queue.enqueue("work")
+
+        worker = Worker(
+            WorkerSettings(concurrency=4, max_jobs=12, poll_delay=0.01, warm_up_models=False),
+            queue=queue,
+        )
+        await asyncio.wait_for(worker.run(), timeout=5)
+
+        assert worker._jobs_processed == 12
+        assert peak == 4
+
+    async def test_shutdown_returns_unfinished_tasks(self):
+        """Test tasks still running after the shutdown timeout are requeued."""
+        queue = InMemoryTaskQueue()
+
+        async def hang():
+            await asyncio.sleep(10)
+
+        queue.register("hang", hang)
+        task_id = await queue.enqueue("hang")
+        worker = Worker(
+            WorkerSettings(poll_delay=0.01, shutdown_timeout=0.05, warm_up_models=False),
+            queue=queue,
+        )
+        runner = asyncio.create_task(worker.run())
+        await asyncio.sleep(0.05)
+        worker._running = False
+        await asyncio.wait_for(runner, timeout=2)
+
+        assert (await queue.get_task(task_id)).status == TaskStatus.PENDING
+        assert (await queue.stats())["pending"] == 1
@@ -1,8 +1,18 @@
 """Infographix ML module - in-house models for infographic generation."""
 
 from ml.inference.engine import InferenceEngine, InferenceResult
+from ml.inference.registry import (
+    EngineRegistry,
+    EngineTimings,
+    get_engine_registry,
+    get_inference_engine,
+)
 
 __all__ = [
     "InferenceEngine",
     "InferenceResult",
+    "EngineRegistry",
+    "EngineTimings",
+    "get_engine_registry",
+    "get_inference_engine",
 ]
@@ -0,0 +1 @@
+"""Benchmarks for Infographix ML inference."""
@@ -0,0 +1,167 @@
+"""Benchmark micro-batched intent classification against per-prompt inference.
+
+For each batch size, ``N`` concurrent requests are classified two ways:
+
+* ``sequential`` - one forward pass per prompt (the old ``batch_predict``).
+* ``batched`` - requests go through ``MicroBatcher`` and share forward passes.
+
+Runs on CPU. The encoder is randomly initialized from ``--model-name``'s
+config, so no trained checkpoint is needed; only the tokenizer and config
+are fetched.
+
+Usage:
+    python -m ml.benchmarks.bench_intent_batching --batch-sizes 1 2 4 8 16 32 64
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+
+import torch
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PROMPTS = [
+    "Create a 4-stage sales funnel",
+    "Show our product roadmap for 2025 as a timeline",
+    "Make a pyramid of needs with five levels",
+    "Compare plan A versus plan B, listing pros and cons for each option",
+    "Draw a hub and spoke diagram with our platform at the core",
+    "A 2x2 matrix of effort versus impact",
+    "Process flow for onboarding new enterprise customers in six steps",
+    "Continuous improvement cycle",
+]
+
+
+def build_classifier(model_name: str):
+    """Build an IntentClassifier with a randomly initialized encoder."""
+    from transformers import AutoConfig, AutoModel, AutoTokenizer
+
+    from ml.config import get_ml_settings
+    from ml.models.intent_classifier.model import IntentClassifier
+
+    config = get_ml_settings().intent_classifier.model_copy(update={"model_name": model_name})
+    model = IntentClassifier(config)
+
+    model.encoder = AutoModel.from_config(AutoConfig.from_pretrained(model_name))
+    model.tokenizer = AutoTokenizer.from_pretrained(model_name)
+    hidden_size = model.encoder.config.hidden_size
+    model.classifier = torch.nn.Sequential(
+        torch.nn.Linear(hidden_size, hidden_size // 2),
+        torch.nn.ReLU(),
+        torch.nn.Linear(hidden_size // 2, config.num_labels),
+    )
+    model._initialized = True
+    model.eval()
+    return model
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def bench_sequential(model, prompts: list[str]) -> tuple[float, list[float]]:
+    """Classify prompts one forward pass at a time."""
+    latencies = []
+    start = time.perf_counter()
+    for prompt in prompts:
+        model.predict(prompt)
+        # Every request waits for all the ones queued before it
+        latencies.append((time.perf_counter() - start) * 1000)
+    return time.perf_counter() - start, latencies
+
+
+async def bench_batched(model, prompts: list[str], window_ms: float) -> tuple[float, list[float]]:
+    """Classify prompts as concurrent requests through a MicroBatcher."""
+    from ml.inference.batching import MicroBatcher
+
+    batcher = MicroBatcher(model.predict_batch, max_batch_size=len(prompts), max_wait_ms=window_ms)
+    latencies = []
+
+    async def one(prompt: str) -> None:
+        t0 = time.perf_counter()
+        await batcher.submit(prompt)
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(p) for p in prompts))
+    elapsed = time.perf_counter() - start
+    await batcher.close()
+    return elapsed, latencies
+
+
+def run(model_name: str, batch_sizes: list[int], window_ms: float, repeats: int) -> list[dict]:
+    """Run the benchmark and return one row per batch size."""
+    torch.set_grad_enabled(False)
+    model = build_classifier(model_name)
+
+    # Warm up kernels and tokenizer caches
+    model.predict_batch(PROMPTS)
+
+    rows = []
+    for size in batch_sizes:
+        prompts = [PROMPTS[i % len(PROMPTS)] for i in range(size)]
+
+        seq_times, seq_lat, bat_times, bat_lat = [], [], [], []
+        for _ in range(repeats):
+            elapsed, lat = bench_sequential(model, prompts)
+            seq_times.append(elapsed)
+            seq_lat.extend(lat)
+
+            elapsed, lat = asyncio.run(bench_batched(model, prompts, window_ms))
+            bat_times.append(elapsed)
+            bat_lat.extend(lat)
+
+        row = {
+            "batch_size": size,
+            "sequential_rps": size / statistics.median(seq_times),
+            "batched_rps": size / statistics.median(bat_times),
+            "sequential_p50_ms": percentile(seq_lat, 50),
+            "sequential_p95_ms": percentile(seq_lat, 95),
+            "batched_p50_ms": percentile(bat_lat, 50),
+            "batched_p95_ms": percentile(bat_lat, 95),
+        }
+        rows.append(row)
+        logger.info(
+            "batch=%3d  seq %7.1f req/s (p50 %7.1fms, p95 %7.1fms)  "
+            "batched %7.1f req/s (p50 %7.1fms, p95 %7.1fms)",
+            size,
+            row["sequential_rps"], row["sequential_p50_ms"], row["sequential_p95_ms"],
+            row["batched_rps"], row["batched_p50_ms"], row["batched_p95_ms"],
+        )
+
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark intent classifier micro-batching")
+    parser.add_argument(
+        "--model-name",
+        type=str,
+        default="distilbert-base-uncased",
+        help="Hugging Face model whose config and tokenizer to use",
+    )
+    parser.add_argument(
+        "--batch-sizes",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8, 16, 32, 64],
+        help="Number of concurrent requests per run",
+    )
+    parser.add_argument("--window-ms", type=float, default=5.0, help="Batching window")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per batch size")
+    parser.add_argument("--threads", type=int, default=0, help="torch threads (0 = default)")
+
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    run(args.model_name, args.batch_sizes, args.window_ms, args.repeats)
@@ -0,0 +1,285 @@
+"""Benchmark the ONNX Runtime backend against PyTorch on CPU.
+
+For each model, the same randomly initialized weights are run through:
+
+* ``torch`` - the PyTorch module.
+* ``onnx`` - the fp32 ONNX export on ONNX Runtime.
+* ``onnx-int8`` - the dynamically quantized export.
+
+Reports median/p95 latency, model file size and resident memory added by
+loading each variant (RSS deltas are indicative only; allocators reuse
+freed pages between variants). Architectures follow the default configs
+(DistilBERT-base encoder, the style MLP and T5-small), so no trained
+checkpoint or network access is needed.
+
+Usage:
+    python -m ml.benchmarks.bench_onnx_backend --models intent style layout
+"""
+
+import gc
+import logging
+import math
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+import torch
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def rss_mb() -> float:
+    """Current resident set size in MB (Linux), or peak RSS elsewhere."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def time_fn(fn: Callable[[], object], iterations: int) -> tuple[float, float]:
+    """Return (median, p95) latency in ms."""
+    fn()  # warm-up
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    p95_index = min(len(samples) - 1, math.ceil(0.95 * len(samples)) - 1)
+    return statistics.median(samples), samples[p95_index]
+
+
+def report(model: str, variant: str, latency: tuple[float, float], size_mb: float, mem_mb: float) -> dict:
+    """Log and return one result row."""
+    logger.info(
+        "%-8s %-10s p50 %8.2fms  p95 %8.2fms  file %7.1fMB  +rss %7.1fMB",
+        model, variant, latency[0], latency[1], size_mb, mem_mb,
+    )
+    return {
+        "model": model,
+        "variant": variant,
+        "p50_ms": latency[0],
+        "p95_ms": latency[1],
+        "file_mb": size_mb,
+        "rss_mb": mem_mb,
+    }
+
+
+def bench_onnx_variants(
+    name: str,
+    paths: list[Path],
+    feed: Callable[[list], Callable[[], object]],
+    iterations: int,
+    threads: int,
+) -> list[dict]:
+    """Benchmark fp32 and int8 sessions for a set of exported graphs."""
+    from ml.inference.onnx_backend import create_session
+    from ml.training.export_onnx import quantize_onnx
+
+    rows = []
+    variants = {
+        "onnx": paths,
+        "onnx-int8": [quantize_onnx(p) for p in paths],
+    }
+    for variant, files in variants.items():
+        gc.collect()
+        before = rss_mb()
+        sessions = [create_session(p, threads) for p in files]
+        mem = rss_mb() - before
+        size = sum(p.stat().st_size for p in files) / 1e6
+        rows.append(report(name, variant, time_fn(feed(sessions), iterations), size, mem))
+        del sessions
+    return rows
+
+
+def bench_intent(workdir: Path, iterations: int, threads: int, seq_len: int, batch: int) -> list[dict]:
+    """Benchmark the intent classifier forward pass."""
+    from transformers import DistilBertConfig, DistilBertModel
+
+    from ml.models.intent_classifier.model import IntentClassifier
+    from ml.training.export_onnx import export_intent_classifier_model
+
+    gc.collect()
+    before = rss_mb()
+    model = IntentClassifier()
+    model.encoder = DistilBertModel(DistilBertConfig())
+    hidden = model.encoder.config.hidden_size
+    model.classifier = torch.nn.Sequential(
+        torch.nn.Linear(hidden, hidden // 2),
+        torch.nn.ReLU(),
+        torch.nn.Linear(hidden // 2, model.config.num_labels),
+    )
+    model._initialized = True
+    model.eval()
+    torch_mem = rss_mb() - before
+
+    input_ids = torch.randint(1000, 20000, (batch, seq_len))
+    attention_mask = torch.ones_like(input_ids)
+
+    def run_torch():
+        with torch.no_grad():
+            model(input_ids, attention_mask)
+
+    torch_path = workdir / "intent.pt"
+    torch.save(model.state_dict(), torch_path)
+    rows = [report(
+        "intent", "torch", time_fn(run_torch, iterations),
+        torch_path.stat().st_size / 1e6, torch_mem,
+    )]
+
+    onnx_path = workdir / "intent" / "model.onnx"
+    export_intent_classifier_model(model, onnx_path)
+
+    feeds = {"input_ids": input_ids.numpy(), "attention_mask": attention_mask.numpy()}
+    rows += bench_onnx_variants(
+        "intent", [onnx_path],
+        lambda sessions: lambda: sessions[0].run(None, feeds),
+        iterations, threads,
+    )
+    return rows
+
+
+def bench_style(workdir: Path, iterations: int, threads: int, batch: int) -> list[dict]:
+    """Benchmark the style recommender forward pass."""
+    from ml.models.style_recommender.model import StyleRecommender
+    from ml.training.export_onnx import export_style_recommender_model
+
+    gc.collect()
+    before = rss_mb()
+    model = StyleRecommender().eval()
+    torch_mem = rss_mb() - before
+
+    features = torch.rand(batch, model.config.input_dim)
+
+    def run_torch():
+        with torch.no_grad():
+            model(features)
+
+    torch_path = workdir / "style.pt"
+    torch.save(model.state_dict(), torch_path)
+    rows = [report(
+        "style", "torch", time_fn(run_torch, iterations),
+        torch_path.stat().st_size / 1e6, torch_mem,
+    )]
+
+    onnx_path = workdir / "style" / "model.onnx"
+    export_style_recommender_model(model, onnx_path)
+
+    feeds = {"features": features.numpy()}
+    rows += bench_onnx_variants(
+        "style", [onnx_path],
+        lambda sessions: lambda: sessions[0].run(None, feeds),
+        iterations, threads,
+    )
+    return rows
+
+
+def bench_layout(workdir: Path, iterations: int, threads: int, decode_steps: int) -> list[dict]:
+    """Benchmark T5 greedy decoding for a fixed number of steps."""
+    from transformers import T5Config, T5ForConditionalGeneration
+
+    from ml.inference.onnx_backend import OnnxLayoutGenerator
+    from ml.models.layout_generator.model import LayoutGenerator
+    from ml.training.export_onnx import export_layout_generator_model
+
+    gc.collect()
+    before = rss_mb()
+    generator = LayoutGenerator()
+    generator.model = T5ForConditionalGeneration(T5Config(
+        decoder_start_token_id=0, pad_token_id=0, eos_token_id=1,
+    )).eval()
+    generator._initialized = True
+    torch_mem = rss_mb() - before
+
+    input_ids = torch.randint(100, 30000, (1, 32))
+    attention_mask = torch.ones_like(input_ids)
+
+    def run_torch():
+        with torch.no_grad():
+            generator.model.generate(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                max_length=decode_steps,
+                min_length=decode_steps,
+                num_beams=1,
+                do_sample=False,
+            )
+
+    torch_path = workdir / "layout.pt"
+    torch.save(generator.model.state_dict(), torch_path)
+    rows = [report(
+        "layout", "torch", time_fn(run_torch, iterations),
+        torch_path.stat().st_size / 1e6, torch_mem,
+    )]
+
+    onnx_dir = workdir / "layout"
+    export_layout_generator_model(generator, onnx_dir)
+
+    # min_length above / eos outside the vocab here: both decode exactly decode_steps tokens
+    def feed(sessions):
+        onnx_model = OnnxLayoutGenerator(
+            sessions[0], sessions[1], generator.config, tokenizer=None, eos_token_id=-1,
+        )
+        return lambda: onnx_model.generate_ids(
+            input_ids.numpy(), attention_mask.numpy(), max_length=decode_steps,
+        )
+
+    rows += bench_onnx_variants(
+        "layout", [onnx_dir / "encoder.onnx", onnx_dir / "decoder.onnx"],
+        feed, iterations, threads,
+    )
+    return rows
+
+
+def run(
+    models: list[str],
+    iterations: int,
+    threads: int,
+    seq_len: int,
+    batch: int,
+    decode_steps: int,
+) -> list[dict]:
+    """Run the selected benchmarks."""
+    if threads:
+        torch.set_num_threads(threads)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workdir = Path(tmpdir)
+        if "style" in models:
+            rows += bench_style(workdir, iterations, threads, batch)
+        if "intent" in models:
+            rows += bench_intent(workdir, iterations, threads, seq_len, batch)
+        if "layout" in models:
+            rows += bench_layout(workdir, max(3, iterations // 5), threads, decode_steps)
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark ONNX Runtime vs PyTorch inference")
+    parser.add_argument(
+        "--models",
+        nargs="+",
+        choices=["intent", "style", "layout"],
+        default=["intent", "style", "layout"],
+        help="Models to benchmark",
+    )
+    parser.add_argument("--iterations", type=int, default=50, help="Timed runs per variant")
+    parser.add_argument("--threads", type=int, default=0, help="CPU threads (0 = default)")
+    parser.add_argument("--seq-len", type=int, default=32, help="Intent prompt length in tokens")
+    parser.add_argument("--batch", type=int, default=1, help="Batch size for intent/style")
+    parser.add_argument("--decode-steps", type=int, default=32, help="Layout tokens to decode")
+
+    args = parser.parse_args()
+
+    run(args.models, args.iterations, args.threads, args.seq_len, args.batch, args.decode_steps)
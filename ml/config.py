@@ -64,6 +64,10 @@ class LayoutGeneratorConfig(BaseModel):
     max_input_length: int = 256
     max_output_length: int = 1024
 
+    # Decoding
+    constrained_decoding: bool = True  # Only emit tokens that keep the DSL JSON valid
+    decode_num_beams: int = 1  # 1 = greedy; small beams for constrained decoding
+
     # Training
     learning_rate: float = 1e-4
     batch_size: int = 8
@@ -114,8 +118,14 @@ class MLSettings(BaseSettings):
 
     # Inference settings
     max_batch_size: int = 8
+    batch_window_ms: float = 5.0  # How long the micro-batcher waits to fill a batch
     inference_timeout_ms: int = 5000
 
+    # Inference backend
+    inference_backend: Literal["torch", "onnx"] = "torch"
+    onnx_quantized: bool = False  # Prefer int8 dynamically quantized exports
+    onnx_num_threads: int = 0  # 0 = onnxruntime default
+
     # Model configs
     paths: ModelPaths = Field(default_factory=ModelPaths)
     intent_classifier: IntentClassifierConfig = Field(default_factory=IntentClassifierConfig)
@@ -1,8 +1,31 @@
 """Inference module for Infographix ML models."""
 
+from ml.inference.batching import BatcherStats, MicroBatcher
 from ml.inference.engine import InferenceEngine, InferenceResult
+from ml.inference.onnx_backend import (
+    ONNX_AVAILABLE,
+    OnnxIntentClassifier,
+    OnnxLayoutGenerator,
+    OnnxStyleRecommender,
+)
+from ml.inference.registry import (
+    EngineRegistry,
+    EngineTimings,
+    get_engine_registry,
+    get_inference_engine,
+)
 
 __all__ = [
     "InferenceEngine",
     "InferenceResult",
+    "EngineRegistry",
+    "EngineTimings",
+    "get_engine_registry",
+    "get_inference_engine",
+    "MicroBatcher",
+    "BatcherStats",
+    "ONNX_AVAILABLE",
+    "OnnxIntentClassifier",
+    "OnnxStyleRecommender",
+    "OnnxLayoutGenerator",
 ]
@@ -0,0 +1,158 @@
+"""Async micro-batching for model inference.
+
+Collects concurrent single-item requests for a short window and runs them
+through a batch function in one call, so N simultaneous requests cost one
+forward pass instead of N.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Callable, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class BatcherStats:
+    """Counters for a micro-batcher."""
+
+    batches: int = 0
+    items: int = 0
+    max_batch: int = 0
+
+    @property
+    def avg_batch_size(self) -> float:
+        """Average number of items per dispatched batch."""
+        return self.items / self.batches if self.batches else 0.0
+
+    def to_dict(self) -> dict[str, float]:
+        """Convert to dictionary for metrics endpoints."""
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "max_batch": self.max_batch,
+            "avg_batch_size": round(self.avg_batch_size, 2),
+        }
+
+
+class MicroBatcher(Generic[T, R]):
+    """Gather concurrent requests into batches.
+
+    The first request of a batch opens a window of ``max_wait_ms``; every
+    request that arrives before the window closes (up to ``max_batch_size``)
+    joins it. The batch function runs in a worker thread so the event loop
+    keeps accepting requests for the next batch meanwhile.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[T]], list[R]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5.0,
+    ):
+        """Initialize the batcher.
+
+        Args:
+            batch_fn: Function mapping a list of inputs to a list of results
+                in the same order.
+            max_batch_size: Maximum items per batch.
+            max_wait_ms: How long to wait for a batch to fill.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.stats = BatcherStats()
+
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _ensure_started(self) -> None:
+        """Start the collector task on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def submit(self, item: T) -> R:
+        """Submit one item and wait for its result.
+
+        Args:
+            item: Input to the batch function.
+
+        Returns:
+            Result for this item.
+        """
+        self._ensure_started()
+        future = self._loop.create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self) -> list[tuple[T, asyncio.Future]]:
+        """Wait for the first item, then gather more until the window closes."""
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait_ms / 1000
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        # Take anything already queued without waiting
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+        return batch
+
+    async def _run(self) -> None:
+        """Collector loop."""
+        while True:
+            batch = await self._collect()
+            await self._dispatch(batch)
+
+    async def _dispatch(self, batch: list[tuple[T, asyncio.Future]]) -> None:
+        """Run the batch function and resolve each caller's future."""
+        items = [item for item, _ in batch]
+
+        self.stats.batches += 1
+        self.stats.items += len(items)
+        self.stats.max_batch = max(self.stats.max_batch, len(items))
+
+        try:
+            results = await asyncio.to_thread(self.batch_fn, items)
+            if len(results) != len(items):
+                raise RuntimeError(
+                    f"Batch function returned {len(results)} results for {len(items)} inputs"
+                )
+        except Exception as e:
+            logger.warning("Batch of %d failed: %s", len(items), e)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """Stop the collector task."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
@@ -1,8 +1,9 @@
 """Unified inference engine for Infographix ML pipeline."""
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field, replace
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Protocol, TypeVar
 
 from ml.config import get_ml_settings
 from ml.models.intent_classifier.inference import IntentClassifierInference
@@ -12,6 +13,28 @@ from ml.models.layout_generator.model import LayoutResult
 from ml.models.style_recommender.inference import StyleRecommenderInference
 from ml.models.style_recommender.model import StyleResult
 
+T = TypeVar("T")
+
+# Called with a stage name ("classified", "layout", "styled", "variations")
+# and, for variations, the number done and the number requested
+ProgressCallback = Callable[..., None]
+
+
+class StageCache(Protocol):
+    """Storage for intermediate pipeline results.
+
+    Implementations derive a key from ``stage`` and the ``inputs`` dict and
+    store the JSON-serializable ``value`` under it.
+    """
+
+    def get_stage(self, stage: str, inputs: dict[str, Any]) -> dict[str, Any] | None:
+        """Return the cached value for a stage, or None on a miss."""
+        ...
+
+    def set_stage(self, stage: str, inputs: dict[str, Any], value: dict[str, Any]) -> None:
+        """Store the value computed for a stage."""
+        ...
+
 
 @dataclass
 class InferenceResult:
@@ -46,6 +69,10 @@ class InferenceResult:
         )
 
 
+def _no_progress(stage: str, *args: Any) -> None:
+    """Default progress callback."""
+
+
 class InferenceEngine:
     """Unified inference engine combining all ML models.
 
@@ -115,6 +142,8 @@ class InferenceEngine:
         brand_colors: list[str] | None = None,
         brand_fonts: list[str] | None = None,
         formality: str = "professional",
+        cache: StageCache | None = None,
+        on_progress: ProgressCallback | None = None,
     ) -> InferenceResult:
         """Generate infographic from prompt.
 
@@ -124,18 +153,26 @@ class InferenceEngine:
             brand_colors: Optional brand color palette.
             brand_fonts: Optional brand fonts.
             formality: Style formality level.
+            cache: Optional stage cache. Classification, layout and style
+                results are looked up individually, so a request that shares
+                only its prompt with an earlier one still skips classification.
+            on_progress: Optional callback invoked as each stage completes.
 
         Returns:
             Complete inference result with DSL and styles.
         """
-        # Step 1: Classify intent
-        classification = self.intent_classifier.predict(prompt)
-
-        # Step 2: Extract parameters
-        parameters = self.intent_classifier.extract_parameters(
-            prompt=prompt,
-            archetype=classification.archetype,
+        report = on_progress or _no_progress
+
+        # Steps 1-2: Classify intent and extract parameters
+        classification = self._cached_stage(
+            cache,
+            "classification",
+            {"prompt": prompt},
+            ClassificationResult,
+            lambda: self._classify(prompt),
         )
+        report("classified")
+        parameters = dict(classification.parameters or {})
 
         # Step 3: Build intent specification
         intent = {
@@ -148,9 +185,18 @@ class InferenceEngine:
 
         # Step 4: Generate layout
         if content:
-            layout = self.layout_generator.generate_with_content(intent, content)
+            compute_layout = partial(self.layout_generator.generate_with_content, intent, content)
         else:
-            layout = self.layout_generator.generate(intent, use_ml=self.use_ml)
+            compute_layout = partial(self.layout_generator.generate, intent, use_ml=self.use_ml)
+
+        layout = self._cached_stage(
+            cache,
+            "layout",
+            {"intent": intent, "content": content},
+            LayoutResult,
+            compute_layout,
+        )
+        report("layout")
 
         # Step 5: Recommend styles
         style_features = {
@@ -162,19 +208,34 @@ class InferenceEngine:
         }
 
         if brand_colors:
-            style = self.style_recommender.recommend_for_brand(
+            compute_style = partial(
+                self.style_recommender.recommend_for_brand,
                 features=style_features,
                 brand_colors=brand_colors,
                 brand_fonts=brand_fonts,
             )
         else:
-            style = self.style_recommender.recommend(
+            compute_style = partial(
+                self.style_recommender.recommend,
                 features=style_features,
                 use_ml=self.use_ml,
             )
 
+        style = self._cached_stage(
+            cache,
+            "style",
+            {
+                "features": style_features,
+                "brand_colors": brand_colors,
+                "brand_fonts": brand_fonts,
+            },
+            StyleResult,
+            compute_style,
+        )
+
         # Step 6: Apply styles to DSL
         styled_dsl = self._apply_styles(layout.dsl, style)
+        report("styled")
 
         return InferenceResult(
             archetype=classification.archetype,
@@ -188,10 +249,225 @@ class InferenceEngine:
             layout_result=layout,
         )
 
+    def generate_batch(
+        self,
+        prompts: list[str],
+        contents: list[list[dict[str, str]] | None] | None = None,
+        brand_colors: list[str] | None = None,
+        brand_fonts: list[str] | None = None,
+        formality: str = "professional",
+        cache: StageCache | None = None,
+    ) -> list[InferenceResult]:
+        """Generate infographics for several prompts sharing brand settings.
+
+        Intent classification and style recommendation each run as one
+        batch over every prompt not found in the cache; layouts are
+        generated per prompt. Results match ``generate`` for each prompt.
+
+        Args:
+            prompts: User prompts.
+            contents: Optional content items for each prompt.
+            brand_colors: Optional brand color palette for all prompts.
+            brand_fonts: Optional brand fonts for all prompts.
+            formality: Style formality level.
+            cache: Optional stage cache, shared with ``generate``.
+
+        Returns:
+            Inference results in prompt order.
+        """
+        contents = contents or [None] * len(prompts)
+
+        # Classify every prompt in one batch
+        classifications = self._cached_batch(
+            cache,
+            "classification",
+            [{"prompt": prompt} for prompt in prompts],
+            ClassificationResult,
+            lambda inputs: self._classify_batch([i["prompt"] for i in inputs]),
+        )
+
+        intents = []
+        layouts = []
+        style_features = []
+        for prompt, content, classification in zip(prompts, contents, classifications):
+            parameters = dict(classification.parameters or {})
+            intent = {
+                "archetype": classification.archetype,
+                "item_count": parameters.get("count", 4),
+                "orientation": parameters.get("orientation", "horizontal"),
+                "style_hints": [],
+                **parameters,
+            }
+            intents.append(intent)
+
+            if content:
+                compute_layout = partial(self.layout_generator.generate_with_content, intent, content)
+            else:
+                compute_layout = partial(self.layout_generator.generate, intent, use_ml=self.use_ml)
+            layouts.append(self._cached_stage(
+                cache,
+                "layout",
+                {"intent": intent, "content": content},
+                LayoutResult,
+                compute_layout,
+            ))
+
+            style_features.append({
+                "archetype": classification.archetype,
+                "item_count": intent["item_count"],
+                "has_icons": "icon" in prompt.lower(),
+                "has_descriptions": content is not None and any("description" in c for c in content),
+                "formality": formality,
+            })
+
+        # Recommend styles for every prompt in one batch
+        if brand_colors:
+            compute_styles = partial(
+                self.style_recommender.batch_recommend_for_brand,
+                brand_colors=brand_colors,
+                brand_fonts=brand_fonts,
+            )
+        else:
+            compute_styles = partial(self.style_recommender.batch_recommend, use_ml=self.use_ml)
+
+        styles = self._cached_batch(
+            cache,
+            "style",
+            [
+                {"features": features, "brand_colors": brand_colors, "brand_fonts": brand_fonts}
+                for features in style_features
+            ],
+            StyleResult,
+            lambda inputs: compute_styles([i["features"] for i in inputs]),
+        )
+
+        return [
+            InferenceResult(
+                archetype=classification.archetype,
+                classification_confidence=classification.confidence,
+                all_archetype_scores=classification.all_scores,
+                parameters=dict(classification.parameters or {}),
+                dsl=self._apply_styles(layout.dsl, style),
+                layout_confidence=layout.confidence,
+                style=style,
+                classification_result=classification,
+                layout_result=layout,
+            )
+            for classification, layout, style in zip(classifications, layouts, styles)
+        ]
+
+    def _classify(self, prompt: str) -> ClassificationResult:
+        """Classify a prompt and attach its extracted parameters."""
+        classification = self.intent_classifier.predict(prompt)
+        parameters = self.intent_classifier.extract_parameters(
+            prompt=prompt,
+            archetype=classification.archetype,
+        )
+        return replace(classification, parameters=parameters)
+
+    def _classify_batch(self, prompts: list[str]) -> list[ClassificationResult]:
+        """Classify prompts in one batch and attach their extracted parameters."""
+        classifications = self.intent_classifier.batch_predict(prompts)
+        return [
+            replace(
+                classification,
+                parameters=self.intent_classifier.extract_parameters(
+                    prompt=prompt,
+                    archetype=classification.archetype,
+                ),
+            )
+            for prompt, classification in zip(prompts, classifications)
+        ]
+
+    def _cached_stage(
+        self,
+        cache: StageCache | None,
+        stage: str,
+        inputs: dict[str, Any],
+        result_type: Callable[..., T],
+        compute: Callable[[], T],
+    ) -> T:
+        """Run one pipeline stage through the stage cache.
+
+        Args:
+            cache: Stage cache, or None to always compute.
+            stage: Stage name used in the cache key.
+            inputs: Everything the stage result depends on.
+            result_type: Dataclass used to rebuild cached values.
+            compute: Computes the result on a miss.
+
+        Returns:
+            Cached or freshly computed stage result.
+        """
+        if cache is None:
+            return compute()
+
+        # Results differ between checkpoints and the rule-based fallbacks
+        inputs = {**inputs, "models_dir": str(self.models_dir), "use_ml": self.use_ml}
+
+        cached = cache.get_stage(stage, inputs)
+        if cached is not None:
+            try:
+                return result_type(**cached)
+            except TypeError:
+                # Entry written by an older result schema; recompute
+                pass
+
+        result = compute()
+        cache.set_stage(stage, inputs, asdict(result))
+        return result
+
+    def _cached_batch(
+        self,
+        cache: StageCache | None,
+        stage: str,
+        inputs: list[dict[str, Any]],
+        result_type: Callable[..., T],
+        compute: Callable[[list[dict[str, Any]]], list[T]],
+    ) -> list[T]:
+        """Run one pipeline stage for several items through the stage cache.
+
+        Items missing from the cache are computed together in one call.
+
+        Args:
+            cache: Stage cache, or None to always compute.
+            stage: Stage name used in the cache key.
+            inputs: Everything each item's result depends on.
+            result_type: Dataclass used to rebuild cached values.
+            compute: Computes results for a list of inputs, in order.
+
+        Returns:
+            Cached or freshly computed results in input order.
+        """
+        if cache is None:
+            return compute(inputs)
+
+        # Results differ between checkpoints and the rule-based fallbacks
+        keys = [{**i, "models_dir": str(self.models_dir), "use_ml": self.use_ml} for i in inputs]
+
+        results: list[T | None] = [None] * len(inputs)
+        for index, key in enumerate(keys):
+            cached = cache.get_stage(stage, key)
+            if cached is not None:
+                try:
+                    results[index] = result_type(**cached)
+                except TypeError:
+                    # Entry written by an older result schema; recompute
+                    pass
+
+        missing = [index for index, result in enumerate(results) if result is None]
+        if missing:
+            computed = compute([inputs[index] for index in missing])
+            for index, result in zip(missing, computed):
+                cache.set_stage(stage, keys[index], asdict(result))
+                results[index] = result
+        return results
+
     def generate_variations(
         self,
         prompt: str,
         count: int = 3,
+        on_progress: ProgressCallback | None = None,
         **kwargs,
     ) -> list[InferenceResult]:
         """Generate multiple variations of an infographic.
@@ -199,13 +475,18 @@ class InferenceEngine:
         Args:
             prompt: User's prompt.
             count: Number of variations.
+            on_progress: Optional callback invoked with ("variations", n, count)
+                as each variation is built.
             **kwargs: Additional arguments passed to generate().
 
         Returns:
             List of inference results.
         """
+        report = on_progress or _no_progress
+
         # Get base result
         base = self.generate(prompt, **kwargs)
+        report("variations", 1, count)
 
         variations = [base]
 
@@ -238,6 +519,7 @@ class InferenceEngine:
                 layout_confidence=layout_variations[i].confidence,
                 style=style_variations[i],
             ))
+            report("variations", i + 1, count)
 
         return variations[:count]
 
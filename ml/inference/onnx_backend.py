@@ -0,0 +1,515 @@
+"""ONNX Runtime inference backend.
+
+Runs the models exported by ``ml/training/export_onnx.py`` on CPU with ONNX
+Runtime instead of PyTorch. Each class here mirrors the ``predict`` /
+``recommend`` / ``generate`` surface of its torch counterpart so the
+inference wrappers can swap them in when ``ML_INFERENCE_BACKEND=onnx``.
+
+Exports live next to the torch checkpoints:
+
+* ``<intent_classifier>/model.onnx`` (+ ``tokenizer/``)
+* ``<style_recommender>/model.onnx``
+* ``<layout_generator>/encoder.onnx`` and ``decoder.onnx``
+
+with optional ``*.int8.onnx`` dynamically quantized variants.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ml.config import (
+    IntentClassifierConfig,
+    LayoutGeneratorConfig,
+    StyleRecommenderConfig,
+    get_ml_settings,
+)
+from ml.models.intent_classifier.model import ClassificationResult
+from ml.models.layout_generator.model import LayoutGenerator, LayoutResult
+from ml.models.style_recommender.model import StyleRecommender, StyleResult
+
+try:
+    import onnxruntime as ort
+    ONNX_AVAILABLE = True
+except ImportError:
+    ort = None
+    ONNX_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+QUANTIZED_SUFFIX = ".int8.onnx"
+
+
+def resolve_onnx_path(
+    model_dir: Path | str,
+    name: str = "model",
+    quantized: bool = False,
+) -> Path | None:
+    """Find an exported ONNX file.
+
+    Args:
+        model_dir: Model checkpoint directory.
+        name: Export file stem (``model``, ``encoder``, ``decoder``).
+        quantized: Prefer the int8 variant when it exists.
+
+    Returns:
+        Path to the ONNX file, or None if not exported.
+    """
+    model_dir = Path(model_dir)
+    if quantized:
+        quantized_path = model_dir / f"{name}{QUANTIZED_SUFFIX}"
+        if quantized_path.exists():
+            return quantized_path
+
+    path = model_dir / f"{name}.onnx"
+    return path if path.exists() else None
+
+
+def create_session(path: Path | str, num_threads: int = 0) -> "ort.InferenceSession":
+    """Create a CPU ONNX Runtime session.
+
+    Args:
+        path: Path to ONNX model.
+        num_threads: Intra-op threads (0 = onnxruntime default).
+
+    Returns:
+        Inference session.
+    """
+    if not ONNX_AVAILABLE:
+        raise ImportError(
+            "onnxruntime library required. Install with: pip install onnxruntime"
+        )
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if num_threads:
+        options.intra_op_num_threads = num_threads
+
+    return ort.InferenceSession(
+        str(path),
+        sess_options=options,
+        providers=["CPUExecutionProvider"],
+    )
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    """Numerically stable softmax over the last axis."""
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+def _load_tokenizer(model_dir: Path, model_name: str):
+    """Load a tokenizer saved with the export, or the base model's."""
+    from transformers import AutoTokenizer
+
+    tokenizer_dir = model_dir / "tokenizer"
+    return AutoTokenizer.from_pretrained(tokenizer_dir if tokenizer_dir.exists() else model_name)
+
+
+class OnnxIntentClassifier:
+    """Intent classifier running on ONNX Runtime."""
+
+    def __init__(
+        self,
+        session: "ort.InferenceSession",
+        config: IntentClassifierConfig,
+        tokenizer: Any,
+    ):
+        """Initialize the classifier.
+
+        Args:
+            session: Session for the exported classifier.
+            config: Model configuration.
+            tokenizer: Tokenizer matching the exported encoder.
+        """
+        self.session = session
+        self.config = config
+        self.tokenizer = tokenizer
+
+    @classmethod
+    def load(
+        cls,
+        model_dir: Path | str,
+        quantized: bool = False,
+        num_threads: int = 0,
+        tokenizer: Any = None,
+    ) -> "OnnxIntentClassifier":
+        """Load an exported classifier.
+
+        Args:
+            model_dir: Directory containing ``model.onnx`` and ``config.json``.
+            quantized: Prefer the int8 export.
+            num_threads: Intra-op threads.
+            tokenizer: Tokenizer to use instead of the saved one.
+
+        Returns:
+            Loaded classifier.
+        """
+        model_dir = Path(model_dir)
+        onnx_path = resolve_onnx_path(model_dir, quantized=quantized)
+        if onnx_path is None:
+            raise FileNotFoundError(f"No ONNX export in {model_dir}")
+
+        config_path = model_dir / "config.json"
+        if config_path.exists():
+            with open(config_path, "r") as f:
+                config = IntentClassifierConfig(**json.load(f))
+        else:
+            config = get_ml_settings().intent_classifier
+
+        if tokenizer is None:
+            tokenizer = _load_tokenizer(model_dir, config.model_name)
+
+        return cls(create_session(onnx_path, num_threads), config, tokenizer)
+
+    def predict(self, prompt: str) -> ClassificationResult:
+        """Predict archetype for a prompt.
+
+        Args:
+            prompt: User prompt text.
+
+        Returns:
+            Classification result.
+        """
+        return self.predict_batch([prompt])[0]
+
+    def predict_batch(self, prompts: list[str]) -> list[ClassificationResult]:
+        """Predict archetypes for several prompts in one run.
+
+        Args:
+            prompts: User prompt texts.
+
+        Returns:
+            Classification results, in the same order as ``prompts``.
+        """
+        if not prompts:
+            return []
+
+        encoding = self.tokenizer(
+            prompts,
+            max_length=self.config.max_length,
+            padding="longest",
+            truncation=True,
+            return_tensors="np",
+        )
+
+        (logits,) = self.session.run(
+            ["logits"],
+            {
+                "input_ids": np.asarray(encoding["input_ids"], dtype=np.int64),
+                "attention_mask": np.asarray(encoding["attention_mask"], dtype=np.int64),
+            },
+        )
+        probs = _softmax(logits)
+
+        results = []
+        for row in probs:
+            pred_idx = int(row.argmax())
+            results.append(ClassificationResult(
+                archetype=self.config.archetypes[pred_idx],
+                confidence=float(row[pred_idx]),
+                all_scores={
+                    archetype: float(row[i])
+                    for i, archetype in enumerate(self.config.archetypes)
+                },
+            ))
+
+        return results
+
+
+class OnnxStyleRecommender:
+    """Style recommender running on ONNX Runtime."""
+
+    OUTPUTS = ["palette", "shadow", "glow", "corner", "font"]
+    SHADOW_OPTIONS = ["none", "soft", "hard"]
+    GLOW_OPTIONS = ["none", "subtle", "strong"]
+    CORNER_OPTIONS = ["sharp", "rounded", "pill"]
+
+    def __init__(self, session: "ort.InferenceSession", config: StyleRecommenderConfig):
+        """Initialize the recommender.
+
+        Args:
+            session: Session for the exported recommender.
+            config: Model configuration.
+        """
+        self.session = session
+        self.config = config
+        self._archetypes = get_ml_settings().intent_classifier.archetypes
+
+    @classmethod
+    def load(
+        cls,
+        model_dir: Path | str,
+        quantized: bool = False,
+        num_threads: int = 0,
+    ) -> "OnnxStyleRecommender":
+        """Load an exported recommender.
+
+        Args:
+            model_dir: Directory containing ``model.onnx`` and ``config.json``.
+            quantized: Prefer the int8 export.
+            num_threads: Intra-op threads.
+
+        Returns:
+            Loaded recommender.
+        """
+        model_dir = Path(model_dir)
+        onnx_path = resolve_onnx_path(model_dir, quantized=quantized)
+        if onnx_path is None:
+            raise FileNotFoundError(f"No ONNX export in {model_dir}")
+
+        config_path = model_dir / "config.json"
+        if config_path.exists():
+            with open(config_path, "r") as f:
+                config = StyleRecommenderConfig(**json.load(f))
+        else:
+            config = get_ml_settings().style_recommender
+
+        return cls(create_session(onnx_path, num_threads), config)
+
+    def encode_input(self, features: dict[str, Any]) -> np.ndarray:
+        """Encode input features, matching ``StyleRecommender.encode_input``.
+
+        Args:
+            features: Input feature dict.
+
+        Returns:
+            Feature array of shape ``(1, input_dim)``.
+        """
+        vec = np.zeros(self.config.input_dim, dtype=np.float32)
+
+        archetype = features.get("archetype", "other")
+        if archetype in self._archetypes:
+            vec[self._archetypes.index(archetype)] = 1.0
+
+        vec[14] = min(features.get("item_count", 4) / 10.0, 1.0)
+
+        vec[15] = 1.0 if features.get("has_icons", False) else 0.0
+        vec[16] = 1.0 if features.get("has_descriptions", False) else 0.0
+        vec[17] = 1.0 if features.get("has_images", False) else 0.0
+
+        formality = features.get("formality", "professional")
+        if formality == "casual":
+            vec[21] = 1.0
+        elif formality == "professional":
+            vec[22] = 1.0
+        elif formality == "corporate":
+            vec[23] = 1.0
+
+        return vec[np.newaxis, :]
+
+    def recommend(self, features: dict[str, Any]) -> StyleResult:
+        """Recommend styles for given features.
+
+        Args:
+            features: Input features dict.
+
+        Returns:
+            Style recommendation result.
+        """
+        return self.recommend_batch([features])[0]
+
+    def recommend_batch(self, features_list: list[dict[str, Any]]) -> list[StyleResult]:
+        """Recommend styles for several feature sets in one session run.
+
+        Args:
+            features_list: Input feature dicts.
+
+        Returns:
+            Style recommendations in input order.
+        """
+        if not features_list:
+            return []
+
+        inputs = np.concatenate([self.encode_input(features) for features in features_list])
+        outputs = dict(zip(
+            self.OUTPUTS,
+            self.session.run(self.OUTPUTS, {"features": inputs}),
+        ))
+
+        probs = {name: _softmax(logits) for name, logits in outputs.items()}
+        palette_names = list(StyleRecommender.PALETTES.keys())
+
+        results = []
+        for i in range(len(features_list)):
+            row = {name: p[i] for name, p in probs.items()}
+            confidence = sum(float(p.max()) for p in row.values()) / len(row)
+            results.append(StyleResult(
+                color_palette=StyleRecommender.PALETTES[palette_names[int(row["palette"].argmax())]],
+                shadow=self.SHADOW_OPTIONS[int(row["shadow"].argmax())],
+                glow=self.GLOW_OPTIONS[int(row["glow"].argmax())],
+                corner_radius=self.CORNER_OPTIONS[int(row["corner"].argmax())],
+                font_family=StyleRecommender.FONT_FAMILIES[int(row["font"].argmax())],
+                confidence=confidence,
+            ))
+        return results
+
+
+class OnnxLayoutGenerator:
+    """T5 layout generator running on ONNX Runtime.
+
+    The encoder runs once per request; the decoder is re-run on the growing
+    prefix with greedy selection until EOS or ``max_length``.
+    """
+
+    def __init__(
+        self,
+        encoder: "ort.InferenceSession",
+        decoder: "ort.InferenceSession",
+        config: LayoutGeneratorConfig,
+        tokenizer: Any,
+        decoder_start_token_id: int = 0,
+        eos_token_id: int = 1,
+    ):
+        """Initialize the generator.
+
+        Args:
+            encoder: Session for the exported encoder.
+            decoder: Session for the exported decoder + LM head.
+            config: Model configuration.
+            tokenizer: T5 tokenizer.
+            decoder_start_token_id: First decoder token (pad for T5).
+            eos_token_id: Token that ends generation.
+        """
+        self.encoder = encoder
+        self.decoder = decoder
+        self.config = config
+        self.tokenizer = tokenizer
+        self.decoder_start_token_id = decoder_start_token_id
+        self.eos_token_id = eos_token_id
+        self._templates = LayoutGenerator(config)
+        self._initialized = True
+
+    @classmethod
+    def load(
+        cls,
+        model_dir: Path | str,
+        quantized: bool = False,
+        num_threads: int = 0,
+        tokenizer: Any = None,
+    ) -> "OnnxLayoutGenerator":
+        """Load an exported generator.
+
+        Args:
+            model_dir: Directory containing ``encoder.onnx`` and ``decoder.onnx``.
+            quantized: Prefer the int8 exports.
+            num_threads: Intra-op threads.
+            tokenizer: Tokenizer to use instead of the saved one.
+
+        Returns:
+            Loaded generator.
+        """
+        model_dir = Path(model_dir)
+        encoder_path = resolve_onnx_path(model_dir, "encoder", quantized)
+        decoder_path = resolve_onnx_path(model_dir, "decoder", quantized)
+        if encoder_path is None or decoder_path is None:
+            raise FileNotFoundError(f"No ONNX encoder/decoder export in {model_dir}")
+
+        config_path = model_dir / "config.json"
+        if config_path.exists():
+            with open(config_path, "r") as f:
+                config = LayoutGeneratorConfig(**json.load(f))
+        else:
+            config = get_ml_settings().layout_generator
+
+        if tokenizer is None:
+            tokenizer = _load_tokenizer(model_dir, config.model_name)
+
+        return cls(
+            create_session(encoder_path, num_threads),
+            create_session(decoder_path, num_threads),
+            config,
+            tokenizer,
+            decoder_start_token_id=tokenizer.pad_token_id or 0,
+            eos_token_id=tokenizer.eos_token_id if tokenizer.eos_token_id is not None else 1,
+        )
+
+    def generate_ids(
+        self,
+        input_ids: np.ndarray,
+        attention_mask: np.ndarray,
+        max_length: int,
+    ) -> list[int]:
+        """Greedy-decode token IDs for a single input.
+
+        Args:
+            input_ids: Encoder input IDs, shape ``(1, seq)``.
+            attention_mask: Encoder attention mask, shape ``(1, seq)``.
+            max_length: Maximum decoded length, including the start token.
+
+        Returns:
+            Decoded token IDs, starting with the decoder start token.
+        """
+        input_ids = np.asarray(input_ids, dtype=np.int64)
+        attention_mask = np.asarray(attention_mask, dtype=np.int64)
+
+        (hidden_states,) = self.encoder.run(
+            ["last_hidden_state"],
+            {"input_ids": input_ids, "attention_mask": attention_mask},
+        )
+
+        tokens = [self.decoder_start_token_id]
+        while len(tokens) < max_length:
+            (logits,) = self.decoder.run(
+                ["logits"],
+                {
+                    "decoder_input_ids": np.asarray([tokens], dtype=np.int64),
+                    "encoder_hidden_states": hidden_states,
+                    "attention_mask": attention_mask,
+                },
+            )
+            next_token = int(logits[0, -1].argmax())
+            tokens.append(next_token)
+            if next_token == self.eos_token_id:
+                break
+
+        return tokens
+
+    def generate(
+        self,
+        intent: dict[str, Any],
+        max_length: int | None = None,
+        num_beams: int = 1,
+    ) -> LayoutResult:
+        """Generate DSL from intent.
+
+        Args:
+            intent: Intent specification.
+            max_length: Maximum output length.
+            num_beams: Ignored; ONNX decoding is greedy.
+
+        Returns:
+            Generated layout result.
+        """
+        max_length = max_length or self.config.max_output_length
+
+        encoding = self.tokenizer(
+            self._templates.format_input(intent),
+            max_length=self.config.max_input_length,
+            truncation=True,
+            return_tensors="np",
+        )
+
+        tokens = self.generate_ids(
+            encoding["input_ids"],
+            encoding["attention_mask"],
+            max_length=max_length,
+        )
+        raw_output = self.tokenizer.decode(tokens, skip_special_tokens=True)
+
+        try:
+            dsl = json.loads(raw_output)
+            confidence = 0.9
+        except json.JSONDecodeError:
+            dsl = self._templates._generate_fallback(intent)
+            confidence = 0.5
+
+        return LayoutResult(
+            dsl=dsl,
+            confidence=confidence,
+            raw_output=raw_output,
+        )
@@ -0,0 +1,188 @@
+"""Process-wide registry of warm inference engines.
+
+Loading checkpoints and tokenizers dominates request latency when an
+``InferenceEngine`` is built per request. The registry keeps one engine per
+``(models_dir, use_ml)`` pair for the lifetime of the process, loads its
+models eagerly and runs a warm-up pass before handing it out.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ml.inference.engine import InferenceEngine
+
+logger = logging.getLogger(__name__)
+
+WARMUP_PROMPT = "Create a 4-stage sales funnel"
+
+
+@dataclass
+class EngineTimings:
+    """Load and warm-up timings for a registered engine."""
+
+    load_ms: float = 0.0
+    warmup_ms: float = 0.0
+    loaded_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, float]:
+        """Convert to dictionary for metrics endpoints."""
+        return {
+            "load_ms": round(self.load_ms, 2),
+            "warmup_ms": round(self.warmup_ms, 2),
+            "loaded_at": self.loaded_at,
+        }
+
+
+class EngineRegistry:
+    """Thread-safe pool of warm ``InferenceEngine`` instances.
+
+    Engines are keyed by their resolved models directory and ``use_ml`` flag.
+    The first caller for a key pays the load and warm-up cost; every later
+    caller gets the same instance.
+    """
+
+    def __init__(self):
+        self._engines: dict[tuple[str, bool], InferenceEngine] = {}
+        self._timings: dict[tuple[str, bool], EngineTimings] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(models_dir: Path | str | None, use_ml: bool) -> tuple[str, bool]:
+        """Build the registry key for an engine configuration."""
+        path = Path(models_dir) if models_dir else Path("ml/checkpoints")
+        return (str(path.resolve()), use_ml)
+
+    def get(
+        self,
+        models_dir: Path | str | None = None,
+        use_ml: bool = True,
+        warm_up: bool = True,
+    ) -> InferenceEngine:
+        """Get a warm engine, creating it on first use.
+
+        Args:
+            models_dir: Base directory for model checkpoints.
+            use_ml: Whether to use ML models (vs rule-based fallbacks).
+            warm_up: Whether to run a warm-up pass on first load.
+
+        Returns:
+            Shared inference engine.
+        """
+        key = self._key(models_dir, use_ml)
+
+        engine = self._engines.get(key)
+        if engine is not None:
+            return engine
+
+        with self._lock:
+            # Another thread may have loaded it while we waited
+            engine = self._engines.get(key)
+            if engine is not None:
+                return engine
+
+            engine, timings = self._load(models_dir, use_ml, warm_up)
+            self._timings[key] = timings
+            self._engines[key] = engine
+
+        logger.info(
+            "Loaded inference engine %s (load=%.1fms, warmup=%.1fms)",
+            key, timings.load_ms, timings.warmup_ms,
+        )
+        return engine
+
+    def _load(
+        self,
+        models_dir: Path | str | None,
+        use_ml: bool,
+        warm_up: bool,
+    ) -> tuple[InferenceEngine, EngineTimings]:
+        """Create an engine, load its models and optionally warm it up."""
+        timings = EngineTimings()
+
+        start = time.perf_counter()
+        engine = InferenceEngine(models_dir=models_dir, use_ml=use_ml)
+        self._load_models(engine)
+        timings.load_ms = (time.perf_counter() - start) * 1000
+
+        if warm_up:
+            start = time.perf_counter()
+            try:
+                engine.generate(WARMUP_PROMPT)
+            except Exception as e:
+                logger.warning("Inference engine warm-up failed: %s", e)
+            timings.warmup_ms = (time.perf_counter() - start) * 1000
+
+        return engine, timings
+
+    @staticmethod
+    def _load_models(engine: InferenceEngine) -> None:
+        """Materialize the lazy wrappers and load any available checkpoints.
+
+        Touching the lazy properties here, under the registry lock, means
+        request threads never race on first access.
+        """
+        classifier = engine.intent_classifier
+        layout = engine.layout_generator
+        style = engine.style_recommender
+
+        if not engine.use_ml:
+            return
+
+        for wrapper in (classifier, layout, style):
+            if wrapper.has_checkpoint():
+                _ = wrapper.model
+
+    def timings(self) -> dict[str, dict[str, float]]:
+        """Get load and warm-up timings for every registered engine.
+
+        Returns:
+            Mapping of ``"<models_dir>:<ml|rules>"`` to timing details.
+        """
+        with self._lock:
+            return {
+                f"{path}:{'ml' if use_ml else 'rules'}": t.to_dict()
+                for (path, use_ml), t in self._timings.items()
+            }
+
+    def clear(self) -> None:
+        """Drop all registered engines."""
+        with self._lock:
+            self._engines.clear()
+            self._timings.clear()
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+
+# Process-wide registry
+_registry: EngineRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_engine_registry() -> EngineRegistry:
+    """Get the process-wide engine registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = EngineRegistry()
+    return _registry
+
+
+def get_inference_engine(
+    models_dir: Path | str | None = None,
+    use_ml: bool = True,
+) -> InferenceEngine:
+    """Get a shared, warm inference engine.
+
+    Args:
+        models_dir: Base directory for model checkpoints.
+        use_ml: Whether to use ML models (vs rule-based fallbacks).
+
+    Returns:
+        Shared inference engine for this process.
+    """
+    return get_engine_registry().get(models_dir=models_dir, use_ml=use_ml)
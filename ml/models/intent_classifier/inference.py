@@ -23,6 +23,7 @@ class IntentClassifierInference:
         self.settings = get_ml_settings()
         self.model_path = Path(model_path) if model_path else self.settings.paths.intent_classifier
         self._model = None
+        self._batcher = None
         self._fallback_rules = self._load_fallback_rules()
 
     def _load_fallback_rules(self) -> dict[str, list[str]]:
@@ -50,8 +51,31 @@ class IntentClassifierInference:
             self._model = self._load_model()
         return self._model
 
+    def _onnx_path(self) -> Path | None:
+        """Get the ONNX export to use, if the ONNX backend is selected."""
+        if self.settings.inference_backend != "onnx":
+            return None
+
+        from ml.inference.onnx_backend import ONNX_AVAILABLE, resolve_onnx_path
+
+        if not ONNX_AVAILABLE:
+            return None
+        return resolve_onnx_path(self.model_path, quantized=self.settings.onnx_quantized)
+
+    def has_checkpoint(self) -> bool:
+        """Check whether a trained model exists for the configured backend."""
+        return self._onnx_path() is not None or (self.model_path / "model.pt").exists()
+
     def _load_model(self) -> IntentClassifier:
         """Load the model from disk or create a new one."""
+        if self._onnx_path() is not None:
+            from ml.inference.onnx_backend import OnnxIntentClassifier
+
+            return OnnxIntentClassifier.load(
+                self.model_path,
+                quantized=self.settings.onnx_quantized,
+                num_threads=self.settings.onnx_num_threads,
+            )
         if (self.model_path / "model.pt").exists():
             return IntentClassifier.load(self.model_path)
         else:
@@ -75,7 +99,7 @@ class IntentClassifierInference:
         """
         try:
             # Try ML model first
-            if self._model is not None or (self.model_path / "model.pt").exists():
+            if self._model is not None or self.has_checkpoint():
                 return self.model.predict(prompt)
         except Exception as e:
             if not use_fallback:
@@ -131,18 +155,62 @@ class IntentClassifierInference:
     def batch_predict(
         self,
         prompts: list[str],
+        use_fallback: bool = True,
+        batch_size: int | None = None,
     ) -> list[ClassificationResult]:
         """Predict archetypes for multiple prompts.
 
+        Prompts are split into chunks of ``batch_size`` and each chunk runs as
+        a single forward pass.
+
         Args:
             prompts: List of prompts.
+            use_fallback: Whether to use fallback rules if model unavailable.
+            batch_size: Maximum prompts per forward pass. Uses settings if None.
 
         Returns:
             List of classification results.
         """
-        # For now, sequential prediction
-        # TODO: Implement batched inference for efficiency
-        return [self.predict(prompt) for prompt in prompts]
+        if not prompts:
+            return []
+
+        batch_size = batch_size or self.settings.max_batch_size
+
+        try:
+            # Try ML model first
+            if self._model is not None or self.has_checkpoint():
+                results = []
+                for start in range(0, len(prompts), batch_size):
+                    results.extend(self.model.predict_batch(prompts[start:start + batch_size]))
+                return results
+        except Exception:
+            if not use_fallback:
+                raise
+
+        # Fallback to keyword matching
+        return [self._fallback_predict(prompt) for prompt in prompts]
+
+    async def predict_async(self, prompt: str) -> ClassificationResult:
+        """Predict archetype, batching with other concurrent callers.
+
+        Concurrent calls made within ``batch_window_ms`` of each other share
+        one forward pass.
+
+        Args:
+            prompt: User prompt text.
+
+        Returns:
+            Classification result.
+        """
+        if self._batcher is None:
+            from ml.inference.batching import MicroBatcher
+
+            self._batcher = MicroBatcher(
+                self.batch_predict,
+                max_batch_size=self.settings.max_batch_size,
+                max_wait_ms=self.settings.batch_window_ms,
+            )
+        return await self._batcher.submit(prompt)
 
     def extract_parameters(
         self,
@@ -113,16 +113,33 @@ class IntentClassifier(nn.Module):
         Returns:
             Classification result with archetype and confidence.
         """
+        return self.predict_batch([prompt])[0]
+
+    def predict_batch(self, prompts: list[str]) -> list[ClassificationResult]:
+        """Predict archetypes for several prompts in one forward pass.
+
+        The batch is padded to its longest prompt rather than ``max_length``,
+        so short prompts don't pay for 128 tokens of attention.
+
+        Args:
+            prompts: User prompt texts.
+
+        Returns:
+            Classification results, in the same order as ``prompts``.
+        """
+        if not prompts:
+            return []
+
         if not self._initialized:
             self.initialize()
 
         self.eval()
 
-        # Tokenize
+        # Tokenize, padding only to the longest prompt in the batch
         encoding = self.tokenizer(
-            prompt,
+            prompts,
             max_length=self.config.max_length,
-            padding="max_length",
+            padding="longest",
             truncation=True,
             return_tensors="pt",
         )
@@ -137,21 +154,23 @@ class IntentClassifier(nn.Module):
             logits = self.forward(input_ids, attention_mask)
             probs = torch.softmax(logits, dim=-1)
 
-        # Get prediction
-        confidence, pred_idx = probs.max(dim=-1)
-        archetype = self.config.archetypes[pred_idx.item()]
-
-        # All scores
-        all_scores = {
-            self.config.archetypes[i]: probs[0, i].item()
-            for i in range(len(self.config.archetypes))
-        }
-
-        return ClassificationResult(
-            archetype=archetype,
-            confidence=confidence.item(),
-            all_scores=all_scores,
-        )
+        # Get predictions
+        confidences, pred_indices = probs.max(dim=-1)
+        probs_list = probs.tolist()
+
+        results = []
+        for row, (confidence, pred_idx) in enumerate(zip(confidences.tolist(), pred_indices.tolist())):
+            all_scores = {
+                archetype: probs_list[row][i]
+                for i, archetype in enumerate(self.config.archetypes)
+            }
+            results.append(ClassificationResult(
+                archetype=self.config.archetypes[pred_idx],
+                confidence=confidence,
+                all_scores=all_scores,
+            ))
+
+        return results
 
     def save(self, path: Path | str) -> None:
         """Save model to disk.
@@ -0,0 +1,555 @@
+"""Grammar-constrained JSON decoding for the Layout Generator.
+
+Beam search to ``max_output_length`` followed by ``json.loads`` wastes the
+whole decode whenever the output is not valid JSON. Here every decoding
+step only accepts tokens that keep the text a valid prefix of a DSL
+document, decoding stops the moment the root object closes, and the
+decoder reuses its KV cache so each step only processes the newest token.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any
+
+import torch
+
+# Root structure of a layout DSL. Objects with "properties" only accept
+# those keys; nodes without a "type" accept any JSON value.
+DSL_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "canvas": {"type": "object"},
+        "shapes": {"type": "array", "items": {"type": "object"}},
+        "archetype": {"type": "string"},
+        "theme": {"type": "object"},
+        "metadata": {"type": "object"},
+    },
+}
+
+_WHITESPACE = " \t\n\r"
+_ESCAPES = '"\\/bfnrtu'
+_HEX = "0123456789abcdefABCDEF"
+_LITERALS = {"t": "true", "f": "false", "n": "null"}
+
+# Lexer modes
+_VALUE = 0  # expecting a value
+_VALUE_OR_END = 1  # after '['
+_KEY = 2  # after ',' in an object
+_KEY_OR_END = 3  # after '{'
+_COLON = 4  # after a key
+_AFTER_VALUE = 5  # expecting ',' or a closing bracket
+_STRING = 6
+_ESCAPE = 7
+_UNICODE = 8
+_NUMBER = 9
+_LITERAL = 10
+_DONE = 11
+
+
+def _value_starts(schema: dict | None, char: str) -> bool:
+    """Check that ``char`` can start a value of the schema's type."""
+    kind = schema.get("type") if schema else None
+    if kind is None:
+        return True
+    if kind == "object":
+        return char == "{"
+    if kind == "array":
+        return char == "["
+    if kind == "string":
+        return char == '"'
+    if kind == "number":
+        return char == "-" or char.isdigit()
+    return True
+
+
+def _number_prefix_ok(text: str) -> bool:
+    """Check that ``text`` is a prefix of a JSON number."""
+    i, n = 0, len(text)
+    if i < n and text[i] == "-":
+        i += 1
+    if i == n:
+        return True
+    if text[i] == "0":
+        i += 1
+    elif text[i].isdigit():
+        while i < n and text[i].isdigit():
+            i += 1
+    else:
+        return False
+    if i < n and text[i] == ".":
+        i += 1
+        if i == n:
+            return True
+        if not text[i].isdigit():
+            return False
+        while i < n and text[i].isdigit():
+            i += 1
+    if i < n and text[i] in "eE":
+        i += 1
+        if i < n and text[i] in "+-":
+            i += 1
+        if i == n:
+            return True
+        if not text[i].isdigit():
+            return False
+        while i < n and text[i].isdigit():
+            i += 1
+    return i == n
+
+
+def _number_complete(text: str) -> bool:
+    """Check that ``text`` is a complete JSON number."""
+    return _number_prefix_ok(text) and text[-1].isdigit()
+
+
+class JsonPrefixState:
+    """Incremental checker for "is this text a valid prefix of a DSL document".
+
+    ``feed`` consumes one character and returns False (leaving the state
+    undefined) as soon as the text can no longer become a valid document.
+    States are cheap to ``copy`` so candidates can be tried speculatively.
+    """
+
+    __slots__ = ("stack", "mode", "buffer", "pending", "is_key", "value_schema")
+
+    def __init__(self, schema: dict | None = None):
+        """Initialize at the start of a document.
+
+        Args:
+            schema: Root schema. Defaults to ``DSL_SCHEMA``.
+        """
+        # Frames are (kind, schema, key) with kind "{" or "["
+        self.stack: list[tuple[str, dict | None, str | None]] = []
+        self.mode = _VALUE
+        self.buffer = ""  # key, number or remaining literal characters
+        self.pending = 0  # unicode hex digits still expected
+        self.is_key = False
+        self.value_schema: dict | None = DSL_SCHEMA if schema is None else schema
+
+    def copy(self) -> "JsonPrefixState":
+        """Return an independent copy of this state."""
+        other = JsonPrefixState.__new__(JsonPrefixState)
+        other.stack = list(self.stack)
+        other.mode = self.mode
+        other.buffer = self.buffer
+        other.pending = self.pending
+        other.is_key = self.is_key
+        other.value_schema = self.value_schema
+        return other
+
+    @property
+    def complete(self) -> bool:
+        """Whether the root value has been closed."""
+        return self.mode == _DONE
+
+    def feed_text(self, text: str) -> bool:
+        """Consume several characters.
+
+        Args:
+            text: Characters to append.
+
+        Returns:
+            True if the text is still a valid prefix.
+        """
+        for char in text:
+            if not self.feed(char):
+                return False
+        return True
+
+    def _allowed_keys(self) -> list[str] | None:
+        """Keys allowed in the innermost object, or None for any."""
+        properties = (self.stack[-1][1] or {}).get("properties")
+        return list(properties) if properties else None
+
+    def _start_value(self, char: str) -> bool:
+        """Handle the first character of a value."""
+        schema = self.value_schema
+        if not _value_starts(schema, char):
+            return False
+
+        if char == "{":
+            self.stack.append(("{", schema, None))
+            self.mode = _KEY_OR_END
+        elif char == "[":
+            self.stack.append(("[", schema, None))
+            self.mode = _VALUE_OR_END
+            self.value_schema = (schema or {}).get("items")
+        elif char == '"':
+            self.mode = _STRING
+            self.is_key = False
+        elif char == "-" or char.isdigit():
+            self.mode = _NUMBER
+            self.buffer = char
+        elif char in _LITERALS:
+            self.mode = _LITERAL
+            self.buffer = _LITERALS[char][1:]
+        else:
+            return False
+        return True
+
+    def _end_value(self) -> None:
+        """Move on after a complete value."""
+        self.mode = _AFTER_VALUE if self.stack else _DONE
+
+    def _close(self, char: str) -> bool:
+        """Close the innermost container with ``char``."""
+        if not self.stack or self.stack[-1][0] != ("{" if char == "}" else "["):
+            return False
+        self.stack.pop()
+        self._end_value()
+        return True
+
+    def feed(self, char: str) -> bool:
+        """Consume one character.
+
+        Args:
+            char: Next output character.
+
+        Returns:
+            True if the text is still a valid prefix.
+        """
+        mode = self.mode
+
+        if mode == _STRING:
+            if char == '"':
+                if self.is_key:
+                    allowed = self._allowed_keys()
+                    if allowed is not None and self.buffer not in allowed:
+                        return False
+                    kind, schema, _ = self.stack[-1]
+                    self.stack[-1] = (kind, schema, self.buffer)
+                    self.mode = _COLON
+                else:
+                    self._end_value()
+                return True
+            if char == "\\":
+                self.mode = _ESCAPE
+                return not self.is_key or self._allowed_keys() is None
+            if ord(char) < 0x20:
+                return False
+            if self.is_key:
+                self.buffer += char
+                allowed = self._allowed_keys()
+                if allowed is not None and not any(k.startswith(self.buffer) for k in allowed):
+                    return False
+            return True
+
+        if mode == _ESCAPE:
+            if char not in _ESCAPES:
+                return False
+            if char == "u":
+                self.mode = _UNICODE
+                self.pending = 4
+            else:
+                self.mode = _STRING
+            return True
+
+        if mode == _UNICODE:
+            if char not in _HEX:
+                return False
+            self.pending -= 1
+            if self.pending == 0:
+                self.mode = _STRING
+            return True
+
+        if mode == _NUMBER:
+            if char.isdigit() or char in "+-.eE":
+                if not _number_prefix_ok(self.buffer + char):
+                    return False
+                self.buffer += char
+                return True
+            if not _number_complete(self.buffer):
+                return False
+            self.buffer = ""
+            self._end_value()
+            return self.feed(char)
+
+        if mode == _LITERAL:
+            if not self.buffer or char != self.buffer[0]:
+                return False
+            self.buffer = self.buffer[1:]
+            if not self.buffer:
+                self._end_value()
+            return True
+
+        if char in _WHITESPACE:
+            return True
+
+        if mode == _VALUE:
+            return self._start_value(char)
+
+        if mode == _VALUE_OR_END:
+            if char == "]":
+                return self._close(char)
+            return self._start_value(char)
+
+        if mode in (_KEY, _KEY_OR_END):
+            if char == '"':
+                self.mode = _STRING
+                self.is_key = True
+                self.buffer = ""
+                return True
+            if char == "}" and mode == _KEY_OR_END:
+                return self._close(char)
+            return False
+
+        if mode == _COLON:
+            if char != ":":
+                return False
+            kind, schema, key = self.stack[-1]
+            properties = (schema or {}).get("properties")
+            self.value_schema = properties.get(key) if properties else None
+            self.mode = _VALUE
+            return True
+
+        if mode == _AFTER_VALUE:
+            kind, schema, _ = self.stack[-1]
+            if char == ",":
+                if kind == "{":
+                    self.mode = _KEY
+                else:
+                    self.mode = _VALUE
+                    self.value_schema = (schema or {}).get("items")
+                return True
+            if char in "}]":
+                return self._close(char)
+            return False
+
+        # _DONE: nothing may follow the document
+        return False
+
+
+class TokenVocabulary:
+    """Surface text of every token, used to test candidates against the grammar."""
+
+    def __init__(self, texts: list[str | None]):
+        """Initialize the vocabulary.
+
+        Args:
+            texts: Text appended by each token ID, or None for special tokens
+                that can never appear inside the document.
+        """
+        self.texts = texts
+
+    @classmethod
+    def from_tokenizer(cls, tokenizer: Any) -> "TokenVocabulary":
+        """Build from a SentencePiece-style tokenizer (``▁`` marks a space).
+
+        Args:
+            tokenizer: Hugging Face tokenizer.
+
+        Returns:
+            Token vocabulary.
+        """
+        special = set(getattr(tokenizer, "all_special_ids", []))
+        texts: list[str | None] = []
+        for token_id, token in enumerate(tokenizer.convert_ids_to_tokens(list(range(len(tokenizer))))):
+            if token_id in special or token is None:
+                texts.append(None)
+            else:
+                texts.append(token.replace("▁", " "))
+        return cls(texts)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+
+@dataclass
+class DecodeResult:
+    """Output of a constrained decode."""
+
+    text: str
+    token_ids: list[int]
+    complete: bool
+    score: float = 0.0
+    steps: int = 0
+
+
+@dataclass
+class _Beam:
+    """A partial hypothesis."""
+
+    tokens: list[int]
+    text: str
+    state: JsonPrefixState
+    score: float = 0.0
+    cache_index: int = 0
+
+
+class ConstrainedDecoder:
+    """KV-cached, grammar-constrained decoder for T5-style seq2seq models.
+
+    At each step the candidate tokens for a hypothesis are tried in order of
+    probability until enough of them keep the output a valid DSL prefix, so
+    most steps only check a handful of tokens instead of masking the whole
+    vocabulary.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        vocabulary: TokenVocabulary,
+        decoder_start_token_id: int = 0,
+        eos_token_id: int = 1,
+        schema: dict | None = None,
+        max_candidates: int = 256,
+    ):
+        """Initialize the decoder.
+
+        Args:
+            model: Seq2seq model with ``get_encoder()`` and KV-cached forward.
+            vocabulary: Token surface texts.
+            decoder_start_token_id: First decoder token.
+            eos_token_id: End-of-sequence token.
+            schema: Root schema. Defaults to ``DSL_SCHEMA``.
+            max_candidates: Most candidates checked per hypothesis per step.
+        """
+        self.model = model
+        self.vocabulary = vocabulary
+        self.decoder_start_token_id = decoder_start_token_id
+        self.eos_token_id = eos_token_id
+        self.schema = schema
+        self.max_candidates = max_candidates
+
+    def _valid_candidates(
+        self,
+        log_probs: torch.Tensor,
+        beam: _Beam,
+        needed: int,
+    ) -> list[tuple[int, float, str, JsonPrefixState]]:
+        """Most probable tokens that keep ``beam`` a valid prefix."""
+        found = []
+        k = min(self.max_candidates, log_probs.shape[-1])
+        values, indices = torch.topk(log_probs, k)
+
+        for score, token_id in zip(values.tolist(), indices.tolist()):
+            if math.isinf(score):
+                break
+            text = self.vocabulary.texts[token_id] if token_id < len(self.vocabulary) else None
+            if not text:
+                continue
+            state = beam.state.copy()
+            if state.feed_text(text):
+                found.append((token_id, score, text, state))
+                if len(found) >= needed:
+                    break
+
+        return found
+
+    @staticmethod
+    def _reorder_cache(past: Any, beam_idx: torch.Tensor) -> Any:
+        """Select cache rows for the surviving hypotheses."""
+        if hasattr(past, "reorder_cache"):
+            past.reorder_cache(beam_idx)
+            return past
+        # Legacy tuple caches
+        return tuple(
+            tuple(layer.index_select(0, beam_idx) for layer in layer_past)
+            for layer_past in past
+        )
+
+    @torch.no_grad()
+    def decode(
+        self,
+        input_ids: torch.Tensor,
+        attention_mask: torch.Tensor,
+        max_length: int,
+        num_beams: int = 1,
+    ) -> DecodeResult:
+        """Decode one input.
+
+        Args:
+            input_ids: Encoder input IDs, shape ``(1, seq)``.
+            attention_mask: Encoder attention mask, shape ``(1, seq)``.
+            max_length: Maximum number of generated tokens.
+            num_beams: 1 for greedy, or a small beam width.
+
+        Returns:
+            Best hypothesis. ``complete`` is False if no valid document was
+            closed within ``max_length``.
+        """
+        encoder_outputs = self.model.get_encoder()(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            return_dict=True,
+        )
+        hidden = encoder_outputs.last_hidden_state
+
+        beams = [_Beam(tokens=[], text="", state=JsonPrefixState(self.schema))]
+        finished: list[_Beam] = []
+        past = None
+        last_tokens = [self.decoder_start_token_id]
+        steps = 0
+
+        while beams and steps < max_length:
+            steps += 1
+            batch = len(beams)
+            encoder_outputs.last_hidden_state = hidden.expand(batch, -1, -1)
+
+            outputs = self.model(
+                encoder_outputs=encoder_outputs,
+                attention_mask=attention_mask.expand(batch, -1),
+                decoder_input_ids=torch.tensor(last_tokens, dtype=torch.long).unsqueeze(-1),
+                past_key_values=past,
+                use_cache=True,
+                return_dict=True,
+            )
+            past = outputs.past_key_values
+            log_probs = torch.log_softmax(outputs.logits[:, -1, :].float(), dim=-1)
+
+            candidates: list[_Beam] = []
+            for row, beam in enumerate(beams):
+                for token_id, score, text, state in self._valid_candidates(
+                    log_probs[row], beam, needed=num_beams,
+                ):
+                    candidates.append(_Beam(
+                        tokens=beam.tokens + [token_id],
+                        text=beam.text + text,
+                        state=state,
+                        score=beam.score + score,
+                        cache_index=row,
+                    ))
+
+            if not candidates:
+                break
+
+            candidates.sort(key=lambda b: b.score, reverse=True)
+
+            beams = []
+            for candidate in candidates[:num_beams]:
+                if candidate.state.complete:
+                    finished.append(candidate)
+                else:
+                    beams.append(candidate)
+
+            # Stop once the best finished hypothesis beats every open one
+            if finished and (
+                not beams
+                or max(b.score for b in finished) >= max(b.score for b in beams)
+            ):
+                break
+
+            if beams:
+                past = self._reorder_cache(
+                    past, torch.tensor([b.cache_index for b in beams], dtype=torch.long),
+                )
+                last_tokens = [b.tokens[-1] for b in beams]
+
+        if finished:
+            best = max(finished, key=lambda b: b.score)
+            return DecodeResult(
+                text=best.text,
+                token_ids=best.tokens + [self.eos_token_id],
+                complete=True,
+                score=best.score,
+                steps=steps,
+            )
+
+        best = max(beams, key=lambda b: b.score) if beams else None
+        return DecodeResult(
+            text=best.text if best else "",
+            token_ids=best.tokens if best else [],
+            complete=False,
+            score=best.score if best else float("-inf"),
+            steps=steps,
+        )
@@ -30,8 +30,34 @@ class LayoutGeneratorInference:
             self._model = self._load_model()
         return self._model
 
+    def _onnx_ready(self) -> bool:
+        """Check whether the ONNX backend is selected and exported."""
+        if self.settings.inference_backend != "onnx":
+            return False
+
+        from ml.inference.onnx_backend import ONNX_AVAILABLE, resolve_onnx_path
+
+        quantized = self.settings.onnx_quantized
+        return (
+            ONNX_AVAILABLE
+            and resolve_onnx_path(self.model_path, "encoder", quantized) is not None
+            and resolve_onnx_path(self.model_path, "decoder", quantized) is not None
+        )
+
+    def has_checkpoint(self) -> bool:
+        """Check whether a trained model exists for the configured backend."""
+        return self._onnx_ready() or (self.model_path / "model").exists()
+
     def _load_model(self) -> LayoutGenerator:
         """Load the model."""
+        if self._onnx_ready():
+            from ml.inference.onnx_backend import OnnxLayoutGenerator
+
+            return OnnxLayoutGenerator.load(
+                self.model_path,
+                quantized=self.settings.onnx_quantized,
+                num_threads=self.settings.onnx_num_threads,
+            )
         if (self.model_path / "model").exists():
             return LayoutGenerator.load(self.model_path)
         else:
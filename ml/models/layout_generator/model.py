@@ -116,14 +116,18 @@ class LayoutGenerator(nn.Module):
         self,
         intent: dict[str, Any],
         max_length: int | None = None,
-        num_beams: int = 4,
+        num_beams: int | None = None,
+        constrained: bool | None = None,
     ) -> LayoutResult:
         """Generate DSL from intent.
 
         Args:
             intent: Intent specification.
             max_length: Maximum output length.
-            num_beams: Beam search width.
+            num_beams: Beam search width. Defaults to ``decode_num_beams``
+                when constrained and 4 otherwise.
+            constrained: Use grammar-constrained decoding. Defaults to
+                ``constrained_decoding`` from the config.
 
         Returns:
             Generated layout result.
@@ -133,6 +137,15 @@ class LayoutGenerator(nn.Module):
 
         self.model.eval()
         max_length = max_length or self.config.max_output_length
+        if constrained is None:
+            constrained = self.config.constrained_decoding
+
+        if constrained:
+            return self._generate_constrained(
+                intent,
+                max_length=max_length,
+                num_beams=num_beams or self.config.decode_num_beams,
+            )
 
         # Format input
         input_text = self.format_input(intent)
@@ -152,7 +165,7 @@ class LayoutGenerator(nn.Module):
                 input_ids=encoding["input_ids"],
                 attention_mask=encoding["attention_mask"],
                 max_length=max_length,
-                num_beams=num_beams,
+                num_beams=num_beams or 4,
                 early_stopping=True,
             )
 
@@ -174,6 +187,73 @@ class LayoutGenerator(nn.Module):
             raw_output=raw_output,
         )
 
+    def _get_constrained_decoder(self):
+        """Get the cached constrained decoder for the loaded model."""
+        from ml.models.layout_generator.constrained import ConstrainedDecoder, TokenVocabulary
+
+        decoder = getattr(self, "_constrained_decoder", None)
+        if decoder is None or decoder.model is not self.model:
+            decoder = ConstrainedDecoder(
+                self.model,
+                TokenVocabulary.from_tokenizer(self.tokenizer),
+                decoder_start_token_id=self.model.config.decoder_start_token_id or 0,
+                eos_token_id=self.tokenizer.eos_token_id,
+            )
+            self._constrained_decoder = decoder
+        return decoder
+
+    def _generate_constrained(
+        self,
+        intent: dict[str, Any],
+        max_length: int,
+        num_beams: int,
+    ) -> LayoutResult:
+        """Generate DSL with grammar-constrained, KV-cached decoding.
+
+        Args:
+            intent: Intent specification.
+            max_length: Maximum output length.
+            num_beams: 1 for greedy, or a small beam width.
+
+        Returns:
+            Generated layout result.
+        """
+        # No padding: a single input needs none, and padding to
+        # max_input_length only makes every cross-attention step longer
+        encoding = self.tokenizer(
+            self.format_input(intent),
+            max_length=self.config.max_input_length,
+            truncation=True,
+            return_tensors="pt",
+        )
+
+        result = self._get_constrained_decoder().decode(
+            encoding["input_ids"],
+            encoding["attention_mask"],
+            max_length=max_length,
+            num_beams=num_beams,
+        )
+
+        dsl = None
+        if result.complete:
+            try:
+                dsl = json.loads(result.text)
+            except json.JSONDecodeError:
+                dsl = None
+
+        if dsl is None:
+            return LayoutResult(
+                dsl=self._generate_fallback(intent),
+                confidence=0.5,
+                raw_output=result.text,
+            )
+
+        return LayoutResult(
+            dsl=dsl,
+            confidence=0.9,
+            raw_output=result.text,
+        )
+
     def _generate_fallback(self, intent: dict[str, Any]) -> dict[str, Any]:
         """Generate fallback DSL using templates.
 
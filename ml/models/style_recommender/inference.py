@@ -68,8 +68,31 @@ class StyleRecommenderInference:
             self._model = self._load_model()
         return self._model
 
+    def _onnx_path(self) -> Path | None:
+        """Get the ONNX export to use, if the ONNX backend is selected."""
+        if self.settings.inference_backend != "onnx":
+            return None
+
+        from ml.inference.onnx_backend import ONNX_AVAILABLE, resolve_onnx_path
+
+        if not ONNX_AVAILABLE:
+            return None
+        return resolve_onnx_path(self.model_path, quantized=self.settings.onnx_quantized)
+
+    def has_checkpoint(self) -> bool:
+        """Check whether a trained model exists for the configured backend."""
+        return self._onnx_path() is not None or (self.model_path / "model.pt").exists()
+
     def _load_model(self) -> StyleRecommender:
         """Load the model."""
+        if self._onnx_path() is not None:
+            from ml.inference.onnx_backend import OnnxStyleRecommender
+
+            return OnnxStyleRecommender.load(
+                self.model_path,
+                quantized=self.settings.onnx_quantized,
+                num_threads=self.settings.onnx_num_threads,
+            )
         if (self.model_path / "model.pt").exists():
             return StyleRecommender.load(self.model_path)
         else:
@@ -90,7 +113,7 @@ class StyleRecommenderInference:
             Style recommendation.
         """
         # Try ML model first
-        if use_ml and (self.model_path / "model.pt").exists():
+        if use_ml and self.has_checkpoint():
             try:
                 return self.model.recommend(features)
             except Exception:
@@ -127,6 +150,35 @@ class StyleRecommenderInference:
             confidence=0.7,  # Rule-based confidence
         )
 
+    def batch_recommend(
+        self,
+        features_list: list[dict[str, Any]],
+        use_ml: bool = True,
+    ) -> list[StyleResult]:
+        """Recommend styles for several feature sets.
+
+        With a trained model, all feature sets go through one forward pass.
+
+        Args:
+            features_list: Input features for each item.
+            use_ml: Whether to use ML model.
+
+        Returns:
+            Style recommendations in input order.
+        """
+        if not features_list:
+            return []
+
+        # Try ML model first
+        if use_ml and self.has_checkpoint():
+            try:
+                return self.model.recommend_batch(features_list)
+            except Exception:
+                pass
+
+        # Fall back to rule-based recommendations
+        return [self._rule_based_recommend(features) for features in features_list]
+
     def recommend_for_brand(
         self,
         features: dict[str, Any],
@@ -145,7 +197,36 @@ class StyleRecommenderInference:
         """
         # Start with base recommendation
         base = self.recommend(features)
+        return self._apply_brand(base, brand_colors, brand_fonts)
+
+    def batch_recommend_for_brand(
+        self,
+        features_list: list[dict[str, Any]],
+        brand_colors: list[str],
+        brand_fonts: list[str] | None = None,
+    ) -> list[StyleResult]:
+        """Recommend brand-compliant styles for several feature sets.
 
+        Args:
+            features_list: Input features for each item.
+            brand_colors: Brand color palette shared by all items.
+            brand_fonts: Brand font families shared by all items.
+
+        Returns:
+            Brand-compliant style recommendations in input order.
+        """
+        return [
+            self._apply_brand(base, brand_colors, brand_fonts)
+            for base in self.batch_recommend(features_list)
+        ]
+
+    @staticmethod
+    def _apply_brand(
+        base: StyleResult,
+        brand_colors: list[str],
+        brand_fonts: list[str] | None,
+    ) -> StyleResult:
+        """Override a recommendation's palette and font with brand ones."""
         # Override with brand colors
         if brand_colors:
             # Extend brand colors to 6 if needed
@@ -139,9 +139,23 @@ class StyleRecommender(nn.Module):
         Returns:
             Style recommendation result.
         """
+        return self.recommend_batch([features])[0]
+
+    def recommend_batch(self, features_list: list[dict[str, Any]]) -> list[StyleResult]:
+        """Recommend styles for several feature sets in one forward pass.
+
+        Args:
+            features_list: Input feature dicts.
+
+        Returns:
+            Style recommendations in input order.
+        """
+        if not features_list:
+            return []
+
         self.eval()
 
-        x = self.encode_input(features)
+        x = torch.cat([self.encode_input(features) for features in features_list])
 
         with torch.no_grad():
             outputs = self.forward(x)
@@ -152,30 +166,27 @@ class StyleRecommender(nn.Module):
         glow_options = ["none", "subtle", "strong"]
         corner_options = ["sharp", "rounded", "pill"]
 
-        palette_idx = outputs["palette"].argmax(dim=-1).item()
-        shadow_idx = outputs["shadow"].argmax(dim=-1).item()
-        glow_idx = outputs["glow"].argmax(dim=-1).item()
-        corner_idx = outputs["corner"].argmax(dim=-1).item()
-        font_idx = outputs["font"].argmax(dim=-1).item()
+        # Best option and its probability for each head, per row
+        best = {
+            name: torch.softmax(logits, dim=-1).max(dim=-1)
+            for name, logits in outputs.items()
+        }
+        indices = {name: b.indices.tolist() for name, b in best.items()}
 
         # Get confidence (average of max probabilities)
-        confidences = [
-            torch.softmax(outputs["palette"], dim=-1).max().item(),
-            torch.softmax(outputs["shadow"], dim=-1).max().item(),
-            torch.softmax(outputs["glow"], dim=-1).max().item(),
-            torch.softmax(outputs["corner"], dim=-1).max().item(),
-            torch.softmax(outputs["font"], dim=-1).max().item(),
+        confidences = torch.stack([b.values for b in best.values()]).mean(dim=0).tolist()
+
+        return [
+            StyleResult(
+                color_palette=self.PALETTES[palette_names[indices["palette"][i]]],
+                shadow=shadow_options[indices["shadow"][i]],
+                glow=glow_options[indices["glow"][i]],
+                corner_radius=corner_options[indices["corner"][i]],
+                font_family=self.FONT_FAMILIES[indices["font"][i]],
+                confidence=confidences[i],
+            )
+            for i in range(len(features_list))
         ]
-        avg_confidence = sum(confidences) / len(confidences)
-
-        return StyleResult(
-            color_palette=self.PALETTES[palette_names[palette_idx]],
-            shadow=shadow_options[shadow_idx],
-            glow=glow_options[glow_idx],
-            corner_radius=corner_options[corner_idx],
-            font_family=self.FONT_FAMILIES[font_idx],
-            confidence=avg_confidence,
-        )
 
     def save(self, path: Path | str) -> None:
         """Save model to disk."""
@@ -227,6 +227,151 @@ class TestLayoutGeneratorInference:
         assert len(variations) == 3
 
 
+class TestConstrainedDecoding:
+    """Tests for grammar-constrained layout decoding."""
+
+    def test_accepts_valid_document(self):
+        """Test a full DSL document is accepted and completes."""
+        from ml.models.layout_generator.constrained import JsonPrefixState
+
+        doc = json.dumps({
+            "canvas": {"w": 12192000, "h": 6858000},
+            "shapes": [{"id": "layer_0", "x": 1.5e3, "label": "A \"quote\" \u00e9", "visible": True}],
+            "archetype": "funnel",
+            "metadata": {"archetype": "funnel", "notes": None},
+        })
+
+        state = JsonPrefixState()
+        assert state.feed_text(doc)
+        assert state.complete
+
+    def test_prefix_is_not_complete(self):
+        """Test a truncated document is a valid but incomplete prefix."""
+        from ml.models.layout_generator.constrained import JsonPrefixState
+
+        state = JsonPrefixState()
+        assert state.feed_text('{"shapes":[{"x":12')
+        assert not state.complete
+
+    @pytest.mark.parametrize("text", [
+        '["not an object"]',
+        '{"unknown_key":1}',
+        '{"shapes":{}}',
+        '{"shapes":[1]}',
+        '{"canvas":{"w":01}}',
+        '{"canvas":{"w":1,}}',
+        '{"archetype":"funnel"} trailing',
+    ])
+    def test_rejects_invalid_prefixes(self, text):
+        """Test text outside the DSL grammar is rejected."""
+        from ml.models.layout_generator.constrained import JsonPrefixState
+
+        assert not JsonPrefixState().feed_text(text)
+
+    def test_copy_is_independent(self):
+        """Test copied states don't share progress."""
+        from ml.models.layout_generator.constrained import JsonPrefixState
+
+        state = JsonPrefixState()
+        state.feed_text('{"shapes":[')
+        branch = state.copy()
+
+        assert branch.feed_text("]}")
+        assert branch.complete
+        assert not state.complete
+        assert state.feed_text("{}]}")
+
+    def test_greedy_skips_invalid_tokens(self):
+        """Test the decoder picks the best token that keeps the JSON valid."""
+        import torch
+        from types import SimpleNamespace
+        from ml.models.layout_generator.constrained import ConstrainedDecoder, TokenVocabulary
+
+        texts = [None, None, "{", "}", '"shapes"', ":", "[", "]", '"bogus"', "oops"]
+        # The model always prefers tokens in this order, invalid ones first
+        preference = [9, 8, 7, 4, 5, 6, 2, 3]
+
+        class FakeModel:
+            def get_encoder(self):
+                return lambda **kwargs: SimpleNamespace(last_hidden_state=torch.zeros(1, 1, 4))
+
+            def __call__(self, decoder_input_ids, **kwargs):
+                logits = torch.full((decoder_input_ids.shape[0], 1, len(texts)), -10.0)
+                for rank, token_id in enumerate(preference):
+                    logits[:, :, token_id] = -float(rank)
+                return SimpleNamespace(logits=logits, past_key_values=None)
+
+        decoder = ConstrainedDecoder(FakeModel(), TokenVocabulary(texts), eos_token_id=1)
+        decoder._reorder_cache = lambda past, idx: past
+
+        result = decoder.decode(torch.ones(1, 3, dtype=torch.long), torch.ones(1, 3, dtype=torch.long), 20)
+
+        assert result.complete
+        assert result.text == '{"shapes":[]}'
+        assert json.loads(result.text) == {"shapes": []}
+        assert result.steps == 6  # stops as soon as the object closes
+
+    @pytest.mark.parametrize("num_beams", [1, 3])
+    def test_random_model_stays_valid(self, num_beams):
+        """Test KV-cached decoding with a real T5 only ever emits valid prefixes."""
+        import torch
+        from transformers import T5Config, T5ForConditionalGeneration
+        from ml.models.layout_generator.constrained import (
+            ConstrainedDecoder,
+            JsonPrefixState,
+            TokenVocabulary,
+        )
+
+        torch.manual_seed(0)
+        model = T5ForConditionalGeneration(T5Config(
+            vocab_size=16, d_model=32, d_kv=8, d_ff=64, num_layers=1, num_heads=2,
+            decoder_start_token_id=0, pad_token_id=0, eos_token_id=1,
+        )).eval()
+        texts = [None, None, "{", "}", '"shapes"', ":", "[", "]", ",", '"canvas"', "1", " ", '"w"', "0", "{}", "]}"]
+
+        decoder = ConstrainedDecoder(model, TokenVocabulary(texts), eos_token_id=1)
+        result = decoder.decode(
+            torch.tensor([[3, 5, 7, 1]]), torch.ones(1, 4, dtype=torch.long),
+            max_length=40, num_beams=num_beams,
+        )
+
+        state = JsonPrefixState()
+        assert state.feed_text(result.text)
+        assert state.complete == result.complete
+        if result.complete:
+            json.loads(result.text)
+
+    def test_generator_falls_back_on_incomplete_output(self):
+        """Test LayoutGenerator uses templates when decoding never closes the JSON."""
+        import torch
+        from transformers import T5Config, T5ForConditionalGeneration
+        from ml.models.layout_generator.constrained import ConstrainedDecoder, TokenVocabulary
+        from ml.models.layout_generator.model import LayoutGenerator
+
+        class Tokenizer:
+            eos_token_id = 1
+
+            def __call__(self, text, max_length, truncation, return_tensors):
+                return {"input_ids": torch.tensor([[3, 4, 1]]), "attention_mask": torch.ones(1, 3, dtype=torch.long)}
+
+        generator = LayoutGenerator()
+        generator.model = T5ForConditionalGeneration(T5Config(
+            vocab_size=8, d_model=16, d_kv=8, d_ff=32, num_layers=1, num_heads=2,
+            decoder_start_token_id=0, pad_token_id=0, eos_token_id=1,
+        )).eval()
+        generator.tokenizer = Tokenizer()
+        generator._initialized = True
+        # Only whitespace and an opening brace: the document can never close
+        generator._constrained_decoder = ConstrainedDecoder(
+            generator.model, TokenVocabulary([None, None, "{", " ", " ", " ", " ", " "]),
+        )
+
+        result = generator.generate({"archetype": "funnel", "item_count": 3}, max_length=8)
+
+        assert result.confidence == 0.5
+        assert len(result.dsl["shapes"]) == 3
+
+
 class TestStyleRecommenderInference:
     """Tests for style recommender inference."""
 
@@ -276,6 +421,361 @@ class TestStyleRecommenderInference:
         palettes = [tuple(v.color_palette) for v in variations]
         assert len(set(palettes)) == 3  # All different
 
+    def test_recommend_batch_matches_single(self):
+        """Test one forward pass over several feature sets matches per-item calls."""
+        import torch
+        from ml.models.style_recommender.model import StyleRecommender
+
+        torch.manual_seed(0)
+        model = StyleRecommender()
+        features = [
+            {"archetype": "funnel", "item_count": 5, "formality": "casual"},
+            {"archetype": "timeline", "item_count": 3, "has_icons": True},
+            {"archetype": "venn", "formality": "corporate"},
+        ]
+
+        batched = model.recommend_batch(features)
+        for b, s in zip(batched, [model.recommend(f) for f in features]):
+            assert b.color_palette == s.color_palette
+            assert (b.shadow, b.glow, b.corner_radius, b.font_family) == (
+                s.shadow, s.glow, s.corner_radius, s.font_family
+            )
+            assert b.confidence == pytest.approx(s.confidence, abs=1e-5)
+        assert model.recommend_batch([]) == []
+
+    def test_batch_recommend_for_brand(self):
+        """Test batched brand recommendations match per-item ones."""
+        from ml.models.style_recommender.inference import StyleRecommenderInference
+
+        inference = StyleRecommenderInference()
+        features = [{"archetype": "process"}, {"archetype": "cycle", "formality": "casual"}]
+
+        batched = inference.batch_recommend_for_brand(features, ["#FF0000"], ["Inter"])
+        single = [inference.recommend_for_brand(f, ["#FF0000"], ["Inter"]) for f in features]
+
+        assert batched == single
+        assert batched[0].color_palette == ["#FF0000"] * 6
+
+
+def _tiny_intent_classifier():
+    """Build an IntentClassifier with a tiny random encoder and toy tokenizer."""
+    import torch
+    from transformers import DistilBertConfig, DistilBertModel
+
+    from ml.models.intent_classifier.model import IntentClassifier
+
+    class ToyTokenizer:
+        def __call__(self, texts, max_length, padding, truncation, return_tensors):
+            if isinstance(texts, str):
+                texts = [texts]
+            ids = [[hash(w) % 90 + 10 for w in t.lower().split()][:max_length] for t in texts]
+            width = max(len(row) for row in ids) if padding == "longest" else max_length
+            input_ids = torch.zeros(len(ids), width, dtype=torch.long)
+            attention_mask = torch.zeros(len(ids), width, dtype=torch.long)
+            for i, row in enumerate(ids):
+                input_ids[i, :len(row)] = torch.tensor(row)
+                attention_mask[i, :len(row)] = 1
+            if return_tensors == "np":
+                return {"input_ids": input_ids.numpy(), "attention_mask": attention_mask.numpy()}
+            return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+    torch.manual_seed(0)
+    model = IntentClassifier()
+    model.encoder = DistilBertModel(DistilBertConfig(
+        vocab_size=100, dim=32, n_layers=1, n_heads=2, hidden_dim=64,
+    ))
+    model.tokenizer = ToyTokenizer()
+    model.classifier = torch.nn.Linear(32, model.config.num_labels)
+    model._initialized = True
+    return model
+
+
+class TestBatchedIntentClassification:
+    """Tests for batched intent classifier inference."""
+
+    def test_predict_batch_matches_single(self):
+        """Test that one padded batch matches per-prompt predictions."""
+        model = _tiny_intent_classifier()
+        prompts = ["sales funnel", "a five level pyramid of needs", "timeline"]
+
+        batched = model.predict_batch(prompts)
+        single = [model.predict(p) for p in prompts]
+
+        assert [r.archetype for r in batched] == [r.archetype for r in single]
+        for b, s in zip(batched, single):
+            assert b.confidence == pytest.approx(s.confidence, abs=1e-5)
+
+    def test_predict_batch_empty(self):
+        """Test that an empty batch returns no results."""
+        model = _tiny_intent_classifier()
+        assert model.predict_batch([]) == []
+
+    def test_batch_predict_fallback(self):
+        """Test batch_predict falls back to keyword rules without a model."""
+        from ml.models.intent_classifier.inference import IntentClassifierInference
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            inference = IntentClassifierInference(model_path=tmpdir)
+            results = inference.batch_predict(["sales funnel", "pyramid levels"])
+
+        assert [r.archetype for r in results] == ["funnel", "pyramid"]
+
+    def test_batch_predict_chunks_by_batch_size(self):
+        """Test batch_predict runs one forward pass per chunk."""
+        from ml.models.intent_classifier.inference import IntentClassifierInference
+
+        model = _tiny_intent_classifier()
+        calls = []
+        original = model.predict_batch
+
+        def spy(prompts):
+            calls.append(len(prompts))
+            return original(prompts)
+
+        model.predict_batch = spy
+        inference = IntentClassifierInference()
+        inference._model = model
+
+        results = inference.batch_predict(["funnel"] * 5, batch_size=2)
+
+        assert len(results) == 5
+        assert calls == [2, 2, 1]
+
+
+class TestMicroBatcher:
+    """Tests for the async micro-batcher."""
+
+    async def test_groups_concurrent_requests(self):
+        """Test that concurrent submissions share one batch call."""
+        import asyncio
+        from ml.inference.batching import MicroBatcher
+
+        calls = []
+
+        def double(items):
+            calls.append(list(items))
+            return [i * 2 for i in items]
+
+        batcher = MicroBatcher(double, max_batch_size=16, max_wait_ms=20)
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+        await batcher.close()
+
+        assert results == [i * 2 for i in range(10)]
+        assert len(calls) == 1
+        assert batcher.stats.avg_batch_size == 10
+
+    async def test_respects_max_batch_size(self):
+        """Test that batches never exceed max_batch_size."""
+        import asyncio
+        from ml.inference.batching import MicroBatcher
+
+        sizes = []
+
+        def identity(items):
+            sizes.append(len(items))
+            return list(items)
+
+        batcher = MicroBatcher(identity, max_batch_size=4, max_wait_ms=20)
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+        await batcher.close()
+
+        assert results == list(range(10))
+        assert max(sizes) <= 4
+        assert sum(sizes) == 10
+
+    async def test_propagates_errors(self):
+        """Test that a failing batch raises in every caller."""
+        import asyncio
+        from ml.inference.batching import MicroBatcher
+
+        def fail(items):
+            raise ValueError("boom")
+
+        batcher = MicroBatcher(fail, max_batch_size=4, max_wait_ms=5)
+        results = await asyncio.gather(
+            *(batcher.submit(i) for i in range(3)),
+            return_exceptions=True,
+        )
+        await batcher.close()
+
+        assert all(isinstance(r, ValueError) for r in results)
+
+    async def test_predict_async(self):
+        """Test batched async prediction on the inference wrapper."""
+        import asyncio
+        from ml.models.intent_classifier.inference import IntentClassifierInference
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            inference = IntentClassifierInference(model_path=tmpdir)
+            results = await asyncio.gather(
+                inference.predict_async("sales funnel"),
+                inference.predict_async("project timeline"),
+            )
+            await inference._batcher.close()
+
+        assert [r.archetype for r in results] == ["funnel", "timeline"]
+
+
+class TestOnnxBackend:
+    """Parity tests for the ONNX Runtime backend."""
+
+    def test_style_recommender_parity(self):
+        """Test ONNX style recommendations match the torch model."""
+        pytest.importorskip("onnxruntime")
+        import torch
+        from ml.inference.onnx_backend import OnnxStyleRecommender
+        from ml.models.style_recommender.model import StyleRecommender
+        from ml.training.export_onnx import export_style_recommender_model
+
+        torch.manual_seed(0)
+        model = StyleRecommender().eval()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            export_style_recommender_model(model, Path(tmpdir) / "model.onnx")
+            onnx_model = OnnxStyleRecommender.load(tmpdir)
+
+            for archetype in ["funnel", "timeline", "venn"]:
+                for formality in ["casual", "professional", "corporate"]:
+                    features = {"archetype": archetype, "item_count": 5, "formality": formality}
+
+                    assert onnx_model.encode_input(features) == pytest.approx(
+                        model.encode_input(features).numpy()
+                    )
+                    expected = model.recommend(features)
+                    actual = onnx_model.recommend(features)
+                    assert actual.color_palette == expected.color_palette
+                    assert actual.font_family == expected.font_family
+                    assert actual.shadow == expected.shadow
+                    assert actual.confidence == pytest.approx(expected.confidence, abs=1e-4)
+
+    def test_style_recommender_batch_parity(self):
+        """Test batched ONNX style recommendations match the torch model."""
+        pytest.importorskip("onnxruntime")
+        import torch
+        from ml.inference.onnx_backend import OnnxStyleRecommender
+        from ml.models.style_recommender.model import StyleRecommender
+        from ml.training.export_onnx import export_style_recommender_model
+
+        torch.manual_seed(0)
+        model = StyleRecommender().eval()
+        features = [
+            {"archetype": archetype, "item_count": 4, "formality": formality}
+            for archetype in ["funnel", "timeline", "venn"]
+            for formality in ["casual", "corporate"]
+        ]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            export_style_recommender_model(model, Path(tmpdir) / "model.onnx")
+            onnx_model = OnnxStyleRecommender.load(tmpdir)
+
+            for actual, expected in zip(
+                onnx_model.recommend_batch(features), model.recommend_batch(features)
+            ):
+                assert actual.color_palette == expected.color_palette
+                assert actual.font_family == expected.font_family
+                assert actual.confidence == pytest.approx(expected.confidence, abs=1e-4)
+
+    def test_intent_classifier_parity(self):
+        """Test ONNX intent predictions match the torch model."""
+        pytest.importorskip("onnxruntime")
+        from ml.inference.onnx_backend import OnnxIntentClassifier
+        from ml.training.export_onnx import export_intent_classifier_model
+
+        model = _tiny_intent_classifier().eval()
+        prompts = ["sales funnel", "a five level pyramid of needs", "timeline"]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            export_intent_classifier_model(model, Path(tmpdir) / "model.onnx")
+            onnx_model = OnnxIntentClassifier.load(tmpdir, tokenizer=model.tokenizer)
+
+            expected = model.predict_batch(prompts)
+            actual = onnx_model.predict_batch(prompts)
+
+        for e, a in zip(expected, actual):
+            assert a.archetype == e.archetype
+            assert a.confidence == pytest.approx(e.confidence, abs=1e-4)
+
+    def test_layout_generator_parity(self):
+        """Test ONNX greedy decoding matches torch greedy generation."""
+        pytest.importorskip("onnxruntime")
+        import torch
+        from transformers import T5Config, T5ForConditionalGeneration
+
+        from ml.inference.onnx_backend import OnnxLayoutGenerator, create_session
+        from ml.models.layout_generator.model import LayoutGenerator
+        from ml.training.export_onnx import export_layout_generator_model
+
+        torch.manual_seed(0)
+        generator = LayoutGenerator()
+        generator.model = T5ForConditionalGeneration(T5Config(
+            vocab_size=64, d_model=32, d_kv=8, d_ff=64, num_layers=1, num_heads=2,
+            decoder_start_token_id=0, pad_token_id=0, eos_token_id=1,
+        )).eval()
+        generator._initialized = True
+
+        input_ids = torch.tensor([[5, 9, 12, 7, 3, 1]])
+        attention_mask = torch.ones_like(input_ids)
+
+        with torch.no_grad():
+            expected = generator.model.generate(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                max_length=12,
+                num_beams=1,
+                do_sample=False,
+            )[0].tolist()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            export_layout_generator_model(generator, tmpdir)
+            onnx_model = OnnxLayoutGenerator(
+                create_session(Path(tmpdir) / "encoder.onnx"),
+                create_session(Path(tmpdir) / "decoder.onnx"),
+                generator.config,
+                tokenizer=None,
+            )
+            actual = onnx_model.generate_ids(input_ids.numpy(), attention_mask.numpy(), max_length=12)
+
+        assert actual == expected
+
+    def test_quantized_model_preferred(self):
+        """Test int8 exports are produced and picked when requested."""
+        pytest.importorskip("onnxruntime")
+        from ml.inference.onnx_backend import OnnxStyleRecommender, resolve_onnx_path
+        from ml.models.style_recommender.model import StyleRecommender
+        from ml.training.export_onnx import export_style_recommender_model, quantize_onnx
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            onnx_path = Path(tmpdir) / "model.onnx"
+            export_style_recommender_model(StyleRecommender(), onnx_path)
+            quantized_path = quantize_onnx(onnx_path)
+
+            assert quantized_path.name == "model.int8.onnx"
+            assert resolve_onnx_path(tmpdir, quantized=True) == quantized_path
+            assert resolve_onnx_path(tmpdir, quantized=False) == onnx_path
+
+            result = OnnxStyleRecommender.load(tmpdir, quantized=True).recommend({"archetype": "funnel"})
+            assert result.font_family in StyleRecommender.FONT_FAMILIES
+
+    def test_wrapper_selects_onnx_backend(self, monkeypatch):
+        """Test the inference wrapper loads ONNX when the setting asks for it."""
+        pytest.importorskip("onnxruntime")
+        from ml.inference.onnx_backend import OnnxStyleRecommender
+        from ml.models.style_recommender.inference import StyleRecommenderInference
+        from ml.models.style_recommender.model import StyleRecommender
+        from ml.training.export_onnx import export_style_recommender_model
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            export_style_recommender_model(StyleRecommender(), Path(tmpdir) / "model.onnx")
+
+            monkeypatch.setenv("ML_INFERENCE_BACKEND", "torch")
+            assert not StyleRecommenderInference(model_path=tmpdir).has_checkpoint()
+
+            monkeypatch.setenv("ML_INFERENCE_BACKEND", "onnx")
+            inference = StyleRecommenderInference(model_path=tmpdir)
+            assert inference.has_checkpoint()
+            assert isinstance(inference.model, OnnxStyleRecommender)
+            assert inference.recommend({"archetype": "funnel"}).confidence > 0
+
 
 class TestInferenceEngine:
     """Tests for the unified inference engine."""
@@ -337,6 +837,53 @@ class TestInferenceEngine:
 
         assert len(variations) == 3
 
+    def test_generate_batch_matches_generate(self):
+        """Test a batch produces the same result as generating each prompt."""
+        from ml.inference.engine import InferenceEngine
+
+        engine = InferenceEngine(use_ml=False)
+        prompts = ["Create a 4-stage sales funnel", "Timeline of our roadmap", "Make a pyramid"]
+        contents = [None, [{"title": "Q1"}, {"title": "Q2"}], None]
+        brand = {"brand_colors": ["#FF5733", "#C70039"], "brand_fonts": ["Inter"]}
+
+        batched = engine.generate_batch(prompts, contents=contents, **brand)
+        single = [
+            engine.generate(prompt, content=content, **brand)
+            for prompt, content in zip(prompts, contents)
+        ]
+
+        assert [r.archetype for r in batched] == [r.archetype for r in single]
+        for b, s in zip(batched, single):
+            assert b.dsl == s.dsl
+            assert b.style == s.style
+            assert b.parameters == s.parameters
+
+    def test_generate_batch_classifies_once(self):
+        """Test a batch classifies every prompt in one call, skipping cached ones."""
+        from ml.inference.engine import InferenceEngine
+
+        class DictCache:
+            def __init__(self):
+                self.entries = {}
+
+            def get_stage(self, stage, inputs):
+                return self.entries.get((stage, repr(sorted(inputs.items()))))
+
+            def set_stage(self, stage, inputs, value):
+                self.entries[(stage, repr(sorted(inputs.items())))] = value
+
+        engine = InferenceEngine(use_ml=False)
+        classifier = engine.intent_classifier
+        calls = []
+        original = classifier.batch_predict
+        classifier.batch_predict = lambda prompts: calls.append(prompts) or original(prompts)
+
+        cache = DictCache()
+        engine.generate_batch(["A sales funnel", "A timeline"], cache=cache)
+        engine.generate_batch(["A sales funnel", "A cycle", "A timeline"], cache=cache)
+
+        assert calls == [["A sales funnel", "A timeline"], ["A cycle"]]
+
     def test_classify_only(self):
         """Test classification without generation."""
         from ml.inference.engine import InferenceEngine
@@ -357,6 +904,68 @@ class TestInferenceEngine:
         assert result.corner_radius == "pill"
 
 
+class TestEngineRegistry:
+    """Tests for the process-wide engine registry."""
+
+    def test_returns_same_engine(self):
+        """Test that repeated lookups share one engine."""
+        from ml.inference.registry import EngineRegistry
+
+        registry = EngineRegistry()
+        first = registry.get(use_ml=False)
+        second = registry.get(use_ml=False)
+
+        assert first is second
+        assert len(registry) == 1
+
+    def test_separate_engines_per_config(self):
+        """Test that different configurations get different engines."""
+        from ml.inference.registry import EngineRegistry
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            registry = EngineRegistry()
+            rules = registry.get(models_dir=tmpdir, use_ml=False)
+            ml = registry.get(models_dir=tmpdir, use_ml=True)
+
+            assert rules is not ml
+            assert len(registry) == 2
+
+    def test_records_timings(self):
+        """Test that load and warm-up timings are exposed."""
+        from ml.inference.registry import EngineRegistry
+
+        registry = EngineRegistry()
+        registry.get(use_ml=False)
+
+        timings = registry.timings()
+        assert len(timings) == 1
+        entry = next(iter(timings.values()))
+        assert entry["load_ms"] >= 0
+        assert entry["warmup_ms"] > 0
+
+    def test_concurrent_access_loads_once(self):
+        """Test that concurrent first access builds a single engine."""
+        from concurrent.futures import ThreadPoolExecutor
+        from ml.inference.registry import EngineRegistry
+
+        registry = EngineRegistry()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            engines = list(pool.map(lambda _: registry.get(use_ml=False), range(16)))
+
+        assert all(e is engines[0] for e in engines)
+        assert len(registry) == 1
+
+    def test_shared_engine_generates(self):
+        """Test that the global helper returns a working engine."""
+        from ml.inference import get_inference_engine
+
+        engine = get_inference_engine(use_ml=False)
+        result = engine.generate("Create a 5 step process")
+
+        assert result.archetype == "process"
+        assert engine is get_inference_engine(use_ml=False)
+
+
 class TestMLConfig:
     """Tests for ML configuration."""
 
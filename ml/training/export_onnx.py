@@ -10,30 +10,20 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def export_intent_classifier(
-    model_path: str = "ml/models/intent_classifier/trained",
-    output_path: str = "ml/models/intent_classifier/trained/model.onnx",
-) -> None:
-    """Export Intent Classifier to ONNX.
+def export_intent_classifier_model(model, output_path: Path | str) -> None:
+    """Export a loaded Intent Classifier to ONNX.
 
     Args:
-        model_path: Path to trained model.
+        model: Initialized IntentClassifier.
         output_path: Path for ONNX output.
     """
-    from ml.models.intent_classifier.model import IntentClassifier
-
-    model_path = Path(model_path)
     output_path = Path(output_path)
-
-    logger.info(f"Loading Intent Classifier from {model_path}")
-
-    # Load model
-    model = IntentClassifier.load(model_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
     model.eval()
 
     # Create dummy input (batch_size=1, sequence_length=128)
-    dummy_input_ids = torch.ones(1, 128, dtype=torch.long)
-    dummy_attention_mask = torch.ones(1, 128, dtype=torch.long)
+    dummy_input_ids = torch.ones(1, model.config.max_length, dtype=torch.long)
+    dummy_attention_mask = torch.ones(1, model.config.max_length, dtype=torch.long)
 
     # Export to ONNX (use legacy export)
     logger.info(f"Exporting to {output_path}")
@@ -55,28 +45,43 @@ def export_intent_classifier(
         dynamo=False,  # Use legacy export
     )
 
-    logger.info("Intent Classifier exported successfully!")
+    # ONNX inference needs the tokenizer without loading the torch model
+    if hasattr(model.tokenizer, "save_pretrained"):
+        model.tokenizer.save_pretrained(output_path.parent / "tokenizer")
 
 
-def export_style_recommender(
-    model_path: str = "ml/models/style_recommender/trained",
-    output_path: str = "ml/models/style_recommender/trained/model.onnx",
+def export_intent_classifier(
+    model_path: str = "ml/models/intent_classifier/trained",
+    output_path: str = "ml/models/intent_classifier/trained/model.onnx",
 ) -> None:
-    """Export Style Recommender to ONNX.
+    """Export Intent Classifier to ONNX.
 
     Args:
         model_path: Path to trained model.
         output_path: Path for ONNX output.
     """
-    from ml.models.style_recommender.model import StyleRecommender
+    from ml.models.intent_classifier.model import IntentClassifier
 
     model_path = Path(model_path)
-    output_path = Path(output_path)
 
-    logger.info(f"Loading Style Recommender from {model_path}")
+    logger.info(f"Loading Intent Classifier from {model_path}")
 
     # Load model
-    model = StyleRecommender.load(model_path)
+    model = IntentClassifier.load(model_path)
+    export_intent_classifier_model(model, output_path)
+
+    logger.info("Intent Classifier exported successfully!")
+
+
+def export_style_recommender_model(model, output_path: Path | str) -> None:
+    """Export a loaded Style Recommender to ONNX.
+
+    Args:
+        model: StyleRecommender instance.
+        output_path: Path for ONNX output.
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
     model.eval()
 
     # Create dummy input
@@ -122,9 +127,160 @@ def export_style_recommender(
         dynamo=False,  # Use legacy export
     )
 
+
+def export_style_recommender(
+    model_path: str = "ml/models/style_recommender/trained",
+    output_path: str = "ml/models/style_recommender/trained/model.onnx",
+) -> None:
+    """Export Style Recommender to ONNX.
+
+    Args:
+        model_path: Path to trained model.
+        output_path: Path for ONNX output.
+    """
+    from ml.models.style_recommender.model import StyleRecommender
+
+    model_path = Path(model_path)
+
+    logger.info(f"Loading Style Recommender from {model_path}")
+
+    # Load model
+    model = StyleRecommender.load(model_path)
+    export_style_recommender_model(model, output_path)
+
     logger.info("Style Recommender exported successfully!")
 
 
+def export_layout_generator_model(model, output_dir: Path | str) -> None:
+    """Export a loaded Layout Generator to ONNX.
+
+    T5 is exported as two graphs: ``encoder.onnx`` (input IDs to hidden
+    states) and ``decoder.onnx`` (decoder prefix plus encoder states to
+    next-token logits), which the ONNX backend drives in a decode loop.
+
+    Args:
+        model: Initialized LayoutGenerator.
+        output_dir: Directory for the ONNX outputs.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    t5 = model.model
+    t5.eval()
+    t5.config.use_cache = False
+
+    class EncoderWrapper(torch.nn.Module):
+        def __init__(self, t5):
+            super().__init__()
+            self.encoder = t5.get_encoder()
+
+        def forward(self, input_ids, attention_mask):
+            return self.encoder(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                return_dict=False,
+            )[0]
+
+    class DecoderWrapper(torch.nn.Module):
+        def __init__(self, t5):
+            super().__init__()
+            self.t5 = t5
+
+        def forward(self, decoder_input_ids, encoder_hidden_states, attention_mask):
+            return self.t5(
+                encoder_outputs=(encoder_hidden_states,),
+                attention_mask=attention_mask,
+                decoder_input_ids=decoder_input_ids,
+                use_cache=False,
+                return_dict=False,
+            )[0]
+
+    dummy_input_ids = torch.ones(1, 8, dtype=torch.long)
+    dummy_attention_mask = torch.ones(1, 8, dtype=torch.long)
+    dummy_decoder_ids = torch.zeros(1, 2, dtype=torch.long)
+    dummy_hidden = torch.zeros(1, 8, t5.config.d_model)
+
+    logger.info(f"Exporting encoder to {output_dir / 'encoder.onnx'}")
+    torch.onnx.export(
+        EncoderWrapper(t5),
+        (dummy_input_ids, dummy_attention_mask),
+        str(output_dir / "encoder.onnx"),
+        input_names=["input_ids", "attention_mask"],
+        output_names=["last_hidden_state"],
+        dynamic_axes={
+            "input_ids": {0: "batch_size", 1: "sequence"},
+            "attention_mask": {0: "batch_size", 1: "sequence"},
+            "last_hidden_state": {0: "batch_size", 1: "sequence"},
+        },
+        opset_version=14,
+        do_constant_folding=True,
+        dynamo=False,
+    )
+
+    logger.info(f"Exporting decoder to {output_dir / 'decoder.onnx'}")
+    torch.onnx.export(
+        DecoderWrapper(t5),
+        (dummy_decoder_ids, dummy_hidden, dummy_attention_mask),
+        str(output_dir / "decoder.onnx"),
+        input_names=["decoder_input_ids", "encoder_hidden_states", "attention_mask"],
+        output_names=["logits"],
+        dynamic_axes={
+            "decoder_input_ids": {0: "batch_size", 1: "decoder_sequence"},
+            "encoder_hidden_states": {0: "batch_size", 1: "sequence"},
+            "attention_mask": {0: "batch_size", 1: "sequence"},
+            "logits": {0: "batch_size", 1: "decoder_sequence"},
+        },
+        opset_version=14,
+        do_constant_folding=True,
+        dynamo=False,
+    )
+
+
+def export_layout_generator(
+    model_path: str = "ml/models/layout_generator/trained",
+    output_dir: str = "ml/models/layout_generator/trained",
+) -> None:
+    """Export Layout Generator to ONNX.
+
+    Args:
+        model_path: Path to trained model.
+        output_dir: Directory for ONNX outputs.
+    """
+    from ml.models.layout_generator.model import LayoutGenerator
+
+    logger.info(f"Loading Layout Generator from {model_path}")
+
+    model = LayoutGenerator.load(model_path)
+    export_layout_generator_model(model, output_dir)
+
+    logger.info("Layout Generator exported successfully!")
+
+
+def quantize_onnx(onnx_path: Path | str, output_path: Path | str | None = None) -> Path:
+    """Apply int8 dynamic quantization to an exported model.
+
+    Weights of MatMul/Gemm nodes are stored as int8 and activations are
+    quantized on the fly, which shrinks the file roughly 4x and speeds up
+    CPU inference for the linear-heavy encoder layers.
+
+    Args:
+        onnx_path: Path to float ONNX model.
+        output_path: Path for quantized output. Defaults to ``<stem>.int8.onnx``.
+
+    Returns:
+        Path to the quantized model.
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    onnx_path = Path(onnx_path)
+    output_path = Path(output_path) if output_path else onnx_path.with_suffix(".int8.onnx")
+
+    logger.info(f"Quantizing {onnx_path} -> {output_path}")
+    quantize_dynamic(str(onnx_path), str(output_path), weight_type=QuantType.QInt8)
+
+    return output_path
+
+
 def verify_onnx(onnx_path: str) -> bool:
     """Verify ONNX model is valid.
 
@@ -150,11 +306,13 @@ def verify_onnx(onnx_path: str) -> bool:
 
 def export_all(
     models_dir: str = "ml/models",
+    quantize: bool = False,
 ) -> dict[str, bool]:
     """Export all trained models to ONNX.
 
     Args:
         models_dir: Base directory for models.
+        quantize: Also write int8 dynamically quantized variants.
 
     Returns:
         Dict of model name -> success status.
@@ -171,6 +329,8 @@ def export_all(
                 output_path=str(intent_path / "model.onnx"),
             )
             results["intent_classifier"] = verify_onnx(str(intent_path / "model.onnx"))
+            if quantize:
+                quantize_onnx(intent_path / "model.onnx")
         except Exception as e:
             logger.error(f"Failed to export Intent Classifier: {e}")
             results["intent_classifier"] = False
@@ -187,6 +347,8 @@ def export_all(
                 output_path=str(style_path / "model.onnx"),
             )
             results["style_recommender"] = verify_onnx(str(style_path / "model.onnx"))
+            if quantize:
+                quantize_onnx(style_path / "model.onnx")
         except Exception as e:
             logger.error(f"Failed to export Style Recommender: {e}")
             results["style_recommender"] = False
@@ -194,11 +356,24 @@ def export_all(
         logger.warning("Style Recommender not found, skipping")
         results["style_recommender"] = False
 
-    # Layout Generator would need GPU-trained model
+    # Export Layout Generator (saved as a Hugging Face model directory)
     layout_path = models_dir / "layout_generator/trained"
-    if (layout_path / "model.pt").exists():
-        logger.info("Layout Generator found but T5 export requires special handling")
-        results["layout_generator"] = False
+    if (layout_path / "model").exists():
+        try:
+            export_layout_generator(
+                model_path=str(layout_path),
+                output_dir=str(layout_path),
+            )
+            results["layout_generator"] = (
+                verify_onnx(str(layout_path / "encoder.onnx"))
+                and verify_onnx(str(layout_path / "decoder.onnx"))
+            )
+            if quantize:
+                quantize_onnx(layout_path / "encoder.onnx")
+                quantize_onnx(layout_path / "decoder.onnx")
+        except Exception as e:
+            logger.error(f"Failed to export Layout Generator: {e}")
+            results["layout_generator"] = False
     else:
         logger.warning("Layout Generator not trained yet")
         results["layout_generator"] = False
@@ -213,7 +388,7 @@ if __name__ == "__main__":
     parser.add_argument(
         "--model",
         type=str,
-        choices=["intent_classifier", "style_recommender", "all"],
+        choices=["intent_classifier", "style_recommender", "layout_generator", "all"],
         default="all",
         help="Which model to export",
     )
@@ -223,13 +398,27 @@ if __name__ == "__main__":
         default="ml/models",
         help="Base directory for models",
     )
+    parser.add_argument(
+        "--quantize",
+        action="store_true",
+        help="Also write int8 dynamically quantized models",
+    )
 
     args = parser.parse_args()
 
     if args.model == "all":
-        results = export_all(args.models_dir)
+        results = export_all(args.models_dir, quantize=args.quantize)
         logger.info(f"Export results: {results}")
     elif args.model == "intent_classifier":
         export_intent_classifier()
+        if args.quantize:
+            quantize_onnx("ml/models/intent_classifier/trained/model.onnx")
     elif args.model == "style_recommender":
         export_style_recommender()
+        if args.quantize:
+            quantize_onnx("ml/models/style_recommender/trained/model.onnx")
+    elif args.model == "layout_generator":
+        export_layout_generator()
+        if args.quantize:
+            quantize_onnx("ml/models/layout_generator/trained/encoder.onnx")
+            quantize_onnx("ml/models/layout_generator/trained/decoder.onnx")